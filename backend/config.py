@@ -18,6 +18,43 @@ class Settings(BaseSettings):
     cors_origins: list[str] = ["http://localhost:5173"]
     environment: str = "development"
     log_level: str = "INFO"
+    db_pool_size: int = 20
+    db_max_concurrency: int = 16
+    db_timeout_s: float = 30.0
+    # Rows per page for unbounded reads (PostgREST db-max-rows caps a single response)
+    db_page_size: int = 1000
+    # Allocation delta feed: beyond these the client is told to reload the full matrix
+    delta_max_rows: int = 2000
+    delta_max_age_hours: int = 24
+    # Seconds of the delta feed read again by the next poll: covers write transactions still open at a poll
+    delta_overlap_s: float = 10.0
+    # Projects kept in the in-process snapshot cache (LRU)
+    snapshot_cache_size: int = 8
+    # ISO-week tiles kept by the daily matrix tile cache (LRU, all projects)
+    matrix_tile_cache_size: int = 512
+    # Decoded baseline plans kept in-process (LRU by baseline id; plans are immutable)
+    baseline_plan_cache_size: int = 32
+    # Write-behind buffer for grid PUTs: coalesce cells per project for this long, spill to disk until written
+    write_buffer_enabled: bool = False
+    write_buffer_window_ms: int = 250
+    write_buffer_max_cells: int = 2000
+    write_buffer_spill_dir: str = ".write_buffer"
+    # Allocation SSE stream: per-client queue bound, replay log per project, idle version poll
+    stream_queue_size: int = 256
+    stream_replay_events: int = 256
+    stream_poll_s: float = 5.0
+    stream_retry_ms: int = 3000
+    # Background jobs (Prefer: respond-async): concurrent runs per job type on each worker, queued runs beyond
+    # which submits are refused, progress write interval, how long file results are kept
+    job_workers: dict[str, int] = {"baseline": 2, "import": 1, "pdf": 2, "forecast": 1}
+    job_max_queued: int = 50
+    job_progress_interval_s: float = 1.0
+    job_retention_hours: int = 24
+    job_shutdown_grace_s: float = 20.0
+    # Unfinished jobs refresh their row (updated_at) every job_heartbeat_s; one not refreshed for
+    # job_stale_after_s has lost its worker (on any host) and is failed when read or on startup
+    job_heartbeat_s: float = 30.0
+    job_stale_after_s: float = 120.0
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -11,9 +11,17 @@ from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import settings
+from backend.models.db import close_async_db
 from backend.middleware.auth import get_current_user, get_optional_user
 from backend.middleware.audit import AuditMiddleware
-from backend.routers import projects, wbs, allocations, baselines, chat, ai, reports
+from backend.middleware.compression import StreamingAwareGZipMiddleware
+from backend.routers import projects, wbs, allocations, baselines, chat, ai, reports, jobs
+from backend.services.baseline_cache import baseline_cache
+from backend.services.change_stream import change_broker
+from backend.services.job_runner import job_runner
+from backend.services.matrix_tiles import matrix_tiles
+from backend.services.project_snapshot import snapshot_cache
+from backend.services.write_buffer import allocation_buffer
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -47,6 +55,9 @@ app.add_middleware(
 # Audit logging middleware (records mutating API calls)
 app.add_middleware(AuditMiddleware)
 
+# Compress JSON bodies (matrix, weekly and Gantt responses are highly repetitive); SSE streams pass through
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024)
+
 # ---------------------------------------------------------------------------
 # Auth — enforce on all /api/ routes in production
 # In development, auth is optional (still verifies if token present)
@@ -66,6 +77,7 @@ app.include_router(baselines.router, dependencies=_auth_deps)
 app.include_router(chat.router, dependencies=_auth_deps)
 app.include_router(ai.router, dependencies=_auth_deps)
 app.include_router(reports.router, dependencies=_auth_deps)
+app.include_router(jobs.router, dependencies=_auth_deps)
 
 
 # ---------------------------------------------------------------------------
@@ -77,13 +89,31 @@ async def health_check():
     return {"status": "ok", "version": "1.0.0", "environment": settings.environment}
 
 
+@app.get("/health/caches", tags=["health"])
+async def cache_stats():
+    """Per-process cache counters for tuning (each uvicorn worker reports its own)."""
+    return {
+        "matrix_tiles": matrix_tiles.stats(),
+        "project_snapshots": snapshot_cache.stats(),
+        "baseline_plans": baseline_cache.stats(),
+        "write_buffer": allocation_buffer.stats(),
+        "change_stream": change_broker.stats(),
+        "jobs": job_runner.stats(),
+    }
+
+
 @app.on_event("startup")
 async def on_startup():
-    """Log a banner on application start."""
+    """Log a banner, replay grid edits a crashed worker left buffered, fail its interrupted jobs."""
     logger.info("MetalYapi Scheduling API v1.0.0 starting (%s)", settings.environment)
+    await allocation_buffer.replay()
+    await job_runner.recover()
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
-    """Clean-up hook (future: close DB pools, flush queues)."""
+    """Clean-up hook: finish (or fail) running jobs, write buffered grid edits, close the pooled DB connection."""
+    await job_runner.drain()
+    await allocation_buffer.flush_all()
+    await close_async_db()
     logger.info("MetalYapi Scheduling API shutting down")
@@ -7,6 +7,7 @@ persists it to the ``audit_log`` Supabase table.  Read-only requests
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import time
@@ -16,13 +17,16 @@ from typing import Callable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
-from backend.models.db import get_db
+from backend.models.db import get_async_db
 
 logger = logging.getLogger(__name__)
 
 # HTTP methods that mutate state
 _MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
+# Audit inserts still running; the event loop keeps only weak references to tasks
+_pending: set[asyncio.Task] = set()
+
 
 class AuditMiddleware(BaseHTTPMiddleware):
     """Starlette middleware that records an audit trail for write operations."""
@@ -56,11 +60,10 @@ class AuditMiddleware(BaseHTTPMiddleware):
             "user_agent": request.headers.get("user-agent"),
         }
 
-        # Persist asynchronously (best-effort -- don't block the response)
-        try:
-            self._persist(audit_record)
-        except Exception:
-            logger.debug("Audit persistence skipped (DB may not be configured)")
+        # Persist in the background (best-effort -- don't block the response)
+        task = asyncio.create_task(self._persist(audit_record))
+        _pending.add(task)
+        task.add_done_callback(_persisted)
 
         logger.info(
             "AUDIT %s %s -> %s (%.1fms)",
@@ -77,15 +80,15 @@ class AuditMiddleware(BaseHTTPMiddleware):
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _persist(record: dict) -> None:
+    async def _persist(record: dict) -> None:
         """Insert an audit row into Supabase.
 
         Fails silently when the database is not configured (e.g. in local dev
         without Supabase credentials).
         """
         try:
-            db = get_db()
-            db.table("audit_log").insert(record).execute()
+            db = get_async_db()
+            await db.table("audit_log").insert(record).execute()
         except RuntimeError:
             # Supabase not configured -- skip
             pass
@@ -97,3 +100,9 @@ class AuditMiddleware(BaseHTTPMiddleware):
         if forwarded:
             return forwarded.split(",")[0].strip()
         return request.client.host if request.client else "unknown"
+
+
+def _persisted(task: asyncio.Task) -> None:
+    _pending.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Audit persistence skipped (DB may not be configured): %s", task.exception())
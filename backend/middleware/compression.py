@@ -0,0 +1,22 @@
+"""GZip middleware that never touches server-sent event streams.
+
+Starlette releases before 0.45 compress ``text/event-stream`` too, and the
+compressor holds small chunks back until its buffer fills — events would
+reach the browser late and in bursts. Stream endpoints are passed through
+by path so this holds on every supported Starlette version.
+"""
+
+from __future__ import annotations
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips paths ending in ``/stream``."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -3,12 +3,22 @@
 When SUPABASE_URL is not set or starts with "http://db", falls back to mock mode
 which returns seed data from memory. This lets the app run in Docker without
 a real Supabase project.
+
+Two entry points:
+- ``get_db()``: synchronous supabase client (scripts, one-off tooling)
+- ``get_async_db()``: async facade used by services and routers — a PostgREST
+  client on one pooled HTTP connection with a bounded number of in-flight
+  queries, or MockDB behind the same awaitable interface.
 """
 
 from __future__ import annotations
 
+import asyncio
+import bisect
+import inspect
 import logging
-from datetime import date, datetime, timezone
+from collections.abc import Callable
+from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
 
@@ -18,6 +28,7 @@ logger = logging.getLogger(__name__)
 
 _client = None
 _mock_mode = False
+_async_client: AsyncDB | None = None
 
 
 def get_db():
@@ -56,29 +67,333 @@ def is_mock_mode() -> bool:
     return _mock_mode
 
 
+def get_async_db() -> AsyncDB:
+    """Return the async DB facade (pooled PostgREST client or MockDB).
+
+    The mode follows ``get_db()``: in mock mode the facade wraps the same
+    MockDB instance, so sync and async callers see the same data.
+    """
+    global _async_client
+    if _async_client is not None:
+        return _async_client
+
+    client = get_db()
+    if _mock_mode:
+        _async_client = AsyncDB(client)
+        return _async_client
+
+    import httpx
+    from postgrest import AsyncPostgrestClient
+
+    key = settings.supabase_service_key or settings.supabase_key
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.db_pool_size,
+            max_keepalive_connections=settings.db_pool_size,
+        ),
+        timeout=settings.db_timeout_s,
+        follow_redirects=True,
+        http2=True,
+    )
+    rest = AsyncPostgrestClient(
+        f"{settings.supabase_url}/rest/v1",
+        headers={
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        },
+        http_client=http_client,
+    )
+    _async_client = AsyncDB(rest, http_client)
+    logger.info(
+        "Async DB pool ready (%d connections, %d concurrent queries)",
+        settings.db_pool_size, settings.db_max_concurrency,
+    )
+    return _async_client
+
+
+async def close_async_db() -> None:
+    """Close the pooled HTTP connection (called on application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+# Ids per in.() filter, keeping the PostgREST GET URL well under proxy limits
+ID_CHUNK_SIZE = 150
+
+
+async def fetch_all(build_query: Callable[[], AsyncQuery]) -> list[dict[str, Any]]:
+    """Every row of ``build_query()``, read in settings.db_page_size pages.
+
+    PostgREST caps a response at db-max-rows, so one request can silently
+    truncate. ``build_query`` returns a fresh, totally ordered query (e.g.
+    ``.order("id")``) per page; a short page ends the read.
+    """
+    rows: list[dict[str, Any]] = []
+    page_size = settings.db_page_size
+    while True:
+        response = await build_query().range(len(rows), len(rows) + page_size - 1).execute()
+        rows.extend(response.data)
+        if len(response.data) < page_size:
+            return rows
+
+
+async def fetch_all_in(ids: list[str], build_query: Callable[[list[str]], AsyncQuery]) -> list[dict[str, Any]]:
+    """``fetch_all`` for a query filtered by ``ids``: chunks of ID_CHUNK_SIZE ids, read concurrently.
+
+    ``build_query(chunk)`` applies the ``.in_()`` filter for one chunk. Rows
+    are returned chunk by chunk in the order of ``ids``.
+    """
+    chunks = await asyncio.gather(*(
+        fetch_all(lambda chunk=ids[i:i + ID_CHUNK_SIZE]: build_query(chunk))
+        for i in range(0, len(ids), ID_CHUNK_SIZE)
+    ))
+    return [row for chunk in chunks for row in chunk]
+
+
+async def fetch_first_in(
+    ids: list[str], build_query: Callable[[list[str]], AsyncQuery], limit: int
+) -> list[dict[str, Any]]:
+    """Up to ``limit`` rows of a query filtered by ``ids``, read one ID_CHUNK_SIZE chunk at a time.
+
+    Each chunk asks only for the rows still missing and the read stops once
+    ``limit`` rows are in, so callers can tell "more than N" apart cheaply.
+    Rows are ordered within each chunk only.
+    """
+    rows: list[dict[str, Any]] = []
+    for i in range(0, len(ids), ID_CHUNK_SIZE):
+        response = await build_query(ids[i:i + ID_CHUNK_SIZE]).limit(limit - len(rows)).execute()
+        rows.extend(response.data)
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+class AsyncDB:
+    """Awaitable query-builder facade with bounded concurrency.
+
+    Wraps either an ``AsyncPostgrestClient`` or ``MockDB``; both expose the
+    same builder chain (.table().select().eq()...). ``execute()`` is awaited
+    under a semaphore so one worker never has more than
+    ``settings.db_max_concurrency`` queries in flight.
+    """
+
+    def __init__(self, client: Any, http_client: Any = None):
+        self._client = client
+        self._http_client = http_client
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.db_max_concurrency)
+        return self._semaphore
+
+    def table(self, name: str) -> AsyncQuery:
+        return AsyncQuery(self._client.table(name), self)
+
+    def rpc(self, func: str, params: dict[str, Any]) -> AsyncQuery:
+        return AsyncQuery(self._client.rpc(func, params), self)
+
+    async def aclose(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+
+
+class AsyncQuery:
+    """Proxy over a sync or async query builder; ``execute()`` is awaitable."""
+
+    def __init__(self, builder: Any, db: AsyncDB):
+        self._builder = builder
+        self._db = db
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def _chain(*args, **kwargs):
+            return AsyncQuery(attr(*args, **kwargs), self._db)
+
+        return _chain
+
+    async def execute(self) -> Any:
+        async with self._db.semaphore:
+            result = self._builder.execute()
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+
+# Unique constraints from supabase/migrations — used for upsert conflict lookups
+_UNIQUE_KEYS: dict[str, tuple[str, ...]] = {
+    "projects": ("code",),
+    "wbs_items": ("project_id", "wbs_code"),
+    "daily_allocations": ("wbs_item_id", "date"),
+    "baselines": ("project_id", "version"),
+    "project_calendars": ("project_id",),
+}
+
+# Column DEFAULTs from supabase/migrations that services rely on
+_COLUMN_DEFAULTS: dict[str, dict[str, Any]] = {
+    "projects": {"data_version": 0},
+    "jobs": {"status": "queued", "progress": 0},
+}
+
+# Columns that get a hash index for eq/in filters
+_INDEXED_COLUMNS: tuple[str, ...] = ("id", "project_id", "wbs_item_id", "baseline_id")
+
+
 class MockDB:
     """In-memory mock that mimics the Supabase Python client API.
 
     Supports: .table(name).select("*").eq(k,v).order(k).execute()
-    and .table(name).insert(data).execute() / .upsert(data).execute()
+    and .table(name).insert(data).execute() / .upsert(data).execute() / .delete().eq(k,v).execute()
     """
 
     def __init__(self):
-        self._data: dict[str, list[dict]] = _build_seed_data()
+        self._data: dict[str, MockStore] = {
+            name: MockStore(name, rows) for name, rows in _build_seed_data().items()
+        }
 
     def table(self, name: str) -> MockTable:
         if name not in self._data:
-            self._data[name] = []
+            self._data[name] = MockStore(name, [])
         return MockTable(self._data[name])
 
+    def rpc(self, func: str, params: dict[str, Any]) -> MockRpc:
+        if func not in _MOCK_RPCS:
+            raise ValueError(f"Could not find the function public.{func} (mock)")
+        return MockRpc(self, func, params)
+
+
+class MockRpc:
+    """Deferred call of a local stand-in for a Postgres function."""
+
+    def __init__(self, db: MockDB, func: str, params: dict[str, Any]):
+        self._db = db
+        self._func = func
+        self._params = params
+
+    def execute(self) -> MockResponse:
+        return MockResponse(_MOCK_RPCS[self._func](self._db, self._params))
+
+
+class MockStore:
+    """Row storage for one mock table with hash indexes.
+
+    Rows are appended; each row keeps its insertion position so indexed
+    lookups return rows in the same order as a full scan would. Deletes
+    rebuild the indexes.
+
+    - column indexes: ``{column: {str(value): [positions]}}`` for _INDEXED_COLUMNS
+    - unique indexes: ``{(col, ...): {(str(v), ...): row}}`` for _UNIQUE_KEYS
+      (other ``on_conflict`` key sets are indexed lazily on first use)
+    """
+
+    def __init__(self, name: str, rows: list[dict]):
+        self.name = name
+        self.rows: list[dict] = []
+        self._positions: dict[int, int] = {}
+        self._columns: dict[str, dict[str, list[int]]] = {c: {} for c in _INDEXED_COLUMNS}
+        self._unique: dict[tuple[str, ...], dict[tuple[str, ...], dict]] = {}
+        if name in _UNIQUE_KEYS:
+            self._unique[_UNIQUE_KEYS[name]] = {}
+        for row in rows:
+            self.append(row)
+
+    # -- write path ----------------------------------------------------
+
+    def append(self, row: dict) -> None:
+        for col, value in _COLUMN_DEFAULTS.get(self.name, {}).items():
+            row.setdefault(col, value)
+        pos = len(self.rows)
+        self.rows.append(row)
+        self._positions[id(row)] = pos
+        for col, index in self._columns.items():
+            index.setdefault(self._value_key(row.get(col, "")), []).append(pos)
+        for keys, index in self._unique.items():
+            index.setdefault(self._unique_key(row, keys), row)
+
+    def update_row(self, row: dict, changes: dict) -> None:
+        """Apply ``changes`` to a stored row, keeping every index consistent."""
+        touched_cols = [c for c in self._columns if c in changes and changes[c] != row.get(c)]
+        touched_unique = [k for k in self._unique if any(c in changes for c in k)]
+        pos = self._positions[id(row)]
+
+        for col in touched_cols:
+            bucket = self._columns[col].get(self._value_key(row.get(col, "")), [])
+            if pos in bucket:
+                bucket.remove(pos)
+        for keys in touched_unique:
+            index = self._unique[keys]
+            old_key = self._unique_key(row, keys)
+            if index.get(old_key) is row:
+                del index[old_key]
+
+        row.update(changes)
+
+        for col in touched_cols:
+            bisect.insort(self._columns[col].setdefault(self._value_key(row.get(col, "")), []), pos)
+        for keys in touched_unique:
+            self._unique[keys].setdefault(self._unique_key(row, keys), row)
+
+    def remove(self, rows: list[dict]) -> None:
+        """Delete stored rows and re-index the rest (O(n))."""
+        gone = {id(r) for r in rows}
+        kept = [r for r in self.rows if id(r) not in gone]
+        self.rows.clear()
+        self._positions.clear()
+        for index in (*self._columns.values(), *self._unique.values()):
+            index.clear()
+        for row in kept:
+            self.append(row)
+
+    # -- read path -----------------------------------------------------
+
+    def find_unique(self, keys: tuple[str, ...], row: dict) -> dict | None:
+        """Return the stored row matching ``row`` on ``keys`` (O(1))."""
+        if keys not in self._unique:
+            index: dict[tuple[str, ...], dict] = {}
+            for r in self.rows:
+                index.setdefault(self._unique_key(r, keys), r)
+            self._unique[keys] = index
+        return self._unique[keys].get(self._unique_key(row, keys))
+
+    def is_indexed(self, col: str) -> bool:
+        return col in self._columns
+
+    def lookup(self, col: str, values: list) -> list[dict]:
+        """Rows whose ``col`` matches any of ``values``, in insertion order."""
+        index = self._columns[col]
+        if len(values) == 1:
+            positions = index.get(self._value_key(values[0]), [])
+        else:
+            keys = {self._value_key(v) for v in values}
+            positions = sorted(p for k in keys for p in index.get(k, []))
+        return [self.rows[p] for p in positions]
+
+    @staticmethod
+    def _value_key(value: Any) -> str:
+        return str(value)
+
+    @classmethod
+    def _unique_key(cls, row: dict, keys: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(cls._value_key(row.get(k)) for k in keys)
+
 
 class MockTable:
-    def __init__(self, rows: list[dict]):
-        self._rows = rows
+    def __init__(self, store: MockStore):
+        self._store = store
+        self._rows = store.rows
         self._filters: list[tuple[str, str, Any]] = []
         self._order_key: str | None = None
         self._order_desc: bool = False
         self._limit_n: int | None = None
+        self._range: tuple[int, int] | None = None
         self._select_cols: str = "*"
 
     def select(self, cols: str = "*") -> MockTable:
@@ -93,6 +408,10 @@ class MockTable:
         self._filters.append((key, "in", values))
         return self
 
+    def gt(self, key: str, value: Any) -> MockTable:
+        self._filters.append((key, "gt", value))
+        return self
+
     def gte(self, key: str, value: Any) -> MockTable:
         self._filters.append((key, "gte", value))
         return self
@@ -110,49 +429,65 @@ class MockTable:
         self._limit_n = n
         return self
 
+    def range(self, start: int, end: int) -> MockTable:
+        """Inclusive row window, like PostgREST's offset/limit pagination."""
+        self._range = (start, end)
+        return self
+
     def insert(self, data: dict | list) -> MockTable:
         rows = data if isinstance(data, list) else [data]
         for row in rows:
             if "id" not in row:
                 row["id"] = str(uuid4())
-            row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
-            row.setdefault("updated_at", datetime.now(timezone.utc).isoformat())
-            self._rows.append(row)
+            row.setdefault("created_at", datetime.now(UTC).isoformat())
+            row.setdefault("updated_at", datetime.now(UTC).isoformat())
+            self._store.append(row)
         self._last_inserted = rows
         return self
 
     def upsert(self, data: dict | list, on_conflict: str = "") -> MockTable:
         rows = data if isinstance(data, list) else [data]
-        conflict_keys = on_conflict.split(",") if on_conflict else []
+        conflict_keys = tuple(on_conflict.split(",")) if on_conflict else ()
+        written = []
         for row in rows:
-            if "id" not in row:
-                row["id"] = str(uuid4())
-            # Check for existing row by conflict keys
+            # Check for existing row by conflict keys (hash lookup)
             if conflict_keys:
-                existing = None
-                for r in self._rows:
-                    if all(r.get(k) == row.get(k) for k in conflict_keys):
-                        existing = r
-                        break
-                if existing:
-                    existing.update(row)
+                existing = self._store.find_unique(conflict_keys, row)
+                if existing is not None:
+                    # fn_update_timestamp trigger: every UPDATE bumps updated_at
+                    self._store.update_row(existing, {**row, "updated_at": datetime.now(UTC).isoformat()})
+                    written.append(existing)
                     continue
-            row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
-            row.setdefault("updated_at", datetime.now(timezone.utc).isoformat())
-            self._rows.append(row)
-        self._last_inserted = rows
+            if "id" not in row:
+                row["id"] = str(uuid4())
+            row.setdefault("created_at", datetime.now(UTC).isoformat())
+            row.setdefault("updated_at", datetime.now(UTC).isoformat())
+            self._store.append(row)
+            written.append(row)
+        self._last_inserted = written
         return self
 
     def update(self, data: dict) -> MockTable:
         self._update_data = data
         return self
 
+    def delete(self) -> MockTable:
+        self._delete = True
+        return self
+
     def execute(self) -> MockResponse:
+        # Handle delete
+        if hasattr(self, "_delete"):
+            filtered = self._apply_filters(self._rows)
+            self._store.remove(filtered)
+            return MockResponse(filtered)
+
         # Handle update
         if hasattr(self, "_update_data"):
             filtered = self._apply_filters(self._rows)
+            changes = {**self._update_data, "updated_at": datetime.now(UTC).isoformat()}
             for row in filtered:
-                row.update(self._update_data)
+                self._store.update_row(row, changes)
             return MockResponse(filtered)
 
         # Handle insert/upsert
@@ -165,6 +500,9 @@ class MockTable:
         if self._order_key:
             result = sorted(result, key=lambda r: r.get(self._order_key, ""), reverse=self._order_desc)
 
+        if self._range is not None:
+            result = result[self._range[0]:self._range[1] + 1]
+
         if self._limit_n:
             result = result[:self._limit_n]
 
@@ -179,12 +517,31 @@ class MockTable:
             return str(a), str(b)
 
     def _apply_filters(self, rows: list[dict]) -> list[dict]:
-        result = list(rows)
-        for key, op, value in self._filters:
+        filters = list(self._filters)
+
+        # Seed the candidate set from the first indexed eq/in filter instead of a full scan
+        seed = next(
+            (f for f in filters if f[1] in ("eq", "in") and self._store.is_indexed(f[0])),
+            None,
+        )
+        if seed is not None:
+            key, op, value = seed
+            result = self._store.lookup(key, [value] if op == "eq" else list(value))
+            filters.remove(seed)
+        else:
+            result = list(rows)
+
+        for key, op, value in filters:
             if op == "eq":
                 result = [r for r in result if str(r.get(key, "")) == str(value)]
             elif op == "in":
                 result = [r for r in result if r.get(key) in value]
+            elif op == "gt":
+                result = [
+                    r for r in result
+                    if self._coerce_for_compare(r.get(key, ""), value)[0]
+                    > self._coerce_for_compare(r.get(key, ""), value)[1]
+                ]
             elif op == "gte":
                 result = [
                     r for r in result
@@ -201,14 +558,101 @@ class MockTable:
 
 
 class MockResponse:
-    def __init__(self, data: list[dict]):
+    def __init__(self, data: list[dict] | dict):
         self.data = data
 
 
+# ---------------------------------------------------------------------------
+# Local equivalents of the Postgres functions in supabase/migrations
+# ---------------------------------------------------------------------------
+
+def _mock_wbs_progress(db: MockDB, project_id: str) -> list[dict]:
+    """Mirror of vw_wbs_progress (010_wbs_progress_parent.sql) for one project, ordered by wbs_code."""
+    items = db.table("wbs_items").select("*").eq("project_id", project_id).execute().data
+    allocs = (
+        db.table("daily_allocations")
+        .select("*")
+        .in_("wbs_item_id", [w["id"] for w in items])
+        .execute()
+        .data
+    )
+    by_wbs: dict[str, list[dict]] = {}
+    for a in allocs:
+        by_wbs.setdefault(str(a["wbs_item_id"]), []).append(a)
+
+    rows = []
+    for w in items:
+        wbs_allocs = by_wbs.get(str(w["id"]), [])
+        qty = float(w.get("qty") or 0)
+        done = sum(float(a.get("qty_done") or 0) for a in wbs_allocs)
+        manday = sum(float(a.get("actual_manpower") or 0) for a in wbs_allocs)
+        worked = sorted({str(a["date"]) for a in wbs_allocs if float(a.get("actual_manpower") or 0) > 0})
+        rows.append({
+            "id": w["id"], "project_id": w["project_id"], "wbs_code": w["wbs_code"],
+            "wbs_name": w["wbs_name"], "qty": qty, "unit": w.get("unit"),
+            "sort_order": w.get("sort_order"), "level": w.get("level"), "is_summary": w.get("is_summary"),
+            "done": done,
+            "remaining": qty - done,
+            "progress_pct": round(done / qty * 100, 1) if qty > 0 else 0,
+            "total_actual_manday": manday,
+            "working_days": len(worked),
+            "productivity_rate": round(done / manday, 3) if manday > 0 else 0,
+            "first_working_day": worked[0] if worked else None,
+            "last_working_day": worked[-1] if worked else None,
+            "parent_id": w.get("parent_id"),
+        })
+    return sorted(rows, key=lambda r: r["wbs_code"])
+
+
+def _mock_fn_daily_matrix(db: MockDB, params: dict[str, Any]) -> dict[str, Any]:
+    """Mirror of fn_daily_matrix (013_fn_daily_matrix_active_baseline.sql)."""
+    project_id = str(params["p_project_id"])
+    date_from, date_to = str(params["p_from"]), str(params["p_to"])
+
+    projects = db.table("projects").select("*").eq("id", project_id).execute().data
+    wbs_ids = [w["id"] for w in db.table("wbs_items").select("id").eq("project_id", project_id).execute().data]
+    allocations = (
+        db.table("daily_allocations")
+        .select("*")
+        .in_("wbs_item_id", wbs_ids)
+        .gte("date", date_from)
+        .lte("date", date_to)
+        .order("date")
+        .execute()
+        .data
+    )
+
+    active = db.table("baselines").select("id").eq("project_id", project_id).eq("is_active", True).execute().data
+
+    return {
+        "project": projects[0] if projects else None,
+        "wbs_progress": _mock_wbs_progress(db, project_id),
+        "allocations": allocations,
+        "active_baseline_id": active[0]["id"] if active else None,
+    }
+
+
+def _mock_fn_bump_project_version(db: MockDB, params: dict[str, Any]) -> int | None:
+    """Mirror of fn_bump_project_version (009_project_data_version.sql)."""
+    project_id = str(params["p_project_id"])
+    projects = db.table("projects").select("*").eq("id", project_id).execute().data
+    if not projects:
+        return None
+    version = int(projects[0].get("data_version") or 0) + 1
+    db.table("projects").update({"data_version": version}).eq("id", project_id).execute()
+    return version
+
+
+_MOCK_RPCS = {
+    "fn_daily_matrix": _mock_fn_daily_matrix,
+    "fn_bump_project_version": _mock_fn_bump_project_version,
+}
+
+
 def _build_seed_data() -> dict[str, list[dict]]:
     """Build in-memory seed data matching supabase/seed.sql."""
     project_id = "00000000-0000-0000-0000-000000000001"
-    now = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(UTC).isoformat()
 
     wbs = [
         # Summary/Parent items (level 0-1)
@@ -256,8 +700,11 @@ def _build_seed_data() -> dict[str, list[dict]]:
         ],
         "baselines": [],
         "baseline_snapshots": [],
+        "project_calendars": [],
         "ai_forecasts": [],
         "chat_messages": [],
         "audit_log": [],
+        "jobs": [],
+        "job_artifacts": [],
         "vw_wbs_progress": [],  # computed on-the-fly by service
     }
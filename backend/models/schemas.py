@@ -11,7 +11,7 @@ from datetime import date, datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 # ---------------------------------------------------------------------------
@@ -40,6 +40,60 @@ class ProjectResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# ---------------------------------------------------------------------------
+# Project calendar (working days)
+# ---------------------------------------------------------------------------
+
+class CalendarHoliday(BaseModel):
+    date: date
+    name: str | None = Field(None, max_length=255)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CalendarShutdown(BaseModel):
+    start: date
+    end: date
+    name: str | None = Field(None, max_length=255)
+
+    @model_validator(mode="after")
+    def _end_not_before_start(self) -> CalendarShutdown:
+        if self.end < self.start:
+            raise ValueError("shutdown end must not be before start")
+        return self
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectCalendar(BaseModel):
+    """Working weekdays (ISO 1 = Monday .. 7 = Sunday), holidays and site shutdowns."""
+    working_weekdays: list[int] = Field(default_factory=lambda: [1, 2, 3, 4, 5, 6], min_length=1, max_length=7)
+    holidays: list[CalendarHoliday] = []
+    shutdowns: list[CalendarShutdown] = []
+
+    @field_validator("working_weekdays")
+    @classmethod
+    def _iso_weekdays(cls, value: list[int]) -> list[int]:
+        if any(d < 1 or d > 7 for d in value):
+            raise ValueError("working_weekdays must be ISO weekdays 1-7")
+        return sorted(set(value))
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectCalendarResponse(ProjectCalendar):
+    project_id: UUID
+
+
+class CalendarDaysResponse(BaseModel):
+    """Per-day calendar view: parallel arrays over the requested window."""
+    dates: list[str]
+    working: list[bool]
+    kw: list[str]  # "2026-KW08"
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ---------------------------------------------------------------------------
 # WBS Items
 # ---------------------------------------------------------------------------
@@ -159,6 +213,9 @@ class AllocationCell(BaseModel):
     actual_manpower: float | None = Field(None, ge=0, le=200)
     qty_done: float | None = Field(None, ge=0)
     notes: str | None = None
+    # Optimistic concurrency: the cell's updated_at when read, or the matrix as_of (a conflict is any
+    # later write); null = the cell was empty; omit to overwrite unconditionally
+    expected_updated_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -174,6 +231,9 @@ class AllocationBatchUpdate(BaseModel):
 class AllocationBatchResponse(BaseModel):
     updated_count: int
     errors: list[dict[str, Any]] = []
+    buffered: bool = False  # accepted by the write-behind buffer; cell errors are logged at flush
+    applied: list[dict[str, Any]] = []  # [{wbs_id, date, updated_at}] of written cells
+    conflicts: list[dict[str, Any]] = []  # [{wbs_id, date, expected_updated_at, current}] not written
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -210,6 +270,114 @@ class DailyMatrixResponse(BaseModel):
     date_range: list[str]  # ["2026-02-17", "2026-02-18", ...]
     matrix: dict[str, dict[str, CellData]]  # {wbs_id: {date: CellData}}
     totals: dict[str, dict[str, float]]  # {date: {planned: N, actual: N}}
+    as_of: datetime | None = None  # read time; send as expected_updated_at for conflict-checked edits
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SparseCells(BaseModel):
+    """Non-empty matrix cells as parallel arrays (same length)."""
+    row: list[int] = []  # index into wbs_items
+    day: list[int] = []  # index into date_range
+    planned: list[float] = []
+    actual: list[float] = []
+    qty_done: list[float] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DailyMatrixSparseResponse(BaseModel):
+    """Sparse daily matrix — IC-002 v2, opt-in via ?format=v2.
+
+    Cells missing from ``cells`` are all-zero. A cell is future when its
+    date >= ``future_from`` (None = no future dates in the window).
+    """
+    format: str = "v2"
+    wbs_items: list[WBSProgressResponse]
+    date_range: list[str]
+    future_from: str | None = None
+    cells: SparseCells
+    totals: dict[str, list[float]]  # {planned: [per day], actual: [per day]}
+    as_of: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WeekInfo(BaseModel):
+    """One ISO calendar week (KW) column."""
+    key: str  # "2026-KW08"
+    year: int
+    week: int
+    start: str  # Monday, YYYY-MM-DD
+    end: str  # Sunday, YYYY-MM-DD
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WeeklyMatrixResponse(BaseModel):
+    """Per-WBS sums per ISO week; weeks without activity are omitted from ``matrix``."""
+    wbs_items: list[WBSProgressResponse]
+    weeks: list[WeekInfo]
+    matrix: dict[str, dict[str, dict[str, float]]]  # {wbs_id: {week_key: {planned, actual, qty_done}}}
+    totals: dict[str, dict[str, float]]  # {week_key: {planned, actual, qty_done}}
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GanttBar(BaseModel):
+    """One WBS bar; spans are inclusive [first, last] indices into ``buckets``."""
+    wbs_id: str
+    wbs_code: str
+    wbs_name: str
+    parent_id: str | None = None
+    level: int = 0
+    is_summary: bool = False
+    progress_pct: float = 0.0
+    baseline_start: str | None = None
+    baseline_end: str | None = None
+    actual_start: str | None = None
+    actual_end: str | None = None  # last working day
+    forecast_end: str | None = None
+    planned_manday: float = 0.0
+    actual_manday: float = 0.0
+    planned_spans: list[list[int]] = []
+    actual_spans: list[list[int]] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SummaryOverall(BaseModel):
+    total_progress: float
+    total_planned_manday: float
+    total_actual_manday: float
+    project_health: str = Field(..., pattern="^(on_track|at_risk|behind)$")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SummaryResponse(BaseModel):
+    """Gantt summary — activity bucketed server-side by ``zoom`` (day/week/month)."""
+    zoom: str
+    buckets: list[str]  # bucket start dates, YYYY-MM-DD
+    gantt_bars: list[GanttBar]
+    milestones: list[dict[str, Any]] = []
+    overall: SummaryOverall
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AllocationChangesResponse(BaseModel):
+    """Rows changed after the client's watermark — incremental grid refresh.
+
+    When ``full_reload`` is true the delta is incomplete (gap too large or
+    the baseline changed) and the client should refetch the daily matrix.
+    Rows written just before a poll are sent again by the next one (the
+    watermark trails by settings.delta_overlap_s), so apply them idempotently.
+    """
+    watermark: datetime  # pass back as ?since= on the next poll
+    full_reload: bool = False
+    allocations: list[dict[str, Any]] = []  # daily_allocations rows
+    baselines: list[dict[str, Any]] = []  # baselines rows
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -233,6 +401,67 @@ class BaselineResponse(BaseModel):
     approved_at: datetime | None = None
     is_active: bool = True
     created_at: datetime | None = None
+    parent_id: UUID | None = None  # previous version; snapshots are stored as a delta against it
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BaselineRef(BaseModel):
+    version: int | None = None  # None: actual allocations
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BaselineVarianceItem(BaseModel):
+    """One WBS row; variance and shifts are target - base (positive = more / later)."""
+    wbs_id: str
+    wbs_code: str
+    wbs_name: str
+    level: int = 0
+    is_summary: bool = False
+    base_manday: float
+    target_manday: float
+    variance_manday: float
+    base_start: str | None = None
+    base_end: str | None = None
+    target_start: str | None = None
+    target_end: str | None = None
+    start_shift_days: int | None = None  # calendar days
+    finish_shift_days: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BaselineVarianceWeek(BaseModel):
+    key: str  # e.g. "2026-KW08"
+    start: str
+    end: str
+    base_manday: float
+    target_manday: float
+    variance_manday: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BaselineVarianceTotals(BaseModel):
+    base_manday: float
+    target_manday: float
+    variance_manday: float
+    variance_pct: float | None = None  # of base_manday; None when the base is empty
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BaselineComparisonResponse(BaseModel):
+    """Baseline vs baseline (or vs actuals) on one WBS x date grid."""
+    base: BaselineRef
+    target: BaselineRef
+    from_date: str
+    to_date: str
+    items: list[BaselineVarianceItem]
+    weeks: list[BaselineVarianceWeek]
+    totals: BaselineVarianceTotals
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -287,6 +516,27 @@ class ForecastResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# ---------------------------------------------------------------------------
+# Background jobs (Prefer: respond-async)
+# ---------------------------------------------------------------------------
+
+class JobResponse(BaseModel):
+    """A background job; poll GET /api/v1/jobs/{id} until status is succeeded or failed."""
+    id: UUID
+    project_id: UUID
+    job_type: str = Field(..., pattern="^(baseline|import|pdf|forecast)$")
+    status: str = Field("queued", pattern="^(queued|running|succeeded|failed)$")
+    progress: float = Field(0.0, ge=0, le=1)
+    message: str | None = None
+    result: Any = None  # the endpoint's response; {filename, media_type, size} for files (GET .../download)
+    error: dict[str, Any] | None = None  # {"error", "code"} as the endpoint would have answered
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ---------------------------------------------------------------------------
 # Error
 # ---------------------------------------------------------------------------
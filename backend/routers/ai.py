@@ -4,17 +4,22 @@ POST   /api/v1/ai/{project_id}/forecast        Generate forecast
 POST   /api/v1/ai/{project_id}/optimize        Resource optimization suggestions
 POST   /api/v1/ai/{project_id}/daily-digest    Daily activity digest
 GET    /api/v1/ai/{project_id}/report          AI weekly report
+
+The forecast runs as a background job (202 + job) with
+``Prefer: respond-async``; poll /api/v1/jobs/{job_id}.
 """
 
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+import anthropic
+from fastapi import APIRouter, HTTPException, Request
 
-from backend.models.schemas import ForecastResponse, ErrorResponse
+from backend.models.schemas import ForecastResponse, ErrorResponse, JobResponse
 from backend.services.ai.forecast import ForecastEngine
 from backend.services.ai.optimizer import ScheduleOptimizer
 from backend.services.ai.report_gen import ReportGenerator
 from backend.services.ai.daily_digest import DailyDigestEngine
+from backend.services.job_runner import prefers_async, respond_async
 
 router = APIRouter(prefix="/api/v1/ai", tags=["ai"])
 forecast_engine = ForecastEngine()
@@ -22,19 +27,28 @@ optimizer = ScheduleOptimizer()
 report_gen = ReportGenerator()
 digest_engine = DailyDigestEngine()
 
+# Job error codes, matching the synchronous forecast responses (anything else is a JOB_FAILED / 500)
+_FORECAST_ERROR_CODES = {ValueError: "PRJ_NOT_FOUND", anthropic.APIError: "AI_UNAVAILABLE"}
+
 
 @router.post(
     "/{project_id}/forecast",
     response_model=ForecastResponse,
-    responses={503: {"model": ErrorResponse}},
+    responses={202: {"model": JobResponse}, 503: {"model": ErrorResponse}},
 )
-async def generate_forecast(project_id: UUID):
+async def generate_forecast(project_id: UUID, request: Request):
     """Generate AI-powered forecast for all WBS items."""
+    if prefers_async(request):
+        return await respond_async(
+            "forecast", project_id,
+            lambda progress: forecast_engine.generate_forecast(project_id, progress),
+            error_codes=_FORECAST_ERROR_CODES,
+        )
     try:
         return await forecast_engine.generate_forecast(project_id)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail={"error": str(exc), "code": "PRJ_NOT_FOUND"}) from exc
-    except Exception as exc:
+    except anthropic.APIError as exc:
         raise HTTPException(
             status_code=503,
             detail={"error": f"Forecast generation failed: {str(exc)}", "code": "AI_UNAVAILABLE"},
@@ -2,23 +2,32 @@
 
 Endpoints
 ---------
-GET    /api/v1/allocations/{project_id}/daily     Daily matrix (IC-002 DailyMatrixResponse)
+GET    /api/v1/allocations/{project_id}/daily     Daily matrix (IC-002, or sparse v2 with ?format=v2)
 PUT    /api/v1/allocations/{project_id}/daily     Batch update cells
-GET    /api/v1/allocations/{project_id}/weekly    Weekly aggregated
-GET    /api/v1/allocations/{project_id}/summary   Summary with Gantt data
+GET    /api/v1/allocations/{project_id}/changes   Rows changed since a watermark
+GET    /api/v1/allocations/{project_id}/weekly    Per-WBS sums per ISO week (KW)
+GET    /api/v1/allocations/{project_id}/summary   Gantt bars bucketed by ?zoom=day|week|month
+GET    /api/v1/allocations/{project_id}/stream    Server-sent cell change events
 """
 
-from datetime import date
+from datetime import date, datetime
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from backend.models.schemas import (
     AllocationBatchResponse,
     AllocationBatchUpdate,
+    AllocationChangesResponse,
     DailyMatrixResponse,
+    DailyMatrixSparseResponse,
     ErrorResponse,
+    SummaryResponse,
+    WeeklyMatrixResponse,
 )
+from backend.services.change_stream import stream_events
+from backend.services.project_version import conditional_get
 from backend.services.schedule_service import ScheduleService
 
 router = APIRouter(prefix="/api/v1/allocations", tags=["allocations"])
@@ -27,20 +36,33 @@ service = ScheduleService()
 
 @router.get(
     "/{project_id}/daily",
-    response_model=DailyMatrixResponse,
+    response_model=DailyMatrixResponse | DailyMatrixSparseResponse,
     responses={404: {"model": ErrorResponse}},
 )
 async def get_daily_matrix(
     project_id: UUID,
+    request: Request,
+    response: Response,
     from_date: date = Query(..., alias="from", description="Start date inclusive"),
     to_date: date = Query(..., alias="to", description="End date inclusive"),
+    format: str = Query("v1", pattern="^v[12]$", description="v1 = IC-002 nested matrix, v2 = sparse cells"),
 ):
-    """Return the full daily allocation matrix for the requested date window.
+    """Return the daily allocation matrix for the requested date window.
 
-    Response matches IC-002 DailyMatrixResponse: wbs_items, date_range, matrix, totals.
+    v1 matches IC-002 DailyMatrixResponse: wbs_items, date_range, matrix, totals.
+    v2 returns DailyMatrixSparseResponse: only non-empty cells as parallel arrays.
+    Supports If-None-Match: 304 when the project's data_version is unchanged.
     """
+    # is_future depends on today, so the date is part of the representation
+    not_modified = await conditional_get(
+        request, response, project_id, "daily", from_date, to_date, format, date.today()
+    )
+    if not_modified is not None:
+        return not_modified
     try:
-        return service.get_daily_matrix(project_id, from_date, to_date)
+        if format == "v2":
+            return await service.get_daily_matrix_sparse(project_id, from_date, to_date)
+        return await service.get_daily_matrix(project_id, from_date, to_date)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,7 +81,7 @@ async def batch_update_daily(project_id: UUID, payload: AllocationBatchUpdate):
     Body: { updates: [{wbs_id, date, actual_manpower, qty_done}], source: "grid"|"chat" }
     """
     try:
-        return service.batch_update_allocations(project_id, payload)
+        return await service.batch_update_allocations(project_id, payload)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -67,13 +89,111 @@ async def batch_update_daily(project_id: UUID, payload: AllocationBatchUpdate):
         ) from exc
 
 
-@router.get("/{project_id}/weekly")
-async def get_weekly(project_id: UUID):
-    """Weekly aggregated view (Phase 2)."""
-    return service.get_weekly_data(project_id)
+@router.get(
+    "/{project_id}/changes",
+    response_model=AllocationChangesResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_changes(
+    project_id: UUID,
+    since: datetime = Query(..., description="Watermark from the previous response"),
+    from_date: date | None = Query(None, alias="from", description="Limit to grid window start"),
+    to_date: date | None = Query(None, alias="to", description="Limit to grid window end"),
+):
+    """Return allocation/baseline rows updated after ``since`` and a new watermark.
+
+    When ``full_reload`` is true the client should refetch the daily matrix.
+    """
+    try:
+        return await service.get_allocation_changes(project_id, since, from_date, to_date)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
+        ) from exc
 
 
-@router.get("/{project_id}/summary")
-async def get_summary(project_id: UUID):
-    """Summary with Gantt data (Phase 2)."""
-    return service.get_summary_data(project_id)
+@router.get(
+    "/{project_id}/weekly",
+    response_model=WeeklyMatrixResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_weekly(
+    project_id: UUID,
+    request: Request,
+    response: Response,
+    from_date: date | None = Query(None, alias="from", description="Window start (default: project start)"),
+    to_date: date | None = Query(None, alias="to", description="Window end (default: project end)"),
+):
+    """Planned/actual manday and qty_done per WBS per ISO week, plus weekly totals.
+
+    The window is widened to whole Monday-Sunday weeks.
+    """
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "'to' must not be before 'from'", "code": "ALC_DATE_INVALID"},
+        )
+    not_modified = await conditional_get(request, response, project_id, "weekly", from_date, to_date)
+    if not_modified is not None:
+        return not_modified
+    try:
+        return await service.get_weekly_data(project_id, from_date, to_date)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
+        ) from exc
+
+
+@router.get(
+    "/{project_id}/summary",
+    response_model=SummaryResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_summary(
+    project_id: UUID,
+    request: Request,
+    response: Response,
+    zoom: str = Query("week", pattern="^(day|week|month)$", description="Span bucket size"),
+):
+    """Gantt summary: per-WBS baseline/actual start-finish, bucketed spans and roll-ups."""
+    # Health compares against work planned up to today, so the date is part of the representation
+    not_modified = await conditional_get(request, response, project_id, "summary", zoom, date.today())
+    if not_modified is not None:
+        return not_modified
+    try:
+        return await service.get_summary_data(project_id, zoom)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
+        ) from exc
+
+
+@router.get(
+    "/{project_id}/stream",
+    response_class=StreamingResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def stream_changes(
+    project_id: UUID,
+    request: Request,
+    last_event_id: int | None = Header(None, alias="Last-Event-ID"),
+    since: int | None = Query(None, description="Resume after this version (when the header cannot be set)"),
+):
+    """Server-sent events: ``cells`` for each allocation write, ``changed`` / ``reset`` when the client must pull.
+
+    Event ids are the project's data_version; reconnecting with Last-Event-ID
+    replays what was missed. See change_stream for the protocol.
+    """
+    if await service.get_project(project_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": f"Project {project_id} not found", "code": "PRJ_NOT_FOUND"},
+        )
+    return StreamingResponse(
+        stream_events(project_id, last_event_id if last_event_id is not None else since, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
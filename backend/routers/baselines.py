@@ -4,50 +4,126 @@ Endpoints
 ---------
 GET    /api/v1/baselines/{project_id}/             List baselines
 POST   /api/v1/baselines/{project_id}/             Create baseline + snapshot
+GET    /api/v1/baselines/{project_id}/compare      Variance vs another baseline or actuals
 GET    /api/v1/baselines/{project_id}/{version}    Specific baseline
 POST   /api/v1/baselines/{project_id}/rebaseline   Re-baseline
+
+Create and rebaseline run as a background job (202 + job) with
+``Prefer: respond-async``; poll /api/v1/jobs/{job_id}.
 """
 
+from collections.abc import Awaitable, Callable
+from datetime import date
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
-from backend.models.schemas import BaselineCreate, BaselineResponse, ErrorResponse
-from backend.services.baseline_service import BaselineService
+from backend.models.schemas import (
+    BaselineComparisonResponse,
+    BaselineCreate,
+    BaselineResponse,
+    ErrorResponse,
+    JobResponse,
+)
+from backend.services.baseline_service import BaselineService, BaselineVersionConflict
+from backend.services.job_runner import prefers_async, respond_async
+from backend.services.project_version import conditional_get
 
 router = APIRouter(prefix="/api/v1/baselines", tags=["baselines"])
 service = BaselineService()
 
+# Job error codes, matching the synchronous responses of _create
+_ERROR_CODES = {ValueError: "PRJ_NOT_FOUND", BaselineVersionConflict: "BSL_VERSION_CONFLICT"}
+
+
+async def _create(
+    create: Callable[[UUID, BaselineCreate], Awaitable[dict[str, Any]]], project_id: UUID, payload: BaselineCreate
+) -> dict[str, Any]:
+    """Run create_baseline/rebaseline inline: 404 for a missing project, 422 on a version conflict."""
+    try:
+        return await create(project_id, payload)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
+        ) from exc
+    except BaselineVersionConflict as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error": str(exc), "code": "BSL_VERSION_CONFLICT"},
+        ) from exc
+
 
 @router.get("/{project_id}/", response_model=list[BaselineResponse])
-async def list_baselines(project_id: UUID):
-    """Return all baselines for a project."""
-    return service.list_baselines(project_id)
+async def list_baselines(project_id: UUID, request: Request, response: Response):
+    """Return all baselines for a project (304 on matching If-None-Match)."""
+    if (not_modified := await conditional_get(request, response, project_id, "baselines")) is not None:
+        return not_modified
+    return await service.list_baselines(project_id)
 
 
 @router.post(
     "/{project_id}/",
     response_model=BaselineResponse,
     status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": JobResponse}, 404: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
 )
-async def create_baseline(project_id: UUID, payload: BaselineCreate):
+async def create_baseline(project_id: UUID, payload: BaselineCreate, request: Request):
     """Create a new baseline snapshot of current allocations."""
+    if prefers_async(request):
+        return await respond_async(
+            "baseline", project_id,
+            lambda progress: service.create_baseline(project_id, payload, progress),
+            params=payload.model_dump(),
+            error_codes=_ERROR_CODES,
+        )
+    return await _create(service.create_baseline, project_id, payload)
+
+
+@router.get(
+    "/{project_id}/compare",
+    response_model=BaselineComparisonResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def compare_baselines(
+    project_id: UUID,
+    request: Request,
+    response: Response,
+    base: int = Query(..., description="Baseline version compared against"),
+    target: int | None = Query(None, description="Baseline version to compare; omit for actual allocations"),
+    until: date | None = Query(None, description="Ignore days after this date"),
+):
+    """Per-WBS and per-week manday variance plus start/finish shifts (304 on matching If-None-Match)."""
+    if (not_modified := await conditional_get(
+        request, response, project_id, "baseline-compare", base, target, until
+    )) is not None:
+        return not_modified
     try:
-        return service.create_baseline(project_id, payload)
-    except Exception as exc:
+        result = await service.compare_baselines(project_id, base, target, until)
+    except ValueError as exc:
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail={"error": str(exc), "code": "BSL_VERSION_CONFLICT"},
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
         ) from exc
+    if result is None:
+        missing = base if target is None else f"{base} or v{target}"
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": f"Baseline v{missing} not found", "code": "BSL_NO_ACTIVE"},
+        )
+    return result
 
 
 @router.get(
     "/{project_id}/{version}",
     responses={404: {"model": ErrorResponse}},
 )
-async def get_baseline(project_id: UUID, version: int):
-    """Get a specific baseline version with snapshots."""
-    result = service.get_baseline(project_id, version)
+async def get_baseline(project_id: UUID, version: int, request: Request, response: Response):
+    """Get a specific baseline version with snapshots (304 on matching If-None-Match)."""
+    if (not_modified := await conditional_get(request, response, project_id, "baseline", version)) is not None:
+        return not_modified
+    result = await service.get_baseline(project_id, version)
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -56,7 +132,18 @@ async def get_baseline(project_id: UUID, version: int):
     return result
 
 
-@router.post("/{project_id}/rebaseline", response_model=BaselineResponse)
-async def rebaseline(project_id: UUID, payload: BaselineCreate):
+@router.post(
+    "/{project_id}/rebaseline",
+    response_model=BaselineResponse,
+    responses={202: {"model": JobResponse}, 404: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
+)
+async def rebaseline(project_id: UUID, payload: BaselineCreate, request: Request):
     """Archive old baseline and create a new one."""
-    return service.rebaseline(project_id, payload)
+    if prefers_async(request):
+        return await respond_async(
+            "baseline", project_id,
+            lambda progress: service.rebaseline(project_id, payload, progress),
+            params={**payload.model_dump(), "rebaseline": True},
+            error_codes=_ERROR_CODES,
+        )
+    return await _create(service.rebaseline, project_id, payload)
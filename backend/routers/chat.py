@@ -10,7 +10,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, status
 
-from backend.models.db import get_db
+from backend.models.db import get_async_db
 
 logger = logging.getLogger(__name__)
 from backend.models.schemas import ChatMessageRequest, ChatParseResponse, ErrorResponse
@@ -33,15 +33,15 @@ async def send_message(project_id: UUID, payload: ChatMessageRequest):
     Flow: User message → Claude API → ParsedActions → Preview (not applied yet)
     """
     # Get WBS items for context
-    wbs_items = schedule.list_wbs_items(project_id)
+    wbs_items = await schedule.list_wbs_items(project_id)
     wbs_context = [{"wbs_code": w["wbs_code"], "wbs_name": w["wbs_name"]} for w in wbs_items]
 
     result = await nlp.parse_message(payload.message, wbs_context)
 
     # Store chat message in DB
-    db = get_db()
+    db = get_async_db()
     try:
-        db.table("chat_messages").insert({
+        await db.table("chat_messages").insert({
             "project_id": str(project_id),
             "message": payload.message,
             "parsed_actions": result.get("actions", []),
@@ -64,50 +64,48 @@ async def apply_actions(project_id: UUID, body: dict):
     if not message_id:
         raise HTTPException(status_code=400, detail={"error": "message_id required", "code": "ALC_DATE_INVALID"})
 
-    db = get_db()
+    db = get_async_db()
 
     # Get the chat message with parsed actions
-    msg_resp = db.table("chat_messages").select("*").eq("id", message_id).execute()
+    msg_resp = await db.table("chat_messages").select("*").eq("id", message_id).execute()
     if not msg_resp.data:
         raise HTTPException(status_code=404, detail={"error": "Message not found", "code": "PRJ_NOT_FOUND"})
 
     msg = msg_resp.data[0]
     actions = msg.get("parsed_actions", [])
 
-    # Apply each action as an allocation upsert
-    updated = 0
+    # Resolve WBS codes to IDs in one query, then apply all actions as one bulk upsert
+    wbs_resp = (
+        await db.table("wbs_items")
+        .select("id, wbs_code")
+        .eq("project_id", str(project_id))
+        .execute()
+    )
+    code_map = {w["wbs_code"]: w["id"] for w in wbs_resp.data}
+
+    rows = []
     for action in actions:
-        try:
-            wbs_code = action.get("wbs_code")
-            # Resolve WBS code to ID
-            wbs_resp = (
-                db.table("wbs_items")
-                .select("id")
-                .eq("project_id", str(project_id))
-                .eq("wbs_code", wbs_code)
-                .execute()
-            )
-            if not wbs_resp.data:
-                continue
-
-            wbs_id = wbs_resp.data[0]["id"]
-            row = {
-                "wbs_item_id": wbs_id,
-                "date": action.get("date"),
-                "actual_manpower": action.get("actual_manpower", 0),
-                "qty_done": action.get("qty_done", 0),
-                "source": "chat",
-            }
-            if action.get("note"):
-                row["notes"] = action["note"]
-
-            db.table("daily_allocations").upsert(row, on_conflict="wbs_item_id,date").execute()
-            updated += 1
-        except Exception as e:
-            logger.error("Failed to apply action for wbs %s: %s", action.get("wbs_code"), e)
+        wbs_id = code_map.get(action.get("wbs_code"))
+        if not wbs_id:
+            continue
+        row = {
+            "wbs_item_id": wbs_id,
+            "date": action.get("date"),
+            "actual_manpower": action.get("actual_manpower", 0),
+            "qty_done": action.get("qty_done", 0),
+            "source": "chat",
+        }
+        if action.get("note"):
+            row["notes"] = action["note"]
+        rows.append(row)
+
+    result = await schedule.upsert_allocations(project_id, rows) if rows else {"updated_count": 0, "errors": []}
+    for err in result["errors"]:
+        logger.error("Failed to apply action for wbs %s on %s: %s", err["wbs_id"], err["date"], err["error"])
+    updated = result["updated_count"]
 
     # Mark message as applied
-    db.table("chat_messages").update({"applied": True}).eq("id", message_id).execute()
+    await db.table("chat_messages").update({"applied": True}).eq("id", message_id).execute()
 
     return {"applied": True, "updated_count": updated}
 
@@ -115,9 +113,9 @@ async def apply_actions(project_id: UUID, body: dict):
 @router.get("/{project_id}/history")
 async def get_history(project_id: UUID):
     """Return chat message history for a project."""
-    db = get_db()
+    db = get_async_db()
     resp = (
-        db.table("chat_messages")
+        await db.table("chat_messages")
         .select("*")
         .eq("project_id", str(project_id))
         .order("timestamp", desc=True)
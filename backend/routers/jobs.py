@@ -0,0 +1,78 @@
+"""Jobs router — status and results of background jobs.
+
+Endpoints accepting ``Prefer: respond-async`` (baseline create/rebaseline,
+Excel import, PDF reports, forecast) answer 202 with a job and
+``Location: /api/v1/jobs/{job_id}``.
+
+Endpoints
+---------
+GET    /api/v1/jobs/?project_id=...            Recent jobs of a project
+GET    /api/v1/jobs/{job_id}                   Job status, progress and result
+GET    /api/v1/jobs/{job_id}/download          File result (PDF reports)
+"""
+
+from io import BytesIO
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from backend.models.schemas import ErrorResponse, JobResponse
+from backend.services.job_runner import job_runner
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+async def _job_or_404(job_id: UUID) -> dict:
+    job = await job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": f"Job {job_id} not found", "code": "JOB_NOT_FOUND"},
+        )
+    return job
+
+
+@router.get("/", response_model=list[JobResponse])
+async def list_jobs(
+    project_id: UUID = Query(...),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """A project's most recent jobs, newest first."""
+    return await job_runner.list_jobs(project_id, limit)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_job(job_id: UUID):
+    """Poll a job; ``result`` is set once status is succeeded, ``error`` once failed."""
+    return await _job_or_404(job_id)
+
+
+@router.get(
+    "/{job_id}/download",
+    responses={404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}, 410: {"model": ErrorResponse}},
+)
+async def download_job_result(job_id: UUID):
+    """Stream a succeeded job's file result."""
+    job = await _job_or_404(job_id)
+    result = job.get("result") or {}
+    if job["status"] != "succeeded" or "filename" not in result:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": f"Job {job_id} has no file result ({job['status']})", "code": "JOB_NOT_READY"},
+        )
+    file = await job_runner.artifact(job_id)
+    if file is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail={"error": f"Result of job {job_id} has expired", "code": "JOB_RESULT_EXPIRED"},
+        )
+    return StreamingResponse(
+        BytesIO(file.content),
+        media_type=file.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file.filename}"'},
+    )
@@ -5,23 +5,36 @@ Endpoints
 GET    /api/v1/projects/          List all projects
 POST   /api/v1/projects/          Create a new project
 GET    /api/v1/projects/{id}      Retrieve a single project
+GET    /api/v1/projects/{id}/calendar       Working weekdays, holidays, shutdowns
+PUT    /api/v1/projects/{id}/calendar       Replace the project calendar
+GET    /api/v1/projects/{id}/calendar/days  Working flags and KW per day
 """
 
+from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 
-from backend.models.schemas import ErrorResponse, ProjectCreate, ProjectResponse
+from backend.models.schemas import (
+    CalendarDaysResponse,
+    ErrorResponse,
+    ProjectCalendar,
+    ProjectCalendarResponse,
+    ProjectCreate,
+    ProjectResponse,
+)
+from backend.services.calendar_service import CalendarService
 from backend.services.schedule_service import ScheduleService
 
 router = APIRouter(prefix="/api/v1/projects", tags=["projects"])
 service = ScheduleService()
+calendar_service = CalendarService()
 
 
 @router.get("/", response_model=list[ProjectResponse])
 async def list_projects():
     """Return every project."""
-    return service.list_projects()
+    return await service.list_projects()
 
 
 @router.post(
@@ -33,7 +46,7 @@ async def list_projects():
 async def create_project(payload: ProjectCreate):
     """Create a project and return the newly created record."""
     try:
-        return service.create_project(payload)
+        return await service.create_project(payload)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -48,10 +61,67 @@ async def create_project(payload: ProjectCreate):
 )
 async def get_project(project_id: UUID):
     """Retrieve a single project by its UUID."""
-    project = service.get_project(project_id)
+    project = await service.get_project(project_id)
     if project is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"error": f"Project {project_id} not found", "code": "PRJ_NOT_FOUND"},
         )
     return project
+
+
+@router.get(
+    "/{project_id}/calendar",
+    response_model=ProjectCalendarResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_calendar(project_id: UUID):
+    """The project's working-day calendar (default Monday-Saturday if never set)."""
+    try:
+        return await calendar_service.get_calendar(project_id)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
+        ) from exc
+
+
+@router.put(
+    "/{project_id}/calendar",
+    response_model=ProjectCalendarResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def update_calendar(project_id: UUID, payload: ProjectCalendar):
+    """Replace the project's working weekdays, holidays and shutdowns."""
+    try:
+        return await calendar_service.update_calendar(project_id, payload)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
+        ) from exc
+
+
+@router.get(
+    "/{project_id}/calendar/days",
+    response_model=CalendarDaysResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def get_calendar_days(
+    project_id: UUID,
+    from_date: date = Query(..., alias="from", description="Start date inclusive"),
+    to_date: date = Query(..., alias="to", description="End date inclusive"),
+):
+    """Per-day working flags and ISO week (KW) keys for a date window."""
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "'to' must not be before 'from'", "code": "CAL_DATE_INVALID"},
+        )
+    try:
+        return await calendar_service.get_days(project_id, from_date, to_date)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": str(exc), "code": "PRJ_NOT_FOUND"},
+        ) from exc
@@ -1,21 +1,40 @@
-"""Reports router -- PDF and Excel export.
+"""Reports router -- PDF and Excel export, Excel import.
 
 Endpoints
 ---------
 GET    /api/v1/reports/{project_id}/pdf        PDF daily report
 GET    /api/v1/reports/{project_id}/progress    PDF progress report
 GET    /api/v1/reports/{project_id}/excel      Excel export (full)
+POST   /api/v1/reports/{project_id}/excel      Excel import (export layout)
 GET    /api/v1/reports/{project_id}/sample     Download sample import template
+
+PDF reports and the Excel import run as a background job (202 + job) with
+``Prefer: respond-async``; poll /api/v1/jobs/{job_id}, PDFs are then
+fetched from /api/v1/jobs/{job_id}/download.
 """
 
-from uuid import UUID
+from collections.abc import Awaitable, Callable
 from io import BytesIO
+from typing import BinaryIO
+from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
 import openpyxl
+from fastapi import APIRouter, File, HTTPException, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 
-from backend.services.import_export import ImportExportService
+from backend.models.schemas import ErrorResponse, JobResponse
+from backend.services.import_export import (
+    DuplicateWbsCode,
+    ImportExportService,
+    InvalidWorkbook,
+)
+from backend.services.job_runner import (
+    JobFile,
+    ProgressFn,
+    no_progress,
+    prefers_async,
+    respond_async,
+)
 from backend.services.pdf_generator import PDFGenerator
 from backend.services.schedule_service import ScheduleService
 
@@ -25,56 +44,56 @@ ie_service = ImportExportService()
 pdf_service = PDFGenerator()
 
 
-@router.get("/{project_id}/pdf")
-async def export_pdf(project_id: UUID):
-    """Export daily allocation report as PDF."""
+def _pdf_file(stream: BinaryIO, filename: str) -> JobFile:
+    """Report bytes with their media type; without xhtml2pdf the generator returns HTML."""
+    content = stream.read()
+    if content[:5] == b"<!DOC":
+        return JobFile(content, filename.replace(".pdf", ".html"), "text/html")
+    return JobFile(content, filename, "application/pdf")
+
+
+async def _pdf_report(
+    request: Request, project_id: UUID, generate: Callable[..., Awaitable[tuple[BinaryIO, str]]]
+) -> Response:
+    """Run a PDFGenerator method inline, or as a background job with Prefer: respond-async."""
+    async def render(progress: ProgressFn) -> JobFile:
+        return _pdf_file(*await generate(project_id, progress))
+
+    if prefers_async(request):
+        return await respond_async(
+            "pdf", project_id, render,
+            params={"report": generate.__name__},
+            error_codes={ValueError: "PRJ_NOT_FOUND"},
+        )
     try:
-        stream, filename = pdf_service.generate_daily_report(project_id)
+        report = await render(no_progress)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    media = "application/pdf"
-    # If xhtml2pdf is not installed, HTML fallback uses text/html
-    content = stream.read()
-    stream.seek(0)
-    if content[:5] == b"<!DOC":
-        media = "text/html"
-        filename = filename.replace(".pdf", ".html")
-
     return StreamingResponse(
-        stream,
-        media_type=media,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        BytesIO(report.content),
+        media_type=report.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{report.filename}"'},
     )
 
 
-@router.get("/{project_id}/progress")
-async def export_progress_report(project_id: UUID):
-    """Export progress summary report as PDF."""
-    try:
-        stream, filename = pdf_service.generate_progress_report(project_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+@router.get("/{project_id}/pdf", responses={202: {"model": JobResponse}})
+async def export_pdf(project_id: UUID, request: Request):
+    """Export daily allocation report as PDF."""
+    return await _pdf_report(request, project_id, pdf_service.generate_daily_report)
 
-    media = "application/pdf"
-    content = stream.read()
-    stream.seek(0)
-    if content[:5] == b"<!DOC":
-        media = "text/html"
-        filename = filename.replace(".pdf", ".html")
 
-    return StreamingResponse(
-        stream,
-        media_type=media,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+@router.get("/{project_id}/progress", responses={202: {"model": JobResponse}})
+async def export_progress_report(project_id: UUID, request: Request):
+    """Export progress summary report as PDF."""
+    return await _pdf_report(request, project_id, pdf_service.generate_progress_report)
 
 
 @router.get("/{project_id}/excel")
 async def export_excel(project_id: UUID):
     """Export grid data as Excel (WBS + allocations)."""
     try:
-        stream, filename = ie_service.export_to_excel(project_id)
+        stream, filename = await ie_service.export_to_excel(project_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -85,6 +104,28 @@ async def export_excel(project_id: UUID):
     )
 
 
+@router.post(
+    "/{project_id}/excel",
+    responses={202: {"model": JobResponse}, 400: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
+)
+async def import_excel(project_id: UUID, request: Request, file: UploadFile = File(...)):
+    """Merge a workbook in the export's layout (WBS + Allocations sheets) into the project."""
+    contents = await file.read()
+    if prefers_async(request):
+        return await respond_async(
+            "import", project_id,
+            lambda progress: ie_service.import_from_excel(project_id, contents, progress),
+            params={"filename": file.filename},
+            error_codes={InvalidWorkbook: "IMP_INVALID_WORKBOOK", DuplicateWbsCode: "WBS_DUPLICATE_CODE"},
+        )
+    try:
+        return await ie_service.import_from_excel(project_id, contents)
+    except InvalidWorkbook as e:
+        raise HTTPException(status_code=400, detail={"error": str(e), "code": "IMP_INVALID_WORKBOOK"}) from e
+    except DuplicateWbsCode as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "code": "WBS_DUPLICATE_CODE"}) from e
+
+
 @router.get("/{project_id}/sample")
 async def download_sample(project_id: UUID):
     """Download a sample WBS import template."""
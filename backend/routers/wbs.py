@@ -12,9 +12,9 @@ GET    /api/v1/wbs/{project_id}/export         Export (Phase 4)
 import logging
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, HTTPException, Request, Response, UploadFile, File, status
 
-from backend.models.db import get_db
+from backend.models.db import get_async_db
 
 logger = logging.getLogger(__name__)
 from backend.models.schemas import (
@@ -23,6 +23,7 @@ from backend.models.schemas import (
     WBSItemResponse,
     WBSItemUpdate,
 )
+from backend.services.project_version import bump_project_version, conditional_get
 from backend.services.schedule_service import ScheduleService
 
 router = APIRouter(prefix="/api/v1/wbs", tags=["wbs"])
@@ -30,9 +31,14 @@ service = ScheduleService()
 
 
 @router.get("/{project_id}/items", response_model=list[WBSItemResponse])
-async def list_wbs_items(project_id: UUID):
-    """Return all WBS items for a project, ordered by sort_order."""
-    return service.list_wbs_items(project_id)
+async def list_wbs_items(project_id: UUID, request: Request, response: Response):
+    """Return all WBS items for a project, ordered by sort_order.
+
+    Supports If-None-Match: 304 when the project's data_version is unchanged.
+    """
+    if (not_modified := await conditional_get(request, response, project_id, "wbs-items")) is not None:
+        return not_modified
+    return await service.list_wbs_items(project_id)
 
 
 @router.post(
@@ -44,7 +50,7 @@ async def list_wbs_items(project_id: UUID):
 async def create_wbs_item(project_id: UUID, payload: WBSItemCreate):
     """Create a new WBS item."""
     try:
-        return service.create_wbs_item(project_id, payload)
+        return await service.create_wbs_item(project_id, payload)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -59,7 +65,7 @@ async def create_wbs_item(project_id: UUID, payload: WBSItemCreate):
 )
 async def update_wbs_item(project_id: UUID, item_id: UUID, payload: WBSItemUpdate):
     """Partially update a WBS item."""
-    result = service.update_wbs_item(project_id, item_id, payload)
+    result = await service.update_wbs_item(project_id, item_id, payload)
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,7 +84,7 @@ async def import_wbs(project_id: UUID, file: UploadFile = File(...)):
     wb = openpyxl.load_workbook(BytesIO(content))
     ws = wb.active
 
-    db = get_db()
+    db = get_async_db()
     imported = 0
     errors = []
 
@@ -96,7 +102,7 @@ async def import_wbs(project_id: UUID, file: UploadFile = File(...)):
             parent_code = data.get("parent_code")
             if parent_code:
                 parent_resp = (
-                    db.table("wbs_items")
+                    await db.table("wbs_items")
                     .select("id")
                     .eq("project_id", str(project_id))
                     .eq("wbs_code", parent_code)
@@ -117,7 +123,7 @@ async def import_wbs(project_id: UUID, file: UploadFile = File(...)):
                 "sort_order": row_num,
             }
 
-            db.table("wbs_items").upsert(
+            await db.table("wbs_items").upsert(
                 item, on_conflict="project_id,wbs_code"
             ).execute()
             imported += 1
@@ -125,4 +131,6 @@ async def import_wbs(project_id: UUID, file: UploadFile = File(...)):
             logger.warning("Import row %d failed: %s", row_num, e)
             errors.append({"row": row_num, "error": str(e)})
 
+    if imported:
+        await bump_project_version(project_id)
     return {"imported": imported, "errors": errors}
@@ -15,7 +15,7 @@ from uuid import UUID
 import anthropic
 
 from backend.config import settings
-from backend.models.db import get_db
+from backend.services.project_snapshot import get_project_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -37,51 +37,19 @@ class DailyDigestEngine:
 
         Returns: {date, summary, kpi, highlights, concerns}
         """
-        db = get_db()
         today = date.today()
-        yesterday = today - timedelta(days=1)
-
-        # Query 1: Project info
-        project_resp = db.table("projects").select("*").eq("id", str(project_id)).execute()
-        if not project_resp.data:
-            raise ValueError(f"Project {project_id} not found")
-        project = project_resp.data[0]
-
-        # Query 2: All WBS items
-        wbs_items = (
-            db.table("wbs_items")
-            .select("id, wbs_code, wbs_name, qty, is_summary")
-            .eq("project_id", str(project_id))
-            .order("sort_order")
-            .execute()
-            .data
-        )
-        wbs_ids = [w["id"] for w in wbs_items]
-        wbs_map = {w["id"]: w for w in wbs_items}
-
-        # Query 3: Today's allocations
-        today_allocs = []
-        if wbs_ids:
-            today_allocs = (
-                db.table("daily_allocations")
-                .select("wbs_item_id, actual_manpower, qty_done")
-                .in_("wbs_item_id", wbs_ids)
-                .eq("date", today.isoformat())
-                .execute()
-                .data
-            )
 
-        # Query 4: Yesterday's allocations (for trend)
-        yesterday_allocs = []
-        if wbs_ids:
-            yesterday_allocs = (
-                db.table("daily_allocations")
-                .select("wbs_item_id, actual_manpower, qty_done")
-                .in_("wbs_item_id", wbs_ids)
-                .eq("date", yesterday.isoformat())
-                .execute()
-                .data
-            )
+        # Project, WBS items and allocations from the shared snapshot (raises if missing)
+        snapshot = await get_project_snapshot(project_id)
+        # Trend against the previous working day (Monday compares with Saturday, not Sunday)
+        yesterday = snapshot.calendar.previous_working_day(today) or today - timedelta(days=1)
+        project = snapshot.project
+        wbs_items = snapshot.wbs_items
+        wbs_map = snapshot.wbs_by_id
+
+        # Today's and yesterday's allocations (for trend)
+        today_allocs = snapshot.allocations_on(today.isoformat())
+        yesterday_allocs = snapshot.allocations_on(yesterday.isoformat())
 
         # Compute KPIs
         today_workers = sum(float(a.get("actual_manpower", 0)) for a in today_allocs)
@@ -97,17 +65,8 @@ class DailyDigestEngine:
         # Overall progress
         total_qty = sum(float(w.get("qty", 0)) for w in wbs_items if not w.get("is_summary"))
 
-        # Need cumulative qty_done — fetch all allocations for this
-        all_allocs = []
-        if wbs_ids:
-            all_allocs = (
-                db.table("daily_allocations")
-                .select("wbs_item_id, qty_done")
-                .in_("wbs_item_id", wbs_ids)
-                .execute()
-                .data
-            )
-        cumulative_done = sum(float(a.get("qty_done", 0)) for a in all_allocs)
+        # Cumulative qty_done over all allocations
+        cumulative_done = sum(float(a.get("qty_done", 0)) for a in snapshot.allocations)
         overall_progress = min(100, (cumulative_done / total_qty * 100)) if total_qty > 0 else 0
 
         # Highlights: items with most progress today
@@ -8,12 +8,11 @@ items to behind-schedule items.
 from __future__ import annotations
 
 import logging
-from datetime import date, timedelta
 from typing import Any
 from uuid import UUID
 
-from backend.models.db import get_db
 from backend.services.compute_engine import ComputeEngine
+from backend.services.project_snapshot import get_project_snapshot
 
 logger = logging.getLogger(__name__)
 compute = ComputeEngine()
@@ -35,27 +34,9 @@ class ScheduleOptimizer:
         Returns:
             List of suggestion dicts, sorted by ``impact_score`` descending.
         """
-        db = get_db()
-
-        wbs_items = (
-            db.table("wbs_items")
-            .select("*")
-            .eq("project_id", str(project_id))
-            .order("sort_order")
-            .execute()
-            .data
-        )
-        # Get WBS item IDs, then fetch allocations from daily_allocations
-        wbs_ids = [w["id"] for w in wbs_items]
-        allocations = []
-        if wbs_ids:
-            allocations = (
-                db.table("daily_allocations")
-                .select("*")
-                .in_("wbs_item_id", wbs_ids)
-                .execute()
-                .data
-            )
+        snapshot = await get_project_snapshot(project_id)
+        wbs_items = snapshot.wbs_items
+        allocations = snapshot.allocations
 
         # Aggregate actuals per WBS
         actual_map: dict[str, float] = {}
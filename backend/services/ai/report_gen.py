@@ -8,15 +8,16 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import date, datetime, timezone
+from datetime import UTC, date, datetime
 from typing import Any
 from uuid import UUID
 
 import anthropic
 
 from backend.config import settings
-from backend.models.db import get_db
 from backend.services.compute_engine import ComputeEngine
+from backend.services.project_snapshot import get_project_snapshot
+from backend.services.rollup_engine import rollup_progress
 
 logger = logging.getLogger(__name__)
 compute = ComputeEngine()
@@ -60,11 +61,11 @@ class ReportGenerator:
         Returns:
             A dict containing ``generated_at``, ``markdown``, and ``metrics``.
         """
-        metrics = self._gather_metrics(project_id)
+        metrics = await self._gather_metrics(project_id)
         markdown = self._generate_narrative(metrics)
 
         return {
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": datetime.now(UTC).isoformat(),
             "markdown": markdown,
             "metrics": metrics,
         }
@@ -73,37 +74,12 @@ class ReportGenerator:
     # Data gathering
     # ------------------------------------------------------------------
 
-    def _gather_metrics(self, project_id: UUID) -> dict[str, Any]:
+    async def _gather_metrics(self, project_id: UUID) -> dict[str, Any]:
         """Pull WBS + allocation data and compute aggregate KPIs."""
-        db = get_db()
-
-        project_resp = (
-            db.table("projects")
-            .select("*")
-            .eq("id", str(project_id))
-            .execute()
-        )
-        project = project_resp.data[0] if project_resp.data else {}
-
-        wbs_items = (
-            db.table("wbs_items")
-            .select("*")
-            .eq("project_id", str(project_id))
-            .order("sort_order")
-            .execute()
-            .data
-        )
-        # Get WBS item IDs, then fetch allocations from daily_allocations
-        wbs_ids = [w["id"] for w in wbs_items]
-        allocations = []
-        if wbs_ids:
-            allocations = (
-                db.table("daily_allocations")
-                .select("*")
-                .in_("wbs_item_id", wbs_ids)
-                .execute()
-                .data
-            )
+        snapshot = await get_project_snapshot(project_id)
+        project = snapshot.project
+        wbs_items = snapshot.wbs_items
+        allocations = snapshot.allocations
 
         # Aggregate per WBS
         actual_map: dict[str, float] = {}
@@ -111,17 +87,31 @@ class ReportGenerator:
             wid = a["wbs_item_id"]
             actual_map[wid] = actual_map.get(wid, 0.0) + float(a.get("qty_done", 0))
 
-        item_metrics: list[dict[str, Any]] = []
+        rows = []
         for item in wbs_items:
-            wid = item["id"]
-            planned = float(item.get("qty", 0))
-            actual = actual_map.get(wid, 0.0)
-            pct = compute.calculate_progress_pct(planned, actual)
-            spi = compute.schedule_performance_index(planned, actual)
+            qty = float(item.get("qty", 0))
+            done = actual_map.get(item["id"], 0.0)
+            rows.append({
+                "id": item["id"],
+                "parent_id": item.get("parent_id"),
+                "is_summary": item.get("is_summary", False),
+                "qty": qty,
+                "done": done,
+                "progress_pct": compute.calculate_progress_pct(qty, done),
+            })
+
+        item_metrics: list[dict[str, Any]] = []
+        for item, row, rolled in zip(wbs_items, rows, rollup_progress(rows)):
+            planned = row["qty"]
+            actual = row["done"]
+            pct = rolled["progress_pct"]
+            # Summary rows: subtree progress stands in for their own qty
+            spi = pct / 100 if row["is_summary"] else compute.schedule_performance_index(planned, actual)
             item_metrics.append(
                 {
                     "code": item["wbs_code"],
                     "name": item["wbs_name"],
+                    "is_summary": bool(row["is_summary"]),
                     "planned_qty": planned,
                     "actual_qty": actual,
                     "progress_pct": round(pct, 1),
@@ -130,7 +120,7 @@ class ReportGenerator:
             )
 
         overall_progress = compute.weighted_progress(
-            [{"qty": m["planned_qty"], "done": m["actual_qty"]} for m in item_metrics]
+            [{"qty": r["qty"], "done": r["done"]} for r in rows if not r["is_summary"]]
         )
 
         return {
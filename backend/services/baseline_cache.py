@@ -0,0 +1,197 @@
+"""Active-baseline plan cache — decoded BaselinePlans keyed by baseline id.
+
+A baseline's snapshots never change once create_baseline has written them
+(and set approved_at), so its decoded plan (baseline_engine.decode_plans) is
+cached in an in-process LRU of ``settings.baseline_plan_cache_size``
+baselines and never revalidated. A baseline still being built is decoded
+but not cached. Concurrent misses for the same baseline share one load. Delta
+baselines (migration 014) are materialized through their parent chain
+(``materialize_snapshots``) before decoding, so the cached plan is always
+the full one.
+
+Which baseline is active is remembered per project together with the
+data_version it was read at:
+
+- create_baseline / rebaseline on this worker set the new active id (and
+  seed its plan from the rows just built) — no reads afterwards.
+- the matrix RPC (fn_daily_matrix, migration 013) reports the active id on
+  every grid load, which refreshes the entry for free.
+- other callers pass the version they already hold; a different version (a
+  write on any worker) costs one indexed ``baselines`` lookup, never a
+  snapshot fetch. Without versions (migration 009 not applied) the lookup
+  runs every time.
+
+Plans are shared between requests — treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from backend.config import settings
+from backend.models.db import fetch_all, get_async_db
+from backend.services.baseline_engine import BaselinePlan, decode_plans
+
+logger = logging.getLogger(__name__)
+
+# Snapshot columns a plan is decoded from (daily_plan: rows written before migration 012)
+_PLAN_COLUMNS = "wbs_item_id, start_date, plan_runs, plan_values, daily_plan"
+
+
+class BaselinePlanCache:
+    """LRU of immutable BaselinePlans plus each project's active baseline id."""
+
+    def __init__(self, max_plans: int | None = None):
+        self._max_plans = max_plans
+        self._plans: OrderedDict[str, BaselinePlan] = OrderedDict()
+        self._active: dict[str, tuple[int, str | None]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_plans(self) -> int:
+        return self._max_plans if self._max_plans is not None else settings.baseline_plan_cache_size
+
+    async def plan(self, baseline_id: str | None) -> BaselinePlan:
+        """Decoded plan of one baseline (empty for None)."""
+        if baseline_id is None:
+            return decode_plans([])
+        bid = str(baseline_id)
+        cached = self._plans.get(bid)
+        if cached is not None:
+            self._plans.move_to_end(bid)
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        pending = self._inflight.get(bid)
+        if pending is not None:
+            return await pending
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[bid] = future
+        try:
+            rows, approved = await _materialize(bid, _PLAN_COLUMNS)
+            plan = decode_plans(rows)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            seeded = self._plans.get(bid)
+            if seeded is not None:
+                plan = seeded  # create_baseline stored the plan it built while this load ran
+            elif approved:
+                self.store(bid, plan)
+            future.set_result(plan)
+            return plan
+        finally:
+            del self._inflight[bid]
+
+    async def active_id(self, project_id: UUID | str, version: int | None) -> str | None:
+        """Id of the project's active baseline as of data_version ``version``."""
+        pid = str(project_id)
+        cached = self._active.get(pid)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+
+        db = get_async_db()
+        resp = await (
+            db.table("baselines")
+            .select("id")
+            .eq("project_id", pid)
+            .eq("is_active", True)
+            .limit(1)
+            .execute()
+        )
+        baseline_id = str(resp.data[0]["id"]) if resp.data else None
+        self.set_active(pid, baseline_id, version)
+        return baseline_id
+
+    def set_active(self, project_id: UUID | str, baseline_id: str | None, version: int | None) -> None:
+        """Record the active baseline seen at ``version`` (ignored without a version)."""
+        if version is None:
+            return
+        self._active[str(project_id)] = (version, str(baseline_id) if baseline_id is not None else None)
+
+    def store(self, baseline_id: str, plan: BaselinePlan) -> None:
+        self._plans[str(baseline_id)] = plan
+        self._plans.move_to_end(str(baseline_id))
+        while len(self._plans) > self.max_plans:
+            evicted, _ = self._plans.popitem(last=False)
+            logger.debug("Baseline plan cache evicted baseline %s", evicted)
+
+    def invalidate(self, project_id: UUID | str | None = None) -> None:
+        """Forget one project's active baseline, or everything."""
+        if project_id is None:
+            self._active.clear()
+            self._plans.clear()
+        else:
+            self._active.pop(str(project_id), None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "baselines": len(self._plans),
+            "max_baselines": self.max_plans,
+            "projects": len(self._active),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+async def _baseline_chain(baseline_id: str) -> tuple[list[str], bool]:
+    """``baseline_id`` followed by its ancestors via parent_id (migration 014), nearest first.
+
+    Also whether the baseline was approved, i.e. create_baseline had written
+    all its snapshots when this was read.
+    """
+    db = get_async_db()
+    own = await db.table("baselines").select("id, project_id, approved_at").eq("id", baseline_id).execute()
+    if not own.data:
+        return [], False
+    siblings = await db.table("baselines").select("id, parent_id").eq("project_id", own.data[0]["project_id"]).execute()
+    parent_of = {str(b["id"]): b.get("parent_id") for b in siblings.data}
+    chain = [baseline_id]
+    while (parent := parent_of.get(chain[-1])) is not None and str(parent) not in chain:
+        chain.append(str(parent))
+    return chain, own.data[0].get("approved_at") is not None
+
+
+async def materialize_snapshots(baseline_id: str, columns: str = "*") -> list[dict[str, Any]]:
+    """Full snapshot set of a baseline: for each WBS item the row of the nearest version in its chain.
+
+    A delta baseline stores only the snapshots that differ from its parent
+    (BaselineService.create_baseline), so this reads the rows of the whole
+    chain in db_page_size pages and keeps the newest per WBS item. Each
+    returned row's ``baseline_id`` is the version that stored it.
+    """
+    rows, _ = await _materialize(baseline_id, columns)
+    return rows
+
+
+async def _materialize(baseline_id: str, columns: str) -> tuple[list[dict[str, Any]], bool]:
+    """materialize_snapshots plus whether the baseline was approved before its rows were read."""
+    chain, approved = await _baseline_chain(str(baseline_id))
+    if not chain:
+        return [], False
+    if columns != "*" and "baseline_id" not in columns:
+        columns = f"{columns}, baseline_id"
+    db = get_async_db()
+    rows = await fetch_all(lambda: db.table("baseline_snapshots").select(columns).in_("baseline_id", chain).order("id"))
+
+    rank = {bid: i for i, bid in enumerate(chain)}
+    nearest: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        wbs_id = str(row["wbs_item_id"])
+        held = nearest.get(wbs_id)
+        if held is None or rank[str(row["baseline_id"])] < rank[str(held["baseline_id"])]:
+            nearest[wbs_id] = row
+    return list(nearest.values()), approved
+
+
+baseline_cache = BaselinePlanCache()
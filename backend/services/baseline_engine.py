@@ -0,0 +1,174 @@
+"""Baseline snapshot rows built from a project's allocations in one pass,
+and the run-length plan encoding they are stored in.
+
+BaselineService.create_baseline reads every allocation of the project once
+and turns it into one baseline_snapshots row per WBS item here: rows with
+actual_manpower > 0 are sorted by (WBS, date) with ``np.lexsort``, totals
+and day counts come from ``np.bincount`` and each item's slice of the
+sorted arrays becomes its plan.
+
+Plan encoding (migration 012): a snapshot's daily plan is the run-length
+segments ``plan_runs`` (day counts) / ``plan_values`` (manpower) starting
+at ``start_date`` and covering every day up to ``end_date``; gaps are runs
+of 0. A constant crew over six months is one segment instead of ~180 JSON
+keys. ``decode_plans`` expands any number of snapshots with ``np.repeat``
+into a columnar BaselinePlan that ``build_daily_matrix`` scatters directly.
+Rows written before 012 (``daily_plan`` JSON object, no runs) still decode.
+
+Snapshot semantics are unchanged from the per-item loop:
+
+- plan: {date: actual_manpower} for days with manpower > 0
+- ``total_manday``: sum of the plan; ``manpower_per_day`` its mean (2 dp)
+- ``start_date`` / ``end_date``: first / last planned date (None if empty)
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+import numpy as np
+
+from backend.services.matrix_engine import column, date_positions
+
+_EPOCH = date(1970, 1, 1)
+_CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class BaselinePlan:
+    """Planned manpower per (WBS, day) in columnar form, one entry per planned day."""
+
+    wbs_ids: list[str]
+    row: np.ndarray  # int64 index into wbs_ids
+    day: np.ndarray  # int64 days since 1970-01-01
+    value: np.ndarray  # float64, > 0
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def bounds(self) -> tuple[date, date] | None:
+        """First and last planned day, or None for an empty plan."""
+        if not len(self.day):
+            return None
+        return _EPOCH + timedelta(days=int(self.day.min())), _EPOCH + timedelta(days=int(self.day.max()))
+
+    def to_nested(self) -> dict[str, dict[str, float]]:
+        """``{wbs_item_id: {date: planned_manpower}}`` — the pre-012 daily_plan shape."""
+        nested: dict[str, dict[str, float]] = {wbs_id: {} for wbs_id in self.wbs_ids}
+        days = np.datetime_as_string(self.day.astype("datetime64[D]")).tolist()
+        for r, d, v in zip(self.row.tolist(), days, self.value.tolist()):
+            nested[self.wbs_ids[r]][d] = v
+        return nested
+
+
+def _numeric_2dp(values: np.ndarray) -> np.ndarray:
+    """``values`` as a numeric(8,2) column stores them (half away from zero on the decimal text)."""
+    unique, inverse = np.unique(values, return_inverse=True)
+    rounded = [float(Decimal(repr(v)).quantize(_CENT, ROUND_HALF_UP)) for v in unique.tolist()]
+    return np.asarray(rounded, dtype=np.float64)[inverse]
+
+
+def encode_runs(days: np.ndarray, values: np.ndarray) -> tuple[list[int], list[float]]:
+    """Run-length segments of a plan given as ascending day numbers and their manpower.
+
+    Values are rounded to the 2 dp of plan_values first, so runs and values
+    equal what the column returns (and compare equal to it in rebaselines).
+    """
+    if not len(days):
+        return [], []
+    span = int(days[-1] - days[0]) + 1
+    dense = np.zeros(span)
+    dense[days - days[0]] = _numeric_2dp(values)
+    starts = np.concatenate([[0], np.flatnonzero(dense[1:] != dense[:-1]) + 1])
+    lengths = np.diff(np.append(starts, span))
+    return lengths.tolist(), dense[starts].tolist()
+
+
+def _floats(values: Any) -> np.ndarray:
+    return np.fromiter((float(v or 0) for v in values), dtype=np.float64)
+
+
+def decode_plans(snapshots: list[dict]) -> BaselinePlan:
+    """Expand baseline_snapshots rows (wbs_item_id, start_date, plan_runs, plan_values) into one BaselinePlan.
+
+    Rows without ``plan_runs`` fall back to their ``daily_plan`` JSON object.
+    """
+    wbs_ids = [str(s["wbs_item_id"]) for s in snapshots]
+    encoded = [i for i, s in enumerate(snapshots) if s.get("plan_runs") is not None and s.get("start_date")]
+    run_counts = np.fromiter((len(snapshots[i]["plan_runs"]) for i in encoded), dtype=np.int64, count=len(encoded))
+    run_lengths = np.fromiter((n for i in encoded for n in snapshots[i]["plan_runs"]), dtype=np.int64)
+    run_values = _floats(v for i in encoded for v in snapshots[i]["plan_values"])
+
+    # A run starts at its snapshot's start_date plus the lengths of the snapshot's earlier runs
+    before = np.cumsum(run_lengths) - run_lengths
+    first_run = np.repeat(np.cumsum(run_counts) - run_counts, run_counts)
+    run_day = np.repeat(date_positions((snapshots[i]["start_date"] for i in encoded), _EPOCH), run_counts)
+    run_day += before - before[first_run]
+
+    within = np.arange(int(run_lengths.sum())) - np.repeat(before, run_lengths)
+    rows = np.repeat(np.repeat(np.asarray(encoded, dtype=np.int64), run_counts), run_lengths)
+    days = np.repeat(run_day, run_lengths) + within
+    values = np.repeat(run_values, run_lengths)
+
+    legacy = [
+        (i, s["daily_plan"]) for i, s in enumerate(snapshots)
+        if s.get("plan_runs") is None and isinstance(s.get("daily_plan"), dict)
+    ]
+    if legacy:
+        rows = np.concatenate([rows, np.fromiter((i for i, plan in legacy for _ in plan), dtype=np.int64)])
+        days = np.concatenate([days, date_positions((d for _, plan in legacy for d in plan), _EPOCH)])
+        values = np.concatenate([values, _floats(v for _, plan in legacy for v in plan.values())])
+
+    keep = values > 0
+    return BaselinePlan(wbs_ids, rows[keep], days[keep], values[keep])
+
+
+def daily_plan(snapshot: dict) -> dict[str, float]:
+    """One snapshot's plan as ``{date: planned_manpower}``."""
+    return decode_plans([snapshot]).to_nested()[str(snapshot["wbs_item_id"])]
+
+
+def snapshot_rows(baseline_id: str, wbs_items: list[dict], allocations: list[dict]) -> list[dict[str, Any]]:
+    """baseline_snapshots rows for ``wbs_items`` (same order) from their allocations.
+
+    Allocations of WBS ids not in ``wbs_items`` are ignored.
+    """
+    n_rows = len(wbs_items)
+    row_of = {str(w["id"]): i for i, w in enumerate(wbs_items)}
+    rows = np.fromiter(
+        (row_of.get(str(a["wbs_item_id"]), -1) for a in allocations), dtype=np.int64, count=len(allocations)
+    )
+    manpower = column(allocations, "actual_manpower")
+    keep = np.flatnonzero((rows >= 0) & (manpower > 0))
+    days = date_positions((allocations[i]["date"] for i in keep), _EPOCH)
+
+    order = np.lexsort((days, rows[keep]))
+    keep, days = keep[order], days[order]
+    rows, manpower = rows[keep], manpower[keep]
+
+    total = np.bincount(rows, weights=manpower, minlength=n_rows)
+    counts = np.bincount(rows, minlength=n_rows)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    day_keys = np.datetime_as_string(days.astype("datetime64[D]")).tolist()
+
+    out = []
+    for i, w in enumerate(wbs_items):
+        first, last = int(bounds[i]), int(bounds[i + 1])
+        n_days = last - first
+        plan_runs, plan_values = encode_runs(days[first:last], manpower[first:last])
+        out.append({
+            "baseline_id": baseline_id,
+            "wbs_item_id": w["id"],
+            "total_manday": float(total[i]),
+            "start_date": day_keys[first] if n_days else None,
+            "end_date": day_keys[last - 1] if n_days else None,
+            "plan_runs": plan_runs,
+            "plan_values": plan_values,
+            "manpower_per_day": round(float(total[i]) / n_days, 2) if n_days else 0,
+        })
+    return out
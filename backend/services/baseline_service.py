@@ -7,26 +7,75 @@ Rebaseline deactivates the old baseline and creates a new one.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timezone
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 from uuid import UUID
 
-from backend.models.db import get_db
+from backend.models.db import fetch_all_in, get_async_db
 from backend.models.schemas import BaselineCreate
+from backend.services.baseline_cache import baseline_cache, materialize_snapshots
+from backend.services.baseline_engine import (
+    BaselinePlan,
+    daily_plan,
+    decode_plans,
+    snapshot_rows,
+)
+from backend.services.job_runner import ProgressFn, no_progress
+from backend.services.matrix_engine import build_daily_matrix
+from backend.services.project_snapshot import get_project_snapshot
+from backend.services.project_version import bump_project_version, get_project_version
+from backend.services.variance_engine import compare_grids
 from backend.utils import safe_first
 
 logger = logging.getLogger(__name__)
 
+# Rows per baseline_snapshots insert request
+_INSERT_CHUNK_SIZE = 500
+
+
+async def _fetch_worked_allocations(wbs_ids: list[str]) -> list[dict[str, Any]]:
+    """Allocations with actual_manpower > 0 for ``wbs_ids``, every page of every id chunk."""
+    db = get_async_db()
+    return await fetch_all_in(wbs_ids, lambda ids: (
+        db.table("daily_allocations")
+        .select("wbs_item_id, date, actual_manpower")
+        .in_("wbs_item_id", ids)
+        .gt("actual_manpower", 0)
+        .order("id")
+    ))
+
+
+class BaselineVersionConflict(Exception):
+    """Concurrent baselines kept taking the next version number (after retries)."""
+
+
+# Parent snapshot columns compared against (daily_plan: rows stored before migration 012)
+_PARENT_COLUMNS = "wbs_item_id, start_date, plan_runs, plan_values, daily_plan"
+
+
+def _plan_changed(row: dict[str, Any], parent_row: dict[str, Any] | None) -> bool:
+    """Whether a freshly built snapshot differs from the parent version's row for the same WBS item."""
+    if parent_row is None:
+        return bool(row["plan_runs"])  # absent from the chain = empty plan
+    if parent_row.get("plan_runs") is None:  # stored before migration 012
+        return daily_plan(row) != daily_plan(parent_row)
+    return (
+        str(row["start_date"] or "")[:10] != str(parent_row.get("start_date") or "")[:10]
+        or row["plan_runs"] != [int(n) for n in parent_row["plan_runs"]]
+        or row["plan_values"] != [float(v) for v in parent_row.get("plan_values") or []]
+    )
+
 
 class BaselineService:
     """Manages baselines and baseline_snapshots."""
 
-    def list_baselines(self, project_id: UUID) -> list[dict[str, Any]]:
+    async def list_baselines(self, project_id: UUID) -> list[dict[str, Any]]:
         """Return all baselines for a project, newest first."""
-        db = get_db()
+        db = get_async_db()
         response = (
-            db.table("baselines")
+            await db.table("baselines")
             .select("*")
             .eq("project_id", str(project_id))
             .order("version", desc=True)
@@ -34,116 +83,126 @@ class BaselineService:
         )
         return response.data
 
-    def create_baseline(self, project_id: UUID, payload: BaselineCreate) -> dict[str, Any]:
+    async def create_baseline(
+        self, project_id: UUID, payload: BaselineCreate, progress: ProgressFn = no_progress
+    ) -> dict[str, Any]:
         """Create a new baseline with snapshots for each WBS item.
 
         1. Determine next version number
-        2. Insert baseline record
-        3. For each WBS item, snapshot its daily_plan from daily_allocations
+        2. Insert the baseline record inactive and without approved_at,
+           parent_id = the latest approved version (migration 014)
+        3. Snapshot every WBS item's plan from daily_allocations:
+           one paged allocation read, baseline_engine, chunked bulk inserts
+           (run-length plan_runs/plan_values, migration 012)
+        4. Deactivate the previous baseline, then activate and approve this one
+
+        Until step 4 no reader sees the new baseline as active, and
+        baseline_cache does not cache a plan without approved_at, so a
+        half-written snapshot set is never served for good.
+
+        Only snapshots that differ from the parent's materialized set are
+        stored (an item whose plan became empty gets an empty row), so
+        rebaselines grow baseline_snapshots by what changed.
+        materialize_snapshots resolves the full set of any version.
+
+        Raises:
+            ValueError: The project does not exist.
+            BaselineVersionConflict: The version number was still taken after 3 attempts.
         """
         import random
-        import time
 
-        db = get_db()
+        db = get_async_db()
+        project = await db.table("projects").select("id").eq("id", str(project_id)).execute()
+        if not project.data:
+            raise ValueError(f"Project {project_id} not found")
 
         # Retry loop to handle race condition on version numbering
         for attempt in range(3):
             try:
-                # Get next version
+                # Get next version; the parent is the newest baseline that finished building
                 existing = (
-                    db.table("baselines")
-                    .select("version")
+                    await db.table("baselines")
+                    .select("id, version, approved_at")
                     .eq("project_id", str(project_id))
                     .order("version", desc=True)
-                    .limit(1)
                     .execute()
                 )
-                latest = safe_first(existing)
-                next_version = (latest["version"] + 1) if latest else 1
+                next_version = (existing.data[0]["version"] + 1) if existing.data else 1
+                latest = next((b for b in existing.data if b.get("approved_at")), None)
 
-                # Deactivate previous baselines
-                db.table("baselines").update({"is_active": False}).eq(
-                    "project_id", str(project_id)
-                ).eq("is_active", True).execute()
-
-                # Insert new baseline
+                # Insert new baseline, activated once its snapshots are written
                 baseline_row = {
                     "project_id": str(project_id),
                     "version": next_version,
                     "name": payload.name,
                     "notes": payload.notes,
-                    "is_active": True,
-                    "approved_at": datetime.now(timezone.utc).isoformat(),
+                    "is_active": False,
+                    "approved_at": None,
+                    "parent_id": latest["id"] if latest else None,
                 }
-                baseline_resp = db.table("baselines").insert(baseline_row).execute()
+                baseline_resp = await db.table("baselines").insert(baseline_row).execute()
                 baseline = safe_first(baseline_resp)
                 if not baseline:
-                    raise ValueError("Failed to create baseline — insert returned no data")
+                    raise RuntimeError("Failed to create baseline — insert returned no data")
                 baseline_id = baseline["id"]
                 break
             except Exception as e:
-                if "unique" in str(e).lower() and attempt < 2:
-                    logger.warning("Baseline version conflict, retrying: %s", e)
-                    time.sleep(random.uniform(0.05, 0.2))
-                    continue
-                raise
+                if "unique" not in str(e).lower():
+                    raise
+                if attempt == 2:
+                    raise BaselineVersionConflict(f"Baseline version conflict: {e}") from e
+                logger.warning("Baseline version conflict, retrying: %s", e)
+                await asyncio.sleep(random.uniform(0.05, 0.2))
 
-        # Get all WBS items
+        # One paged read of the whole project's allocations, snapshots built in memory
+        await progress(0.1, "Reading allocations")
         wbs_items = (
-            db.table("wbs_items")
-            .select("*")
+            await db.table("wbs_items")
+            .select("id")
             .eq("project_id", str(project_id))
             .execute()
         )
+        allocations = await _fetch_worked_allocations([w["id"] for w in wbs_items.data])
+        snapshots = snapshot_rows(baseline_id, wbs_items.data, allocations)
 
-        # For each WBS item, create a snapshot
-        for item in wbs_items.data:
-            wbs_id = item["id"]
-
-            # Get all allocations for this WBS item
-            allocs = (
-                db.table("daily_allocations")
-                .select("date, planned_manpower, actual_manpower, qty_done")
-                .eq("wbs_item_id", wbs_id)
-                .order("date")
-                .execute()
-            )
-
-            # Build daily_plan JSONB: {"2026-02-17": 5, "2026-02-18": 7}
-            daily_plan = {}
-            total_manday = 0.0
-            start_date = None
-            end_date = None
-
-            for a in allocs.data:
-                mp = float(a.get("actual_manpower", 0))
-                if mp > 0:
-                    daily_plan[a["date"]] = mp
-                    total_manday += mp
-                    if start_date is None:
-                        start_date = a["date"]
-                    end_date = a["date"]
-
-            avg_mp = total_manday / len(daily_plan) if daily_plan else 0
-
-            snapshot_row = {
-                "baseline_id": baseline_id,
-                "wbs_item_id": wbs_id,
-                "total_manday": total_manday,
-                "start_date": start_date,
-                "end_date": end_date,
-                "daily_plan": daily_plan,
-                "manpower_per_day": round(avg_mp, 2),
+        changed = snapshots
+        if baseline_row["parent_id"] is not None:
+            await progress(0.4, f"Comparing with v{latest['version']}")
+            parent_rows = {
+                str(r["wbs_item_id"]): r
+                for r in await materialize_snapshots(baseline_row["parent_id"], _PARENT_COLUMNS)
             }
-            db.table("baseline_snapshots").insert(snapshot_row).execute()
+            changed = [s for s in snapshots if _plan_changed(s, parent_rows.get(str(s["wbs_item_id"])))]
+
+        for start in range(0, len(changed), _INSERT_CHUNK_SIZE):
+            await progress(0.5 + 0.5 * start / len(changed), f"Writing snapshots ({start}/{len(changed)})")
+            await db.table("baseline_snapshots").insert(changed[start:start + _INSERT_CHUNK_SIZE]).execute()
 
+        # Deactivate first: fn_daily_matrix expects at most one active baseline per project
+        await db.table("baselines").update({"is_active": False}).eq(
+            "project_id", str(project_id)
+        ).eq("is_active", True).execute()
+        activated = safe_first(
+            await db.table("baselines")
+            .update({"is_active": True, "approved_at": datetime.now(UTC).isoformat()})
+            .eq("id", str(baseline_id))
+            .execute()
+        )
+        if activated:
+            baseline = activated
+
+        version = await bump_project_version(project_id)
+        # The new plan is immutable: seed the cache so the next grid load reads no snapshots
+        baseline_cache.store(baseline_id, decode_plans(snapshots))
+        baseline_cache.invalidate(project_id)
+        baseline_cache.set_active(project_id, baseline_id, version)
         return baseline
 
-    def get_baseline(self, project_id: UUID, version: int) -> dict[str, Any] | None:
-        """Get a specific baseline by version with its snapshots."""
-        db = get_db()
+    async def get_baseline(self, project_id: UUID, version: int) -> dict[str, Any] | None:
+        """Get a specific baseline by version with its full (materialized) snapshot set."""
+        db = get_async_db()
         baseline = (
-            db.table("baselines")
+            await db.table("baselines")
             .select("*")
             .eq("project_id", str(project_id))
             .eq("version", version)
@@ -154,51 +213,99 @@ class BaselineService:
 
         bl = baseline.data[0]
 
-        # Get snapshots
-        snapshots = (
-            db.table("baseline_snapshots")
-            .select("*")
-            .eq("baseline_id", bl["id"])
-            .execute()
-        )
-        bl["snapshots"] = snapshots.data
+        snapshots = await materialize_snapshots(bl["id"])
+        # API shape stays {date: manpower}; the runs are a storage detail
+        for snap in snapshots:
+            snap["daily_plan"] = daily_plan(snap)
+            snap.pop("plan_runs", None)
+            snap.pop("plan_values", None)
+        bl["snapshots"] = snapshots
         return bl
 
-    def get_active_baseline_plan(self, project_id: UUID) -> dict[str, dict[str, float]]:
-        """Get the active baseline's daily_plan indexed by (wbs_item_id, date) -> manpower.
+    async def get_active_baseline_plan(self, project_id: UUID, version: int | None = None) -> BaselinePlan:
+        """Get the active baseline's plan, decoded into columnar (WBS, day, manpower) form.
 
-        Returns: {wbs_item_id: {date: planned_manpower}}
+        Served from baseline_cache: the active id is looked up again only when
+        the project's data_version differs from ``version`` (read here if not
+        given), the plan itself only once per baseline. Returns an empty
+        BaselinePlan when the project has no active baseline.
         Used by schedule_service to populate CellData.planned.
         """
-        db = get_db()
-        active = (
-            db.table("baselines")
-            .select("id")
+        if version is None:
+            version = await get_project_version(project_id)
+        return await baseline_cache.plan(await baseline_cache.active_id(project_id, version))
+
+    async def compare_baselines(
+        self,
+        project_id: UUID,
+        base_version: int,
+        target_version: int | None = None,
+        until: date | None = None,
+    ) -> dict[str, Any] | None:
+        """Variance of baseline ``target_version`` (None: actual allocations) against ``base_version``.
+
+        Both sides are laid on one WBS x date grid spanning everything either
+        side plans or worked (clipped at ``until``) and compared with
+        variance_engine. Plans come from baseline_cache, WBS rows and actuals
+        from the project snapshot.
+        Returns None if a baseline version does not exist; raises ValueError
+        if the project does not exist.
+        """
+        snapshot = await get_project_snapshot(project_id)
+        versions = [base_version] if target_version is None else [base_version, target_version]
+        db = get_async_db()
+        found = (
+            await db.table("baselines")
+            .select("id, version, name")
             .eq("project_id", str(project_id))
-            .eq("is_active", True)
-            .limit(1)
-            .execute()
-        )
-        if not active.data:
-            return {}
-
-        baseline_id = active.data[0]["id"]
-        snapshots = (
-            db.table("baseline_snapshots")
-            .select("wbs_item_id, daily_plan")
-            .eq("baseline_id", baseline_id)
+            .in_("version", versions)
             .execute()
         )
+        by_version = {b["version"]: b for b in found.data}
+        if any(v not in by_version for v in versions):
+            return None
+
+        base_plan = await baseline_cache.plan(by_version[base_version]["id"])
+        target_plan = None
+        if target_version is not None:
+            target_plan = await baseline_cache.plan(by_version[target_version]["id"])
+
+        bounds = [b for plan in (base_plan, target_plan) if plan is not None and (b := plan.bounds())]
+        if target_plan is None:
+            worked = [str(a["date"])[:10] for a in snapshot.allocations if float(a.get("actual_manpower") or 0) > 0]
+            if worked:
+                bounds.append((date.fromisoformat(min(worked)), date.fromisoformat(max(worked))))
+        if bounds:
+            from_date, to_date = min(b[0] for b in bounds), max(b[1] for b in bounds)
+        else:
+            from_date = to_date = date.today()
+        if until is not None:
+            to_date = min(to_date, until)
+        if not bounds or to_date < from_date:
+            to_date = from_date - timedelta(days=1)  # empty window
+
+        wbs_ids = snapshot.wbs_ids
+        base = build_daily_matrix(wbs_ids, from_date, to_date, [], base_plan, today=from_date).planned
+        if target_plan is not None:
+            target = build_daily_matrix(wbs_ids, from_date, to_date, [], target_plan, today=from_date).planned
+        else:
+            target = build_daily_matrix(wbs_ids, from_date, to_date, snapshot.allocations, {}, today=from_date).actual
 
-        result: dict[str, dict[str, float]] = {}
-        for snap in snapshots.data:
-            wbs_id = snap["wbs_item_id"]
-            daily_plan = snap.get("daily_plan", {})
-            if isinstance(daily_plan, dict):
-                result[wbs_id] = {k: float(v) for k, v in daily_plan.items()}
+        def describe(version: int | None) -> dict[str, Any]:
+            if version is None:
+                return {"version": None, "name": "Actual"}
+            return {"version": version, "name": by_version[version]["name"]}
 
-        return result
+        return {
+            "base": describe(base_version),
+            "target": describe(target_version),
+            "from_date": from_date.isoformat(),
+            "to_date": to_date.isoformat(),
+            **compare_grids(snapshot.wbs_items, from_date, base, target),
+        }
 
-    def rebaseline(self, project_id: UUID, payload: BaselineCreate) -> dict[str, Any]:
+    async def rebaseline(
+        self, project_id: UUID, payload: BaselineCreate, progress: ProgressFn = no_progress
+    ) -> dict[str, Any]:
         """Archive current baseline and create a new one. Alias for create_baseline."""
-        return self.create_baseline(project_id, payload)
+        return await self.create_baseline(project_id, payload, progress)
@@ -0,0 +1,148 @@
+"""Working-day calendar — precomputed ordinal index over a date span.
+
+A project's calendar (project_calendars, migration 011) is expanded once
+into per-day arrays starting at ``start``:
+
+- ``is_working``: worked weekday and not a holiday / shutdown day
+- ``worked_through``: working days from ``start`` up to and including the day
+- ``kw``: ISO week number (KW), ``iso_year`` its ISO year
+
+Date arithmetic is then integer offsets into these arrays: adding N working
+days is one ``np.searchsorted`` on ``worked_through`` (for a whole array of
+N at once with ``add_working_days_many``). The span grows on
+demand when a query falls past its end.
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+# ISO weekdays (1 = Monday .. 7 = Sunday); site work runs Monday to Saturday
+DEFAULT_WORKING_WEEKDAYS = (1, 2, 3, 4, 5, 6)
+
+# Extra days indexed past the requested end, so forecasts rarely force a rebuild
+_SPAN_MARGIN_DAYS = 5 * 366
+
+
+def _iso_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+class WorkCalendar:
+    """Working-day index for one project over [start, end] (extended on demand)."""
+
+    def __init__(
+        self,
+        start: date,
+        end: date,
+        working_weekdays: Iterable[int] = DEFAULT_WORKING_WEEKDAYS,
+        holidays: Iterable[dict] = (),
+        shutdowns: Iterable[dict] = (),
+    ):
+        self.working_weekdays = tuple(sorted({int(d) for d in working_weekdays})) or DEFAULT_WORKING_WEEKDAYS
+        self.holidays = [dict(h) for h in holidays]
+        self.shutdowns = [dict(s) for s in shutdowns]
+        self.start = start
+        self._build(max(end, start))
+
+    def _build(self, end: date) -> None:
+        n_days = (end - self.start).days + 1
+        self.end = end
+        days = np.datetime64(self.start, "D") + np.arange(n_days)
+
+        iso_weekday = (np.arange(n_days) + self.start.weekday()) % 7 + 1
+        working = np.isin(iso_weekday, self.working_weekdays)
+        for h in self.holidays:
+            pos = (_iso_date(h["date"]) - self.start).days
+            if 0 <= pos < n_days:
+                working[pos] = False
+        for s in self.shutdowns:
+            first = max((_iso_date(s["start"]) - self.start).days, 0)
+            last = min((_iso_date(s["end"]) - self.start).days, n_days - 1)
+            if first <= last:
+                working[first:last + 1] = False
+        self.is_working = working
+        self.worked_through = np.cumsum(working)
+
+        # ISO week: the week's Thursday decides the ISO year
+        thursday = days + (4 - iso_weekday)
+        year_start = thursday.astype("datetime64[Y]").astype("datetime64[D]")
+        self.iso_year = thursday.astype("datetime64[Y]").astype(np.int64) + 1970
+        self.kw = (thursday - year_start).astype(np.int64) // 7 + 1
+
+    def index(self, day: date) -> int:
+        """Position of ``day`` in the arrays, extending the span if needed."""
+        if day < self.start:
+            raise ValueError(f"{day} is before the calendar start {self.start}")
+        if day > self.end:
+            self._build(day + timedelta(days=_SPAN_MARGIN_DAYS))
+        return (day - self.start).days
+
+    def date_at(self, pos: int) -> date:
+        return self.start + timedelta(days=int(pos))
+
+    def is_working_day(self, day: date) -> bool:
+        return bool(self.is_working[self.index(day)])
+
+    def next_working_day(self, day: date) -> date:
+        """``day`` itself if worked, else the first working day after it."""
+        pos = self.index(day)
+        done = int(self.worked_through[pos]) - int(self.is_working[pos])
+        return self._nth_working_day(done + 1)
+
+    def previous_working_day(self, day: date) -> date | None:
+        """Last working day strictly before ``day`` (None if none since ``start``)."""
+        pos = self.index(day)
+        done = int(self.worked_through[pos]) - int(self.is_working[pos])
+        return self._nth_working_day(done) if done > 0 else None
+
+    def add_working_days(self, day: date, n: int) -> date:
+        """Date on which ``n`` working days counted after ``day`` are complete.
+
+        ``n <= 0`` returns ``day`` unchanged.
+        """
+        if n <= 0:
+            return day
+        pos = self.index(day)  # may extend the span (and replace worked_through)
+        return self._nth_working_day(int(self.worked_through[pos]) + n)
+
+    def add_working_days_many(self, day: date, n: np.ndarray) -> np.ndarray:
+        """``add_working_days`` for an array of counts at once (datetime64[D])."""
+        n = np.asarray(n, dtype=np.int64)
+        pos = self.index(day)
+        targets = int(self.worked_through[pos]) + np.maximum(n, 0)
+        self._cover(int(targets.max(initial=0)))
+        ends = np.datetime64(self.start, "D") + np.searchsorted(self.worked_through, targets)
+        return np.where(n > 0, ends, np.datetime64(day, "D"))
+
+    def working_days_between(self, from_date: date, to_date: date) -> int:
+        """Working days in (from_date, to_date]."""
+        to_pos, from_pos = self.index(to_date), self.index(from_date)
+        return int(self.worked_through[to_pos] - self.worked_through[from_pos])
+
+    def _cover(self, n: int) -> None:
+        """Extend the span until it holds ``n`` working days."""
+        # Terminates: at least one weekday is worked and shutdowns are finite
+        while self.worked_through[-1] < n:
+            self._build(self.end + timedelta(days=_SPAN_MARGIN_DAYS))
+
+    def _nth_working_day(self, n: int) -> date:
+        """The n-th working day since ``start`` (1-based)."""
+        self._cover(n)
+        return self.date_at(int(np.searchsorted(self.worked_through, n)))
+
+    def days(self, from_date: date, to_date: date) -> dict[str, list]:
+        """Per-day view of [from_date, to_date]: dates, working flags and KW keys."""
+        first, last = self.index(from_date), self.index(to_date)
+        cols = slice(first, last + 1)
+        return {
+            "dates": [self.date_at(p).isoformat() for p in range(first, last + 1)],
+            "working": self.is_working[cols].tolist(),
+            "kw": [f"{y}-KW{w:02d}" for y, w in zip(self.iso_year[cols].tolist(), self.kw[cols].tolist())],
+        }
@@ -0,0 +1,99 @@
+"""Project calendar service — project_calendars rows and their WorkCalendar.
+
+A project without a row (or a database without migration 011) uses the
+default Monday-Saturday calendar with no holidays. Calendar edits bump the
+project's data_version, so the WorkCalendar cached on the project snapshot
+is rebuilt on the next read.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Any
+from uuid import UUID
+
+from backend.models.db import get_async_db
+from backend.models.schemas import ProjectCalendar
+from backend.services.calendar_engine import DEFAULT_WORKING_WEEKDAYS, WorkCalendar
+from backend.services.project_version import bump_project_version
+
+logger = logging.getLogger(__name__)
+
+# Set to False once PostgREST reports project_calendars missing (migration 011 not applied)
+_calendar_available = True
+
+# Days indexed before the project start / after its end (or today) up front
+_LEAD_DAYS = 366
+_TAIL_DAYS = 2 * 365
+
+
+async def fetch_calendar_row(project_id: UUID | str) -> dict[str, Any] | None:
+    """The project's project_calendars row, or None for the default calendar."""
+    global _calendar_available
+    if not _calendar_available:
+        return None
+    db = get_async_db()
+    try:
+        resp = await db.table("project_calendars").select("*").eq("project_id", str(project_id)).execute()
+    except Exception as e:
+        if "PGRST205" in str(e) or "42P01" in str(e) or "project_calendars" in str(e):
+            _calendar_available = False
+        logger.warning("Project calendar lookup failed, using default calendar: %s", e, exc_info=_calendar_available)
+        return None
+    return resp.data[0] if resp.data else None
+
+
+def build_calendar(project: dict[str, Any], row: dict[str, Any] | None, today: date | None = None) -> WorkCalendar:
+    """WorkCalendar spanning the project (and today), from a project_calendars row."""
+    today = today or date.today()
+    start = date.fromisoformat(str(project["start_date"])[:10])
+    end = date.fromisoformat(str(project["end_date"])[:10]) if project.get("end_date") else today
+    row = row or {}
+    return WorkCalendar(
+        start=min(start, today) - timedelta(days=_LEAD_DAYS),
+        end=max(end, today) + timedelta(days=_TAIL_DAYS),
+        working_weekdays=row.get("working_weekdays") or DEFAULT_WORKING_WEEKDAYS,
+        holidays=row.get("holidays") or [],
+        shutdowns=row.get("shutdowns") or [],
+    )
+
+
+class CalendarService:
+    """Read and replace a project's working-day calendar."""
+
+    async def get_calendar(self, project_id: UUID) -> dict[str, Any]:
+        """The stored calendar, or the default one. Raises ValueError for unknown projects."""
+        await self._require_project(project_id)
+        row = await fetch_calendar_row(project_id)
+        calendar = ProjectCalendar.model_validate(row) if row else ProjectCalendar()
+        return {"project_id": str(project_id), **calendar.model_dump(mode="json")}
+
+    async def update_calendar(self, project_id: UUID, payload: ProjectCalendar) -> dict[str, Any]:
+        """Replace the project's calendar (upsert on project_id)."""
+        await self._require_project(project_id)
+        db = get_async_db()
+        data = {"project_id": str(project_id), **payload.model_dump(mode="json")}
+        await db.table("project_calendars").upsert(data, on_conflict="project_id").execute()
+        await bump_project_version(project_id)
+        return {"project_id": str(project_id), **payload.model_dump(mode="json")}
+
+    async def get_days(self, project_id: UUID, from_date: date, to_date: date) -> dict[str, list]:
+        """Working flags and KW keys for [from_date, to_date] from the snapshot's calendar."""
+        # Deferred: project_snapshot imports this module
+        from backend.services.project_snapshot import get_project_snapshot
+
+        calendar = (await get_project_snapshot(project_id)).calendar
+        if from_date < calendar.start:
+            # Rare look far back: index a throwaway calendar instead of the cached one
+            calendar = WorkCalendar(
+                from_date, to_date, calendar.working_weekdays, calendar.holidays, calendar.shutdowns
+            )
+        return calendar.days(from_date, to_date)
+
+    @staticmethod
+    async def _require_project(project_id: UUID) -> None:
+        db = get_async_db()
+        resp = await db.table("projects").select("id").eq("id", str(project_id)).execute()
+        if not resp.data:
+            raise ValueError(f"Project {project_id} not found")
@@ -0,0 +1,199 @@
+"""In-process fan-out of allocation cell changes for the SSE stream.
+
+ScheduleService.upsert_allocations — the single write path behind the grid
+batch update, chat apply and Excel import — publishes one ``cells`` event
+per write with the cells that were stored. Each open
+``GET /allocations/{id}/stream`` holds a Subscription that receives them.
+
+Event ids are the project's data_version after the write (migration 009),
+which all workers agree on, so the browser's ``Last-Event-ID`` on reconnect
+means "I have seen everything up to this version". A fresh connect starts
+with a ``ready`` event carrying the current version; the client loads the
+matrix then and applies the events that follow.
+
+- The broker keeps the last ``settings.stream_replay_events`` events per
+  project. A reconnect is replayed from them when they cover every version
+  since Last-Event-ID.
+- Otherwise (a write on another worker, a WBS edit or baseline, a restart)
+  the client gets one ``changed`` event and pulls the delta feed
+  (``/changes?since=``). The stream handler also polls data_version while
+  idle and emits ``changed`` for versions it did not see published here.
+
+Backpressure: every subscriber has a bounded queue
+(``settings.stream_queue_size``). Publishing never waits; a subscriber
+whose queue is full has it replaced by a single ``reset`` event and is
+expected to reload the matrix.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from backend.config import settings
+from backend.services.project_version import get_project_version
+
+logger = logging.getLogger(__name__)
+
+# Cell columns carried by ``cells`` events (only those present in the write)
+_CELL_COLUMNS = ("planned_manpower", "actual_manpower", "qty_done", "notes")
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """One SSE message; ``id`` is the data_version it brings the client to."""
+
+    event: str  # "ready" | "cells" | "changed" | "reset"
+    data: dict[str, Any]
+    id: int | None = None
+
+    def encode(self) -> str:
+        lines = [f"event: {self.event}"]
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        lines.append("data: " + json.dumps(self.data, separators=(",", ":"), default=str))
+        return "\n".join(lines) + "\n\n"
+
+
+def cell_changes(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Compact cell dicts {wbs_id, date, <written columns>} for a ``cells`` event."""
+    cells = []
+    for row in rows:
+        cell = {"wbs_id": str(row["wbs_item_id"]), "date": str(row["date"])[:10]}
+        cell.update({c: row[c] for c in _CELL_COLUMNS if c in row})
+        cells.append(cell)
+    return cells
+
+
+class Subscription:
+    """One stream's bounded event queue."""
+
+    def __init__(self, project_id: str, max_queue: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue[StreamEvent] = asyncio.Queue(maxsize=max_queue)
+        self.overflows = 0
+
+    def offer(self, event: StreamEvent) -> None:
+        """Enqueue without waiting; a full queue collapses into one ``reset``."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(StreamEvent("reset", {"reason": "slow_consumer"}, event.id))
+
+    async def next(self, timeout: float) -> StreamEvent | None:
+        """The next event, or None after ``timeout`` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class ChangeBroker:
+    """Per-project subscriber sets plus a short replay log."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._recent: dict[str, deque[StreamEvent]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, project_id: UUID | str, version: int | None, rows: list[dict[str, Any]]) -> None:
+        """Broadcast the cells of one write that brought the project to ``version``."""
+        pid = str(project_id)
+        event = StreamEvent("cells", {"version": version, "cells": cell_changes(rows)}, version)
+        if version is not None:
+            log = self._recent.setdefault(pid, deque(maxlen=settings.stream_replay_events))
+            log.append(event)
+        self.published += 1
+        for sub in self._subscribers.get(pid, ()):
+            before = sub.overflows
+            sub.offer(event)
+            self.dropped += sub.overflows - before
+
+    def subscribe(self, project_id: UUID | str) -> Subscription:
+        pid = str(project_id)
+        sub = Subscription(pid, settings.stream_queue_size)
+        self._subscribers.setdefault(pid, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._subscribers.get(sub.project_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.project_id]
+
+    def replay(self, project_id: UUID | str, last_seen: int, current: int) -> list[StreamEvent] | None:
+        """Events for versions (last_seen, current], or None if this process did not publish all of them."""
+        if current <= last_seen:
+            return []
+        events = [e for e in self._recent.get(str(project_id), ()) if last_seen < e.id <= current]
+        if [e.id for e in events] != list(range(last_seen + 1, current + 1)):
+            return None
+        return events
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+change_broker = ChangeBroker()
+
+
+def _changed(version: int, since: int) -> StreamEvent:
+    return StreamEvent("changed", {"version": version, "since": since}, version)
+
+
+async def stream_events(
+    project_id: UUID | str,
+    last_event_id: int | None,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    """Encoded SSE messages for one client until it disconnects."""
+    pid = str(project_id)
+    sub = change_broker.subscribe(pid)  # before reading the version, so no write falls in between
+    try:
+        seen = await get_project_version(pid)
+        yield f"retry: {settings.stream_retry_ms}\n\n"
+        if last_event_id is None:
+            # Fresh connect: the client (re)loads the matrix and applies events after this version
+            yield StreamEvent("ready", {"version": seen}, seen).encode()
+        elif seen is not None and seen > last_event_id:
+            missed = change_broker.replay(pid, last_event_id, seen)
+            for event in missed if missed is not None else [_changed(seen, last_event_id)]:
+                yield event.encode()
+
+        while not await is_disconnected():
+            event = await sub.next(settings.stream_poll_s)
+            if event is None:
+                # Idle: catch writes from other workers and non-grid changes
+                current = await get_project_version(pid)
+                if current is not None and seen is not None and current > seen:
+                    yield _changed(current, seen).encode()
+                    seen = current
+                else:
+                    yield ": keepalive\n\n"
+                continue
+            if event.id is not None and seen is not None:
+                if event.id <= seen:
+                    continue  # already covered by the replay / a changed event
+                if event.event == "cells" and event.id > seen + 1:
+                    # Versions in between were not published here; the delta feed covers them and this write
+                    event = _changed(event.id, seen)
+            yield event.encode()
+            if event.id is not None:
+                seen = event.id
+    finally:
+        change_broker.unsubscribe(sub)
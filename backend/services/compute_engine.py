@@ -14,6 +14,10 @@ from __future__ import annotations
 
 import math
 from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from backend.services.calendar_engine import WorkCalendar
 
 
 def calculate_productivity_rate(total_qty_done: float, total_actual_manday: float) -> float:
@@ -59,8 +63,13 @@ def estimate_completion_date(
     productivity_rate: float,
     avg_daily_manpower: float,
     from_date: date | None = None,
+    calendar: WorkCalendar | None = None,
 ) -> date | None:
-    """Project completion date from current rate. Returns None when rate is zero."""
+    """Project completion date from current rate. Returns None when rate is zero.
+
+    With a ``calendar`` the remaining days are working days; without one
+    they are calendar days.
+    """
     if remaining_qty <= 0:
         return from_date or date.today()
     if productivity_rate <= 0 or avg_daily_manpower <= 0:
@@ -69,6 +78,8 @@ def estimate_completion_date(
     if days >= 999:
         return None
     base = from_date or date.today()
+    if calendar is not None:
+        return calendar.add_working_days(base, days)
     return base + timedelta(days=days)
 
 
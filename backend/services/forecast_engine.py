@@ -0,0 +1,148 @@
+"""Forecast engine — completion forecasts for all WBS items at once.
+
+The local compute step of ai.forecast.ForecastEngine. A project's
+allocations become columns once (``allocation_arrays``: WBS row, day,
+qty_done, actual_manpower) and every per-WBS figure is a grouped
+reduction over them:
+
+- totals: qty_done and manday per row (``np.bincount``); working days are
+  allocations with actual_manpower > 0
+- average daily manpower: mean actual_manpower of the worked days in the
+  last ``window_days``, else of all worked days, else 0
+- remaining days = ceil(remaining / (productivity * avg)), 999 when either
+  is 0; the predicted end adds them as crew working days on the project
+  calendar (WorkCalendar.add_working_days_many)
+- risk: no estimate -> high; predicted end after the project end -> high;
+  progress < 30 % after more than 5 working days -> medium; else low
+
+Rates and percentages are rounded with Python's ``round`` like
+compute_engine, so results equal the per-item formulas exactly.
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from backend.services.matrix_engine import column, date_positions
+
+if TYPE_CHECKING:
+    from backend.services.calendar_engine import WorkCalendar
+
+_EPOCH = date(1970, 1, 1)
+
+# calculate_remaining_days' "cannot estimate"
+NO_ESTIMATE_DAYS = 999
+
+
+@dataclass(frozen=True)
+class AllocationArrays:
+    """daily_allocations rows as columns; ``row`` indexes the wbs_items they were built for."""
+
+    row: np.ndarray  # int64
+    day: np.ndarray  # int64 days since 1970-01-01
+    qty_done: np.ndarray  # float64
+    actual: np.ndarray  # float64
+    n_rows: int
+
+
+def allocation_arrays(wbs_items: list[dict], allocations: list[dict]) -> AllocationArrays:
+    """Columns of ``allocations`` (order kept); rows of WBS ids not in ``wbs_items`` are dropped."""
+    row_of = {str(w["id"]): i for i, w in enumerate(wbs_items)}
+    rows = np.fromiter(
+        (row_of.get(str(a["wbs_item_id"]), -1) for a in allocations), dtype=np.int64, count=len(allocations)
+    )
+    keep = rows >= 0
+    return AllocationArrays(
+        row=rows[keep],
+        day=date_positions((a["date"] for a in allocations), _EPOCH)[keep],
+        qty_done=column(allocations, "qty_done")[keep],
+        actual=column(allocations, "actual_manpower")[keep],
+        n_rows=len(wbs_items),
+    )
+
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    # np.round scales by 10**n first and can differ from round() at ties
+    return np.array([round(v, ndigits) for v in values.tolist()], dtype=np.float64)
+
+
+def _mean(total: np.ndarray, count: np.ndarray) -> np.ndarray:
+    return np.divide(total, count, out=np.zeros(len(total)), where=count > 0)
+
+
+def forecast_items(
+    wbs_items: list[dict],
+    arrays: AllocationArrays,
+    calendar: WorkCalendar,
+    today: date,
+    project_end: str | date | None,
+    window_days: int = 14,
+) -> list[dict[str, Any]]:
+    """IC-003 forecast items for ``wbs_items`` (same order) from their allocation columns."""
+    n = arrays.n_rows
+    rows = arrays.row
+    qty = column(wbs_items, "qty")
+    done = np.bincount(rows, weights=arrays.qty_done, minlength=n)
+    manday = np.bincount(rows, weights=arrays.actual, minlength=n)
+
+    worked = arrays.actual > 0
+    working_days = np.bincount(rows[worked], minlength=n)
+    recent = worked & (arrays.day >= (today - timedelta(days=window_days) - _EPOCH).days)
+    recent_days = np.bincount(rows[recent], minlength=n)
+    avg_mp = np.where(
+        recent_days > 0,
+        _mean(np.bincount(rows[recent], weights=arrays.actual[recent], minlength=n), recent_days),
+        _mean(np.bincount(rows[worked], weights=arrays.actual[worked], minlength=n), working_days),
+    )
+
+    remaining = np.maximum(qty - done, 0)
+    progress = _round(np.where(
+        qty > 0,
+        np.minimum(_mean(done, np.where(qty > 0, qty, 0)) * 100, 100.0),
+        np.where(done > 0, 100.0, 0.0),
+    ), 1)
+    productivity = np.where(manday > 0, _round(_mean(done, manday), 3), 0.0)
+
+    rate = productivity * avg_mp
+    est_days = np.full(n, NO_ESTIMATE_DAYS, dtype=np.int64)
+    can_estimate = (productivity > 0) & (avg_mp > 0)
+    est_days[can_estimate] = np.minimum(
+        np.ceil(remaining[can_estimate] / rate[can_estimate]), NO_ESTIMATE_DAYS
+    ).astype(np.int64)
+    estimated = est_days < NO_ESTIMATE_DAYS
+
+    end = project_end if project_end is None or isinstance(project_end, str) else project_end.isoformat()
+    ends = np.datetime_as_string(calendar.add_working_days_many(today, np.where(estimated, est_days, 0)), unit="D")
+    late = estimated & (ends > end) if end else np.zeros(n, dtype=bool)
+    slow = estimated & ~late & (progress < 30) & (working_days > 5)
+    fallback_end = end or calendar.next_working_day(today + timedelta(days=90)).isoformat()
+    predicted_manday = _round(manday + np.where(estimated, avg_mp * est_days, 0), 1)
+
+    forecasts = []
+    for i, w in enumerate(wbs_items):
+        if not estimated[i]:
+            predicted_end, risk, recommendation = fallback_end, "high", "Yeterli veri yok, tahmin yapılamıyor"
+        elif late[i]:
+            predicted_end, risk = str(ends[i]), "high"
+            recommendation = f"Planlanan bitişten {est_days[i]} gün geç kalma riski"
+        elif slow[i]:
+            predicted_end, risk = str(ends[i]), "medium"
+            recommendation = "İlerleme yavaş, kaynak artırımı değerlendirilmeli"
+        else:
+            predicted_end, risk, recommendation = str(ends[i]), "low", "Plan dahilinde ilerliyor"
+        forecasts.append({
+            "wbs_code": w["wbs_code"],
+            "wbs_name": w["wbs_name"],
+            "current_progress": float(progress[i]),
+            "predicted_end_date": predicted_end,
+            "predicted_total_manday": float(predicted_manday[i]),
+            "risk_level": risk,
+            "recommendation": recommendation,
+        })
+    return forecasts
@@ -0,0 +1,161 @@
+"""Gantt summary engine — per-WBS bars with server-side level of detail.
+
+Builds one dense (rows x days) grid over the whole data range with
+``build_daily_matrix``, rolls activity up the ``parent_id`` tree, then folds
+the day axis into day/week/month buckets (``zoom``). Each bar carries its
+baseline and actual start/finish dates plus planned/actual *spans*: runs of
+consecutive active buckets as ``[first, last]`` bucket indices. A
+multi-month bar is then a handful of integers instead of one cell per day.
+
+Planned activity follows the daily matrix rule (baseline value if non-zero,
+else allocation planned_manpower); actual activity is actual_manpower > 0.
+Summary rows take the union of their descendants' activity; the tree walk
+and qty-weighted progress come from rollup_engine.
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from backend.services.compute_engine import calculate_progress_pct, weighted_progress
+from backend.services.matrix_engine import bucket_starts, build_daily_matrix
+from backend.services.rollup_engine import rollup_rows, subtree_progress, tree_levels
+
+if TYPE_CHECKING:
+    from backend.services.baseline_engine import BaselinePlan
+
+ZOOM_LEVELS = ("day", "week", "month")
+
+
+def spans(active: np.ndarray) -> list[list[list[int]]]:
+    """Runs of True per row as ``[[first, last], ...]`` (inclusive indices)."""
+    n_rows = active.shape[0]
+    if active.shape[1] == 0:
+        return [[] for _ in range(n_rows)]
+    padded = np.pad(active.astype(np.int8), ((0, 0), (1, 1)))
+    edges = np.diff(padded, axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+    out: list[list[list[int]]] = [[] for _ in range(n_rows)]
+    for r, s, e in zip(start_rows.tolist(), start_cols.tolist(), (end_cols - 1).tolist()):
+        out[r].append([s, e])
+    return out
+
+
+def first_last(active: np.ndarray, dates: list[str]) -> tuple[list[str | None], list[str | None]]:
+    """First and last active date per row (None when a row has no activity)."""
+    if active.shape[1] == 0:
+        empty: list[str | None] = [None] * active.shape[0]
+        return empty, list(empty)
+    has_any = active.any(axis=1)
+    first = active.argmax(axis=1)
+    last = active.shape[1] - 1 - active[:, ::-1].argmax(axis=1)
+    return (
+        [dates[i] if ok else None for i, ok in zip(first.tolist(), has_any.tolist())],
+        [dates[i] if ok else None for i, ok in zip(last.tolist(), has_any.tolist())],
+    )
+
+
+def build_gantt(
+    wbs_items: list[dict],
+    allocations: list[dict],
+    baseline_plan: BaselinePlan | dict[str, dict[str, float]],
+    zoom: str = "week",
+    today: date | None = None,
+) -> dict[str, Any]:
+    """Build the SummaryResponse body for ``wbs_items`` (in display order).
+
+    Returns {zoom, buckets, gantt_bars, milestones, overall}; ``buckets`` are
+    the bucket start dates that span indices refer to.
+    """
+    if zoom not in ZOOM_LEVELS:
+        raise ValueError(f"zoom must be one of {ZOOM_LEVELS}")
+    today = today or date.today()
+    wbs_ids = [str(w["id"]) for w in wbs_items]
+
+    all_dates = [str(a["date"])[:10] for a in allocations]
+    if isinstance(baseline_plan, dict):
+        all_dates += [d for plan in baseline_plan.values() for d in plan]
+    elif (plan_bounds := baseline_plan.bounds()) is not None:
+        all_dates += [d.isoformat() for d in plan_bounds]
+    if all_dates:
+        from_date, to_date = date.fromisoformat(min(all_dates)), date.fromisoformat(max(all_dates))
+    else:
+        from_date, to_date = today, today - timedelta(days=1)  # empty window
+    grid = build_daily_matrix(wbs_ids, from_date, to_date, allocations, baseline_plan, today=today)
+    n_days = len(grid.dates)
+
+    parent, depth = tree_levels(wbs_items)
+    planned_active = rollup_rows(grid.planned > 0, parent, depth, np.logical_or)
+    actual_active = rollup_rows(grid.actual > 0, parent, depth, np.logical_or)
+
+    # Per-row totals; summary rows aggregate their subtree
+    qty = np.array([float(w.get("qty") or 0) for w in wbs_items])
+    is_summary = np.array([bool(w.get("is_summary")) for w in wbs_items], dtype=bool)
+    done = grid.qty_done.sum(axis=1)
+    sub_progress = subtree_progress(qty, done, is_summary, parent, depth)
+    planned_manday = rollup_rows(grid.planned.sum(axis=1), parent, depth, np.add)
+    actual_manday = rollup_rows(grid.actual.sum(axis=1), parent, depth, np.add)
+
+    starts = bucket_starts(grid.start, n_days, zoom)
+    if n_days:
+        planned_buckets = np.logical_or.reduceat(planned_active, starts, axis=1)
+        actual_buckets = np.logical_or.reduceat(actual_active, starts, axis=1)
+    else:
+        planned_buckets = actual_buckets = np.zeros((len(wbs_ids), 0), dtype=bool)
+    planned_spans = spans(planned_buckets)
+    actual_spans = spans(actual_buckets)
+    baseline_start, baseline_end = first_last(planned_active, grid.dates)
+    actual_start, actual_end = first_last(actual_active, grid.dates)
+
+    bars = []
+    for i, w in enumerate(wbs_items):
+        if is_summary[i]:
+            progress = float(sub_progress[i])
+        else:
+            progress = calculate_progress_pct(float(qty[i]), float(done[i]))
+        bars.append({
+            "wbs_id": wbs_ids[i],
+            "wbs_code": w["wbs_code"],
+            "wbs_name": w["wbs_name"],
+            "parent_id": wbs_ids[int(parent[i])] if parent[i] >= 0 else None,
+            "level": int(depth[i]),
+            "is_summary": bool(is_summary[i]),
+            "progress_pct": progress,
+            "baseline_start": baseline_start[i],
+            "baseline_end": baseline_end[i],
+            "actual_start": actual_start[i],
+            "actual_end": actual_end[i],
+            "forecast_end": None,
+            "planned_manday": round(float(planned_manday[i]), 2),
+            "actual_manday": round(float(actual_manday[i]), 2),
+            "planned_spans": planned_spans[i],
+            "actual_spans": actual_spans[i],
+        })
+
+    # Planned vs actual manday up to today decides overall health
+    cutoff = grid.future_from
+    planned_to_date = float(grid.planned[:, :cutoff].sum())
+    actual_to_date = float(grid.actual[:, :cutoff].sum())
+    ratio = actual_to_date / planned_to_date if planned_to_date > 0 else 1.0
+    health = "on_track" if ratio >= 0.95 else ("at_risk" if ratio >= 0.8 else "behind")
+
+    return {
+        "zoom": zoom,
+        "buckets": [grid.dates[i] for i in starts.tolist()],
+        "gantt_bars": bars,
+        "milestones": [],
+        "overall": {
+            "total_progress": weighted_progress(
+                [{"qty": q, "done": d} for q, d, s in zip(qty.tolist(), done.tolist(), is_summary.tolist()) if not s]
+            ),
+            "total_planned_manday": round(float(grid.planned.sum()), 2),
+            "total_actual_manday": round(float(grid.actual.sum()), 2),
+            "project_health": health,
+        },
+    }
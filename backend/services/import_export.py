@@ -7,8 +7,11 @@ Provides:
 
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
+from collections import Counter
+from collections.abc import Callable
 from datetime import date, datetime
 from typing import Any, BinaryIO
 from uuid import UUID
@@ -17,11 +20,23 @@ from fastapi import UploadFile
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill
 
-from backend.models.db import get_db
+from backend.models.db import fetch_all, get_async_db
+from backend.services.job_runner import ProgressFn, no_progress
+from backend.services.project_snapshot import get_project_snapshot
+from backend.services.project_version import bump_project_version
+from backend.services.schedule_service import ScheduleService
 
 logger = logging.getLogger(__name__)
 
 
+class InvalidWorkbook(Exception):
+    """The upload is not an .xlsx workbook, or a cell cannot be converted."""
+
+
+class DuplicateWbsCode(Exception):
+    """An imported WBS code repeats in the sheet or already exists in the project."""
+
+
 class ImportExportService:
     """Handles Excel import and export of schedule data."""
 
@@ -29,7 +44,7 @@ class ImportExportService:
     # Export
     # ------------------------------------------------------------------
 
-    def export_to_excel(
+    async def export_to_excel(
         self, project_id: UUID
     ) -> tuple[BinaryIO, str]:
         """Generate an .xlsx workbook and return ``(stream, filename)``.
@@ -41,38 +56,10 @@ class ImportExportService:
         Raises:
             ValueError: If the project does not exist.
         """
-        db = get_db()
-
-        project_resp = (
-            db.table("projects")
-            .select("*")
-            .eq("id", str(project_id))
-            .execute()
-        )
-        if not project_resp.data:
-            raise ValueError(f"Project {project_id} not found")
-        project = project_resp.data[0]
-
-        wbs_items = (
-            db.table("wbs_items")
-            .select("*")
-            .eq("project_id", str(project_id))
-            .order("sort_order")
-            .execute()
-            .data
-        )
-        # Get WBS item IDs for this project, then fetch allocations
-        wbs_ids = [w["id"] for w in wbs_items]
-        allocations = []
-        if wbs_ids:
-            allocations = (
-                db.table("daily_allocations")
-                .select("*")
-                .in_("wbs_item_id", wbs_ids)
-                .order("date")
-                .execute()
-                .data
-            )
+        snapshot = await get_project_snapshot(project_id)
+        project = snapshot.project
+        wbs_items = snapshot.wbs_items
+        allocations = snapshot.allocations
 
         wb = Workbook()
 
@@ -131,78 +118,116 @@ class ImportExportService:
     # ------------------------------------------------------------------
 
     async def import_from_excel(
-        self, project_id: UUID, file: UploadFile
+        self, project_id: UUID, file: UploadFile | bytes, progress: ProgressFn = no_progress
     ) -> dict[str, int]:
         """Parse an uploaded .xlsx and merge rows into the project.
 
+        ``file`` may be the upload's bytes: background jobs outlive the request
+        and its UploadFile. Every WBS row is parsed and checked before the
+        first write, so a rejected workbook imports nothing.
+
         Returns a summary dict like ``{"wbs_items": 12, "allocations": 48}``.
+
+        Raises:
+            InvalidWorkbook: Not an .xlsx file, or a cell that cannot be read.
+            DuplicateWbsCode: A WBS code repeats in the sheet or already exists in the project.
         """
-        contents = await file.read()
-        wb = load_workbook(filename=io.BytesIO(contents), read_only=True)
-        db = get_db()
+        contents = file if isinstance(file, bytes) else await file.read()
+        await progress(0.0, "Reading workbook")
+        try:
+            # Parsing is CPU-bound: keep it off the event loop
+            wb = await asyncio.to_thread(load_workbook, filename=io.BytesIO(contents), read_only=True)
+        except Exception as e:
+            raise InvalidWorkbook(f"Not a readable .xlsx workbook: {e}") from e
+        try:
+            return await self._import_workbook(project_id, wb, progress)
+        finally:
+            wb.close()
 
+    async def _import_workbook(self, project_id: UUID, wb: Workbook, progress: ProgressFn) -> dict[str, int]:
+        db = get_async_db()
         imported_wbs = 0
         imported_alloc = 0
 
         # -- WBS sheet -------------------------------------------------
         if "WBS" in wb.sheetnames:
-            ws = wb["WBS"]
-            rows = list(ws.iter_rows(min_row=2, values_only=True))
-            for row in rows:
-                if not row or not row[0]:
-                    continue
-                data: dict[str, Any] = {
-                    "project_id": str(project_id),
-                    "wbs_code": str(row[0]),
-                    "wbs_name": str(row[1]) if len(row) > 1 and row[1] else str(row[0]),
-                    "is_summary": row[2] in (True, 1, "True", "true") if len(row) > 2 and row[2] else False,
-                    "qty": float(row[3]) if len(row) > 3 and row[3] else 0.0,
-                    "unit": str(row[4]) if len(row) > 4 and row[4] else "m2",
-                    "level": int(row[5]) if len(row) > 5 and row[5] else 0,
-                    "sort_order": int(row[6]) if len(row) > 6 and row[6] else 0,
-                }
-                db.table("wbs_items").insert(data).execute()
+            wbs_rows = self._parse_rows(wb["WBS"], "WBS", lambda row: {
+                "project_id": str(project_id),
+                "wbs_code": str(row[0]),
+                "wbs_name": str(row[1]) if len(row) > 1 and row[1] else str(row[0]),
+                "is_summary": row[2] in (True, 1, "True", "true") if len(row) > 2 and row[2] else False,
+                "qty": float(row[3]) if len(row) > 3 and row[3] else 0.0,
+                "unit": str(row[4]) if len(row) > 4 and row[4] else "m2",
+                "level": int(row[5]) if len(row) > 5 and row[5] else 0,
+                "sort_order": int(row[6]) if len(row) > 6 and row[6] else 0,
+            })
+            existing = await fetch_all(lambda: (
+                db.table("wbs_items").select("id, wbs_code").eq("project_id", str(project_id)).order("id")
+            ))
+            codes = Counter(r["wbs_code"] for r in wbs_rows)
+            taken = {r["wbs_code"] for r in existing}
+            duplicates = sorted({c for c, n in codes.items() if n > 1 or c in taken})
+            if duplicates:
+                raise DuplicateWbsCode(f"WBS codes already used: {', '.join(duplicates[:20])}")
+
+            for row_num, data in enumerate(wbs_rows):
+                await progress(0.5 * row_num / len(wbs_rows), f"Importing WBS items ({row_num}/{len(wbs_rows)})")
+                try:
+                    await db.table("wbs_items").insert(data).execute()
+                except Exception as e:
+                    if "unique" in str(e).lower():  # written concurrently since the check
+                        raise DuplicateWbsCode(f"WBS code already used: {data['wbs_code']}") from e
+                    raise
                 imported_wbs += 1
 
         # -- Allocations sheet -----------------------------------------
         if "Allocations" in wb.sheetnames:
-            ws = wb["Allocations"]
             # Build a code->id lookup from the project's current WBS items
-            wbs_resp = (
-                db.table("wbs_items")
-                .select("id, wbs_code")
-                .eq("project_id", str(project_id))
-                .execute()
-            )
-            code_map = {r["wbs_code"]: r["id"] for r in wbs_resp.data}
-
-            rows = list(ws.iter_rows(min_row=2, values_only=True))
-            for row in rows:
-                if not row or not row[0]:
-                    continue
-                wbs_ref = str(row[0])
-                wbs_item_id = code_map.get(wbs_ref, wbs_ref)  # fall back to raw id
-                alloc_data: dict[str, Any] = {
-                    "wbs_item_id": str(wbs_item_id),
+            wbs_items = await fetch_all(lambda: (
+                db.table("wbs_items").select("id, wbs_code").eq("project_id", str(project_id)).order("id")
+            ))
+            code_map = {r["wbs_code"]: r["id"] for r in wbs_items}
+
+            alloc_rows = [
+                a for a in self._parse_rows(wb["Allocations"], "Allocations", lambda row: {
+                    "wbs_item_id": str(code_map.get(str(row[0]), row[0])),  # fall back to raw id
                     "date": self._parse_date(row[1]) if len(row) > 1 and row[1] else None,
                     "planned_manpower": float(row[2]) if len(row) > 2 and row[2] else 0.0,
                     "actual_manpower": float(row[3]) if len(row) > 3 and row[3] else 0.0,
                     "qty_done": float(row[4]) if len(row) > 4 and row[4] else 0.0,
                     "notes": str(row[5]) if len(row) > 5 and row[5] else None,
-                }
-                if alloc_data["date"]:
-                    db.table("daily_allocations").upsert(
-                        alloc_data, on_conflict="wbs_item_id,date"
-                    ).execute()
-                    imported_alloc += 1
-
-        wb.close()
+                })
+                if a["date"]
+            ]
+
+            if alloc_rows:
+                await progress(0.6, f"Writing {len(alloc_rows)} allocations")
+                result = await ScheduleService().upsert_allocations(project_id, alloc_rows)
+                for err in result["errors"]:
+                    logger.warning("Allocation import failed wbs=%s date=%s: %s", err["wbs_id"], err["date"], err["error"])
+                imported_alloc = result["updated_count"]
+
+        if imported_wbs:
+            await bump_project_version(project_id)
         return {"wbs_items": imported_wbs, "allocations": imported_alloc}
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _parse_rows(ws: Any, sheet: str, parse: Callable[[tuple], dict[str, Any]]) -> list[dict[str, Any]]:
+        """``parse`` applied to every data row with a first cell; a bad cell raises InvalidWorkbook."""
+        parsed = []
+        for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            if not row or not row[0]:
+                continue
+            try:
+                parsed.append(parse(row))
+            except (ValueError, TypeError) as e:
+                raise InvalidWorkbook(f"{sheet} sheet, row {row_num}: {e}") from e
+        return parsed
+
     @staticmethod
     def _parse_date(value: Any) -> str | None:
         """Best-effort date parsing from Excel cell values."""
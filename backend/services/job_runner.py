@@ -0,0 +1,391 @@
+"""Background jobs — long operations off the request path.
+
+Baseline creation, Excel import, PDF reports and forecasts can outlast the
+proxy's 30 s request timeout. Their endpoints accept ``Prefer:
+respond-async`` (RFC 7240): instead of running the operation they hand it to
+``job_runner.submit`` and answer ``202 Accepted`` with the job row and a
+``Location: /api/v1/jobs/{id}`` to poll (routers/jobs.py).
+
+- Every job is a row in ``jobs`` (migration 015), so any API worker can
+  answer a poll. The work runs as an asyncio task in the process that
+  accepted it, which keeps the live row in memory and writes status,
+  progress (at most every ``settings.job_progress_interval_s``) and the
+  outcome through.
+- Each job type has a bounded pool (``settings.job_workers``); jobs beyond it
+  wait as ``queued``, and past ``settings.job_max_queued`` waiting jobs a
+  submit raises JobQueueFull.
+- The work callable gets a ProgressFn to report ``(fraction, message)``. It
+  returns the operation's JSON response, or a JobFile, which is stored in
+  ``job_artifacts`` (migration 016) and served by ``GET /jobs/{id}/download``
+  from any worker.
+- Exceptions fail the job with an ``{"error", "code"}`` detail; the submit's
+  ``error_codes`` map exception types to the codes the synchronous endpoint
+  would have answered with.
+
+The work itself is not persisted: a job whose process dies cannot resume.
+While a process has unfinished jobs it touches their rows every
+``settings.job_heartbeat_s`` (the jobs trigger bumps ``updated_at``). A
+queued or running job whose row is older than ``settings.job_stale_after_s``
+has lost its worker — a crash, or a redeploy that replaced the host — and
+any worker fails it when it is polled. ``recover`` (startup) fails those
+and the unfinished jobs of dead processes on this host, and deletes file
+results older than ``settings.job_retention_hours``; ``drain`` (shutdown)
+gives running jobs ``settings.job_shutdown_grace_s`` before failing them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.config import settings
+from backend.models.db import ID_CHUNK_SIZE, get_async_db
+from backend.models.schemas import JobResponse
+from backend.utils import pid_alive, safe_first
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = ("baseline", "import", "pdf", "forecast")
+
+ProgressFn = Callable[..., Awaitable[None]]
+"""``await progress(fraction, message=None)`` — fraction of the work done, 0..1."""
+
+
+async def no_progress(fraction: float, message: str | None = None) -> None:
+    """ProgressFn for synchronous calls."""
+
+
+@dataclass(frozen=True)
+class JobFile:
+    """A file result (e.g. a PDF report); the job's ``result`` keeps its name, type and size."""
+
+    content: bytes
+    filename: str
+    media_type: str
+
+
+class JobQueueFull(Exception):
+    """The job type already has settings.job_max_queued jobs waiting for its pool."""
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+class JobRunner:
+    """Per-process job executor with one bounded pool per job type."""
+
+    def __init__(self, workers: dict[str, int] | None = None):
+        self._workers = workers
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pools: dict[str, asyncio.Semaphore] = {}
+        self._waiting: dict[str, int] = {}
+        self._live: dict[str, dict[str, Any]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._heartbeat_task: asyncio.Task | None = None
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def _pool(self, job_type: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores bind to one event loop; a new loop (restarted server, tests) starts empty
+            self._loop = loop
+            self._pools.clear()
+            self._waiting.clear()
+        pool = self._pools.get(job_type)
+        if pool is None:
+            size = (self._workers if self._workers is not None else settings.job_workers).get(job_type, 1)
+            pool = self._pools[job_type] = asyncio.Semaphore(max(size, 1))
+        return pool
+
+    async def submit(
+        self,
+        job_type: str,
+        project_id: UUID | str,
+        work: Callable[[ProgressFn], Awaitable[Any]],
+        *,
+        params: dict[str, Any] | None = None,
+        error_codes: dict[type[BaseException], str] | None = None,
+    ) -> dict[str, Any]:
+        """Record a queued job and start ``work(progress)`` in the background; returns the job row.
+
+        Raises:
+            ValueError: Unknown job type.
+            JobQueueFull: Too many jobs of this type are already waiting.
+        """
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type {job_type!r}")
+        pool = self._pool(job_type)
+        if self._waiting.get(job_type, 0) >= settings.job_max_queued:
+            raise JobQueueFull(f"Too many {job_type} jobs queued, try again later")
+
+        db = get_async_db()
+        inserted = safe_first(await db.table("jobs").insert({
+            "project_id": str(project_id),
+            "job_type": job_type,
+            "status": "queued",
+            "progress": 0,
+            "params": jsonable_encoder(params or {}),
+            "worker": self.worker_id,
+        }).execute())
+        if not inserted:
+            raise ValueError("Failed to create job — insert returned no data")
+        job = dict(inserted)
+        job_id = str(job["id"])
+
+        self._live[job_id] = job
+        self._waiting[job_type] = self._waiting.get(job_type, 0) + 1
+        task = asyncio.create_task(self._run(job, pool, work, error_codes or {}))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self._start_heartbeat()
+        self.submitted += 1
+        logger.info("Job %s (%s) queued for project %s", job_id, job_type, project_id)
+        return dict(job)
+
+    async def _run(
+        self,
+        job: dict[str, Any],
+        pool: asyncio.Semaphore,
+        work: Callable[[ProgressFn], Awaitable[Any]],
+        error_codes: dict[type[BaseException], str],
+    ) -> None:
+        job_id, job_type = str(job["id"]), job["job_type"]
+        try:
+            try:
+                await pool.acquire()
+            finally:
+                self._waiting[job_type] = self._waiting.get(job_type, 1) - 1
+            try:
+                await self._write(job, {"status": "running", "started_at": _now()})
+                result = await self._keep(job_id, await work(self._reporter(job)))
+            finally:
+                pool.release()
+        except asyncio.CancelledError:
+            await self._finish(job, error={"error": "Interrupted by server shutdown", "code": "JOB_INTERRUPTED"})
+            raise
+        except Exception as e:
+            code = next((c for exc_type, c in error_codes.items() if isinstance(e, exc_type)), "JOB_FAILED")
+            logger.warning("Job %s (%s) failed: %s", job_id, job_type, e, exc_info=code == "JOB_FAILED")
+            await self._finish(job, error={"error": str(e), "code": code})
+        else:
+            await self._finish(job, result=result)
+        finally:
+            self._live.pop(job_id, None)
+
+    def _reporter(self, job: dict[str, Any]) -> ProgressFn:
+        last_write = -float("inf")
+
+        async def progress(fraction: float, message: str | None = None) -> None:
+            nonlocal last_write
+            job["progress"] = round(min(max(float(fraction), 0.0), 1.0), 4)
+            job["message"] = message
+            now = time.monotonic()
+            if now - last_write >= settings.job_progress_interval_s:
+                last_write = now
+                await self._write(job, {"progress": job["progress"], "message": message})
+
+        return progress
+
+    async def _keep(self, job_id: str, outcome: Any) -> Any:
+        """The job's stored ``result``: JSON as-is, a JobFile stored in job_artifacts."""
+        if not isinstance(outcome, JobFile):
+            return jsonable_encoder(outcome)
+        await get_async_db().table("job_artifacts").insert({
+            "job_id": job_id,
+            "filename": outcome.filename,
+            "media_type": outcome.media_type,
+            "content": base64.b64encode(outcome.content).decode("ascii"),
+        }).execute()
+        return {"filename": outcome.filename, "media_type": outcome.media_type, "size": len(outcome.content)}
+
+    def _start_heartbeat(self) -> None:
+        task = self._heartbeat_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def _heartbeat(self) -> None:
+        """While this process has unfinished jobs, touch their rows every job_heartbeat_s."""
+        while self._live:
+            await asyncio.sleep(settings.job_heartbeat_s)
+            ids = list(self._live)
+            try:
+                for i in range(0, len(ids), ID_CHUNK_SIZE):
+                    # A no-op change: trg_jobs_updated stamps updated_at
+                    await get_async_db().table("jobs").update({"worker": self.worker_id}).in_(
+                        "id", ids[i:i + ID_CHUNK_SIZE]
+                    ).execute()
+            except Exception as e:
+                logger.warning("Could not refresh the heartbeat of %d jobs: %s", len(ids), e, exc_info=True)
+
+    def _is_stale(self, row: dict[str, Any]) -> bool:
+        """An unfinished job of another process whose heartbeat is older than job_stale_after_s."""
+        if row.get("status") not in ("queued", "running") or str(row["id"]) in self._live:
+            return False
+        beat = datetime.fromisoformat(str(row["updated_at"]))
+        return datetime.now(UTC) - beat > timedelta(seconds=settings.job_stale_after_s)
+
+    async def _interrupt(self, job_id: str, reason: str) -> dict[str, Any] | None:
+        """Fail an unfinished job whose worker is gone; returns the row, None if it finished meanwhile."""
+        db = get_async_db()
+        return safe_first(await db.table("jobs").update({
+            "status": "failed",
+            "finished_at": _now(),
+            "error": {"error": reason, "code": "JOB_INTERRUPTED"},
+        }).eq("id", job_id).in_("status", ["queued", "running"]).execute())
+
+    async def _checked(self, row: dict[str, Any]) -> dict[str, Any]:
+        """``row``, failed first if its worker stopped sending heartbeats."""
+        if not self._is_stale(row):
+            return row
+        logger.warning("Job %s (%s) of %s has no heartbeat, failing it", row["id"], row["job_type"], row.get("worker"))
+        failed = await self._interrupt(str(row["id"]), "Worker stopped responding")
+        if failed is None:
+            return await self.get(row["id"]) or row
+        return failed
+
+    async def _finish(self, job: dict[str, Any], result: Any = None, error: dict[str, str] | None = None) -> None:
+        changes: dict[str, Any] = {"status": "failed" if error else "succeeded", "finished_at": _now()}
+        if error:
+            changes["error"] = error
+            self.failed += 1
+        else:
+            changes.update(progress=1, message=None, result=result)
+            self.succeeded += 1
+        await self._write(job, changes)
+
+    async def _write(self, job: dict[str, Any], changes: dict[str, Any]) -> None:
+        """Apply ``changes`` to the live row and the table; a failed write is logged, the job goes on."""
+        job.update(changes)
+        try:
+            await get_async_db().table("jobs").update(changes).eq("id", str(job["id"])).execute()
+        except Exception as e:
+            logger.warning("Could not record job %s state %s: %s", job["id"], sorted(changes), e, exc_info=True)
+
+    async def get(self, job_id: UUID | str) -> dict[str, Any] | None:
+        """Current job row; this process's running jobs come from memory (latest progress)."""
+        live = self._live.get(str(job_id))
+        if live is not None:
+            return dict(live)
+        db = get_async_db()
+        row = safe_first(await db.table("jobs").select("*").eq("id", str(job_id)).execute())
+        return await self._checked(row) if row is not None else None
+
+    async def artifact(self, job_id: UUID | str) -> JobFile | None:
+        """A job's file result, or None when it has none or it has expired."""
+        db = get_async_db()
+        row = safe_first(await (
+            db.table("job_artifacts").select("filename, media_type, content").eq("job_id", str(job_id)).execute()
+        ))
+        if row is None:
+            return None
+        return JobFile(base64.b64decode(row["content"]), row["filename"], row["media_type"])
+
+    async def list_jobs(self, project_id: UUID | str, limit: int = 20) -> list[dict[str, Any]]:
+        """A project's most recent jobs, newest first."""
+        db = get_async_db()
+        resp = await (
+            db.table("jobs")
+            .select("*")
+            .eq("project_id", str(project_id))
+            .order("created_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return [
+            dict(self._live[str(row["id"])]) if str(row["id"]) in self._live else await self._checked(row)
+            for row in resp.data
+        ]
+
+    async def recover(self) -> int:
+        """Fail unfinished jobs of dead processes on this host or without heartbeat, delete expired files.
+
+        Returns the number of jobs failed.
+        """
+        db = get_async_db()
+        resp = await (
+            db.table("jobs").select("id, status, worker, updated_at").in_("status", ["queued", "running"]).execute()
+        )
+        host = socket.gethostname()
+        failed = 0
+        for row in resp.data:
+            owner_host, _, owner_pid = (row.get("worker") or "").rpartition(":")
+            dead = owner_host == host and owner_pid.isdigit() and not pid_alive(int(owner_pid))
+            if not dead and not self._is_stale(row):
+                continue
+            if await self._interrupt(str(row["id"]), "Interrupted by server restart") is not None:
+                failed += 1
+        if failed:
+            logger.warning("Marked %d interrupted jobs as failed", failed)
+        cutoff = datetime.now(UTC) - timedelta(hours=settings.job_retention_hours)
+        await db.table("job_artifacts").delete().lte("created_at", cutoff.isoformat()).execute()
+        return failed
+
+    async def drain(self) -> None:
+        """Shutdown: wait up to job_shutdown_grace_s for running jobs, then cancel (fail) the rest."""
+        if self._tasks:
+            _, pending = await asyncio.wait(set(self._tasks), timeout=settings.job_shutdown_grace_s)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        task, self._heartbeat_task = self._heartbeat_task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        waiting = sum(self._waiting.values())
+        return {
+            "queued": waiting,
+            "running": len(self._live) - waiting,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+
+def prefers_async(request: Request) -> bool:
+    """True when the client sent ``Prefer: respond-async``."""
+    return "respond-async" in request.headers.get("prefer", "").lower()
+
+
+async def respond_async(
+    job_type: str,
+    project_id: UUID | str,
+    work: Callable[[ProgressFn], Awaitable[Any]],
+    *,
+    params: dict[str, Any] | None = None,
+    error_codes: dict[type[BaseException], str] | None = None,
+) -> JSONResponse:
+    """Submit ``work`` as a job and answer 202 with it (503 JOB_QUEUE_FULL when the pool's queue is full)."""
+    try:
+        job = await job_runner.submit(job_type, project_id, work, params=params, error_codes=error_codes)
+    except JobQueueFull as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": str(exc), "code": "JOB_QUEUE_FULL"},
+        ) from exc
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobResponse.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"/api/v1/jobs/{job['id']}", "Preference-Applied": "respond-async"},
+    )
+
+
+job_runner = JobRunner()
@@ -0,0 +1,275 @@
+"""Columnar daily matrix engine — dense NumPy arrays for the allocation grid.
+
+WBS ids and dates are mapped to integer positions once; allocations and the
+baseline plan are scattered into dense (rows x days) arrays in vectorised
+form, and totals are column sums. The IC-002 nested-dict shape is produced
+only by ``DailyMatrix.to_ic002()`` at serialization time.
+
+``resample_weeks`` folds the day axis into ISO calendar weeks (KW) with one
+``np.add.reduceat`` per array.
+
+Planned value rule (same as the original per-cell loop):
+    planned = baseline[wbs][date] if non-zero else allocation.planned_manpower
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from backend.services.baseline_engine import BaselinePlan
+
+
+@dataclass
+class DailyMatrix:
+    """Dense per-(WBS, day) arrays for one date window."""
+
+    wbs_ids: list[str]
+    start: date
+    dates: list[str]
+    planned: np.ndarray  # float64 (rows, days)
+    actual: np.ndarray  # float64 (rows, days)
+    qty_done: np.ndarray  # float64 (rows, days)
+    future_from: int  # first day index strictly after "today"
+
+    @property
+    def totals_planned(self) -> np.ndarray:
+        return self.planned.sum(axis=0)
+
+    @property
+    def totals_actual(self) -> np.ndarray:
+        return self.actual.sum(axis=0)
+
+    def to_ic002(self) -> tuple[dict[str, dict[str, dict]], dict[str, dict[str, float]]]:
+        """Return ``(matrix, totals)`` in the IC-002 DailyMatrixResponse shape."""
+        dates = self.dates
+        is_future = [i >= self.future_from for i in range(len(dates))]
+        matrix: dict[str, dict[str, dict]] = {}
+        for wbs_id, p_row, a_row, q_row in zip(
+            self.wbs_ids, self.planned.tolist(), self.actual.tolist(), self.qty_done.tolist()
+        ):
+            matrix[wbs_id] = {
+                d: {"planned": p, "actual": a, "qty_done": q, "is_future": f}
+                for d, p, a, q, f in zip(dates, p_row, a_row, q_row, is_future)
+            }
+        totals = {
+            d: {"planned": p, "actual": a}
+            for d, p, a in zip(dates, self.totals_planned.tolist(), self.totals_actual.tolist())
+        }
+        return matrix, totals
+
+    def to_sparse(self) -> dict[str, Any]:
+        """Return the IC-002 v2 body minus ``wbs_items``: only non-empty cells."""
+        nonzero = (self.planned != 0) | (self.actual != 0) | (self.qty_done != 0)
+        rows, days = np.nonzero(nonzero)
+        return {
+            "format": "v2",
+            "date_range": self.dates,
+            "future_from": self.dates[self.future_from] if self.future_from < len(self.dates) else None,
+            "cells": {
+                "row": rows.tolist(),
+                "day": days.tolist(),
+                "planned": self.planned[rows, days].tolist(),
+                "actual": self.actual[rows, days].tolist(),
+                "qty_done": self.qty_done[rows, days].tolist(),
+            },
+            "totals": {
+                "planned": self.totals_planned.tolist(),
+                "actual": self.totals_actual.tolist(),
+            },
+        }
+
+
+@dataclass
+class WeeklyMatrix:
+    """Per-(WBS, ISO week) sums of a DailyMatrix."""
+
+    wbs_ids: list[str]
+    weeks: list[dict[str, Any]]  # [{key: "2026-KW08", year, week, start, end}]
+    planned: np.ndarray  # float64 (rows, weeks)
+    actual: np.ndarray  # float64 (rows, weeks)
+    qty_done: np.ndarray  # float64 (rows, weeks)
+
+    def to_nested(self) -> tuple[dict[str, dict[str, dict]], dict[str, dict[str, float]]]:
+        """Return ``(matrix, totals)`` keyed by week key; all-zero cells are omitted."""
+        keys = [w["key"] for w in self.weeks]
+        nonzero = (self.planned != 0) | (self.actual != 0) | (self.qty_done != 0)
+        rows, cols = np.nonzero(nonzero)
+        matrix: dict[str, dict[str, dict]] = {wbs_id: {} for wbs_id in self.wbs_ids}
+        for r, c, p, a, q in zip(
+            rows.tolist(), cols.tolist(),
+            self.planned[rows, cols].tolist(), self.actual[rows, cols].tolist(), self.qty_done[rows, cols].tolist(),
+        ):
+            matrix[self.wbs_ids[r]][keys[c]] = {"planned": p, "actual": a, "qty_done": q}
+        totals = {
+            k: {"planned": p, "actual": a, "qty_done": q}
+            for k, p, a, q in zip(
+                keys,
+                self.planned.sum(axis=0).tolist(),
+                self.actual.sum(axis=0).tolist(),
+                self.qty_done.sum(axis=0).tolist(),
+            )
+        }
+        return matrix, totals
+
+
+def iso_week_window(from_date: date, to_date: date) -> tuple[date, date]:
+    """Widen [from_date, to_date] to whole ISO weeks (Monday .. Sunday)."""
+    return from_date - timedelta(days=from_date.weekday()), to_date + timedelta(days=6 - to_date.weekday())
+
+
+def week_key(monday: date) -> str:
+    """ISO week label used by the grid, e.g. ``2026-KW08``."""
+    year, week, _ = monday.isocalendar()
+    return f"{year}-KW{week:02d}"
+
+
+def bucket_starts(start: date, n_days: int, zoom: str) -> np.ndarray:
+    """Day indices where a day/week/month bucket begins (always includes 0).
+
+    Feed to ``np.<ufunc>.reduceat(arr, starts, axis=1)`` to aggregate a
+    (rows, days) array into buckets.
+    """
+    if n_days <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if zoom == "day":
+        return np.arange(n_days, dtype=np.int64)
+    days = np.datetime64(start, "D") + np.arange(n_days)
+    if zoom == "week":
+        # Day offset -> weekday (Mon=0); a new week starts at every Monday
+        is_start = (np.arange(n_days) + start.weekday()) % 7 == 0
+    elif zoom == "month":
+        is_start = days.astype("datetime64[M]") == days
+    else:
+        raise ValueError(f"Unknown zoom {zoom!r}")
+    is_start[0] = True
+    return np.flatnonzero(is_start)
+
+
+def resample_weeks(grid: DailyMatrix) -> WeeklyMatrix:
+    """Sum a DailyMatrix into ISO weeks. Partial weeks at the edges are kept as-is."""
+    n_rows, n_days = grid.planned.shape
+    if n_days == 0:
+        empty = np.zeros((n_rows, 0))
+        return WeeklyMatrix(list(grid.wbs_ids), [], empty, empty.copy(), empty.copy())
+
+    starts = bucket_starts(grid.start, n_days, "week")
+    ends = np.append(starts[1:], n_days) - 1
+
+    weeks = []
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        first = grid.start + timedelta(days=s)
+        monday = first - timedelta(days=first.weekday())
+        year, week, _ = monday.isocalendar()
+        weeks.append({
+            "key": week_key(monday),
+            "year": year,
+            "week": week,
+            "start": first.isoformat(),
+            "end": (grid.start + timedelta(days=e)).isoformat(),
+        })
+
+    return WeeklyMatrix(
+        wbs_ids=list(grid.wbs_ids),
+        weeks=weeks,
+        planned=np.add.reduceat(grid.planned, starts, axis=1),
+        actual=np.add.reduceat(grid.actual, starts, axis=1),
+        qty_done=np.add.reduceat(grid.qty_done, starts, axis=1),
+    )
+
+
+def date_positions(values: Iterable[Any], start: date) -> np.ndarray:
+    """Vectorised ISO date -> day offset from ``start`` (int64)."""
+    parsed = np.array([str(v)[:10] for v in values], dtype="datetime64[D]")
+    return (parsed - np.datetime64(start, "D")).astype(np.int64)
+
+
+def column(rows: list[dict], key: str) -> np.ndarray:
+    """Extract a numeric column as float64, treating missing/None as 0."""
+    return np.fromiter((float(r.get(key) or 0) for r in rows), dtype=np.float64, count=len(rows))
+
+
+def build_daily_matrix(
+    wbs_ids: list[str],
+    from_date: date,
+    to_date: date,
+    allocations: list[dict],
+    baseline_plan: BaselinePlan | dict[str, dict[str, float]],
+    today: date | None = None,
+) -> DailyMatrix:
+    """Fill dense planned/actual/qty arrays for ``wbs_ids`` x [from_date, to_date].
+
+    ``allocations`` are daily_allocations rows; ``baseline_plan`` is a decoded
+    BaselinePlan or ``{wbs_item_id: {date: planned_manpower}}``. Rows/dates
+    outside the grid are ignored.
+    """
+    n_rows = len(wbs_ids)
+    n_days = max((to_date - from_date).days + 1, 0)
+    row_of = {wbs_id: i for i, wbs_id in enumerate(wbs_ids)}
+    dates = np.arange(
+        np.datetime64(from_date, "D"), np.datetime64(from_date, "D") + n_days
+    ).astype(str).tolist()
+
+    planned_alloc = np.zeros((n_rows, n_days))
+    baseline = np.zeros((n_rows, n_days))
+    actual = np.zeros((n_rows, n_days))
+    qty_done = np.zeros((n_rows, n_days))
+
+    if allocations and n_days:
+        rows = np.fromiter(
+            (row_of.get(str(a["wbs_item_id"]), -1) for a in allocations), dtype=np.int64, count=len(allocations)
+        )
+        days = date_positions((a["date"] for a in allocations), from_date)
+        keep = (rows >= 0) & (days >= 0) & (days < n_days)
+        r, d = rows[keep], days[keep]
+        planned_alloc[r, d] = column(allocations, "planned_manpower")[keep]
+        actual[r, d] = column(allocations, "actual_manpower")[keep]
+        qty_done[r, d] = column(allocations, "qty_done")[keep]
+
+    if isinstance(baseline_plan, dict):
+        plan_rows: list[int] = []
+        plan_dates: list[str] = []
+        plan_values: list[float] = []
+        for wbs_id, plan in baseline_plan.items():
+            row = row_of.get(str(wbs_id))
+            if row is None or not plan:
+                continue
+            plan_rows.extend([row] * len(plan))
+            plan_dates.extend(plan.keys())
+            plan_values.extend(plan.values())
+        rows = np.asarray(plan_rows, dtype=np.int64)
+        days = date_positions(plan_dates, from_date)
+        values = np.asarray(plan_values, dtype=np.float64)
+    else:
+        row_lookup = np.fromiter(
+            (row_of.get(wbs_id, -1) for wbs_id in baseline_plan.wbs_ids), dtype=np.int64,
+            count=len(baseline_plan.wbs_ids),
+        )
+        rows = row_lookup[baseline_plan.row]
+        days = baseline_plan.day - (from_date - date(1970, 1, 1)).days
+        values = baseline_plan.value
+    if len(rows) and n_days:
+        keep = (rows >= 0) & (days >= 0) & (days < n_days)
+        baseline[rows[keep], days[keep]] = values[keep]
+
+    planned = np.where(baseline != 0, baseline, planned_alloc)
+
+    today = today or date.today()
+    future_from = int(np.clip((today - from_date).days + 1, 0, n_days))
+
+    return DailyMatrix(
+        wbs_ids=list(wbs_ids),
+        start=from_date,
+        dates=dates,
+        planned=planned,
+        actual=actual,
+        qty_done=qty_done,
+        future_from=future_from,
+    )
@@ -0,0 +1,161 @@
+"""Per-ISO-week tile cache for the daily matrix.
+
+Scrolling the grid requests overlapping ``from``/``to`` windows. Instead of
+rebuilding the whole window each time, ScheduleService._build_matrix keeps
+the dense planned/actual/qty_done arrays of every ISO week (Monday..Sunday)
+it has built as a *tile*, and only fetches the weeks it is missing. Totals
+are column sums of the assembled cells, so tiles hold cells only;
+``is_future`` depends on today and is applied at assembly time.
+
+Validity follows projects.data_version (migration 009):
+
+- A read stores tiles tagged with the version its data was read at; tiles
+  of an older version are never stored over newer ones.
+- Allocation writes from this process (upsert_allocations — grid batch
+  update, chat apply, Excel import) call ``advance`` with the dates they
+  touched and the version their bump produced. When that bump directly
+  follows the cached version only the touched weeks are dropped; otherwise
+  (someone else wrote in between) the project's tiles are dropped.
+- Any other version change — WBS edits, baselines, writes from another
+  worker — shows up as a version mismatch on the next read and drops the
+  project's tiles.
+
+Without versions (migration 009 not applied) nothing is cached.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from uuid import UUID
+
+import numpy as np
+
+from backend.config import settings
+from backend.services.matrix_engine import DailyMatrix, iso_week_window
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MatrixTile:
+    """One ISO week of dense cells (rows x 7 days)."""
+
+    wbs_ids: tuple[str, ...]
+    planned: np.ndarray
+    actual: np.ndarray
+    qty_done: np.ndarray
+
+
+def week_mondays(from_date: date, to_date: date) -> list[date]:
+    """Mondays of the ISO weeks overlapping [from_date, to_date]."""
+    first, last = iso_week_window(from_date, to_date)
+    return [first + timedelta(weeks=i) for i in range(((last - first).days + 1) // 7)]
+
+
+def split_tiles(grid: DailyMatrix) -> dict[date, MatrixTile]:
+    """Cut a grid that starts on a Monday and spans whole weeks into tiles."""
+    wbs_ids = tuple(grid.wbs_ids)
+    tiles = {}
+    for offset in range(0, len(grid.dates), 7):
+        cols = slice(offset, offset + 7)
+        tiles[grid.start + timedelta(days=offset)] = MatrixTile(
+            wbs_ids, grid.planned[:, cols].copy(), grid.actual[:, cols].copy(), grid.qty_done[:, cols].copy()
+        )
+    return tiles
+
+
+def assemble(
+    tiles: list[MatrixTile], first_monday: date, from_date: date, to_date: date, today: date
+) -> DailyMatrix:
+    """Concatenate consecutive week tiles and clip them to [from_date, to_date]."""
+    cols = slice((from_date - first_monday).days, (to_date - first_monday).days + 1)
+    n_days = (to_date - from_date).days + 1
+    return DailyMatrix(
+        wbs_ids=list(tiles[0].wbs_ids),
+        start=from_date,
+        dates=[(from_date + timedelta(days=i)).isoformat() for i in range(n_days)],
+        planned=np.concatenate([t.planned for t in tiles], axis=1)[:, cols],
+        actual=np.concatenate([t.actual for t in tiles], axis=1)[:, cols],
+        qty_done=np.concatenate([t.qty_done for t in tiles], axis=1)[:, cols],
+        future_from=int(np.clip((today - from_date).days + 1, 0, n_days)),
+    )
+
+
+class MatrixTileCache:
+    """LRU of MatrixTile keyed by (project, week Monday), version-checked per project."""
+
+    def __init__(self, max_tiles: int | None = None):
+        self._max_tiles = max_tiles
+        self._tiles: OrderedDict[tuple[str, date], MatrixTile] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_tiles(self) -> int:
+        return self._max_tiles if self._max_tiles is not None else settings.matrix_tile_cache_size
+
+    def lookup(self, project_id: UUID | str, mondays: list[date]) -> tuple[int | None, dict[date, MatrixTile]]:
+        """Cached tiles among ``mondays`` and the version they belong to.
+
+        Counts one hit or miss per requested week.
+        """
+        pid = str(project_id)
+        found = {}
+        for monday in mondays:
+            tile = self._tiles.get((pid, monday))
+            if tile is not None:
+                self._tiles.move_to_end((pid, monday))
+                found[monday] = tile
+        self.hits += len(found)
+        self.misses += len(mondays) - len(found)
+        return self._versions.get(pid), found
+
+    def store(self, project_id: UUID | str, version: int | None, tiles: dict[date, MatrixTile]) -> None:
+        """Keep tiles read at ``version``; a newer version drops the project's older tiles."""
+        if version is None:
+            return
+        pid = str(project_id)
+        current = self._versions.get(pid)
+        if current is not None and version < current:
+            return  # read raced with a newer write
+        if current != version:
+            self.invalidate(pid)
+            self._versions[pid] = version
+        for monday, tile in tiles.items():
+            self._tiles[(pid, monday)] = tile
+            self._tiles.move_to_end((pid, monday))
+        while len(self._tiles) > self.max_tiles:
+            (evicted_pid, evicted_week), _ = self._tiles.popitem(last=False)
+            logger.debug("Matrix tile cache evicted %s week %s", evicted_pid, evicted_week)
+
+    def advance(self, project_id: UUID | str, dates: Iterable[str], version: int | None) -> None:
+        """Account for an allocation write on ``dates`` that bumped the project to ``version``."""
+        pid = str(project_id)
+        if version is None or self._versions.get(pid) != version - 1:
+            self.invalidate(pid)
+            return
+        for day in {date.fromisoformat(str(d)[:10]) for d in dates}:
+            self._tiles.pop((pid, day - timedelta(days=day.weekday())), None)
+        self._versions[pid] = version
+
+    def invalidate(self, project_id: UUID | str | None = None) -> None:
+        """Drop one project's tiles, or everything."""
+        if project_id is None:
+            self._tiles.clear()
+            self._versions.clear()
+            return
+        pid = str(project_id)
+        self._versions.pop(pid, None)
+        for key in [k for k in self._tiles if k[0] == pid]:
+            del self._tiles[key]
+
+    def stats(self) -> dict[str, int]:
+        return {"tiles": len(self._tiles), "max_tiles": self.max_tiles, "hits": self.hits, "misses": self.misses}
+
+
+matrix_tiles = MatrixTileCache()
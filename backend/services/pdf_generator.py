@@ -5,13 +5,17 @@ Generates HTML tables styled for A3 landscape, then converts to PDF.
 
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
 from datetime import date, datetime, timezone
 from typing import Any, BinaryIO
 from uuid import UUID
 
-from backend.models.db import get_db
+from backend.services.compute_engine import weighted_progress
+from backend.services.job_runner import ProgressFn, no_progress
+from backend.services.project_snapshot import get_project_snapshot
+from backend.services.rollup_engine import rollup_progress
 
 logger = logging.getLogger(__name__)
 
@@ -19,143 +23,95 @@ logger = logging.getLogger(__name__)
 class PDFGenerator:
     """Generates PDF reports from project data."""
 
-    def generate_daily_report(self, project_id: UUID) -> tuple[BinaryIO, str]:
+    async def generate_daily_report(
+        self, project_id: UUID, progress: ProgressFn = no_progress
+    ) -> tuple[BinaryIO, str]:
         """Generate a daily allocation report as PDF.
 
         Returns (stream, filename).
         """
-        db = get_db()
-
-        project_resp = db.table("projects").select("*").eq("id", str(project_id)).execute()
-        if not project_resp.data:
-            raise ValueError(f"Project {project_id} not found")
-        project = project_resp.data[0]
-
-        wbs_items = (
-            db.table("wbs_items")
-            .select("*")
-            .eq("project_id", str(project_id))
-            .order("sort_order")
-            .execute()
-            .data
-        )
+        await progress(0.0, "Loading project")
+        snapshot = await get_project_snapshot(project_id)
+        project = snapshot.project
+        wbs_items = snapshot.wbs_items
+        alloc_by_wbs = snapshot.by_wbs
 
-        wbs_ids = [w["id"] for w in wbs_items]
-        allocations = []
-        if wbs_ids:
-            allocations = (
-                db.table("daily_allocations")
-                .select("*")
-                .in_("wbs_item_id", wbs_ids)
-                .order("date")
-                .execute()
-                .data
-            )
-
-        # Group allocations by wbs_item_id
-        alloc_by_wbs: dict[str, list[dict]] = {}
-        all_dates: set[str] = set()
-        for a in allocations:
-            wbs_id = a["wbs_item_id"]
-            alloc_by_wbs.setdefault(wbs_id, []).append(a)
-            all_dates.add(a["date"])
-
-        sorted_dates = sorted(all_dates)
+        sorted_dates = sorted(snapshot.by_date)
         # Limit to most recent 14 days for readability
         if len(sorted_dates) > 14:
             sorted_dates = sorted_dates[-14:]
 
         html = self._build_daily_html(project, wbs_items, alloc_by_wbs, sorted_dates)
-        pdf_bytes = self._html_to_pdf(html)
+        await progress(0.3, "Rendering PDF")
+        # xhtml2pdf is CPU-bound: keep it off the event loop
+        pdf_bytes = await asyncio.to_thread(self._html_to_pdf, html)
 
         stream = io.BytesIO(pdf_bytes)
         safe_name = project["name"].replace(" ", "_")[:40]
         filename = f"{safe_name}_daily_report_{date.today().isoformat()}.pdf"
         return stream, filename
 
-    def generate_progress_report(self, project_id: UUID) -> tuple[BinaryIO, str]:
+    async def generate_progress_report(
+        self, project_id: UUID, progress: ProgressFn = no_progress
+    ) -> tuple[BinaryIO, str]:
         """Generate a progress summary report as PDF.
 
-        Includes KPIs, risk items, and progress overview.
+        Includes KPIs, risk items, and progress overview. Summary rows show
+        their subtree totals; KPIs and rankings use leaf items only.
         """
-        db = get_db()
-
-        project_resp = db.table("projects").select("*").eq("id", str(project_id)).execute()
-        if not project_resp.data:
-            raise ValueError(f"Project {project_id} not found")
-        project = project_resp.data[0]
-
-        # Get progress view data
-        try:
-            progress_data = db.table("vw_wbs_progress").select("*").eq("project_id", str(project_id)).execute().data
-        except Exception:
-            progress_data = []
-
-        # Get WBS items with allocation summaries
-        wbs_items = (
-            db.table("wbs_items")
-            .select("*")
-            .eq("project_id", str(project_id))
-            .order("sort_order")
-            .execute()
-            .data
-        )
-
-        wbs_ids = [w["id"] for w in wbs_items]
-        allocations = []
-        if wbs_ids:
-            allocations = (
-                db.table("daily_allocations")
-                .select("wbs_item_id, actual_manpower, qty_done")
-                .in_("wbs_item_id", wbs_ids)
-                .execute()
-                .data
-            )
-
-        # Compute per-WBS summaries
-        wbs_summary = []
-        total_qty = 0.0
-        total_done = 0.0
-        total_mandays = 0.0
-
-        alloc_by_wbs: dict[str, list[dict]] = {}
-        for a in allocations:
-            alloc_by_wbs.setdefault(a["wbs_item_id"], []).append(a)
-
+        await progress(0.0, "Loading project")
+        snapshot = await get_project_snapshot(project_id)
+        project = snapshot.project
+        wbs_items = snapshot.wbs_items
+        alloc_by_wbs = snapshot.by_wbs
+
+        # Per-WBS totals, summary rows rolled up from their descendants
+        rows = []
         for wbs in wbs_items:
-            if wbs.get("is_summary"):
-                continue
             qty = float(wbs.get("qty", 0))
             wbs_allocs = alloc_by_wbs.get(wbs["id"], [])
             done = sum(float(a.get("qty_done", 0)) for a in wbs_allocs)
-            mandays = sum(float(a.get("actual_manpower", 0)) for a in wbs_allocs)
-            progress = min(100, (done / qty * 100)) if qty > 0 else 0
-
-            total_qty += qty
-            total_done += done
-            total_mandays += mandays
+            rows.append({
+                "id": wbs["id"],
+                "parent_id": wbs.get("parent_id"),
+                "is_summary": wbs.get("is_summary", False),
+                "qty": qty,
+                "done": done,
+                "remaining": qty - done,
+                "progress_pct": min(100, (done / qty * 100)) if qty > 0 else 0,
+                "total_actual_manday": sum(float(a.get("actual_manpower", 0)) for a in wbs_allocs),
+            })
 
+        wbs_summary = []
+        for wbs, row in zip(wbs_items, rollup_progress(rows)):
+            pct = row["progress_pct"]
+            mandays = row["total_actual_manday"]
             wbs_summary.append({
                 "code": wbs["wbs_code"],
                 "name": wbs["wbs_name"],
-                "qty": qty,
-                "done": done,
+                "is_summary": bool(row["is_summary"]),
+                "qty": row["qty"],
+                "done": row["done"],
                 "unit": wbs.get("unit", ""),
-                "progress": round(progress, 1),
+                "progress": round(pct, 1),
                 "mandays": round(mandays, 1),
-                "risk": "high" if progress < 20 and mandays > 10 else ("medium" if progress < 50 else "low"),
+                "risk": "high" if pct < 20 and mandays > 10 else ("medium" if pct < 50 else "low"),
             })
 
-        overall_progress = min(100, (total_done / total_qty * 100)) if total_qty > 0 else 0
+        leaves = [r for r in rows if not r["is_summary"]]
+        overall_progress = weighted_progress(leaves)
+        total_mandays = sum(r["total_actual_manday"] for r in leaves)
 
-        # Sort for top risk and top progress
-        risk_items = sorted([w for w in wbs_summary if w["risk"] in ("high", "medium")], key=lambda x: x["progress"])[:5]
-        top_items = sorted(wbs_summary, key=lambda x: -x["progress"])[:5]
+        # Sort for top risk and top progress (leaf items only)
+        leaf_summary = [w for w in wbs_summary if not w["is_summary"]]
+        risk_items = sorted([w for w in leaf_summary if w["risk"] in ("high", "medium")], key=lambda x: x["progress"])[:5]
+        top_items = sorted(leaf_summary, key=lambda x: -x["progress"])[:5]
 
         html = self._build_progress_html(
             project, wbs_summary, overall_progress, total_mandays, risk_items, top_items,
         )
-        pdf_bytes = self._html_to_pdf(html)
+        await progress(0.3, "Rendering PDF")
+        pdf_bytes = await asyncio.to_thread(self._html_to_pdf, html)
 
         stream = io.BytesIO(pdf_bytes)
         safe_name = project["name"].replace(" ", "_")[:40]
@@ -246,9 +202,10 @@ th {{ background: #2563eb; color: white; font-size: 8px; text-align: center; }}
     ) -> str:
         """Build HTML for the progress summary report."""
         # KPI section
-        total_items = len(wbs_summary)
-        high_risk = sum(1 for w in wbs_summary if w["risk"] == "high")
-        med_risk = sum(1 for w in wbs_summary if w["risk"] == "medium")
+        leaf_summary = [w for w in wbs_summary if not w["is_summary"]]
+        total_items = len(leaf_summary)
+        high_risk = sum(1 for w in leaf_summary if w["risk"] == "high")
+        med_risk = sum(1 for w in leaf_summary if w["risk"] == "medium")
 
         # Risk table
         risk_rows = ""
@@ -274,7 +231,8 @@ th {{ background: #2563eb; color: white; font-size: 8px; text-align: center; }}
         for w in wbs_summary:
             bar_width = min(100, w["progress"])
             bar_color = "#dc2626" if w["risk"] == "high" else ("#f59e0b" if w["risk"] == "medium" else "#22c55e")
-            wbs_rows += f"""<tr>
+            row_class = "summary-row" if w["is_summary"] else ""
+            wbs_rows += f"""<tr class="{row_class}">
                 <td>{w["code"]}</td><td>{w["name"]}</td>
                 <td class="num">{w["qty"]}</td>
                 <td class="num">{w["done"]}</td>
@@ -306,6 +264,7 @@ table {{ border-collapse: collapse; width: 100%; margin-bottom: 12px; }}
 th, td {{ border: 1px solid #ddd; padding: 4px 8px; }}
 th {{ background: #2563eb; color: white; font-size: 9px; }}
 .num {{ text-align: center; }}
+.summary-row {{ background: #f0f4ff; font-weight: bold; }}
 .footer {{ margin-top: 16px; font-size: 8px; color: #94a3b8; text-align: center; }}
 </style>
 </head>
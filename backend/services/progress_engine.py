@@ -0,0 +1,74 @@
+"""Per-WBS progress aggregation — the vw_wbs_progress view in NumPy.
+
+Used when the view is unavailable: one pass over a project's allocations
+groups qty_done, actual_manpower and worked dates by WBS row with
+``np.bincount`` / ``ufunc.at`` instead of one query per item. Output rows
+have the view's columns and formulas (no clamping of remaining or
+progress_pct), so callers can use either source interchangeably.
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+from backend.services.matrix_engine import column, date_positions
+
+_EPOCH = date(1970, 1, 1)
+
+
+def wbs_progress(wbs_items: list[dict], allocations: list[dict]) -> list[dict[str, Any]]:
+    """vw_wbs_progress rows for ``wbs_items`` (same order) from their allocations.
+
+    Allocations for WBS ids not in ``wbs_items`` are ignored.
+    """
+    n_rows = len(wbs_items)
+    row_of = {str(w["id"]): i for i, w in enumerate(wbs_items)}
+    rows = np.fromiter(
+        (row_of.get(str(a["wbs_item_id"]), -1) for a in allocations), dtype=np.int64, count=len(allocations)
+    )
+    keep = rows >= 0
+    rows = rows[keep]
+    qty_done = column(allocations, "qty_done")[keep]
+    actual = column(allocations, "actual_manpower")[keep]
+    days = date_positions((a["date"] for a in allocations), _EPOCH)[keep]
+
+    done = np.bincount(rows, weights=qty_done, minlength=n_rows)
+    manday = np.bincount(rows, weights=actual, minlength=n_rows)
+
+    # Working days: distinct dates with actual_manpower > 0
+    worked = actual > 0
+    worked_rows, worked_days = rows[worked], days[worked]
+    distinct = np.unique(np.stack([worked_rows, worked_days], axis=1), axis=0)
+    working_days = np.bincount(distinct[:, 0], minlength=n_rows)
+    first = np.full(n_rows, np.iinfo(np.int64).max)
+    last = np.full(n_rows, np.iinfo(np.int64).min)
+    np.minimum.at(first, worked_rows, worked_days)
+    np.maximum.at(last, worked_rows, worked_days)
+    has_worked = working_days > 0
+
+    out = []
+    for i, w in enumerate(wbs_items):
+        qty = float(w.get("qty") or 0)
+        d = float(done[i])
+        m = float(manday[i])
+        out.append({
+            "id": w["id"], "project_id": w.get("project_id"), "wbs_code": w["wbs_code"],
+            "wbs_name": w["wbs_name"], "qty": qty, "unit": w.get("unit"),
+            "sort_order": w.get("sort_order"), "level": w.get("level"), "is_summary": w.get("is_summary"),
+            "done": d,
+            "remaining": qty - d,
+            "progress_pct": round(d / qty * 100, 1) if qty > 0 else 0,
+            "total_actual_manday": m,
+            "working_days": int(working_days[i]),
+            "productivity_rate": round(d / m, 3) if m > 0 else 0,
+            "first_working_day": (_EPOCH + timedelta(days=int(first[i]))).isoformat() if has_worked[i] else None,
+            "last_working_day": (_EPOCH + timedelta(days=int(last[i]))).isoformat() if has_worked[i] else None,
+            "parent_id": w.get("parent_id"),
+        })
+    return out
+
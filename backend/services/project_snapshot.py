@@ -0,0 +1,184 @@
+"""Project data snapshot cache — project + WBS items + all allocations.
+
+Forecast, optimizer, report, digest, PDF and Excel export all need the same
+three reads, plus the project's working-day calendar. ``get_project_snapshot``
+loads them once per project version and serves every caller from an
+in-process LRU (settings.snapshot_cache_size projects).
+
+An entry is valid only while projects.data_version matches the version it was
+loaded at, so writes from any worker invalidate it; writes from this worker
+also drop it immediately via project_version.on_bump. Concurrent misses for
+the same project share one load. When versions are unavailable (migration
+009 not applied) snapshots are loaded fresh on every call.
+
+Snapshots are shared between requests — treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from backend.config import settings
+from backend.models.db import fetch_all, fetch_all_in, get_async_db
+from backend.services.calendar_engine import WorkCalendar
+from backend.services.calendar_service import build_calendar, fetch_calendar_row
+from backend.services.project_version import get_project_version, on_bump
+from backend.services.write_buffer import allocation_buffer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProjectSnapshot:
+    """One project's rows at a given data_version, with lookup indexes."""
+
+    project: dict[str, Any]
+    wbs_items: list[dict[str, Any]]  # ordered by sort_order
+    allocations: list[dict[str, Any]]  # ordered by date
+    version: int | None = None
+    calendar: WorkCalendar | None = None
+    wbs_by_id: dict[str, dict[str, Any]] = field(default_factory=dict)
+    by_wbs: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    by_date: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.wbs_by_id = {str(w["id"]): w for w in self.wbs_items}
+        for a in self.allocations:
+            self.by_wbs.setdefault(str(a["wbs_item_id"]), []).append(a)
+            self.by_date.setdefault(str(a["date"])[:10], []).append(a)
+
+    @property
+    def wbs_ids(self) -> list[str]:
+        return list(self.wbs_by_id)
+
+    def allocations_for(self, wbs_id: str) -> list[dict[str, Any]]:
+        """Allocations of one WBS item, in date order."""
+        return self.by_wbs.get(str(wbs_id), [])
+
+    def allocations_on(self, day: str) -> list[dict[str, Any]]:
+        """Allocations of all WBS items on one ISO date."""
+        return self.by_date.get(day, [])
+
+
+class ProjectSnapshotCache:
+    """Version-checked LRU of ProjectSnapshot, keyed by project id."""
+
+    def __init__(self, max_projects: int | None = None):
+        self._max_projects = max_projects
+        self._entries: OrderedDict[str, ProjectSnapshot] = OrderedDict()
+        self._inflight: dict[tuple[str, int | None], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_projects(self) -> int:
+        return self._max_projects if self._max_projects is not None else settings.snapshot_cache_size
+
+    async def get(self, project_id: UUID | str) -> ProjectSnapshot:
+        """Return the current snapshot; raises ValueError if the project does not exist."""
+        pid = str(project_id)
+        await allocation_buffer.flush(pid)
+        version = await get_project_version(pid)
+
+        cached = self._entries.get(pid)
+        if cached is not None and version is not None and cached.version == version:
+            self._entries.move_to_end(pid)
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        key = (pid, version)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await pending
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            snapshot = await _load_snapshot(pid, version)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(snapshot)
+            if version is not None:
+                self._store(pid, snapshot)
+            return snapshot
+        finally:
+            del self._inflight[key]
+
+    def invalidate(self, project_id: UUID | str | None = None) -> None:
+        """Drop one project's snapshot, or all of them."""
+        if project_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(str(project_id), None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "projects": len(self._entries),
+            "max_projects": self.max_projects,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _store(self, pid: str, snapshot: ProjectSnapshot) -> None:
+        self._entries[pid] = snapshot
+        self._entries.move_to_end(pid)
+        while len(self._entries) > self.max_projects:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug("Snapshot cache evicted project %s", evicted)
+
+
+async def _fetch_wbs_items(project_id: str) -> list[dict[str, Any]]:
+    """The project's WBS items in sort_order (paged read)."""
+    db = get_async_db()
+    rows = await fetch_all(lambda: db.table("wbs_items").select("*").eq("project_id", project_id).order("id"))
+    # Pages are ordered by id; NULL sort_order last, as ORDER BY sort_order puts it
+    return sorted(rows, key=lambda w: (w.get("sort_order") is None, w.get("sort_order") or 0))
+
+
+async def _fetch_allocations(wbs_ids: list[str]) -> list[dict[str, Any]]:
+    """All allocations of ``wbs_ids`` in date order (paged, id-chunked read)."""
+    db = get_async_db()
+    rows = await fetch_all_in(wbs_ids, lambda ids: (
+        db.table("daily_allocations").select("*").in_("wbs_item_id", ids).order("id")
+    ))
+    # Pages are ordered by id (stable across requests); callers expect date order
+    return sorted(rows, key=lambda a: str(a["date"]))
+
+
+async def _load_snapshot(project_id: str, version: int | None) -> ProjectSnapshot:
+    db = get_async_db()
+    project_resp, wbs_items, calendar_row = await asyncio.gather(
+        db.table("projects").select("*").eq("id", project_id).execute(),
+        _fetch_wbs_items(project_id),
+        fetch_calendar_row(project_id),
+    )
+    if not project_resp.data:
+        raise ValueError(f"Project {project_id} not found")
+
+    allocations = await _fetch_allocations([w["id"] for w in wbs_items])
+
+    return ProjectSnapshot(
+        project=project_resp.data[0],
+        wbs_items=wbs_items,
+        allocations=allocations,
+        version=version,
+        calendar=build_calendar(project_resp.data[0], calendar_row),
+    )
+
+
+snapshot_cache = ProjectSnapshotCache()
+on_bump(snapshot_cache.invalidate)
+
+
+async def get_project_snapshot(project_id: UUID | str) -> ProjectSnapshot:
+    """Shared project snapshot — see module docstring."""
+    return await snapshot_cache.get(project_id)
@@ -0,0 +1,124 @@
+"""Per-project change version and conditional GET (ETag / If-None-Match).
+
+projects.data_version (migration 009) is bumped through fn_bump_project_version
+by every mutation path: allocation upserts (grid, chat apply, Excel import),
+WBS create/update/import and baseline creation. Read endpoints build a strong
+ETag from it plus their request parameters and return 304 when the client
+already holds that representation — one primary-key lookup instead of the
+full recompute.
+
+The version lives in the database rather than in-process so all uvicorn
+workers agree on it. If migration 009 is not applied, versions are reported
+as unavailable and endpoints simply skip the ETag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+from fastapi import Request, Response, status
+
+from backend.models.db import get_async_db
+from backend.services.write_buffer import allocation_buffer
+
+logger = logging.getLogger(__name__)
+
+# Set to False once the data_version column / bump function is found missing
+_version_available = True
+
+# In-process caches register here to drop their entry for a project on bump
+_bump_listeners: list[Callable[[str], None]] = []
+
+
+def on_bump(listener: Callable[[str], None]) -> None:
+    """Call ``listener(project_id)`` whenever this process bumps a project's version."""
+    _bump_listeners.append(listener)
+
+
+def _is_missing_schema(exc: Exception) -> bool:
+    msg = str(exc)
+    return any(s in msg for s in ("PGRST202", "42703", "data_version", "Could not find the function"))
+
+
+async def get_project_version(project_id: UUID | str) -> int | None:
+    """Current data_version of a project, or None if unknown/unavailable."""
+    global _version_available
+    if not _version_available:
+        return None
+    db = get_async_db()
+    try:
+        resp = await db.table("projects").select("id, data_version").eq("id", str(project_id)).execute()
+    except Exception as e:
+        if _is_missing_schema(e):
+            _version_available = False
+        logger.warning("Project version lookup failed, skipping ETag: %s", e, exc_info=_version_available)
+        return None
+    if not resp.data:
+        return None
+    return int(resp.data[0].get("data_version") or 0)
+
+
+async def bump_project_version(project_id: UUID | str) -> int | None:
+    """Invalidate cached representations of a project after a write.
+
+    Returns the new data_version, or None when it is unavailable.
+    Best-effort: the write has already happened, so failures are only logged.
+    """
+    global _version_available
+    for listener in _bump_listeners:
+        listener(str(project_id))
+    if not _version_available:
+        return None
+    db = get_async_db()
+    try:
+        resp = await db.rpc("fn_bump_project_version", {"p_project_id": str(project_id)}).execute()
+    except Exception as e:
+        if _is_missing_schema(e):
+            _version_available = False
+        logger.warning("Project version bump failed for %s: %s", project_id, e, exc_info=_version_available)
+        return None
+    return int(resp.data) if resp.data is not None else None
+
+
+async def project_etag(project_id: UUID | str, *parts: Any) -> str | None:
+    """Strong ETag for a project-scoped representation (``parts`` = endpoint + params)."""
+    version = await get_project_version(project_id)
+    if version is None:
+        return None
+    key = ":".join(str(p) for p in (project_id, version, *parts))
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:24] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match covers ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def conditional_get(
+    request: Request, response: Response, project_id: UUID | str, *parts: Any
+) -> Response | None:
+    """Run the ETag check for a read endpoint.
+
+    Returns a 304 response when the client's copy is current; otherwise sets
+    ETag/Cache-Control on ``response`` and returns None so the handler proceeds.
+    The version is read before the data, so a concurrent write can only make
+    the ETag older than the body, never newer.
+    """
+    # Pending buffered edits would otherwise surface as a 304 of the old version
+    await allocation_buffer.flush(project_id)
+    etag = await project_etag(project_id, *parts)
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,150 @@
+"""WBS hierarchy roll-up engine — summary rows from their descendants.
+
+vw_wbs_progress (and the _compute_progress fallback) aggregate only the
+allocations attached directly to each WBS row, so summary items show zero.
+``rollup_progress`` builds the ``parent_id`` tree once and folds every row into
+its ancestors level by level, deepest first — each level is one
+``ufunc.at`` call, so the whole tree is a single post-order pass with no
+per-node queries.
+
+Rolled-up fields for rows that have descendants:
+- done, remaining, total_actual_manday: subtree sums (own row included)
+- progress_pct: qty-weighted over non-summary items in the subtree
+  (compute_engine.weighted_progress semantics)
+- productivity_rate: done / total_actual_manday
+- first_working_day / last_working_day: subtree min / max
+- working_days: subtree max — distinct days are not recoverable from
+  per-row counts, so this is a lower bound bracketed by first/last
+
+Rows without descendants are returned unchanged.
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from backend.services.compute_engine import calculate_productivity_rate
+
+
+def tree_levels(wbs_items: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(parent_index, depth)`` arrays; parent_index is -1 for roots.
+
+    Parents that are not in ``wbs_items`` (or form a cycle) make the row a root.
+    """
+    row_of = {str(w["id"]): i for i, w in enumerate(wbs_items)}
+    parent = np.array(
+        [row_of.get(str(w.get("parent_id")), -1) if w.get("parent_id") else -1 for w in wbs_items],
+        dtype=np.int64,
+    )
+    depth = np.full(len(wbs_items), -1, dtype=np.int64)
+    for i in range(len(wbs_items)):
+        path: list[int] = []
+        seen: set[int] = set()
+        node = i
+        while node != -1 and depth[node] == -1 and node not in seen:
+            path.append(node)
+            seen.add(node)
+            node = int(parent[node])
+        if node in seen:  # cycle: the repeated node becomes a root
+            parent[node] = -1
+            path = path[: path.index(node) + 1]
+            node = -1
+        base = -1 if node == -1 else int(depth[node])
+        for offset, n in enumerate(reversed(path), start=1):
+            depth[n] = base + offset
+    return parent, depth
+
+
+def rollup_rows(values: np.ndarray, parent: np.ndarray, depth: np.ndarray, ufunc: np.ufunc) -> np.ndarray:
+    """Fold each row into its ancestors, deepest level first (one ``ufunc.at`` per level)."""
+    out = values.copy()
+    for d in range(int(depth.max(initial=0)), 0, -1):
+        nodes = np.flatnonzero((depth == d) & (parent >= 0))
+        if nodes.size:
+            ufunc.at(out, parent[nodes], out[nodes])
+    return out
+
+
+def subtree_progress(
+    qty: np.ndarray, done: np.ndarray, is_summary: np.ndarray, parent: np.ndarray, depth: np.ndarray
+) -> np.ndarray:
+    """Qty-weighted progress % of each row's subtree (non-summary items with qty > 0)."""
+    leaf_qty = np.where(~is_summary & (qty > 0), qty, 0.0)
+    leaf_weighted = np.where(leaf_qty > 0, np.minimum(done / np.where(qty > 0, qty, 1.0), 1.0) * leaf_qty, 0.0)
+    sub_qty = rollup_rows(leaf_qty, parent, depth, np.add)
+    sub_weighted = rollup_rows(leaf_weighted, parent, depth, np.add)
+    pct = np.divide(sub_weighted, sub_qty, out=np.zeros_like(sub_qty), where=sub_qty > 0) * 100
+    return np.round(pct, 1)
+
+
+def _float_column(rows: list[dict], key: str) -> np.ndarray:
+    return np.fromiter((float(r.get(key) or 0) for r in rows), dtype=np.float64, count=len(rows))
+
+
+def _day_column(rows: list[dict], key: str, missing: float) -> np.ndarray:
+    """ISO date column as day ordinals; None becomes ``missing`` (±inf)."""
+    return np.fromiter(
+        (date.fromisoformat(str(r[key])[:10]).toordinal() if r.get(key) else missing for r in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+
+
+def _ordinal_to_iso(value: float) -> str | None:
+    return date.fromordinal(int(value)).isoformat() if np.isfinite(value) else None
+
+
+def rollup_progress(rows: list[dict], wbs_items: list[dict] | None = None) -> list[dict[str, Any]]:
+    """Return ``rows`` (vw_wbs_progress shape) with ancestors rolled up.
+
+    The tree comes from ``wbs_items`` (id, parent_id, is_summary) when given,
+    otherwise from ``parent_id``/``is_summary`` on the rows themselves. Rows
+    keep their order; input dicts are not mutated.
+    """
+    if not rows:
+        return []
+    if wbs_items is not None:
+        info = {str(w["id"]): w for w in wbs_items}
+        tree = [{**info.get(str(r["id"]), {}), "id": r["id"]} for r in rows]
+    else:
+        tree = rows
+
+    parent, depth = tree_levels(tree)
+    has_children = np.zeros(len(rows), dtype=bool)
+    has_children[parent[parent >= 0]] = True
+    if not has_children.any():
+        return [dict(r) for r in rows]
+
+    is_summary = np.array([bool(t.get("is_summary")) for t in tree], dtype=bool)
+    qty = _float_column(rows, "qty")
+    done = _float_column(rows, "done")
+
+    sub_done = rollup_rows(done, parent, depth, np.add)
+    sub_remaining = rollup_rows(_float_column(rows, "remaining"), parent, depth, np.add)
+    sub_manday = rollup_rows(_float_column(rows, "total_actual_manday"), parent, depth, np.add)
+    sub_days = rollup_rows(_float_column(rows, "working_days"), parent, depth, np.maximum)
+    sub_first = rollup_rows(_day_column(rows, "first_working_day", np.inf), parent, depth, np.minimum)
+    sub_last = rollup_rows(_day_column(rows, "last_working_day", -np.inf), parent, depth, np.maximum)
+    progress = subtree_progress(qty, done, is_summary, parent, depth)
+
+    out = []
+    for i, row in enumerate(rows):
+        row = dict(row)
+        if has_children[i]:
+            row.update({
+                "done": round(float(sub_done[i]), 3),
+                "remaining": round(float(sub_remaining[i]), 3),
+                "progress_pct": float(progress[i]),
+                "total_actual_manday": round(float(sub_manday[i]), 2),
+                "working_days": int(sub_days[i]),
+                "productivity_rate": calculate_productivity_rate(float(sub_done[i]), float(sub_manday[i])),
+                "first_working_day": _ordinal_to_iso(sub_first[i]),
+                "last_working_day": _ordinal_to_iso(sub_last[i]),
+            })
+        out.append(row)
+    return out
@@ -6,7 +6,7 @@ Table names match the DB schema exactly:
 - daily_allocations (columns: wbs_item_id, date, planned_manpower, actual_manpower, qty_done, notes, source)
 
 DailyMatrixResponse matches IC-002:
-- wbs_items: list[WBSProgress] from vw_wbs_progress
+- wbs_items: list[WBSProgress] from vw_wbs_progress, summary rows rolled up
 - date_range: list[str] of YYYY-MM-DD
 - matrix: {wbs_id: {date: {planned, actual, qty_done, is_future}}}
 - totals: {date: {planned, actual}}
@@ -14,17 +14,36 @@ DailyMatrixResponse matches IC-002:
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import date, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 from uuid import UUID
 
-from backend.models.db import get_db
-from backend.models.schemas import AllocationBatchUpdate, ProjectCreate, WBSItemCreate, WBSItemUpdate
+from backend.config import settings
+from backend.models.db import fetch_all_in, fetch_first_in, get_async_db
+from backend.models.schemas import AllocationBatchUpdate, AllocationCell, ProjectCreate, WBSItemCreate, WBSItemUpdate
+from backend.services.baseline_cache import baseline_cache
+from backend.services.baseline_engine import decode_plans
+from backend.services.change_stream import change_broker
+from backend.services.gantt_engine import build_gantt
+from backend.services.matrix_engine import DailyMatrix, build_daily_matrix, iso_week_window, resample_weeks
+from backend.services.matrix_tiles import assemble, matrix_tiles, split_tiles, week_mondays
+from backend.services.progress_engine import wbs_progress
+from backend.services.project_snapshot import get_project_snapshot
+from backend.services.project_version import bump_project_version
+from backend.services.rollup_engine import rollup_progress
+from backend.services.write_buffer import allocation_buffer
 from backend.utils import require_first
 
 logger = logging.getLogger(__name__)
 
+# Max rows per daily_allocations upsert request
+_UPSERT_CHUNK_SIZE = 500
+
+# Set to False once PostgREST reports fn_daily_matrix missing (migration 007 not applied)
+_matrix_rpc_available = True
+
 # Lazy import to avoid circular dependency
 _baseline_service = None
 def _get_baseline_service():
@@ -42,30 +61,30 @@ class ScheduleService:
     # Projects
     # ------------------------------------------------------------------
 
-    def list_projects(self) -> list[dict[str, Any]]:
-        db = get_db()
-        response = db.table("projects").select("*").order("created_at", desc=True).execute()
+    async def list_projects(self) -> list[dict[str, Any]]:
+        db = get_async_db()
+        response = await db.table("projects").select("*").order("created_at", desc=True).execute()
         return response.data
 
-    def create_project(self, payload: ProjectCreate) -> dict[str, Any]:
-        db = get_db()
+    async def create_project(self, payload: ProjectCreate) -> dict[str, Any]:
+        db = get_async_db()
         data = payload.model_dump(mode="json")
-        response = db.table("projects").insert(data).execute()
+        response = await db.table("projects").insert(data).execute()
         return require_first(response, "project")
 
-    def get_project(self, project_id: UUID) -> dict[str, Any] | None:
-        db = get_db()
-        response = db.table("projects").select("*").eq("id", str(project_id)).execute()
+    async def get_project(self, project_id: UUID) -> dict[str, Any] | None:
+        db = get_async_db()
+        response = await db.table("projects").select("*").eq("id", str(project_id)).execute()
         return response.data[0] if response.data else None
 
     # ------------------------------------------------------------------
     # WBS Items
     # ------------------------------------------------------------------
 
-    def list_wbs_items(self, project_id: UUID) -> list[dict[str, Any]]:
-        db = get_db()
+    async def list_wbs_items(self, project_id: UUID) -> list[dict[str, Any]]:
+        db = get_async_db()
         response = (
-            db.table("wbs_items")
+            await db.table("wbs_items")
             .select("*")
             .eq("project_id", str(project_id))
             .order("sort_order")
@@ -73,31 +92,36 @@ class ScheduleService:
         )
         return response.data
 
-    def create_wbs_item(self, project_id: UUID, payload: WBSItemCreate) -> dict[str, Any]:
-        db = get_db()
+    async def create_wbs_item(self, project_id: UUID, payload: WBSItemCreate) -> dict[str, Any]:
+        db = get_async_db()
         data = payload.model_dump(mode="json")
         data["project_id"] = str(project_id)
-        response = db.table("wbs_items").insert(data).execute()
-        return require_first(response, "WBS item")
+        response = await db.table("wbs_items").insert(data).execute()
+        item = require_first(response, "WBS item")
+        await bump_project_version(project_id)
+        return item
 
-    def update_wbs_item(self, project_id: UUID, item_id: UUID, payload: WBSItemUpdate) -> dict[str, Any] | None:
-        db = get_db()
+    async def update_wbs_item(self, project_id: UUID, item_id: UUID, payload: WBSItemUpdate) -> dict[str, Any] | None:
+        db = get_async_db()
         data = payload.model_dump(mode="json", exclude_none=True)
         if not data:
-            return self._get_wbs_item(project_id, item_id)
+            return await self._get_wbs_item(project_id, item_id)
         response = (
-            db.table("wbs_items")
+            await db.table("wbs_items")
             .update(data)
             .eq("id", str(item_id))
             .eq("project_id", str(project_id))
             .execute()
         )
-        return response.data[0] if response.data else None
+        if not response.data:
+            return None
+        await bump_project_version(project_id)
+        return response.data[0]
 
-    def _get_wbs_item(self, project_id: UUID, item_id: UUID) -> dict[str, Any] | None:
-        db = get_db()
+    async def _get_wbs_item(self, project_id: UUID, item_id: UUID) -> dict[str, Any] | None:
+        db = get_async_db()
         response = (
-            db.table("wbs_items")
+            await db.table("wbs_items")
             .select("*")
             .eq("id", str(item_id))
             .eq("project_id", str(project_id))
@@ -109,7 +133,7 @@ class ScheduleService:
     # Daily Allocations — IC-002 DailyMatrixResponse
     # ------------------------------------------------------------------
 
-    def get_daily_matrix(
+    async def get_daily_matrix(
         self,
         project_id: UUID,
         from_date: date,
@@ -122,206 +146,512 @@ class ScheduleService:
                 wbs_items: [{id, wbs_code, wbs_name, qty, done, remaining, progress_pct, ...}],
                 date_range: ["2026-02-17", "2026-02-18", ...],
                 matrix: {wbs_id: {date: {planned, actual, qty_done, is_future}}},
-                totals: {date: {planned, actual}}
+                totals: {date: {planned, actual}},
+                as_of: read time (for expected_updated_at)
             }
         """
-        project = self.get_project(project_id)
-        if project is None:
-            raise ValueError(f"Project {project_id} not found")
-
-        # Get WBS progress from view
-        db = get_db()
-        wbs_progress = (
-            db.table("vw_wbs_progress")
-            .select("*")
-            .eq("project_id", str(project_id))
-            .order("sort_order" if "sort_order" in {} else "wbs_code")
-            .execute()
-        )
-
-        # Fallback: if view doesn't work, compute from tables
-        if not wbs_progress.data:
-            wbs_items = self.list_wbs_items(project_id)
-            wbs_progress_data = self._compute_progress(project_id, wbs_items)
-        else:
-            wbs_progress_data = wbs_progress.data
-
-        # Get allocations for date range
-        allocations = self._fetch_allocations(project_id, from_date, to_date)
-
-        # Get baseline planned data (from active baseline snapshots)
-        baseline_plan = _get_baseline_service().get_active_baseline_plan(project_id)
-
-        # Build date range
-        date_range = self._build_date_range(from_date, to_date)
-        today = date.today()
-
-        # Build matrix and totals
-        matrix: dict[str, dict[str, dict]] = {}
-        totals: dict[str, dict[str, float]] = {}
-
-        # Initialize totals
-        for d in date_range:
-            totals[d] = {"planned": 0.0, "actual": 0.0}
-
-        # Index allocations by (wbs_item_id, date)
-        alloc_index: dict[tuple[str, str], dict] = {}
-        for a in allocations:
-            key = (str(a["wbs_item_id"]), str(a["date"]))
-            alloc_index[key] = a
-
-        # Build matrix with baseline comparison
-        for wbs in wbs_progress_data:
-            wbs_id = str(wbs["id"])
-            wbs_baseline = baseline_plan.get(wbs_id, {})
-            matrix[wbs_id] = {}
-            for d in date_range:
-                key = (wbs_id, d)
-                alloc = alloc_index.get(key)
-                is_future = date.fromisoformat(d) > today
-
-                # Planned comes from baseline snapshot (if exists), else from allocation
-                planned = wbs_baseline.get(d, 0.0)
-                if planned == 0 and alloc:
-                    planned = float(alloc.get("planned_manpower", 0))
-
-                cell = {
-                    "planned": planned,
-                    "actual": float(alloc.get("actual_manpower", 0)) if alloc else 0.0,
-                    "qty_done": float(alloc.get("qty_done", 0)) if alloc else 0.0,
-                    "is_future": is_future,
-                }
-                matrix[wbs_id][d] = cell
-
-                # Accumulate totals
-                totals[d]["planned"] += cell["planned"]
-                totals[d]["actual"] += cell["actual"]
+        as_of = datetime.now(UTC)
+        wbs_progress_data, grid = await self._build_matrix(project_id, from_date, to_date)
+        matrix, totals = grid.to_ic002()
 
         return {
             "wbs_items": wbs_progress_data,
-            "date_range": date_range,
+            "date_range": grid.dates,
             "matrix": matrix,
             "totals": totals,
+            "as_of": as_of,
         }
 
-    def batch_update_allocations(
+    async def get_daily_matrix_sparse(
+        self,
+        project_id: UUID,
+        from_date: date,
+        to_date: date,
+    ) -> dict[str, Any]:
+        """Build the sparse IC-002 v2 DailyMatrixSparseResponse.
+
+        Returns:
+            {
+                format: "v2",
+                wbs_items: [...same as IC-002...],
+                date_range: ["2026-02-17", ...],
+                future_from: "2026-02-21" | None,
+                cells: {row: [..], day: [..], planned: [..], actual: [..], qty_done: [..]},
+                totals: {planned: [per day], actual: [per day]},
+                as_of: read time (for expected_updated_at)
+            }
+        """
+        as_of = datetime.now(UTC)
+        wbs_progress_data, grid = await self._build_matrix(project_id, from_date, to_date)
+        return {"wbs_items": wbs_progress_data, **grid.to_sparse(), "as_of": as_of}
+
+    async def _build_matrix(
+        self,
+        project_id: UUID,
+        from_date: date,
+        to_date: date,
+    ) -> tuple[list[dict[str, Any]], DailyMatrix]:
+        """Fill the dense grid for [from_date, to_date]; shared by the v1, v2 and weekly views.
+
+        Whole ISO weeks are served from matrix_tiles when cached at the current
+        data_version; only the span of missing weeks is fetched and built (the
+        bundle is still read for project, progress rows and version).
+        """
+        await allocation_buffer.flush(project_id)
+        mondays = week_mondays(from_date, to_date)
+        cached_version, tiles = matrix_tiles.lookup(project_id, mondays)
+        missing = [m for m in mondays if m not in tiles]
+        if missing:
+            fetch_from, fetch_to = missing[0], missing[-1] + timedelta(days=6)
+        else:
+            fetch_from, fetch_to = from_date, from_date - timedelta(days=1)  # empty window
+
+        bundle = await self._fetch_matrix_bundle(project_id, fetch_from, fetch_to)
+        if bundle["project"] is None:
+            raise ValueError(f"Project {project_id} not found")
+
+        # Fallback: if view doesn't work, compute from tables
+        if not bundle["wbs_progress"]:
+            wbs_items = await self.list_wbs_items(project_id)
+            wbs_progress_data = rollup_progress(await self._compute_progress(project_id, wbs_items))
+        elif "parent_id" not in bundle["wbs_progress"][0]:  # view predates migration 010
+            wbs_progress_data = rollup_progress(bundle["wbs_progress"], await self.list_wbs_items(project_id))
+        else:
+            wbs_progress_data = rollup_progress(bundle["wbs_progress"])
+        wbs_ids = [str(w["id"]) for w in wbs_progress_data]
+
+        version = bundle["project"].get("data_version")
+        stale = tiles and (
+            version is None
+            or version != cached_version
+            or next(iter(tiles.values())).wbs_ids != tuple(wbs_ids)
+        )
+        if stale:
+            tiles = {}
+            fetch_from, fetch_to = mondays[0], mondays[-1] + timedelta(days=6)
+            bundle = await self._fetch_matrix_bundle(project_id, fetch_from, fetch_to)
+
+        if to_date < from_date:  # reversed window: no days, WBS rows only
+            return wbs_progress_data, build_daily_matrix(wbs_ids, from_date, to_date, [], {}, today=date.today())
+
+        if fetch_from <= fetch_to:
+            fetched = split_tiles(build_daily_matrix(
+                wbs_ids, fetch_from, fetch_to, bundle["allocations"], bundle["baseline_plan"],
+            ))
+            matrix_tiles.store(project_id, version, fetched)
+            tiles = {**tiles, **fetched}
+
+        grid = assemble([tiles[m] for m in mondays], mondays[0], from_date, to_date, today=date.today())
+        return wbs_progress_data, grid
+
+    async def batch_update_allocations(
         self,
         project_id: UUID,
         payload: AllocationBatchUpdate,
     ) -> dict[str, Any]:
-        """Upsert allocation cells. Returns {updated_count, errors}."""
-        db = get_db()
+        """Upsert allocation cells in bulk. Returns {updated_count, errors, applied, conflicts}.
+
+        Cells that carry ``expected_updated_at`` — the cell's updated_at or the
+        matrix ``as_of`` when read — are written only if their row has not
+        been written since (explicit null: the cell must still be empty).
+        All such cells are checked with one read; conflicting keys are left
+        out of the single bulk write and returned in ``conflicts`` with their
+        current values. ``applied`` has the new updated_at of every written
+        cell for the client's next conditional edit.
+
+        With settings.write_buffer_enabled, batches without expectations are
+        queued in the write-behind buffer instead (see write_buffer) and
+        ``buffered`` is set.
+        """
+        rows = []
+        for cell in payload.updates:
+            row = {
+                "wbs_item_id": cell.wbs_id,
+                "date": cell.date.isoformat(),
+                "source": payload.source,
+            }
+            if cell.actual_manpower is not None:
+                row["actual_manpower"] = cell.actual_manpower
+            if cell.qty_done is not None:
+                row["qty_done"] = cell.qty_done
+            if cell.notes is not None:
+                row["notes"] = cell.notes
+            rows.append(row)
+
+        checked = [cell for cell in payload.updates if "expected_updated_at" in cell.model_fields_set]
+        if not checked:
+            if settings.write_buffer_enabled:
+                return await allocation_buffer.submit(project_id, rows)
+            return await self.upsert_allocations(project_id, rows)
+
+        conflicts = await self._find_conflicts(project_id, checked)
+        conflict_keys = {(c["wbs_id"], c["date"]) for c in conflicts}
+        rows = [r for r in rows if (r["wbs_item_id"], r["date"]) not in conflict_keys]
+        result = await self.upsert_allocations(project_id, rows) if rows else {
+            "updated_count": 0, "errors": [], "applied": [],
+        }
+        return {**result, "conflicts": conflicts}
+
+    async def _find_conflicts(self, project_id: UUID, cells: list[AllocationCell]) -> list[dict[str, Any]]:
+        """Current rows of ``cells`` written after their expected_updated_at.
+
+        The check and the following upsert are two requests: a write landing
+        between them is not detected.
+        """
+        await allocation_buffer.flush(project_id)  # compare against what readers would see
+        days = [cell.date for cell in cells]
+        current = await self._fetch_allocations(
+            project_id, min(days), max(days),
+            columns="wbs_item_id, date, planned_manpower, actual_manpower, qty_done, notes, updated_at",
+            wbs_ids=sorted({cell.wbs_id for cell in cells}),
+        )
+        by_key = {(str(r["wbs_item_id"]), str(r["date"])[:10]): r for r in current}
+
+        conflicts = []
+        for key, cell in {(c.wbs_id, c.date.isoformat()): c for c in cells}.items():
+            row = by_key.get(key)
+            if row is None:
+                continue  # still empty: nothing to overwrite
+            expected = cell.expected_updated_at
+            if expected is not None and expected.tzinfo is None:
+                expected = expected.replace(tzinfo=UTC)
+            stamp = datetime.fromisoformat(str(row["updated_at"])) if row.get("updated_at") else None
+            if expected is None or (stamp is not None and stamp > expected):
+                conflicts.append({
+                    "wbs_id": key[0],
+                    "date": key[1],
+                    "expected_updated_at": cell.expected_updated_at,
+                    "current": {c: row.get(c) for c in (
+                        "planned_manpower", "actual_manpower", "qty_done", "notes", "updated_at",
+                    )},
+                })
+        return conflicts
+
+    async def upsert_allocations(
+        self, project_id: UUID | str, rows: list[dict[str, Any]], *, drain_buffer: bool = True
+    ) -> dict[str, Any]:
+        """Bulk upsert daily_allocations rows keyed on (wbs_item_id, date).
+
+        Rows are merged per key (later rows win), grouped by column set so each
+        request carries a uniform payload — PostgREST would otherwise null out
+        columns missing from some rows — and sent in chunks of
+        _UPSERT_CHUNK_SIZE. A chunk that fails is retried row by row so one
+        bad cell only costs its own error entry.
+
+        The project's data_version is bumped once if anything was written,
+        only the matrix tiles of the touched weeks are dropped, and the stored
+        cells are published to the project's SSE subscribers (change_stream).
+
+        Buffered grid edits of the project are written first so they cannot
+        land on top of these rows later; the buffer itself passes
+        ``drain_buffer=False``.
+
+        Returns {updated_count, errors, applied} where errors are
+        [{wbs_id, date, error}] and applied is [{wbs_id, date, updated_at}] of
+        the stored rows.
+        """
+        if drain_buffer:
+            await allocation_buffer.flush(project_id)
+        db = get_async_db()
+        merged: dict[tuple[str, str], dict[str, Any]] = {}
+        cell_counts: dict[tuple[str, str], int] = {}
+        for row in rows:
+            key = (str(row["wbs_item_id"]), str(row["date"]))
+            merged.setdefault(key, {}).update(row)
+            cell_counts[key] = cell_counts.get(key, 0) + 1
+
+        groups: dict[frozenset[str], list[tuple[str, str]]] = {}
+        for key, row in merged.items():
+            groups.setdefault(frozenset(row), []).append(key)
+
         updated = 0
         errors = []
+        applied = []
 
-        for cell in payload.updates:
-            try:
-                row = {
-                    "wbs_item_id": cell.wbs_id,
-                    "date": cell.date.isoformat(),
-                    "source": payload.source,
-                }
-                if cell.actual_manpower is not None:
-                    row["actual_manpower"] = cell.actual_manpower
-                if cell.qty_done is not None:
-                    row["qty_done"] = cell.qty_done
-                if cell.notes is not None:
-                    row["notes"] = cell.notes
-
-                db.table("daily_allocations").upsert(
-                    row, on_conflict="wbs_item_id,date"
-                ).execute()
-                updated += 1
-            except Exception as e:
-                logger.warning("Allocation upsert failed wbs=%s date=%s: %s", cell.wbs_id, cell.date, e)
-                errors.append({
-                    "wbs_id": cell.wbs_id,
-                    "date": cell.date.isoformat(),
-                    "error": str(e),
-                })
+        def stamp(stored: list[dict[str, Any]]) -> None:
+            applied.extend(
+                {"wbs_id": str(r["wbs_item_id"]), "date": str(r["date"])[:10], "updated_at": r.get("updated_at")}
+                for r in stored
+            )
 
-        return {"updated_count": updated, "errors": errors}
+        for keys in groups.values():
+            for start in range(0, len(keys), _UPSERT_CHUNK_SIZE):
+                chunk = keys[start:start + _UPSERT_CHUNK_SIZE]
+                try:
+                    resp = await db.table("daily_allocations").upsert(
+                        [merged[k] for k in chunk], on_conflict="wbs_item_id,date"
+                    ).execute()
+                    updated += sum(cell_counts[k] for k in chunk)
+                    stamp(resp.data)
+                    continue
+                except Exception as e:
+                    logger.warning(
+                        "Bulk allocation upsert failed (%d rows), retrying per row: %s", len(chunk), e, exc_info=True
+                    )
+
+                for key in chunk:
+                    try:
+                        resp = await db.table("daily_allocations").upsert(
+                            merged[key], on_conflict="wbs_item_id,date"
+                        ).execute()
+                        updated += cell_counts[key]
+                        stamp(resp.data)
+                    except Exception as e:
+                        logger.warning("Allocation upsert failed wbs=%s date=%s: %s", key[0], key[1], e)
+                        errors.append({"wbs_id": key[0], "date": key[1], "error": str(e)})
+
+        if updated:
+            version = await bump_project_version(project_id)
+            matrix_tiles.advance(project_id, (k[1] for k in merged), version)
+            failed = {(e["wbs_id"], e["date"]) for e in errors}
+            change_broker.publish(project_id, version, [row for k, row in merged.items() if k not in failed])
+        return {"updated_count": updated, "errors": errors, "applied": applied}
+
+    async def get_allocation_changes(
+        self,
+        project_id: UUID,
+        since: datetime,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> dict[str, Any]:
+        """Allocation and baseline rows whose updated_at is after ``since``.
+
+        Relies on the fn_update_timestamp triggers (trg_allocations_updated,
+        trg_baselines_updated) to bump updated_at on every write. The optional
+        date window limits allocations to the grid the client has loaded.
+
+        The triggers stamp now(), the start of the writing transaction, so a
+        row can commit after rows stamped later than it. The watermark is
+        therefore this read's time minus settings.delta_overlap_s (never
+        before ``since``): rows stamped within that overlap are returned again
+        by the next poll, and the client applies rows idempotently
+        (allocations by wbs_item_id + date).
+
+        Returns {watermark, full_reload, allocations, baselines}. full_reload is
+        set when ``since`` is older than settings.delta_max_age_hours, more than
+        settings.delta_max_rows allocations changed, or a baseline changed
+        (planned values shift across the whole grid).
+        """
+        if await self.get_project(project_id) is None:
+            raise ValueError(f"Project {project_id} not found")
+        await allocation_buffer.flush(project_id)
+
+        now = datetime.now(UTC)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        # Rows stamped before this have committed by the time of the reads below
+        watermark = max(since, now - timedelta(seconds=settings.delta_overlap_s))
+        if now - since > timedelta(hours=settings.delta_max_age_hours):
+            return {"watermark": watermark, "full_reload": True, "allocations": [], "baselines": []}
+
+        db = get_async_db()
+        allocations, baselines = await asyncio.gather(
+            self._fetch_allocations(
+                project_id, from_date, to_date,
+                updated_since=since, limit=settings.delta_max_rows + 1,
+            ),
+            db.table("baselines")
+            .select("*")
+            .eq("project_id", str(project_id))
+            .gt("updated_at", since.isoformat())
+            .execute(),
+        )
+        if len(allocations) > settings.delta_max_rows:
+            return {"watermark": watermark, "full_reload": True, "allocations": [], "baselines": []}
+
+        return {
+            "watermark": watermark,
+            "full_reload": bool(baselines.data),
+            "allocations": allocations,
+            "baselines": baselines.data,
+        }
+
+    async def get_weekly_data(
+        self,
+        project_id: UUID,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> dict[str, Any]:
+        """Planned/actual manday and qty_done per WBS per ISO week (KW).
 
-    def get_weekly_data(self, project_id: UUID) -> dict[str, Any]:
-        """Weekly aggregated view — Phase 2 stub."""
-        return {"message": "Weekly view not yet implemented"}
+        The window defaults to the project's start_date .. end_date (or today)
+        and is widened to whole Monday-Sunday weeks. Cells follow the daily
+        matrix planned rule and are summed per week in one vectorised pass.
 
-    def get_summary_data(self, project_id: UUID) -> dict[str, Any]:
-        """Summary with Gantt data — Phase 2 stub."""
-        return {"message": "Summary view not yet implemented"}
+        Returns:
+            {
+                wbs_items: [...same as IC-002...],
+                weeks: [{key: "2026-KW08", year, week, start, end}],
+                matrix: {wbs_id: {week_key: {planned, actual, qty_done}}},  # empty weeks omitted
+                totals: {week_key: {planned, actual, qty_done}}
+            }
+        """
+        if from_date is None or to_date is None:
+            project = await self.get_project(project_id)
+            if project is None:
+                raise ValueError(f"Project {project_id} not found")
+            from_date = from_date or date.fromisoformat(str(project["start_date"])[:10])
+            to_date = to_date or (
+                date.fromisoformat(str(project["end_date"])[:10]) if project.get("end_date") else date.today()
+            )
+
+        from_date, to_date = iso_week_window(from_date, to_date)
+        wbs_progress_data, grid = await self._build_matrix(project_id, from_date, to_date)
+        weekly = resample_weeks(grid)
+        matrix, totals = weekly.to_nested()
+
+        return {
+            "wbs_items": wbs_progress_data,
+            "weeks": weekly.weeks,
+            "matrix": matrix,
+            "totals": totals,
+        }
+
+    async def get_summary_data(self, project_id: UUID, zoom: str = "week") -> dict[str, Any]:
+        """Gantt summary: one bar per WBS item with activity bucketed by ``zoom``.
+
+        Uses the shared project snapshot plus the active baseline plan; see
+        gantt_engine for the bar/span format. Raises ValueError if the
+        project does not exist.
+        """
+        snapshot, baseline_plan = await asyncio.gather(
+            get_project_snapshot(project_id),
+            _get_baseline_service().get_active_baseline_plan(project_id),
+        )
+        return build_gantt(snapshot.wbs_items, snapshot.allocations, baseline_plan, zoom=zoom, today=date.today())
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _build_date_range(start: date, end: date) -> list[str]:
-        days = (end - start).days + 1
-        return [(start + timedelta(days=i)).isoformat() for i in range(max(days, 0))]
-
-    def _fetch_allocations(
+    async def _fetch_matrix_bundle(
         self, project_id: UUID, from_date: date, to_date: date
-    ) -> list[dict[str, Any]]:
-        """Fetch daily_allocations for WBS items in this project within date range."""
-        db = get_db()
-        # Get WBS item IDs for this project
-        wbs_ids_resp = (
-            db.table("wbs_items")
-            .select("id")
+    ) -> dict[str, Any]:
+        """Fetch the inputs of get_daily_matrix in one fn_daily_matrix RPC call.
+
+        Returns {project, wbs_progress, allocations, baseline_plan} where
+        baseline_plan is the active baseline's decoded BaselinePlan. The RPC only
+        names the active baseline (migration 013); its plan comes from
+        baseline_cache, so snapshots are read once per baseline.
+        Falls back to separate queries when the function is not deployed yet
+        (migration 007) or the call fails.
+        """
+        global _matrix_rpc_available
+        db = get_async_db()
+        if _matrix_rpc_available:
+            try:
+                resp = await db.rpc("fn_daily_matrix", {
+                    "p_project_id": str(project_id),
+                    "p_from": from_date.isoformat(),
+                    "p_to": to_date.isoformat(),
+                }).execute()
+                data = resp.data or {}
+                if "active_baseline_id" in data:
+                    baseline_id = data["active_baseline_id"]
+                    project = data.get("project") or {}
+                    baseline_cache.set_active(project_id, baseline_id, project.get("data_version"))
+                    baseline_plan = await baseline_cache.plan(baseline_id)
+                elif "baseline_snapshots" in data:  # function from migration 012
+                    baseline_plan = decode_plans(data["baseline_snapshots"] or [])
+                else:  # function predates migration 012: {wbs_item_id: {date: manpower}}
+                    baseline_plan = decode_plans([
+                        {"wbs_item_id": wbs_id, "daily_plan": plan}
+                        for wbs_id, plan in (data.get("baseline_plan") or {}).items()
+                    ])
+                return {
+                    "project": data.get("project"),
+                    "wbs_progress": data.get("wbs_progress") or [],
+                    "allocations": data.get("allocations") or [],
+                    "baseline_plan": baseline_plan,
+                }
+            except Exception as e:
+                if "PGRST202" in str(e) or "Could not find the function" in str(e):
+                    _matrix_rpc_available = False
+                # A missing function is expected on older schemas; anything else keeps its traceback
+                logger.warning(
+                    "fn_daily_matrix unavailable, using multi-query path: %s", e, exc_info=_matrix_rpc_available
+                )
+
+        project = await self.get_project(project_id)
+        if project is None:
+            return {"project": None, "wbs_progress": [], "allocations": [], "baseline_plan": decode_plans([])}
+
+        # Progress view, windowed allocations and baseline plan are independent — fetch concurrently
+        wbs_progress, allocations, baseline_plan = await asyncio.gather(
+            db.table("vw_wbs_progress")
+            .select("*")
             .eq("project_id", str(project_id))
-            .execute()
+            .order("wbs_code")
+            .execute(),
+            self._fetch_allocations(project_id, from_date, to_date),
+            _get_baseline_service().get_active_baseline_plan(project_id, project.get("data_version")),
         )
-        wbs_ids = [w["id"] for w in wbs_ids_resp.data]
+        return {
+            "project": project,
+            "wbs_progress": wbs_progress.data,
+            "allocations": allocations,
+            "baseline_plan": baseline_plan,
+        }
+
+    async def _fetch_allocations(
+        self,
+        project_id: UUID,
+        from_date: date | None,
+        to_date: date | None,
+        updated_since: datetime | None = None,
+        limit: int | None = None,
+        columns: str = "*",
+        wbs_ids: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Fetch daily_allocations for WBS items in this project within date range.
+
+        ``updated_since`` keeps only rows written after that instant (ordered by
+        updated_at); a None date bound leaves that side of the window open.
+        Without ``limit`` all rows are read in pages of settings.db_page_size so
+        PostgREST's max-rows cap cannot truncate the result (db.fetch_all_in:
+        id chunks, so rows are ordered within each chunk only); with ``limit``
+        chunks are read in turn until ``limit`` rows are in (db.fetch_first_in).
+        Pass ``wbs_ids`` when the caller already has them to skip the
+        wbs_items lookup.
+        """
+        db = get_async_db()
+        if wbs_ids is None:
+            wbs_ids_resp = (
+                await db.table("wbs_items")
+                .select("id")
+                .eq("project_id", str(project_id))
+                .execute()
+            )
+            wbs_ids = [w["id"] for w in wbs_ids_resp.data]
         if not wbs_ids:
             return []
 
-        response = (
-            db.table("daily_allocations")
-            .select("*")
-            .in_("wbs_item_id", wbs_ids)
-            .gte("date", from_date.isoformat())
-            .lte("date", to_date.isoformat())
-            .execute()
-        )
-        return response.data
+        def build_query(ids: list[str]):
+            query = db.table("daily_allocations").select(columns).in_("wbs_item_id", ids)
+            if from_date is not None:
+                query = query.gte("date", from_date.isoformat())
+            if to_date is not None:
+                query = query.lte("date", to_date.isoformat())
+            if updated_since is not None:
+                query = query.gt("updated_at", updated_since.isoformat())
+            return query.order("updated_at" if updated_since is not None else "id")
+
+        if limit is not None:
+            return await fetch_first_in(wbs_ids, build_query, limit)
+
+        return await fetch_all_in(wbs_ids, build_query)
 
-    def _compute_progress(
+    async def _compute_progress(
         self, project_id: UUID, wbs_items: list[dict]
     ) -> list[dict[str, Any]]:
-        """Compute progress when vw_wbs_progress is not available."""
-        db = get_db()
-        progress = []
-
-        for item in wbs_items:
-            wbs_id = str(item["id"])
-            # Get all allocations for this WBS item
-            allocs = (
-                db.table("daily_allocations")
-                .select("actual_manpower, qty_done, date")
-                .eq("wbs_item_id", wbs_id)
-                .execute()
-            )
+        """Compute vw_wbs_progress rows when the view is not available.
 
-            total_qty_done = sum(float(a.get("qty_done", 0)) for a in allocs.data)
-            total_manday = sum(float(a.get("actual_manpower", 0)) for a in allocs.data)
-            working_days = len([a for a in allocs.data if float(a.get("actual_manpower", 0)) > 0])
-
-            qty = float(item.get("qty", 0))
-            remaining = max(qty - total_qty_done, 0)
-            progress_pct = round(total_qty_done / qty * 100, 1) if qty > 0 else 0.0
-            productivity = round(total_qty_done / total_manday, 3) if total_manday > 0 else 0.0
-
-            progress.append({
-                "id": wbs_id,
-                "wbs_code": item["wbs_code"],
-                "wbs_name": item["wbs_name"],
-                "qty": qty,
-                "done": total_qty_done,
-                "remaining": remaining,
-                "progress_pct": progress_pct,
-                "total_actual_manday": total_manday,
-                "working_days": working_days,
-                "productivity_rate": productivity,
-            })
-
-        return progress
+        One paginated allocation read for the whole project, aggregated per
+        WBS item by progress_engine.
+        """
+        allocations = await self._fetch_allocations(
+            project_id, None, None,
+            columns="wbs_item_id, date, actual_manpower, qty_done",
+            wbs_ids=[str(w["id"]) for w in wbs_items],
+        )
+        return wbs_progress(wbs_items, allocations)
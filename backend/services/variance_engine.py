@@ -0,0 +1,102 @@
+"""Variance engine — baseline vs baseline / baseline vs actual on one grid.
+
+Both sides arrive as dense (rows x days) manpower arrays over the same WBS
+rows and date window (``build_daily_matrix``: a BaselinePlan as ``planned``,
+allocations as ``actual``). Everything below is column/row reductions on
+those two arrays:
+
+- per WBS: manday on each side and their difference, first/last active day
+  on each side and the start/finish shift in calendar days (target - base;
+  positive = later). Summary rows roll their subtree up (rollup_engine).
+- per ISO week: manday on each side across all WBS rows, and the difference
+- totals: overall manday, difference and difference in % of the base
+
+All functions are stateless — no DB access.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+from backend.services.gantt_engine import first_last
+from backend.services.matrix_engine import bucket_starts, week_key
+from backend.services.rollup_engine import rollup_rows, tree_levels
+
+
+def _shift(base: list[str | None], target: list[str | None]) -> list[int | None]:
+    return [
+        (date.fromisoformat(t) - date.fromisoformat(b)).days if b and t else None
+        for b, t in zip(base, target)
+    ]
+
+
+def compare_grids(
+    wbs_items: list[dict],
+    start: date,
+    base: np.ndarray,
+    target: np.ndarray,
+) -> dict[str, Any]:
+    """Variance of ``target`` against ``base`` for ``wbs_items`` (row order) from ``start``.
+
+    Returns {items, weeks, totals}; see the module docstring for the fields.
+    """
+    n_days = base.shape[1]
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(n_days)]
+    parent, depth = tree_levels(wbs_items)
+
+    base_manday = rollup_rows(base.sum(axis=1), parent, depth, np.add)
+    target_manday = rollup_rows(target.sum(axis=1), parent, depth, np.add)
+    base_start, base_end = first_last(rollup_rows(base > 0, parent, depth, np.logical_or), dates)
+    target_start, target_end = first_last(rollup_rows(target > 0, parent, depth, np.logical_or), dates)
+    start_shift, finish_shift = _shift(base_start, target_start), _shift(base_end, target_end)
+
+    items = []
+    for i, w in enumerate(wbs_items):
+        items.append({
+            "wbs_id": str(w["id"]),
+            "wbs_code": w.get("wbs_code", ""),
+            "wbs_name": w.get("wbs_name", ""),
+            "level": int(depth[i]),
+            "is_summary": bool(w.get("is_summary")),
+            "base_manday": round(float(base_manday[i]), 2),
+            "target_manday": round(float(target_manday[i]), 2),
+            "variance_manday": round(float(target_manday[i] - base_manday[i]), 2),
+            "base_start": base_start[i],
+            "base_end": base_end[i],
+            "target_start": target_start[i],
+            "target_end": target_end[i],
+            "start_shift_days": start_shift[i],
+            "finish_shift_days": finish_shift[i],
+        })
+
+    weeks = []
+    if n_days:
+        starts = bucket_starts(start, n_days, "week")
+        base_weeks = np.add.reduceat(base.sum(axis=0), starts).tolist()
+        target_weeks = np.add.reduceat(target.sum(axis=0), starts).tolist()
+        ends = np.append(starts[1:], n_days) - 1
+        for s, e, b, t in zip(starts.tolist(), ends.tolist(), base_weeks, target_weeks):
+            first = start + timedelta(days=s)
+            weeks.append({
+                "key": week_key(first - timedelta(days=first.weekday())),
+                "start": dates[s],
+                "end": dates[e],
+                "base_manday": round(b, 2),
+                "target_manday": round(t, 2),
+                "variance_manday": round(t - b, 2),
+            })
+
+    base_total, target_total = float(base.sum()), float(target.sum())
+    return {
+        "items": items,
+        "weeks": weeks,
+        "totals": {
+            "base_manday": round(base_total, 2),
+            "target_manday": round(target_total, 2),
+            "variance_manday": round(target_total - base_total, 2),
+            "variance_pct": round((target_total - base_total) / base_total * 100, 1) if base_total else None,
+        },
+    }
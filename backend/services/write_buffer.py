@@ -0,0 +1,209 @@
+"""Write-behind buffer for grid cell edits (optional, settings.write_buffer_enabled).
+
+Grid users type quickly and the frontend sends many small
+``PUT /allocations/{id}/daily`` batches touching the same cells. With the
+buffer enabled, ScheduleService.batch_update_allocations hands its rows to
+``allocation_buffer.submit`` instead of writing them:
+
+- Rows are merged per (wbs_item_id, date) — later values win column by
+  column — and flushed as one ScheduleService.upsert_allocations call
+  ``settings.write_buffer_window_ms`` after the first pending edit (or at
+  once past ``settings.write_buffer_max_cells``).
+- Before a submit is acknowledged its rows are appended to a spill file
+  and fsynced, so a crash does not lose acknowledged edits; ``replay`` (run
+  at startup) writes back whatever a dead process left behind. Spill files
+  are named ``<project>.<os pid>.<seq>.jsonl``; a flush rotates to the next
+  seq and deletes the older files once their rows are in the database.
+- ``flush(project_id)`` is the read barrier: matrix, delta, snapshot and
+  ETag reads call it first, so nobody on this process reads past a pending
+  edit. It waits for an in-flight flush and is a dict lookup when the
+  project has nothing pending.
+
+The buffer is per process. With several uvicorn workers an edit buffered
+on one worker reaches readers on the others within one window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from backend.config import settings
+from backend.utils import pid_alive
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ProjectBuffer:
+    """Pending merged rows of one project plus its spill-file sequence."""
+
+    pending: dict[tuple[str, str], dict[str, Any]] = field(default_factory=dict)
+    seq: int = 0
+    oldest_seq: int = 0  # first spill file not yet deleted
+    # Guards pending + spill appends (short); flushing serialises database writes
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    flushing: asyncio.Lock = field(default_factory=asyncio.Lock)
+    timer: asyncio.Task | None = None
+
+
+def _merge(into: dict[tuple[str, str], dict[str, Any]], rows: list[dict[str, Any]]) -> None:
+    for row in rows:
+        into.setdefault((str(row["wbs_item_id"]), str(row["date"])), {}).update(row)
+
+
+class AllocationWriteBuffer:
+    """Per-project coalescing buffer in front of ScheduleService.upsert_allocations."""
+
+    def __init__(self, spill_dir: str | Path | None = None):
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self._projects: dict[str, _ProjectBuffer] = {}
+        self.submitted = 0
+        self.flushed = 0
+
+    @property
+    def spill_dir(self) -> Path:
+        return self._spill_dir if self._spill_dir is not None else Path(settings.write_buffer_spill_dir)
+
+    def _spill_path(self, project_id: str, seq: int) -> Path:
+        return self.spill_dir / f"{project_id}.{os.getpid()}.{seq}.jsonl"
+
+    @staticmethod
+    def _append(path: Path, rows: list[dict[str, Any]]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rows) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def submit(self, project_id: UUID | str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+        """Durably accept ``rows`` for a later flush.
+
+        Returns the AllocationBatchResponse shape with ``buffered`` set; cell
+        errors surface at flush time and are logged.
+        """
+        pid = str(project_id)
+        if not rows:
+            return {"updated_count": 0, "errors": [], "buffered": True}
+        buf = self._projects.setdefault(pid, _ProjectBuffer())
+        async with buf.lock:
+            await asyncio.to_thread(self._append, self._spill_path(pid, buf.seq), rows)
+            _merge(buf.pending, rows)
+        self.submitted += len(rows)
+
+        if len(buf.pending) >= settings.write_buffer_max_cells:
+            await self.flush(pid)
+        elif buf.timer is None or buf.timer.done():
+            buf.timer = asyncio.create_task(self._flush_later(pid))
+        return {"updated_count": len(rows), "errors": [], "buffered": True}
+
+    async def _flush_later(self, project_id: str) -> None:
+        await asyncio.sleep(settings.write_buffer_window_ms / 1000)
+        try:
+            await self.flush(project_id)
+        except Exception as e:
+            logger.warning("Buffered allocation flush failed for %s, will retry: %s", project_id, e, exc_info=True)
+
+    async def flush(self, project_id: UUID | str) -> None:
+        """Write the project's pending rows now; returns once they are in the database."""
+        buf = self._projects.get(str(project_id))
+        if buf is None or (not buf.pending and not buf.flushing.locked()):
+            return
+        pid = str(project_id)
+        async with buf.flushing:
+            async with buf.lock:
+                if not buf.pending:
+                    return  # the flush we waited for took them
+                rows, buf.pending = buf.pending, {}
+                # Edits submitted during the write go to the next spill file
+                flushed_seq, buf.seq = buf.seq, buf.seq + 1
+                if buf.timer is not None and buf.timer is not asyncio.current_task():
+                    buf.timer.cancel()
+                buf.timer = None
+            try:
+                result = await _writer().upsert_allocations(pid, list(rows.values()), drain_buffer=False)
+            except BaseException:
+                # Keep the spill files; edits submitted meanwhile override the failed ones
+                _merge(rows, list(buf.pending.values()))
+                buf.pending = rows
+                if buf.timer is None or buf.timer.done():
+                    buf.timer = asyncio.create_task(self._flush_later(pid))
+                raise
+            for err in result["errors"]:
+                logger.warning(
+                    "Buffered allocation dropped wbs=%s date=%s: %s", err["wbs_id"], err["date"], err["error"]
+                )
+            self.flushed += len(rows)
+            await asyncio.to_thread(self._remove_spills, pid, buf.oldest_seq, flushed_seq)
+            buf.oldest_seq = flushed_seq + 1
+
+    def _remove_spills(self, project_id: str, first_seq: int, last_seq: int) -> None:
+        for seq in range(first_seq, last_seq + 1):
+            self._spill_path(project_id, seq).unlink(missing_ok=True)
+
+    async def flush_all(self) -> None:
+        """Flush every project (shutdown)."""
+        for pid in list(self._projects):
+            try:
+                await self.flush(pid)
+            except Exception:
+                logger.exception("Buffered allocation flush failed for %s, left in spill", pid)
+
+    async def replay(self) -> int:
+        """Write back spill files left by dead processes. Returns the cells written."""
+        if not self.spill_dir.is_dir():
+            return 0
+        by_project: dict[str, list[tuple[int, Path]]] = {}
+        for path in self.spill_dir.glob("*.jsonl"):
+            try:
+                project_id, owner, seq = path.stem.split(".")
+                owner_pid, seq_no = int(owner), int(seq)
+            except ValueError:
+                logger.warning("Ignoring unexpected write buffer spill file %s", path.name)
+                continue
+            if not pid_alive(owner_pid):
+                by_project.setdefault(project_id, []).append((seq_no, path))
+
+        written = 0
+        for project_id, files in by_project.items():
+            rows: dict[tuple[str, str], dict[str, Any]] = {}
+            for _, path in sorted(files):
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    if line.strip():
+                        _merge(rows, json.loads(line))
+            try:
+                result = await _writer().upsert_allocations(project_id, list(rows.values()), drain_buffer=False)
+            except Exception:
+                logger.exception("Replaying buffered allocations for %s failed, kept spill", project_id)
+                continue
+            written += result["updated_count"]
+            for _, path in files:
+                path.unlink(missing_ok=True)
+            logger.info("Replayed %d buffered allocation cells for project %s", len(rows), project_id)
+        return written
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending_cells": sum(len(b.pending) for b in self._projects.values()),
+            "submitted": self.submitted,
+            "flushed": self.flushed,
+        }
+
+
+# Lazy import to avoid circular dependency (schedule_service reads through the barrier)
+_schedule_service = None
+def _writer():
+    global _schedule_service
+    if _schedule_service is None:
+        from backend.services.schedule_service import ScheduleService
+        _schedule_service = ScheduleService()
+    return _schedule_service
+
+
+allocation_buffer = AllocationWriteBuffer()
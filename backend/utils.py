@@ -1,7 +1,8 @@
-"""Shared utility functions for safe database access."""
+"""Shared utility functions: safe database access, process checks."""
 
 from __future__ import annotations
 
+import os
 from typing import Any
 
 
@@ -22,3 +23,20 @@ def require_first(response, entity: str = "record") -> dict[str, Any]:
 def safe_data(response) -> list[dict[str, Any]]:
     """Return the data list from a Supabase response, or empty list if None."""
     return response.data if response and response.data else []
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether another process with ``pid`` runs on this host (spill files, job owners).
+
+    Our own pid counts as dead: a file or row carrying it was left by an
+    earlier container run that happened to get the same pid.
+    """
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -1,3 +1,4 @@
+import { useEffect } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { allocationsApi } from '@/lib/api';
 import type { DateRange, AllocationCell, AllocationBatchUpdate } from '@/types';
@@ -39,3 +40,26 @@ export function useBatchUpdate(projectId: string) {
     },
   });
 }
+
+/**
+ * Keep allocation queries fresh from the server-sent change stream
+ * instead of polling: any write by another planner invalidates them.
+ */
+export function useAllocationStream(projectId: string | null) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!projectId) return;
+    const controller = new AbortController();
+    allocationsApi.streamChanges(
+      projectId,
+      (event) => {
+        if (event.event !== 'ready') {
+          queryClient.invalidateQueries({ queryKey: ['allocations'] });
+        }
+      },
+      controller.signal,
+    );
+    return () => controller.abort();
+  }, [projectId, queryClient]);
+}
@@ -3,14 +3,26 @@ import { supabase } from '@/lib/supabase';
 import type {
   Project,
   ProjectCreate,
+  ProjectCalendar,
+  CalendarDaysResponse,
   WBSItem,
   DailyMatrixResponse,
+  DailyMatrixSparseResponse,
+  AllocationChangesResponse,
+  AllocationStreamEvent,
+  WeeklyMatrixResponse,
+  SummaryResponse,
+  GanttZoom,
   AllocationBatchUpdate,
   AllocationBatchResponse,
   Baseline,
   BaselineCreate,
+  BaselineComparison,
   ChatParseResponse,
   ForecastResponse,
+  ImportSummary,
+  Job,
+  JobFileResult,
   DateRange,
 } from '@/types';
 
@@ -31,6 +43,9 @@ api.interceptors.request.use(async (config) => {
   return config;
 });
 
+// Ask for a 202 + job instead of running a long operation inside the request
+const RESPOND_ASYNC = { headers: { Prefer: 'respond-async' } };
+
 // =============================================================
 // Projects -- /api/v1/projects/
 // =============================================================
@@ -50,6 +65,23 @@ export const projectsApi = {
     const res = await api.post('/api/v1/projects/', data);
     return res.data;
   },
+
+  getCalendar: async (id: string): Promise<ProjectCalendar> => {
+    const res = await api.get(`/api/v1/projects/${id}/calendar`);
+    return res.data;
+  },
+
+  updateCalendar: async (id: string, data: ProjectCalendar): Promise<ProjectCalendar> => {
+    const res = await api.put(`/api/v1/projects/${id}/calendar`, data);
+    return res.data;
+  },
+
+  getCalendarDays: async (id: string, dateRange: DateRange): Promise<CalendarDaysResponse> => {
+    const res = await api.get(`/api/v1/projects/${id}/calendar/days`, {
+      params: { from: dateRange.from, to: dateRange.to },
+    });
+    return res.data;
+  },
 };
 
 // =============================================================
@@ -97,6 +129,27 @@ export const allocationsApi = {
     return res.data;
   },
 
+  getDailyMatrixSparse: async (
+    projectId: string,
+    dateRange: DateRange,
+  ): Promise<DailyMatrixSparseResponse> => {
+    const res = await api.get(`/api/v1/allocations/${projectId}/daily`, {
+      params: { from: dateRange.from, to: dateRange.to, format: 'v2' },
+    });
+    return res.data;
+  },
+
+  getChanges: async (
+    projectId: string,
+    since: string,
+    dateRange?: DateRange,
+  ): Promise<AllocationChangesResponse> => {
+    const res = await api.get(`/api/v1/allocations/${projectId}/changes`, {
+      params: { since, from: dateRange?.from, to: dateRange?.to },
+    });
+    return res.data;
+  },
+
   batchUpdate: async (
     projectId: string,
     updates: AllocationBatchUpdate,
@@ -105,15 +158,76 @@ export const allocationsApi = {
     return res.data;
   },
 
-  getWeekly: async (projectId: string): Promise<unknown> => {
-    const res = await api.get(`/api/v1/allocations/${projectId}/weekly`);
+  getWeekly: async (
+    projectId: string,
+    dateRange?: DateRange,
+  ): Promise<WeeklyMatrixResponse> => {
+    const res = await api.get(`/api/v1/allocations/${projectId}/weekly`, {
+      params: { from: dateRange?.from, to: dateRange?.to },
+    });
     return res.data;
   },
 
-  getSummary: async (projectId: string): Promise<unknown> => {
-    const res = await api.get(`/api/v1/allocations/${projectId}/summary`);
+  getSummary: async (projectId: string, zoom: GanttZoom = 'week'): Promise<SummaryResponse> => {
+    const res = await api.get(`/api/v1/allocations/${projectId}/summary`, {
+      params: { zoom },
+    });
     return res.data;
   },
+
+  /**
+   * Follow the project's SSE change stream until `signal` aborts.
+   * Uses fetch (EventSource cannot send the Bearer token) and reconnects
+   * with Last-Event-ID so missed writes are replayed.
+   */
+  streamChanges: async (
+    projectId: string,
+    onEvent: (event: AllocationStreamEvent) => void,
+    signal: AbortSignal,
+  ): Promise<void> => {
+    let lastEventId: string | null = null;
+    let retryMs = 3000;
+    while (!signal.aborted) {
+      try {
+        const { data: { session } } = await supabase.auth.getSession();
+        const headers: Record<string, string> = { Accept: 'text/event-stream' };
+        if (session?.access_token) headers.Authorization = `Bearer ${session.access_token}`;
+        if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+        const res = await fetch(`${API_BASE}/api/v1/allocations/${projectId}/stream`, { headers, signal });
+        if (!res.ok || !res.body) throw new Error(`stream HTTP ${res.status}`);
+
+        const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          let end: number;
+          while ((end = buffer.indexOf('\n\n')) >= 0) {
+            const message = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            const fields: Record<string, string> = {};
+            for (const line of message.split('\n')) {
+              const sep = line.indexOf(':');
+              if (sep > 0) fields[line.slice(0, sep)] = line.slice(sep + 1).trimStart();
+            }
+            if (fields.retry) retryMs = Number(fields.retry);
+            if (!fields.event) continue; // keepalive comment
+            if (fields.id) lastEventId = fields.id;
+            onEvent({
+              event: fields.event,
+              id: fields.id ? Number(fields.id) : null,
+              data: JSON.parse(fields.data),
+            } as AllocationStreamEvent);
+          }
+        }
+      } catch (err) {
+        if (signal.aborted) return;
+        console.warn('Allocation stream dropped, reconnecting', err);
+      }
+      await new Promise((resolve) => setTimeout(resolve, retryMs));
+    }
+  },
 };
 
 // =============================================================
@@ -130,6 +244,30 @@ export const baselinesApi = {
     const res = await api.post(`/api/v1/baselines/${projectId}/`, data);
     return res.data;
   },
+
+  /** Create (or rebaseline) as a background job; follow it with jobsApi.wait. */
+  createInBackground: async (
+    projectId: string,
+    data: BaselineCreate,
+    rebaseline = false,
+  ): Promise<Job<Baseline>> => {
+    const path = rebaseline ? 'rebaseline' : '';
+    const res = await api.post(`/api/v1/baselines/${projectId}/${path}`, data, RESPOND_ASYNC);
+    return res.data;
+  },
+
+  /** Variance of baseline `target` (omit for actuals) against baseline `base`. */
+  compare: async (
+    projectId: string,
+    base: number,
+    target?: number,
+    until?: string,
+  ): Promise<BaselineComparison> => {
+    const res = await api.get(`/api/v1/baselines/${projectId}/compare`, {
+      params: { base, target, until },
+    });
+    return res.data;
+  },
 };
 
 // =============================================================
@@ -162,6 +300,11 @@ export const aiApi = {
     return res.data;
   },
 
+  startForecast: async (projectId: string): Promise<Job<ForecastResponse>> => {
+    const res = await api.post(`/api/v1/ai/${projectId}/forecast`, undefined, RESPOND_ASYNC);
+    return res.data;
+  },
+
   getOptimization: async (projectId: string): Promise<{ suggestions: any[]; total: number }> => {
     const res = await api.post(`/api/v1/ai/${projectId}/optimize`);
     return res.data;
@@ -183,6 +326,22 @@ export const aiApi = {
 // =============================================================
 
 export const reportsApi = {
+  /** Merge a workbook in the export layout as a background job. */
+  importExcel: async (projectId: string, file: File): Promise<Job<ImportSummary>> => {
+    const form = new FormData();
+    form.append('file', file);
+    const res = await api.post(`/api/v1/reports/${projectId}/excel`, form, {
+      headers: { 'Content-Type': 'multipart/form-data', Prefer: 'respond-async' },
+    });
+    return res.data;
+  },
+
+  /** Render a PDF report as a background job; download it with jobsApi.download. */
+  startPdf: async (projectId: string, report: 'pdf' | 'progress'): Promise<Job<JobFileResult>> => {
+    const res = await api.get(`/api/v1/reports/${projectId}/${report}`, RESPOND_ASYNC);
+    return res.data;
+  },
+
   exportExcel: async (projectId: string): Promise<void> => {
     const res = await api.get(`/api/v1/reports/${projectId}/excel`, { responseType: 'blob' });
     const url = window.URL.createObjectURL(new Blob([res.data]));
@@ -236,4 +395,48 @@ export const reportsApi = {
   },
 };
 
+// =============================================================
+// Jobs -- /api/v1/jobs/
+// =============================================================
+
+export const jobsApi = {
+  get: async <T = unknown>(jobId: string): Promise<Job<T>> => {
+    const res = await api.get(`/api/v1/jobs/${jobId}`);
+    return res.data;
+  },
+
+  getByProject: async (projectId: string, limit = 20): Promise<Job[]> => {
+    const res = await api.get('/api/v1/jobs/', { params: { project_id: projectId, limit } });
+    return res.data;
+  },
+
+  /** Poll until the job has succeeded or failed; `onProgress` sees every intermediate state. */
+  wait: async <T = unknown>(
+    job: Job<T>,
+    onProgress?: (job: Job<T>) => void,
+    intervalMs = 1000,
+  ): Promise<Job<T>> => {
+    let current = job;
+    while (current.status === 'queued' || current.status === 'running') {
+      onProgress?.(current);
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+      current = await jobsApi.get<T>(job.id);
+    }
+    return current;
+  },
+
+  download: async (job: Job<JobFileResult>): Promise<void> => {
+    const res = await api.get(`/api/v1/jobs/${job.id}/download`, { responseType: 'blob' });
+    const contentType = res.headers['content-type'] || job.result?.media_type || 'application/pdf';
+    const url = window.URL.createObjectURL(new Blob([res.data], { type: contentType }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.setAttribute('download', job.result?.filename ?? 'report');
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    window.URL.revokeObjectURL(url);
+  },
+};
+
 export default api;
@@ -12,7 +12,7 @@ import {
   isSameDay,
 } from 'date-fns';
 import { enUS } from 'date-fns/locale';
-import type { DateRange } from '@/types';
+import type { CellData, DailyMatrixResponse, DailyMatrixSparseResponse, DateRange } from '@/types';
 
 // ----- Class Name Utility -----
 
@@ -92,3 +92,32 @@ export function calcProgress(actual: number, total: number): number {
   if (total === 0) return 0;
   return Math.min(100, (actual / total) * 100);
 }
+
+// ----- Sparse Matrix (IC-002 v2) -----
+
+export function expandSparseMatrix(sparse: DailyMatrixSparseResponse): DailyMatrixResponse {
+  const { wbs_items, date_range, future_from, cells, totals } = sparse;
+  const isFuture = date_range.map((d) => future_from !== null && d >= future_from);
+
+  const matrix: Record<string, Record<string, CellData>> = {};
+  for (const wbs of wbs_items) {
+    const row: Record<string, CellData> = {};
+    date_range.forEach((d, i) => {
+      row[d] = { planned: 0, actual: 0, qty_done: 0, is_future: isFuture[i] };
+    });
+    matrix[wbs.id] = row;
+  }
+  for (let k = 0; k < cells.row.length; k++) {
+    const cell = matrix[wbs_items[cells.row[k]].id][date_range[cells.day[k]]];
+    cell.planned = cells.planned[k];
+    cell.actual = cells.actual[k];
+    cell.qty_done = cells.qty_done[k];
+  }
+
+  const dayTotals: Record<string, { planned: number; actual: number }> = {};
+  date_range.forEach((d, i) => {
+    dayTotals[d] = { planned: totals.planned[i], actual: totals.actual[i] };
+  });
+
+  return { wbs_items, date_range, matrix, totals: dayTotals };
+}
@@ -46,6 +46,32 @@ export interface ProjectCreate {
   end_date?: string;
 }
 
+// ----- Project calendar (project_calendars table) -----
+
+export interface CalendarHoliday {
+  date: string;
+  name?: string | null;
+}
+
+export interface CalendarShutdown {
+  start: string;
+  end: string;
+  name?: string | null;
+}
+
+export interface ProjectCalendar {
+  project_id?: string;
+  working_weekdays: number[]; // ISO: 1 = Monday .. 7 = Sunday
+  holidays: CalendarHoliday[];
+  shutdowns: CalendarShutdown[];
+}
+
+export interface CalendarDaysResponse {
+  dates: string[];
+  working: boolean[];
+  kw: string[]; // "2026-KW08"
+}
+
 // ----- WBS Types (IC-001: wbs_items table) -----
 
 export interface WBSItem {
@@ -93,6 +119,7 @@ export interface DailyAllocation {
   qty_done: number;
   notes: string | null;
   source: 'grid' | 'chat';
+  updated_at?: string;
 }
 
 // ----- IC-002: Backend API → Frontend Client -----
@@ -103,6 +130,8 @@ export interface AllocationCell {
   actual_manpower?: number;
   qty_done?: number;
   notes?: string;
+  // cell updated_at or matrix as_of when read (null: it was empty); omit to overwrite unconditionally
+  expected_updated_at?: string | null;
 }
 
 export interface AllocationBatchUpdate {
@@ -113,6 +142,23 @@ export interface AllocationBatchUpdate {
 export interface AllocationBatchResponse {
   updated_count: number;
   errors: Array<{ wbs_id: string; date: string; error: string }>;
+  buffered?: boolean;
+  applied?: Array<{ wbs_id: string; date: string; updated_at: string }>;
+  conflicts?: AllocationConflict[];
+}
+
+// A cell changed by someone else since it was read; it was not written
+export interface AllocationConflict {
+  wbs_id: string;
+  date: string;
+  expected_updated_at: string | null;
+  current: {
+    planned_manpower: number;
+    actual_manpower: number;
+    qty_done: number;
+    notes: string | null;
+    updated_at: string;
+  };
 }
 
 export interface CellData {
@@ -142,8 +188,110 @@ export interface DailyMatrixResponse {
   date_range: string[];        // ["2026-02-17", "2026-02-18", ...]
   matrix: Record<string, Record<string, CellData>>;  // {wbs_id: {date: CellData}}
   totals: Record<string, { planned: number; actual: number }>;
+  as_of?: string;  // read time; send as expected_updated_at for conflict-checked edits
+}
+
+// Sparse IC-002 v2 (?format=v2): only non-empty cells, as parallel arrays
+export interface SparseCells {
+  row: number[];       // index into wbs_items
+  day: number[];       // index into date_range
+  planned: number[];
+  actual: number[];
+  qty_done: number[];
+}
+
+export interface DailyMatrixSparseResponse {
+  format: 'v2';
+  wbs_items: WBSProgress[];
+  date_range: string[];
+  future_from: string | null;  // first future date; null = none in window
+  cells: SparseCells;
+  totals: { planned: number[]; actual: number[] };  // per date_range index
+  as_of?: string;
+}
+
+// Weekly view: per-WBS sums per ISO week (KW); weeks without activity omitted
+export interface WeekInfo {
+  key: string;          // "2026-KW08"
+  year: number;
+  week: number;
+  start: string;        // Monday YYYY-MM-DD
+  end: string;          // Sunday YYYY-MM-DD
+}
+
+export interface WeeklyCell {
+  planned: number;
+  actual: number;
+  qty_done: number;
+}
+
+export interface WeeklyMatrixResponse {
+  wbs_items: WBSProgress[];
+  weeks: WeekInfo[];
+  matrix: Record<string, Record<string, WeeklyCell>>;
+  totals: Record<string, WeeklyCell>;
+}
+
+// Gantt summary: spans are inclusive [first, last] indices into `buckets`
+export type GanttZoom = 'day' | 'week' | 'month';
+
+export interface GanttBar {
+  wbs_id: string;
+  wbs_code: string;
+  wbs_name: string;
+  parent_id: string | null;
+  level: number;
+  is_summary: boolean;
+  progress_pct: number;
+  baseline_start: string | null;
+  baseline_end: string | null;
+  actual_start: string | null;
+  actual_end: string | null;     // last working day
+  forecast_end: string | null;
+  planned_manday: number;
+  actual_manday: number;
+  planned_spans: [number, number][];
+  actual_spans: [number, number][];
+}
+
+export interface SummaryResponse {
+  zoom: GanttZoom;
+  buckets: string[];             // bucket start dates
+  gantt_bars: GanttBar[];
+  milestones: { name: string; date: string; status: 'upcoming' | 'met' | 'missed' }[];
+  overall: {
+    total_progress: number;
+    total_planned_manday: number;
+    total_actual_manday: number;
+    project_health: 'on_track' | 'at_risk' | 'behind';
+  };
+}
+
+// Delta feed: rows updated after `since`; full_reload → refetch the daily matrix.
+// Recent rows repeat in the next poll (the watermark trails a few seconds): apply them idempotently.
+export interface AllocationChangesResponse {
+  watermark: string;    // pass back as `since` on the next poll
+  full_reload: boolean;
+  allocations: DailyAllocation[];
+  baselines: Baseline[];
+}
+
+// SSE stream (/allocations/{id}/stream); event ids are the project's data_version
+export interface AllocationStreamCell {
+  wbs_id: string;
+  date: string;
+  planned_manpower?: number;
+  actual_manpower?: number;
+  qty_done?: number;
+  notes?: string | null;
 }
 
+export type AllocationStreamEvent =
+  | { event: 'ready'; id: number | null; data: { version: number | null } }
+  | { event: 'cells'; id: number | null; data: { version: number | null; cells: AllocationStreamCell[] } }
+  | { event: 'changed'; id: number; data: { version: number; since: number } } // pull /changes
+  | { event: 'reset'; id: number | null; data: { reason: string } }; // reload the matrix
+
 // ----- Baseline Types -----
 
 export interface Baseline {
@@ -154,6 +302,7 @@ export interface Baseline {
   approved_at: string | null;
   is_active: boolean;
   created_at: string;
+  parent_id: string | null; // previous version; snapshots stored as a delta against it
 }
 
 export interface BaselineCreate {
@@ -161,6 +310,53 @@ export interface BaselineCreate {
   notes?: string;
 }
 
+// GET /baselines/{id}/compare; variance and shifts are target - base
+export interface BaselineRef {
+  version: number | null; // null: actual allocations
+  name: string;
+}
+
+export interface BaselineVarianceItem {
+  wbs_id: string;
+  wbs_code: string;
+  wbs_name: string;
+  level: number;
+  is_summary: boolean;
+  base_manday: number;
+  target_manday: number;
+  variance_manday: number;
+  base_start: string | null;
+  base_end: string | null;
+  target_start: string | null;
+  target_end: string | null;
+  start_shift_days: number | null;
+  finish_shift_days: number | null;
+}
+
+export interface BaselineVarianceWeek {
+  key: string;
+  start: string;
+  end: string;
+  base_manday: number;
+  target_manday: number;
+  variance_manday: number;
+}
+
+export interface BaselineComparison {
+  base: BaselineRef;
+  target: BaselineRef;
+  from_date: string;
+  to_date: string;
+  items: BaselineVarianceItem[];
+  weeks: BaselineVarianceWeek[];
+  totals: {
+    base_manday: number;
+    target_manday: number;
+    variance_manday: number;
+    variance_pct: number | null;
+  };
+}
+
 // ----- IC-003: AI Service → Frontend -----
 
 export interface ChatMessage {
@@ -203,6 +399,36 @@ export interface ForecastResponse {
   generated_at: string;
 }
 
+// ----- Background Job Types (Prefer: respond-async) -----
+
+export type JobType = 'baseline' | 'import' | 'pdf' | 'forecast';
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface JobFileResult {
+  filename: string;
+  media_type: string;
+  size: number;
+}
+
+export interface ImportSummary {
+  wbs_items: number;
+  allocations: number;
+}
+
+export interface Job<T = unknown> {
+  id: string;
+  project_id: string;
+  job_type: JobType;
+  status: JobStatus;
+  progress: number; // 0..1
+  message: string | null;
+  result: T | null; // the endpoint's response; JobFileResult for PDFs (GET /jobs/{id}/download)
+  error: ApiError | null;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 // ----- Error Types -----
 
 export interface ApiError {
@@ -0,0 +1,47 @@
+-- Migration 007: fn_daily_matrix
+-- One round trip for the daily grid (IC-002): project row, WBS progress,
+-- allocations inside the date window and the active baseline plan clipped
+-- to the same window.
+--
+-- Called from ScheduleService.get_daily_matrix via
+--   POST /rest/v1/rpc/fn_daily_matrix {p_project_id, p_from, p_to}
+
+CREATE OR REPLACE FUNCTION fn_daily_matrix(p_project_id uuid, p_from date, p_to date)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'project', (
+            SELECT to_jsonb(p) FROM projects p WHERE p.id = p_project_id
+        ),
+        'wbs_progress', COALESCE((
+            SELECT jsonb_agg(to_jsonb(v) ORDER BY v.wbs_code)
+            FROM vw_wbs_progress v
+            WHERE v.project_id = p_project_id
+        ), '[]'::jsonb),
+        'allocations', COALESCE((
+            SELECT jsonb_agg(to_jsonb(da) ORDER BY da.date)
+            FROM daily_allocations da
+            JOIN wbs_items w ON w.id = da.wbs_item_id
+            WHERE w.project_id = p_project_id
+              AND da.date BETWEEN p_from AND p_to
+        ), '[]'::jsonb),
+        'baseline_plan', COALESCE((
+            SELECT jsonb_object_agg(
+                s.wbs_item_id::text,
+                COALESCE((
+                    SELECT jsonb_object_agg(e.key, e.value)
+                    FROM jsonb_each(s.daily_plan) AS e(key, value)
+                    WHERE e.key::date BETWEEN p_from AND p_to
+                ), '{}'::jsonb)
+            )
+            FROM baselines b
+            JOIN baseline_snapshots s ON s.baseline_id = b.id
+            WHERE b.project_id = p_project_id
+              AND b.is_active
+        ), '{}'::jsonb)
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION fn_daily_matrix(uuid, date, date) TO authenticated, service_role;
@@ -0,0 +1,7 @@
+-- Migration 008: updated_at indexes for the allocation delta feed
+-- GET /api/v1/allocations/{project_id}/changes?since=... filters
+-- daily_allocations and baselines on updated_at > watermark. updated_at is
+-- maintained by the fn_update_timestamp triggers from migration 001.
+
+CREATE INDEX IF NOT EXISTS idx_allocations_wbs_updated ON daily_allocations(wbs_item_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_baselines_project_updated ON baselines(project_id, updated_at);
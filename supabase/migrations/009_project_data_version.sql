@@ -0,0 +1,20 @@
+-- Migration 009: per-project change version
+-- projects.data_version is incremented by the API on every mutation path
+-- (allocation upserts, chat apply, Excel/WBS import, WBS edits, baseline
+-- creation). Read endpoints derive their ETag from it and answer
+-- If-None-Match with 304 after a single primary-key lookup.
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS data_version bigint NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION fn_bump_project_version(p_project_id uuid)
+RETURNS bigint
+LANGUAGE sql
+VOLATILE
+AS $$
+    UPDATE projects
+    SET data_version = data_version + 1
+    WHERE id = p_project_id
+    RETURNING data_version;
+$$;
+
+GRANT EXECUTE ON FUNCTION fn_bump_project_version(uuid) TO authenticated, service_role;
@@ -0,0 +1,36 @@
+-- Migration 010: expose parent_id on vw_wbs_progress
+-- Summary rows are rolled up in the API (rollup_engine) from the per-row
+-- aggregates; the view only needs to carry the tree edge so the daily grid
+-- does not have to read wbs_items a second time. New columns go last so
+-- CREATE OR REPLACE VIEW keeps the existing column order.
+
+CREATE OR REPLACE VIEW vw_wbs_progress AS
+SELECT
+    w.id,
+    w.project_id,
+    w.wbs_code,
+    w.wbs_name,
+    w.qty,
+    w.unit,
+    w.sort_order,
+    w.level,
+    w.is_summary,
+    COALESCE(SUM(da.qty_done), 0) AS done,
+    w.qty - COALESCE(SUM(da.qty_done), 0) AS remaining,
+    CASE WHEN w.qty > 0
+        THEN ROUND(COALESCE(SUM(da.qty_done), 0) / w.qty * 100, 1)
+        ELSE 0
+    END AS progress_pct,
+    COALESCE(SUM(da.actual_manpower), 0) AS total_actual_manday,
+    COUNT(DISTINCT da.date) FILTER (WHERE da.actual_manpower > 0) AS working_days,
+    CASE
+        WHEN SUM(da.actual_manpower) > 0
+        THEN ROUND(SUM(da.qty_done) / SUM(da.actual_manpower), 3)
+        ELSE 0
+    END AS productivity_rate,
+    MIN(da.date) FILTER (WHERE da.actual_manpower > 0) AS first_working_day,
+    MAX(da.date) FILTER (WHERE da.actual_manpower > 0) AS last_working_day,
+    w.parent_id
+FROM wbs_items w
+LEFT JOIN daily_allocations da ON da.wbs_item_id = w.id
+GROUP BY w.id, w.project_id, w.wbs_code, w.wbs_name, w.qty, w.unit, w.sort_order, w.level, w.is_summary, w.parent_id;
@@ -0,0 +1,36 @@
+-- Migration 011: per-project working-day calendar
+-- One row per project (absent row = default Mon-Sat calendar). The API
+-- expands it into an ordinal day index (calendar_engine.WorkCalendar) for
+-- forecast date arithmetic and the grid's non-working-day shading.
+--
+-- working_weekdays: ISO weekdays that are worked (1 = Monday .. 7 = Sunday)
+-- holidays:  [{"date": "2026-05-01", "name": "Tag der Arbeit"}]
+-- shutdowns: [{"start": "2026-12-21", "end": "2027-01-06", "name": "Winter shutdown"}]
+
+CREATE TABLE IF NOT EXISTS project_calendars (
+    project_id uuid PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+    working_weekdays smallint[] NOT NULL DEFAULT '{1,2,3,4,5,6}'
+        CHECK (working_weekdays <@ '{1,2,3,4,5,6,7}'::smallint[] AND cardinality(working_weekdays) > 0),
+    holidays jsonb NOT NULL DEFAULT '[]'::jsonb,
+    shutdowns jsonb NOT NULL DEFAULT '[]'::jsonb,
+    created_at timestamptz DEFAULT now() NOT NULL,
+    updated_at timestamptz DEFAULT now() NOT NULL
+);
+
+CREATE TRIGGER trg_project_calendars_updated
+    BEFORE UPDATE ON project_calendars
+    FOR EACH ROW EXECUTE FUNCTION fn_update_timestamp();
+
+ALTER TABLE project_calendars ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can read project_calendars"
+    ON project_calendars FOR SELECT TO authenticated
+    USING (fn_is_project_member(project_id));
+
+CREATE POLICY "Members can insert project_calendars"
+    ON project_calendars FOR INSERT TO authenticated
+    WITH CHECK (fn_is_project_member(project_id));
+
+CREATE POLICY "Members can update project_calendars"
+    ON project_calendars FOR UPDATE TO authenticated
+    USING (fn_is_project_member(project_id));
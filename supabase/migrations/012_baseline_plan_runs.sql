@@ -0,0 +1,104 @@
+-- Migration 012: run-length baseline plans
+-- baseline_snapshots.daily_plan held one JSON key per planned day
+-- ({"2026-02-17": 5, ...}). Plans are now stored as run-length segments
+-- starting at start_date: plan_runs[i] consecutive days at plan_values[i],
+-- covering every day up to end_date, with gaps as runs of 0. A constant crew
+-- over six months is one segment instead of ~180 keys; the API expands the
+-- runs straight into the matrix arrays (baseline_engine.decode_plans).
+--
+-- Existing snapshots are converted below and their daily_plan cleared.
+-- Run VACUUM FULL baseline_snapshots afterwards to return the space.
+
+ALTER TABLE baseline_snapshots ADD COLUMN IF NOT EXISTS plan_runs integer[];
+ALTER TABLE baseline_snapshots ADD COLUMN IF NOT EXISTS plan_values numeric(8,2)[];
+ALTER TABLE baseline_snapshots ALTER COLUMN daily_plan DROP DEFAULT;
+
+WITH plan AS (
+    SELECT s.id, e.key::date AS day, e.value::numeric AS value
+    FROM baseline_snapshots s, jsonb_each_text(s.daily_plan) AS e(key, value)
+    WHERE s.plan_runs IS NULL
+      AND e.value::numeric > 0
+),
+cells AS (
+    -- Every day between the first and last planned day, 0 where nothing is planned
+    SELECT b.id, g.day::date AS day, COALESCE(p.value, 0) AS value
+    FROM (SELECT id, min(day) AS first_day, max(day) AS last_day FROM plan GROUP BY id) b
+    CROSS JOIN LATERAL generate_series(b.first_day, b.last_day, interval '1 day') AS g(day)
+    LEFT JOIN plan p ON p.id = b.id AND p.day = g.day::date
+),
+runs AS (
+    -- Consecutive days with the same value share (day rank - rank within value)
+    SELECT id, value, min(day) AS run_start, count(*)::integer AS run_length
+    FROM (
+        SELECT id, day, value,
+               row_number() OVER (PARTITION BY id ORDER BY day)
+               - row_number() OVER (PARTITION BY id, value ORDER BY day) AS grp
+        FROM cells
+    ) c
+    GROUP BY id, value, grp
+)
+UPDATE baseline_snapshots s
+SET plan_runs = r.plan_runs,
+    plan_values = r.plan_values,
+    start_date = r.first_day,
+    end_date = r.last_day
+FROM (
+    SELECT id,
+           array_agg(run_length ORDER BY run_start) AS plan_runs,
+           array_agg(value ORDER BY run_start) AS plan_values,
+           min(run_start) AS first_day,
+           max(run_start + run_length - 1) AS last_day
+    FROM runs
+    GROUP BY id
+) r
+WHERE s.id = r.id;
+
+-- Snapshots without any planned day
+UPDATE baseline_snapshots
+SET plan_runs = '{}', plan_values = '{}', start_date = NULL, end_date = NULL
+WHERE plan_runs IS NULL;
+
+UPDATE baseline_snapshots SET daily_plan = NULL WHERE daily_plan IS NOT NULL;
+
+-- fn_daily_matrix (migration 007) now returns the active baseline's
+-- snapshots overlapping the window as runs instead of an expanded
+-- {wbs_item_id: {date: manpower}} object; the API clips them to the window.
+CREATE OR REPLACE FUNCTION fn_daily_matrix(p_project_id uuid, p_from date, p_to date)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'project', (
+            SELECT to_jsonb(p) FROM projects p WHERE p.id = p_project_id
+        ),
+        'wbs_progress', COALESCE((
+            SELECT jsonb_agg(to_jsonb(v) ORDER BY v.wbs_code)
+            FROM vw_wbs_progress v
+            WHERE v.project_id = p_project_id
+        ), '[]'::jsonb),
+        'allocations', COALESCE((
+            SELECT jsonb_agg(to_jsonb(da) ORDER BY da.date)
+            FROM daily_allocations da
+            JOIN wbs_items w ON w.id = da.wbs_item_id
+            WHERE w.project_id = p_project_id
+              AND da.date BETWEEN p_from AND p_to
+        ), '[]'::jsonb),
+        'baseline_snapshots', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'wbs_item_id', s.wbs_item_id,
+                'start_date', s.start_date,
+                'plan_runs', s.plan_runs,
+                'plan_values', s.plan_values
+            ))
+            FROM baselines b
+            JOIN baseline_snapshots s ON s.baseline_id = b.id
+            WHERE b.project_id = p_project_id
+              AND b.is_active
+              AND s.start_date <= p_to
+              AND s.end_date >= p_from
+        ), '[]'::jsonb)
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION fn_daily_matrix(uuid, date, date) TO authenticated, service_role;
@@ -0,0 +1,38 @@
+-- Migration 013: fn_daily_matrix names the active baseline instead of shipping it
+-- A baseline's snapshots never change after creation, so the API keeps
+-- decoded plans in an in-process cache keyed by baseline id
+-- (baseline_cache). The grid RPC now returns only the active baseline's id
+-- and the API reads its snapshots once per baseline rather than on every
+-- matrix load.
+
+CREATE OR REPLACE FUNCTION fn_daily_matrix(p_project_id uuid, p_from date, p_to date)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'project', (
+            SELECT to_jsonb(p) FROM projects p WHERE p.id = p_project_id
+        ),
+        'wbs_progress', COALESCE((
+            SELECT jsonb_agg(to_jsonb(v) ORDER BY v.wbs_code)
+            FROM vw_wbs_progress v
+            WHERE v.project_id = p_project_id
+        ), '[]'::jsonb),
+        'allocations', COALESCE((
+            SELECT jsonb_agg(to_jsonb(da) ORDER BY da.date)
+            FROM daily_allocations da
+            JOIN wbs_items w ON w.id = da.wbs_item_id
+            WHERE w.project_id = p_project_id
+              AND da.date BETWEEN p_from AND p_to
+        ), '[]'::jsonb),
+        'active_baseline_id', (
+            SELECT b.id FROM baselines b
+            WHERE b.project_id = p_project_id
+              AND b.is_active
+            LIMIT 1
+        )
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION fn_daily_matrix(uuid, date, date) TO authenticated, service_role;
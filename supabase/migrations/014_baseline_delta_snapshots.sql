@@ -0,0 +1,12 @@
+-- Migration 014: delta-encoded baselines
+-- A rebaseline stores snapshots only for the WBS items whose plan differs
+-- from the previous version (parent_id); unchanged items are inherited.
+-- The API resolves a version's full snapshot set by walking parent_id and
+-- taking, per WBS item, the row of the nearest version
+-- (baseline_cache.materialize_snapshots). Existing baselines keep their
+-- full snapshot sets and parent_id NULL.
+
+ALTER TABLE baselines ADD COLUMN IF NOT EXISTS parent_id uuid REFERENCES baselines(id) ON DELETE RESTRICT;
+
+CREATE INDEX IF NOT EXISTS idx_baselines_parent ON baselines(parent_id);
+CREATE INDEX IF NOT EXISTS idx_snapshots_baseline_wbs ON baseline_snapshots(baseline_id, wbs_item_id);
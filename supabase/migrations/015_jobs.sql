@@ -0,0 +1,42 @@
+-- Migration 015: background jobs
+-- Long operations (baseline creation, Excel import, PDF reports, forecasts)
+-- can run as jobs (backend/services/job_runner.py): the request returns 202
+-- with the job id and the client polls GET /api/v1/jobs/{id}. The row is the
+-- job's state for every API worker; the work itself runs in the process
+-- named by ``worker`` (host:pid), which fails its interrupted jobs on
+-- restart.
+--
+-- progress: 0..1, written at most every job_progress_interval_s
+-- result:   the operation's JSON response, or {filename, media_type, size}
+--           for file results (served from job_artifact_dir)
+-- error:    {"error": "...", "code": "..."} as an HTTP error detail
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id uuid DEFAULT gen_random_uuid() PRIMARY KEY,
+    project_id uuid NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    job_type text NOT NULL CHECK (job_type IN ('baseline', 'import', 'pdf', 'forecast')),
+    status text NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    progress numeric(5,4) NOT NULL DEFAULT 0 CHECK (progress BETWEEN 0 AND 1),
+    message text,
+    params jsonb NOT NULL DEFAULT '{}'::jsonb,
+    result jsonb,
+    error jsonb,
+    worker text,
+    started_at timestamptz,
+    finished_at timestamptz,
+    created_at timestamptz DEFAULT now() NOT NULL,
+    updated_at timestamptz DEFAULT now() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_project_created ON jobs(project_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_unfinished ON jobs(worker) WHERE status IN ('queued', 'running');
+
+CREATE TRIGGER trg_jobs_updated
+    BEFORE UPDATE ON jobs
+    FOR EACH ROW EXECUTE FUNCTION fn_update_timestamp();
+
+ALTER TABLE jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can read jobs"
+    ON jobs FOR SELECT TO authenticated
+    USING (fn_is_project_member(project_id));
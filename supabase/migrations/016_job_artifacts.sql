@@ -0,0 +1,27 @@
+-- Migration 016: job file results in the database
+-- File results of background jobs (PDF reports) were written to the local
+-- job_artifact_dir of the worker that ran the job, so a download answered
+-- by another worker or host found a succeeded job without its file. They
+-- are now stored here, next to the job row, and any API worker can serve
+-- GET /api/v1/jobs/{id}/download. The job's result keeps
+-- {filename, media_type, size}.
+--
+-- content: the file, base64-encoded (PostgREST exchanges JSON)
+-- Rows older than job_retention_hours are deleted by JobRunner.recover on
+-- startup; a download after that answers 410 JOB_RESULT_EXPIRED.
+
+CREATE TABLE IF NOT EXISTS job_artifacts (
+    job_id uuid PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+    filename text NOT NULL,
+    media_type text NOT NULL,
+    content text NOT NULL,
+    created_at timestamptz DEFAULT now() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_artifacts_created ON job_artifacts(created_at);
+
+ALTER TABLE job_artifacts ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can read job artifacts"
+    ON job_artifacts FOR SELECT TO authenticated
+    USING (EXISTS (SELECT 1 FROM jobs j WHERE j.id = job_id AND fn_is_project_member(j.project_id)));
@@ -0,0 +1,65 @@
+"""Helpers shared by the backend tests."""
+
+import random
+from datetime import timedelta
+
+import pytest
+
+
+@pytest.fixture
+def count_table_calls(monkeypatch):
+    """``calls = count_table_calls()`` — from then on, every MockDB.table(name) appends name to ``calls``."""
+    from backend.models import db as db_module
+
+    def start():
+        calls = []
+        original = db_module.MockDB.table
+
+        def counting(self, name):
+            calls.append(name)
+            return original(self, name)
+
+        monkeypatch.setattr(db_module.MockDB, "table", counting)
+        return calls
+
+    return start
+
+
+def _random_project(n_items, n_days, start, seed=7):
+    """WBS items, allocations (date order) and a baseline plan ``{wbs_id: {date: planned}}``.
+
+    Covers the engine branches: about 10% of the items have no allocations,
+    15% none in the last 30 days, qty 0 occurs; allocations and plan spill 5
+    days either side of the window and one allocation belongs to no item.
+    """
+    rng = random.Random(seed)
+    wbs_items, allocations, plan = [], [], {}
+    for i in range(n_items):
+        wbs_id = f"10000000-0000-0000-0000-{i:012d}"
+        wbs_items.append({
+            "id": wbs_id, "wbs_code": f"W-{i:04d}", "wbs_name": f"Item {i}",
+            "qty": rng.choice([0, 20, 80, 150, 400, 2000]),
+        })
+        plan[wbs_id] = {}
+        kind = rng.random()
+        last_day = -5 if kind < 0.1 else n_days - 30 if kind < 0.25 else n_days + 5
+        for day in range(-5, n_days + 5):
+            d = (start + timedelta(days=day)).isoformat()
+            if day < last_day and rng.random() < 0.5:
+                allocations.append({
+                    "wbs_item_id": wbs_id, "date": d,
+                    "planned_manpower": rng.randint(0, 8),
+                    "actual_manpower": rng.randint(0, 8),
+                    "qty_done": rng.randint(0, 12) / 2,
+                })
+            if rng.random() < 0.3:
+                plan[wbs_id][d] = float(rng.randint(0, 6))
+    allocations.append({"wbs_item_id": "unknown", "date": start.isoformat(), "actual_manpower": 3, "qty_done": 1})
+    allocations.sort(key=lambda a: a["date"])
+    return wbs_items, allocations, plan
+
+
+@pytest.fixture
+def random_project():
+    """``random_project(n_items, n_days, start, seed=7)`` -> (wbs_items, allocations, plan)."""
+    return _random_project
@@ -0,0 +1,31 @@
+"""Tests for the audit middleware."""
+
+import asyncio
+import time
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.middleware.audit import AuditMiddleware
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+
+
+class TestAuditMiddleware:
+    def test_insert_does_not_hold_the_response(self, mock_db, monkeypatch):
+        written = []
+
+        async def slow_persist(record):
+            await asyncio.sleep(0.2)
+            written.append(record)
+
+        monkeypatch.setattr(AuditMiddleware, "_persist", staticmethod(slow_persist))
+        with TestClient(app) as client:
+            resp = client.post(f"/api/v1/baselines/{PROJECT_ID}/", json={"name": "v1"})
+            assert resp.status_code in (200, 201) and written == []
+            for _ in range(100):
+                if written:
+                    break
+                time.sleep(0.01)
+        assert [(r["method"], r["status_code"]) for r in written] == [("POST", resp.status_code)]
@@ -0,0 +1,209 @@
+"""Tests for the active-baseline plan cache and delta baseline resolution."""
+
+from datetime import date
+from uuid import UUID
+
+import pytest
+
+from backend.models.schemas import BaselineCreate
+from backend.services import baseline_cache as baseline_cache_module
+from backend.services import schedule_service
+from backend.services.baseline_cache import BaselinePlanCache, baseline_cache, materialize_snapshots
+from backend.services.baseline_engine import daily_plan, decode_plans
+from backend.services.baseline_service import BaselineService
+from backend.services.schedule_service import ScheduleService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+CW_02 = "10000000-0000-0000-0000-000000000002"
+
+
+
+async def _planned(day):
+    result = await ScheduleService().get_daily_matrix(PROJECT_ID, day, day)
+    return result["matrix"][CW_01][day.isoformat()]["planned"]
+
+
+class TestBaselinePlanCache:
+    @pytest.mark.asyncio
+    async def test_grid_loads_read_no_snapshots(self, mock_db, count_table_calls):
+        await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        calls = count_table_calls()
+
+        assert await _planned(date(2026, 2, 17)) == 6.0
+        assert await _planned(date(2026, 2, 18)) == 5.0
+        assert "baseline_snapshots" not in calls
+
+    @pytest.mark.asyncio
+    async def test_plan_loaded_once_per_baseline(self, mock_db, count_table_calls):
+        await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        baseline_cache.invalidate()  # e.g. a fresh worker
+        calls = count_table_calls()
+
+        await _planned(date(2026, 2, 17))
+        await ScheduleService().upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-02-18", "actual_manpower": 9}]
+        )
+        assert await _planned(date(2026, 2, 18)) == 5.0  # still the baseline value
+        assert calls.count("baseline_snapshots") == 1
+
+    @pytest.mark.asyncio
+    async def test_rebaseline_switches_plan(self, mock_db):
+        service = BaselineService()
+        await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        assert await _planned(date(2026, 2, 18)) == 5.0
+
+        await ScheduleService().upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-02-18", "actual_manpower": 9}]
+        )
+        await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"))
+        assert await _planned(date(2026, 2, 18)) == 9.0
+
+    @pytest.mark.asyncio
+    async def test_active_id_follows_version(self, mock_db, count_table_calls):
+        service = BaselineService()
+        await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        calls = count_table_calls()
+
+        await service.get_active_baseline_plan(PROJECT_ID)
+        assert "baselines" not in calls
+
+        mock_db.rpc("fn_bump_project_version", {"p_project_id": str(PROJECT_ID)}).execute()  # another worker
+        plan = await service.get_active_baseline_plan(PROJECT_ID)
+        assert calls.count("baselines") == 1 and "baseline_snapshots" not in calls
+        assert plan.to_nested()[CW_01]["2026-02-17"] == 6.0
+
+    @pytest.mark.asyncio
+    async def test_fallback_path_uses_cache(self, mock_db, monkeypatch, count_table_calls):
+        await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        monkeypatch.setattr(schedule_service, "_matrix_rpc_available", False)
+        calls = count_table_calls()
+
+        assert await _planned(date(2026, 2, 17)) == 6.0
+        assert "baselines" not in calls and "baseline_snapshots" not in calls
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, mock_db):
+        service = BaselineService()
+        ids = [(await service.create_baseline(PROJECT_ID, BaselineCreate(name=f"v{i}")))["id"] for i in range(3)]
+        cache = BaselinePlanCache(max_plans=2)
+        for bid in ids:
+            await cache.plan(bid)
+        await cache.plan(ids[2])
+
+        assert cache.stats()["baselines"] == 2
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_baseline_being_built_is_not_cached(self, mock_db):
+        service = BaselineService()
+        v1 = await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        await ScheduleService().upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-02-18", "actual_manpower": 9}]
+        )
+        other_worker = BaselinePlanCache()
+        seen = {}
+
+        async def progress(fraction, message=None):
+            if message and message.startswith("Writing snapshots") and not seen:
+                building = mock_db.table("baselines").select("id").eq("version", 2).execute().data[0]["id"]
+                seen["active"] = await other_worker.active_id(PROJECT_ID, None)
+                # Nothing written yet: materialized through the parent, CW-01 still has v1's value
+                seen["partial"] = (await other_worker.plan(building)).to_nested()[CW_01]["2026-02-18"]
+
+        v2 = await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"), progress)
+        assert seen == {"active": v1["id"], "partial": 5.0}
+        assert other_worker.stats()["baselines"] == 0
+        assert v2["is_active"] and v2["approved_at"]
+        assert (await other_worker.plan(v2["id"])).to_nested()[CW_01]["2026-02-18"] == 9.0
+
+    @pytest.mark.asyncio
+    async def test_load_in_flight_keeps_seeded_plan(self, mock_db, monkeypatch):
+        v1 = await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        cache = BaselinePlanCache()
+        seeded = decode_plans([])
+        original = baseline_cache_module._materialize
+
+        async def racing(baseline_id, columns):
+            loaded = await original(baseline_id, columns)
+            cache.store(baseline_id, seeded)  # create_baseline finished meanwhile
+            return loaded
+
+        monkeypatch.setattr(baseline_cache_module, "_materialize", racing)
+        assert await cache.plan(v1["id"]) is seeded
+        assert await cache.plan(v1["id"]) is seeded
+
+
+class TestDeltaBaselines:
+    @staticmethod
+    def _stored(db, baseline_id):
+        return db.table("baseline_snapshots").select("*").eq("baseline_id", baseline_id).execute().data
+
+    @staticmethod
+    async def _edit(rows):
+        await ScheduleService().upsert_allocations(PROJECT_ID, [
+            {"wbs_item_id": wbs_id, "date": day, "actual_manpower": mp} for wbs_id, day, mp in rows
+        ])
+
+    @pytest.mark.asyncio
+    async def test_rebaseline_stores_only_changed_items(self, mock_db):
+        service = BaselineService()
+        v1 = await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        await self._edit([(CW_01, "2026-02-18", 9)])
+        v2 = await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"))
+        v3 = await service.rebaseline(PROJECT_ID, BaselineCreate(name="v3"))
+
+        assert (v2["parent_id"], v3["parent_id"]) == (v1["id"], v2["id"])
+        assert [s["wbs_item_id"] for s in self._stored(mock_db, v2["id"])] == [CW_01]
+        assert self._stored(mock_db, v3["id"]) == []
+
+        full_v1 = {s["wbs_item_id"]: s for s in await materialize_snapshots(v1["id"])}
+        full_v3 = {s["wbs_item_id"]: s for s in await materialize_snapshots(v3["id"])}
+        assert full_v3.keys() == full_v1.keys()
+        assert daily_plan(full_v3[CW_01])["2026-02-18"] == 9.0
+        assert full_v3[CW_02]["baseline_id"] == v1["id"]  # inherited
+
+    @pytest.mark.asyncio
+    async def test_unrounded_manpower_is_unchanged_after_round_trip(self, mock_db):
+        service = BaselineService()
+        cw_01 = mock_db.table("daily_allocations").select("date").eq("wbs_item_id", CW_01).execute().data
+        await self._edit([(CW_01, a["date"], 1.333) for a in cw_01])
+        v1 = await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        # plan_values is numeric(8,2): what is read back is rounded
+        for row in self._stored(mock_db, v1["id"]):
+            mock_db.table("baseline_snapshots").update(
+                {"plan_values": [round(float(v), 2) for v in row["plan_values"]]}
+            ).eq("id", row["id"]).execute()
+        baseline_cache.invalidate()
+
+        v2 = await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"))
+        assert self._stored(mock_db, v2["id"]) == []
+        active = await service.get_active_baseline_plan(PROJECT_ID)
+        assert set(active.to_nested()[CW_01].values()) == {1.33}
+
+    @pytest.mark.asyncio
+    async def test_cleared_plan_overrides_parent(self, mock_db):
+        service = BaselineService()
+        await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        cw_01 = mock_db.table("daily_allocations").select("date").eq("wbs_item_id", CW_01).execute().data
+        await self._edit([(CW_01, a["date"], 0) for a in cw_01])
+        await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"))
+
+        v1, v2 = await service.get_baseline(PROJECT_ID, 1), await service.get_baseline(PROJECT_ID, 2)
+        plans_v1 = {s["wbs_item_id"]: s["daily_plan"] for s in v1["snapshots"]}
+        plans_v2 = {s["wbs_item_id"]: s["daily_plan"] for s in v2["snapshots"]}
+        assert plans_v1[CW_01] and plans_v2[CW_01] == {}
+        assert plans_v2[CW_02] == plans_v1[CW_02]
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_resolves_chain(self, mock_db):
+        service = BaselineService()
+        await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        await self._edit([(CW_01, "2026-02-17", 2)])
+        await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"))
+        warm = (await service.get_active_baseline_plan(PROJECT_ID)).to_nested()
+
+        baseline_cache.invalidate()
+        cold = (await service.get_active_baseline_plan(PROJECT_ID)).to_nested()
+        assert cold == warm
+        assert cold[CW_01]["2026-02-17"] == 2.0
@@ -0,0 +1,157 @@
+"""Tests for set-based baseline snapshot creation and the run-length plan encoding."""
+
+import random
+from datetime import date, timedelta
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from backend.models.db import MockTable
+from backend.models.schemas import BaselineCreate
+from backend.services import baseline_service
+from backend.services.baseline_engine import daily_plan, decode_plans, encode_runs, snapshot_rows
+from backend.services.matrix_engine import build_daily_matrix
+from backend.services.baseline_service import BaselineService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+
+
+def _per_item_snapshots(baseline_id, wbs_items, allocations):
+    """The original per-WBS loop of BaselineService.create_baseline."""
+    out = []
+    for item in wbs_items:
+        allocs = sorted((a for a in allocations if a["wbs_item_id"] == item["id"]), key=lambda a: a["date"])
+        daily_plan, total, start, end = {}, 0.0, None, None
+        for a in allocs:
+            mp = float(a.get("actual_manpower", 0))
+            if mp > 0:
+                daily_plan[a["date"]] = mp
+                total += mp
+                start = start or a["date"]
+                end = a["date"]
+        out.append({
+            "baseline_id": baseline_id, "wbs_item_id": item["id"], "total_manday": total,
+            "start_date": start, "end_date": end, "daily_plan": daily_plan,
+            "manpower_per_day": round(total / len(daily_plan) if daily_plan else 0, 2),
+        })
+    return out
+
+
+class TestSnapshotRows:
+    def test_matches_per_item_loop(self):
+        rng = random.Random(3)
+        wbs_items = [{"id": f"w{i}"} for i in range(40)]
+        allocations = [
+            {"wbs_item_id": w["id"], "date": (date(2026, 1, 1) + timedelta(days=d)).isoformat(),
+             "actual_manpower": rng.choice([0, 0, 1, 2.5, 6])}
+            for w in wbs_items[:-5] for d in rng.sample(range(200), 30)
+        ]
+        allocations.append({"wbs_item_id": "other-project", "date": "2026-01-05", "actual_manpower": 3})
+        rng.shuffle(allocations)
+
+        rows = snapshot_rows("b1", wbs_items, allocations)
+        for row in rows:
+            row["daily_plan"] = daily_plan(row)
+            del row["plan_runs"], row["plan_values"]
+        assert rows == _per_item_snapshots("b1", wbs_items, allocations)
+
+    def test_empty(self):
+        assert snapshot_rows("b1", [{"id": "w"}], []) == [{
+            "baseline_id": "b1", "wbs_item_id": "w", "total_manday": 0.0, "start_date": None,
+            "end_date": None, "plan_runs": [], "plan_values": [], "manpower_per_day": 0,
+        }]
+
+
+class TestPlanEncoding:
+    def test_constant_crew_is_one_run(self):
+        days = np.arange(20000, 20180)
+        assert encode_runs(days, np.full(180, 4.0)) == ([180], [4.0])
+
+    def test_gaps_are_zero_runs(self):
+        assert encode_runs(np.array([10, 11, 12, 15, 16]), np.array([4, 4, 4, 2.5, 2.5])) == ([3, 2, 2], [4, 0, 2.5])
+
+    def test_values_rounded_like_numeric_column(self):
+        days = np.array([10, 11, 12, 13])
+        assert encode_runs(days, np.array([1.333, 1.334, 1.005, 0.125])) == ([2, 1, 1], [1.33, 1.01, 0.13])
+
+    def test_decode_mixed_rows(self):
+        plan = decode_plans([
+            {"wbs_item_id": "a", "start_date": "2026-02-27", "plan_runs": [2, 1, 1], "plan_values": [3, 0, 1.5]},
+            {"wbs_item_id": "b", "start_date": None, "plan_runs": [], "plan_values": []},
+            {"wbs_item_id": "c", "daily_plan": {"2026-01-05": 2, "2026-01-06": 0}},  # written before migration 012
+        ])
+        assert plan.to_nested() == {
+            "a": {"2026-02-27": 3.0, "2026-02-28": 3.0, "2026-03-02": 1.5},
+            "b": {},
+            "c": {"2026-01-05": 2.0},
+        }
+        assert plan.bounds() == (date(2026, 1, 5), date(2026, 3, 2))
+
+    def test_matrix_from_runs_matches_nested(self):
+        rng = random.Random(5)
+        wbs_items = [{"id": f"w{i}"} for i in range(30)]
+        allocations = [
+            {"wbs_item_id": w["id"], "date": (date(2026, 1, 1) + timedelta(days=d)).isoformat(),
+             "actual_manpower": rng.choice([0, 3, 3, 4])}
+            for w in wbs_items for d in range(rng.randint(0, 20), rng.randint(40, 120))
+        ]
+        plan = decode_plans(snapshot_rows("b1", wbs_items, allocations))
+        wbs_ids = ["w3", "w0", "unknown"] + [w["id"] for w in wbs_items[5:]]
+        window = (date(2026, 1, 20), date(2026, 3, 10))
+
+        from_runs = build_daily_matrix(wbs_ids, *window, [], plan)
+        from_nested = build_daily_matrix(wbs_ids, *window, [], plan.to_nested())
+        assert np.array_equal(from_runs.planned, from_nested.planned)
+        assert from_runs.planned.sum() > 0
+
+
+class TestCreateBaseline:
+    @pytest.mark.asyncio
+    async def test_bulk_reads_and_inserts(self, mock_db, monkeypatch):
+        monkeypatch.setattr(baseline_service, "_INSERT_CHUNK_SIZE", 4)
+        inserts = []
+        original = MockTable.insert
+
+        def counting_insert(self, data):
+            inserts.append(data)
+            return original(self, data)
+
+        monkeypatch.setattr(MockTable, "insert", counting_insert)
+        wbs_items = mock_db.table("wbs_items").select("id").eq("project_id", str(PROJECT_ID)).execute().data
+        wbs_ids = [w["id"] for w in wbs_items]
+
+        baseline = await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+
+        snapshot_inserts = inserts[1:]  # first insert is the baselines row
+        assert [len(chunk) for chunk in snapshot_inserts] == [4] * (len(wbs_ids) // 4) + (
+            [len(wbs_ids) % 4] if len(wbs_ids) % 4 else []
+        )
+        stored = mock_db.table("baseline_snapshots").select("*").eq("baseline_id", baseline["id"]).execute().data
+        assert sorted(s["wbs_item_id"] for s in stored) == sorted(wbs_ids)
+
+        allocations = mock_db.table("daily_allocations").select("*").execute().data
+        expected = {s["wbs_item_id"]: s for s in _per_item_snapshots(baseline["id"], wbs_items, allocations)}
+        for s in stored:
+            assert daily_plan(s) == expected[s["wbs_item_id"]]["daily_plan"]
+            assert s["total_manday"] == expected[s["wbs_item_id"]]["total_manday"]
+
+    @pytest.mark.asyncio
+    async def test_versions_increment(self, mock_db):
+        service = BaselineService()
+        first = await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        second = await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"))
+
+        assert (first["version"], second["version"]) == (1, 2)
+        baselines = mock_db.table("baselines").select("*").eq("project_id", str(PROJECT_ID)).execute().data
+        assert [b["version"] for b in baselines if b["is_active"]] == [2]
+
+    @pytest.mark.asyncio
+    async def test_get_baseline_returns_daily_plan(self, mock_db):
+        service = BaselineService()
+        await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        baseline = await service.get_baseline(PROJECT_ID, 1)
+
+        snap = next(s for s in baseline["snapshots"] if s["wbs_item_id"] == "10000000-0000-0000-0000-000000000001")
+        assert snap["daily_plan"]["2026-02-17"] == 6.0
+        assert "plan_runs" not in snap
@@ -0,0 +1,141 @@
+"""Tests for the working-day calendar and the project calendar endpoints."""
+
+from datetime import date, timedelta
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.ai.forecast import ForecastEngine
+from backend.services.calendar_engine import WorkCalendar
+from backend.services.compute_engine import estimate_completion_date
+from backend.services.project_snapshot import get_project_snapshot
+from backend.services.project_version import get_project_version
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CALENDAR_URL = f"/api/v1/projects/{PROJECT_ID}/calendar"
+
+SAT = date(2026, 2, 21)
+SUN = date(2026, 2, 22)
+MON = date(2026, 2, 23)
+
+
+def _calendar(**kwargs):
+    return WorkCalendar(date(2026, 1, 1), date(2026, 12, 31), **kwargs)
+
+
+class TestWorkCalendar:
+    def test_default_skips_sundays(self):
+        cal = _calendar()
+        assert cal.is_working_day(SAT) and not cal.is_working_day(SUN)
+        assert cal.add_working_days(SAT, 1) == MON
+        assert cal.next_working_day(SUN) == MON
+        assert cal.next_working_day(MON) == MON
+        assert cal.previous_working_day(MON) == SAT
+
+    def test_holidays_and_shutdowns(self):
+        cal = _calendar(
+            holidays=[{"date": "2026-02-24"}],
+            shutdowns=[{"start": "2026-02-25", "end": "2026-02-27"}],
+        )
+        assert cal.add_working_days(MON, 1) == date(2026, 2, 28)
+        assert cal.working_days_between(SAT, date(2026, 3, 2)) == 3  # Mon, Sat, Mon
+
+    def test_matches_day_by_day_walk(self):
+        cal = _calendar(working_weekdays=[1, 2, 3, 4, 5], holidays=[{"date": "2026-05-01"}])
+        day, walked = date(2026, 4, 20), date(2026, 4, 20)
+        for _ in range(30):
+            walked += timedelta(days=1)
+            while walked.isoweekday() > 5 or walked == date(2026, 5, 1):
+                walked += timedelta(days=1)
+        assert cal.add_working_days(day, 30) == walked
+
+    def test_add_many_matches_add(self):
+        cal = WorkCalendar(date(2026, 1, 1), date(2026, 1, 31), holidays=[{"date": "2026-01-06"}])
+        counts = [0, -3, 1, 5, 30, 400]
+        ends = cal.add_working_days_many(SAT, counts)
+        assert ends.tolist() == [cal.add_working_days(SAT, n) for n in counts]
+
+    def test_extends_past_end(self):
+        cal = WorkCalendar(date(2026, 1, 1), date(2026, 1, 31))
+        assert cal.add_working_days(date(2026, 1, 30), 600) > date(2027, 12, 1)
+        assert cal.add_working_days(date(2026, 6, 1), 1) == date(2026, 6, 2)  # starts past the span
+        assert cal.is_working_day(date(2030, 1, 6)) is False  # a Sunday
+
+    def test_before_start_raises(self):
+        with pytest.raises(ValueError):
+            _calendar().index(date(2025, 12, 31))
+
+    def test_kw_across_year_boundary(self):
+        cal = WorkCalendar(date(2020, 12, 1), date(2027, 1, 10))
+        days = cal.days(date(2020, 12, 31), date(2021, 1, 4))
+        assert days["kw"] == ["2020-KW53"] * 4 + ["2021-KW01"]
+        assert cal.days(date(2026, 12, 31), date(2026, 12, 31))["kw"] == ["2026-KW53"]
+        assert days["working"] == [True, True, True, False, True]
+
+    def test_estimate_completion_with_calendar(self):
+        # 10 / (1 * 1) = 10 working days from Saturday: two Sundays skipped
+        assert estimate_completion_date(10, 1.0, 1, from_date=SAT, calendar=_calendar()) == date(2026, 3, 5)
+
+
+class TestProjectCalendar:
+    def test_default_calendar(self, mock_db):
+        body = TestClient(app).get(CALENDAR_URL).json()
+        assert body["working_weekdays"] == [1, 2, 3, 4, 5, 6]
+        assert body["holidays"] == [] and body["shutdowns"] == []
+
+    @pytest.mark.asyncio
+    async def test_update_bumps_and_rebuilds_snapshot(self, mock_db):
+        client = TestClient(app)
+        before = await get_project_version(PROJECT_ID)
+        resp = client.put(CALENDAR_URL, json={
+            "working_weekdays": [5, 1, 2, 3, 4, 4],
+            "holidays": [{"date": "2026-02-24", "name": "Site holiday"}],
+        })
+        assert resp.status_code == 200
+        assert resp.json()["working_weekdays"] == [1, 2, 3, 4, 5]
+        assert await get_project_version(PROJECT_ID) == before + 1
+
+        calendar = (await get_project_snapshot(PROJECT_ID)).calendar
+        assert not calendar.is_working_day(SAT)
+        assert not calendar.is_working_day(date(2026, 2, 24))
+        assert client.get(CALENDAR_URL).json()["holidays"][0]["name"] == "Site holiday"
+
+    def test_days_endpoint(self, mock_db):
+        body = TestClient(app).get(f"{CALENDAR_URL}/days?from=2026-02-21&to=2026-02-23").json()
+        assert body == {
+            "dates": ["2026-02-21", "2026-02-22", "2026-02-23"],
+            "working": [True, False, True],
+            "kw": ["2026-KW08", "2026-KW08", "2026-KW09"],
+        }
+
+    def test_days_far_before_project_start(self, mock_db):
+        body = TestClient(app).get(f"{CALENDAR_URL}/days?from=2020-12-31&to=2021-01-01").json()
+        assert body["kw"] == ["2020-KW53", "2020-KW53"]
+
+    def test_errors(self, mock_db):
+        client = TestClient(app)
+        assert client.get(f"{CALENDAR_URL}/days?from=2026-02-23&to=2026-02-21").json()["detail"]["code"] == (
+            "CAL_DATE_INVALID"
+        )
+        missing = "/api/v1/projects/00000000-0000-0000-0000-0000000000ff/calendar"
+        assert client.get(missing).status_code == 404
+        assert client.put(missing, json={}).status_code == 404
+        assert client.put(CALENDAR_URL, json={"working_weekdays": [0, 8]}).status_code == 422
+        bad_shutdown = {"shutdowns": [{"start": "2026-03-02", "end": "2026-03-01"}]}
+        assert client.put(CALENDAR_URL, json=bad_shutdown).status_code == 422
+
+
+class TestForecastCalendar:
+    @pytest.mark.asyncio
+    async def test_predicted_end_is_a_working_day(self, mock_db):
+        result = await ForecastEngine().generate_forecast(PROJECT_ID)
+        calendar = (await get_project_snapshot(PROJECT_ID)).calendar
+        project_end = (await get_project_snapshot(PROJECT_ID)).project.get("end_date")
+        ends = [
+            date.fromisoformat(f["predicted_end_date"]) for f in result["forecasts"]
+            if f["predicted_end_date"] and f["predicted_end_date"] != project_end
+        ]
+        assert ends
+        assert all(calendar.is_working_day(d) for d in ends)
@@ -0,0 +1,151 @@
+"""Tests for the allocation change broker and SSE stream."""
+
+import asyncio
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from backend.config import settings
+from backend.main import app
+from backend.middleware.compression import StreamingAwareGZipMiddleware
+from backend.services import change_stream
+from backend.services.change_stream import ChangeBroker, StreamEvent, stream_events
+from backend.services.project_version import get_project_version
+from backend.services.schedule_service import ScheduleService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+
+
+def _row(day, actual):
+    return {"wbs_item_id": CW_01, "date": day, "actual_manpower": actual}
+
+
+class Client:
+    """Drives stream_events like StreamingResponse does, until told to disconnect."""
+
+    def __init__(self, last_event_id=None):
+        self.connected = True
+        self.stream = stream_events(PROJECT_ID, last_event_id, self._is_disconnected)
+
+    async def _is_disconnected(self):
+        return not self.connected
+
+    async def next_event(self):
+        while True:
+            chunk = await asyncio.wait_for(self.stream.__anext__(), 1)
+            if chunk.startswith("event:"):
+                return chunk
+
+    async def close(self):
+        self.connected = False
+        await self.stream.aclose()
+
+
+class TestBroker:
+    def test_encode(self):
+        event = StreamEvent("cells", {"version": 3, "cells": []}, 3)
+        assert event.encode() == 'event: cells\nid: 3\ndata: {"version":3,"cells":[]}\n\n'
+
+    def test_fan_out_and_unsubscribe(self):
+        broker = ChangeBroker()
+        a, b = broker.subscribe(PROJECT_ID), broker.subscribe(PROJECT_ID)
+        broker.publish(PROJECT_ID, 4, [_row("2026-02-24", 3)])
+        assert a.queue.get_nowait().data["cells"] == [{"wbs_id": CW_01, "date": "2026-02-24", "actual_manpower": 3}]
+        assert b.queue.qsize() == 1
+
+        broker.unsubscribe(a)
+        broker.unsubscribe(b)
+        assert broker.stats()["subscribers"] == 0
+
+    def test_slow_consumer_gets_reset(self, monkeypatch):
+        monkeypatch.setattr(settings, "stream_queue_size", 2)
+        broker = ChangeBroker()
+        sub = broker.subscribe(PROJECT_ID)
+        for version in (1, 2, 3):
+            broker.publish(PROJECT_ID, version, [_row("2026-02-24", version)])
+
+        event = sub.queue.get_nowait()
+        assert (event.event, event.id, sub.queue.empty()) == ("reset", 3, True)
+        assert broker.stats()["dropped"] == 1
+
+    def test_replay_needs_every_version(self):
+        broker = ChangeBroker()
+        broker.publish(PROJECT_ID, 5, [_row("2026-02-24", 1)])
+        broker.publish(PROJECT_ID, 6, [_row("2026-02-24", 2)])
+        broker.publish(PROJECT_ID, 8, [_row("2026-02-24", 3)])  # 7 was a WBS edit
+
+        assert [e.id for e in broker.replay(PROJECT_ID, 4, 6)] == [5, 6]
+        assert broker.replay(PROJECT_ID, 6, 6) == []
+        assert broker.replay(PROJECT_ID, 5, 8) is None
+
+
+class TestStream:
+    @pytest.fixture(autouse=True)
+    def fresh_broker(self, monkeypatch):
+        monkeypatch.setattr(change_stream, "change_broker", ChangeBroker())
+        monkeypatch.setattr("backend.services.schedule_service.change_broker", change_stream.change_broker)
+
+    @pytest.mark.asyncio
+    async def test_writes_reach_subscribers(self, mock_db):
+        client = Client()
+        ready = await client.next_event()
+        assert ready.startswith("event: ready")
+
+        await ScheduleService().upsert_allocations(PROJECT_ID, [_row("2026-02-24", 4), _row("2026-02-25", 2)])
+        cells = await client.next_event()
+        version = await get_project_version(PROJECT_ID)
+        assert f"id: {version}" in cells
+        assert '"date":"2026-02-25","actual_manpower":2' in cells
+        await client.close()
+        assert change_stream.change_broker.stats()["subscribers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replays_missed_writes(self, mock_db):
+        last_seen = await get_project_version(PROJECT_ID)
+        await ScheduleService().upsert_allocations(PROJECT_ID, [_row("2026-02-24", 4)])
+        await ScheduleService().upsert_allocations(PROJECT_ID, [_row("2026-02-24", 5)])
+
+        client = Client(last_event_id=last_seen)
+        first, second = await client.next_event(), await client.next_event()
+        assert f"id: {last_seen + 1}" in first and f"id: {last_seen + 2}" in second
+        assert '"actual_manpower":5' in second
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unpublished_versions_send_changed(self, mock_db, monkeypatch):
+        monkeypatch.setattr(settings, "stream_poll_s", 0.01)
+        last_seen = await get_project_version(PROJECT_ID)
+        mock_db.rpc("fn_bump_project_version", {"p_project_id": str(PROJECT_ID)}).execute()  # another worker
+
+        client = Client(last_event_id=last_seen)
+        event = await client.next_event()
+        assert event.startswith("event: changed") and f"id: {last_seen + 1}" in event
+
+        mock_db.rpc("fn_bump_project_version", {"p_project_id": str(PROJECT_ID)}).execute()
+        event = await client.next_event()  # picked up by the idle poll
+        assert event.startswith("event: changed") and f"id: {last_seen + 2}" in event
+        await client.close()
+
+    def test_unknown_project(self, mock_db):
+        resp = TestClient(app).get("/api/v1/allocations/00000000-0000-0000-0000-0000000000ff/stream")
+        assert resp.status_code == 404
+
+
+class TestCompression:
+    def test_streams_are_not_gzipped(self):
+        async def events(request):
+            return StreamingResponse(iter(["data: x\n\n" * 200]), media_type="text/event-stream")
+
+        async def plain(request):
+            return PlainTextResponse("x" * 2000)
+
+        mini = Starlette(routes=[Route("/p/stream", events), Route("/p/plain", plain)])
+        mini.add_middleware(StreamingAwareGZipMiddleware, minimum_size=100)
+        client = TestClient(mini)
+        assert "content-encoding" not in client.get("/p/stream").headers
+        assert client.get("/p/plain").headers["content-encoding"] == "gzip"
@@ -0,0 +1,161 @@
+"""Tests for the vectorised forecast engine and ForecastEngine.generate_forecast."""
+
+from datetime import date, timedelta
+from uuid import UUID
+
+import pytest
+
+from backend.services.ai.forecast import ForecastEngine
+from backend.services.calendar_engine import WorkCalendar
+from backend.services.compute_engine import (
+    calculate_productivity_rate,
+    calculate_progress_pct,
+    calculate_remaining_days,
+)
+from backend.services.forecast_engine import allocation_arrays, forecast_items
+from backend.services.schedule_service import ScheduleService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+TODAY = date(2026, 4, 15)
+
+
+def _avg_recent_manpower(allocs, today, window_days=14):
+    if not allocs:
+        return 0.0
+    cutoff = today - timedelta(days=window_days)
+    recent = [
+        a for a in allocs
+        if date.fromisoformat(str(a["date"])) >= cutoff
+        and float(a.get("actual_manpower", 0)) > 0
+    ]
+    if not recent:
+        all_with_mp = [a for a in allocs if float(a.get("actual_manpower", 0)) > 0]
+        if not all_with_mp:
+            return 0.0
+        return sum(float(a["actual_manpower"]) for a in all_with_mp) / len(all_with_mp)
+    return sum(float(a["actual_manpower"]) for a in recent) / len(recent)
+
+
+def _legacy_forecasts(project, wbs_items, allocations, calendar, today):
+    """The original per-item loop of ForecastEngine.generate_forecast."""
+    by_wbs = {}
+    for a in allocations:
+        by_wbs.setdefault(str(a["wbs_item_id"]), []).append(a)
+    forecasts = []
+    for wbs in wbs_items:
+        qty = float(wbs.get("qty", 0))
+        allocs = by_wbs.get(str(wbs["id"]), [])
+        total_qty_done = sum(float(a.get("qty_done", 0)) for a in allocs)
+        total_manday = sum(float(a.get("actual_manpower", 0)) for a in allocs)
+        working_days = len([a for a in allocs if float(a.get("actual_manpower", 0)) > 0])
+
+        remaining = max(qty - total_qty_done, 0)
+        progress = calculate_progress_pct(qty, total_qty_done)
+        productivity = calculate_productivity_rate(total_qty_done, total_manday)
+        avg_mp = _avg_recent_manpower(allocs, today)
+        est_days = calculate_remaining_days(remaining, productivity, avg_mp)
+
+        if est_days >= 999:
+            project_end = project.get("end_date")
+            if project_end:
+                predicted_end = project_end if isinstance(project_end, str) else project_end.isoformat()
+            else:
+                predicted_end = calendar.next_working_day(today + timedelta(days=90)).isoformat()
+            risk_level = "high"
+            recommendation = "Yeterli veri yok, tahmin yapılamıyor"
+        else:
+            predicted_end = calendar.add_working_days(today, est_days).isoformat()
+            project_end = project.get("end_date")
+            if project_end and predicted_end > project_end:
+                risk_level = "high"
+                recommendation = f"Planlanan bitişten {est_days} gün geç kalma riski"
+            elif progress < 30 and working_days > 5:
+                risk_level = "medium"
+                recommendation = "İlerleme yavaş, kaynak artırımı değerlendirilmeli"
+            else:
+                risk_level = "low"
+                recommendation = "Plan dahilinde ilerliyor"
+
+        predicted_total_manday = total_manday + (avg_mp * est_days if est_days < 999 else 0)
+        forecasts.append({
+            "wbs_code": wbs["wbs_code"],
+            "wbs_name": wbs["wbs_name"],
+            "current_progress": progress,
+            "predicted_end_date": predicted_end,
+            "predicted_total_manday": round(predicted_total_manday, 1),
+            "risk_level": risk_level,
+            "recommendation": recommendation,
+        })
+    return forecasts
+
+
+
+class TestForecastItems:
+    @pytest.mark.parametrize("end_date", ["2026-06-30", "2026-04-20", None])
+    def test_parity_with_legacy_loop(self, end_date, random_project):
+        start = TODAY - timedelta(days=75)
+        wbs_items, allocations, _ = random_project(300, 70, start)
+        calendar = WorkCalendar(start, date(2026, 12, 31), holidays=[{"date": "2026-05-01"}])
+        project = {"end_date": end_date}
+
+        legacy = _legacy_forecasts(project, wbs_items, allocations, calendar, TODAY)
+        vectorised = forecast_items(wbs_items, allocation_arrays(wbs_items, allocations), calendar, TODAY, end_date)
+
+        assert vectorised == legacy
+        if end_date == "2026-06-30":
+            assert {f["risk_level"] for f in legacy} == {"low", "medium", "high"}
+
+    def test_no_allocations(self):
+        wbs_items = [{"id": "a", "wbs_code": "A", "wbs_name": "A", "qty": 10}]
+        calendar = WorkCalendar(TODAY, TODAY)
+        (item,) = forecast_items(wbs_items, allocation_arrays(wbs_items, []), calendar, TODAY, None)
+        assert (item["current_progress"], item["risk_level"]) == (0.0, "high")
+        assert item["predicted_end_date"] == calendar.next_working_day(TODAY + timedelta(days=90)).isoformat()
+
+    def test_foreign_allocations_are_ignored(self):
+        wbs_items = [{"id": "a", "wbs_code": "A", "wbs_name": "A", "qty": 10}]
+        allocations = [
+            {"wbs_item_id": "a", "date": "2026-04-14", "actual_manpower": 2, "qty_done": 5},
+            {"wbs_item_id": "zz", "date": "2026-04-14", "actual_manpower": 9, "qty_done": 9},
+        ]
+        arrays = allocation_arrays(wbs_items, allocations)
+        assert arrays.row.tolist() == [0]
+        (item,) = forecast_items(wbs_items, arrays, WorkCalendar(TODAY, TODAY), TODAY, None)
+        assert item["current_progress"] == 50.0
+        assert item["predicted_end_date"] == "2026-04-16"  # 5 left at 2.5/manday x 2 men: 1 working day
+
+
+class TestGenerateForecast:
+    @pytest.mark.asyncio
+    async def test_stores_one_row_per_item(self, mock_db):
+        result = await ForecastEngine().generate_forecast(PROJECT_ID)
+
+        stored = mock_db.table("ai_forecasts").select("*").eq("project_id", str(PROJECT_ID)).execute().data
+        wbs_ids = [w["id"] for w in mock_db.table("wbs_items").select("id").order("sort_order").execute().data]
+        assert len(result["forecasts"]) == len(stored) == len(wbs_ids)
+        assert sorted(s["wbs_item_id"] for s in stored) == sorted(wbs_ids)
+        by_id = {s["wbs_item_id"]: s for s in stored}
+        cw_01 = next(f for f in result["forecasts"] if f["wbs_code"] == "CW-01")
+        assert by_id[CW_01]["predicted_end_date"] == cw_01["predicted_end_date"]
+
+    @pytest.mark.asyncio
+    async def test_columns_built_once_per_project_version(self, mock_db, monkeypatch):
+        built = []
+
+        def counting(wbs_items, allocations):
+            built.append(len(allocations))
+            return allocation_arrays(wbs_items, allocations)
+
+        monkeypatch.setattr("backend.services.ai.forecast.allocation_arrays", counting)
+        engine = ForecastEngine()
+        first = await engine.generate_forecast(PROJECT_ID)
+        assert (await engine.generate_forecast(PROJECT_ID))["forecasts"] == first["forecasts"]
+        assert len(built) == 1
+
+        await ScheduleService().upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-04-14", "actual_manpower": 4, "qty_done": 3}]
+        )
+        await engine.generate_forecast(PROJECT_ID)
+        assert built == [built[0], built[0] + 1]
+
@@ -0,0 +1,90 @@
+"""Tests for the Gantt summary engine — spans, roll-ups and zoom buckets."""
+
+import gzip
+import json
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.services.gantt_engine import build_gantt, spans
+
+ROOT = {"id": "r", "wbs_code": "CW", "wbs_name": "Curtain Wall", "qty": 0, "is_summary": True}
+A = {"id": "a", "parent_id": "r", "wbs_code": "CW-01", "wbs_name": "Tip-1", "qty": 100}
+B = {"id": "b", "parent_id": "r", "wbs_code": "CW-02", "wbs_name": "Tip-2", "qty": 300}
+
+
+def _alloc(wbs_id, d, actual=0, planned=0, qty_done=0):
+    return {"wbs_item_id": wbs_id, "date": d, "actual_manpower": actual,
+            "planned_manpower": planned, "qty_done": qty_done}
+
+
+class TestHelpers:
+    def test_spans(self):
+        active = np.array([[1, 1, 0, 1], [0, 0, 0, 0], [1, 1, 1, 1]], dtype=bool)
+        assert spans(active) == [[[0, 1], [3, 3]], [], [[0, 3]]]
+
+
+class TestBuildGantt:
+    def test_bar_dates_and_rollup(self):
+        allocations = [
+            _alloc("a", "2026-02-16", actual=4, qty_done=50),
+            _alloc("a", "2026-02-17", actual=4, qty_done=60),
+            _alloc("b", "2026-02-25", actual=2, qty_done=30),
+        ]
+        plan = {"b": {"2026-02-20": 3.0, "2026-03-02": 3.0}}
+        result = build_gantt([ROOT, A, B], allocations, plan, zoom="day", today=date(2026, 2, 26))
+        bars = {b["wbs_id"]: b for b in result["gantt_bars"]}
+
+        assert (bars["a"]["actual_start"], bars["a"]["actual_end"]) == ("2026-02-16", "2026-02-17")
+        assert bars["a"]["progress_pct"] == 100.0
+        assert (bars["b"]["baseline_start"], bars["b"]["baseline_end"]) == ("2026-02-20", "2026-03-02")
+        assert (bars["r"]["actual_start"], bars["r"]["actual_end"]) == ("2026-02-16", "2026-02-25")
+        # weighted: (min(110/100,1)*100 + 30/300*300) / 400
+        assert bars["r"]["progress_pct"] == 32.5
+        assert bars["r"]["actual_manday"] == 10.0
+        assert bars["r"]["level"] == 0 and bars["a"]["level"] == 1
+        assert result["overall"]["total_progress"] == 32.5
+
+    def test_zoom_buckets_compress_spans(self):
+        allocations = [_alloc("a", (date(2026, 2, 2) + timedelta(days=i)).isoformat(), actual=3) for i in range(60)]
+        day = build_gantt([A], allocations, {}, zoom="day")
+        week = build_gantt([A], allocations, {}, zoom="week")
+        month = build_gantt([A], allocations, {}, zoom="month")
+
+        assert day["gantt_bars"][0]["actual_spans"] == [[0, 59]]
+        assert week["buckets"][:2] == ["2026-02-02", "2026-02-09"]
+        assert week["gantt_bars"][0]["actual_spans"] == [[0, len(week["buckets"]) - 1]]
+        assert month["buckets"] == ["2026-02-02", "2026-03-01", "2026-04-01"]
+
+    def test_gaps_split_spans(self):
+        allocations = [_alloc("a", "2026-02-02", actual=1), _alloc("a", "2026-02-20", actual=1)]
+        week = build_gantt([A], allocations, {}, zoom="week")
+        assert week["gantt_bars"][0]["actual_spans"] == [[0, 0], [2, 2]]
+
+    def test_no_data(self):
+        result = build_gantt([A], [], {}, zoom="week")
+        assert result["buckets"] == []
+        assert result["gantt_bars"][0]["actual_start"] is None
+        assert result["overall"]["project_health"] == "on_track"
+
+    def test_unknown_zoom(self):
+        with pytest.raises(ValueError):
+            build_gantt([A], [], {}, zoom="year")
+
+    def test_thousand_bars_payload_is_compact(self):
+        rng = random.Random(3)
+        start = date(2026, 1, 5)
+        items = [{"id": f"s{g}", "wbs_code": f"G{g}", "wbs_name": f"Group {g}", "is_summary": True} for g in range(20)]
+        allocations = []
+        for i in range(980):
+            items.append({"id": f"w{i}", "parent_id": f"s{i % 20}", "wbs_code": f"G{i % 20}-{i:03d}",
+                          "wbs_name": f"Item {i}", "qty": 100})
+            first = rng.randint(0, 500)
+            for d in range(first, first + rng.randint(20, 120)):
+                if rng.random() < 0.8:
+                    allocations.append(_alloc(f"w{i}", (start + timedelta(days=d)).isoformat(), actual=3, qty_done=1))
+
+        body = json.dumps(build_gantt(items, allocations, {}, zoom="week")).encode()
+        assert len(gzip.compress(body)) < 64 * 1024
@@ -0,0 +1,70 @@
+"""Tests for the Excel import endpoint (POST /reports/{id}/excel)."""
+
+from io import BytesIO
+from uuid import UUID
+
+import openpyxl
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+IMPORT_URL = f"/api/v1/reports/{PROJECT_ID}/excel"
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _workbook(wbs_rows=(), allocation_rows=()):
+    wb = openpyxl.Workbook()
+    wbs = wb.active
+    wbs.title = "WBS"
+    wbs.append(["wbs_code", "wbs_name", "is_summary", "qty", "unit", "level", "sort_order"])
+    for row in wbs_rows:
+        wbs.append(list(row))
+    allocations = wb.create_sheet("Allocations")
+    allocations.append(["wbs_code", "date", "planned", "actual", "qty_done", "notes"])
+    for row in allocation_rows:
+        allocations.append(list(row))
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _post(client, content):
+    return client.post(IMPORT_URL, files={"file": ("import.xlsx", content, XLSX)})
+
+
+def _codes(db):
+    rows = db.table("wbs_items").select("wbs_code").eq("project_id", str(PROJECT_ID)).execute().data
+    return [w["wbs_code"] for w in rows]
+
+
+class TestImportExcel:
+    def test_imports_wbs_and_allocations(self, mock_db):
+        content = _workbook([("NEW-01", "New item", False, 10, "m2", 2, 99)], [("NEW-01", "2026-03-02", 2, 3, 1)])
+        with TestClient(app) as client:
+            resp = _post(client, content)
+        assert resp.status_code == 200 and resp.json() == {"wbs_items": 1, "allocations": 1}
+        assert "NEW-01" in _codes(mock_db)
+
+    def test_not_a_workbook(self, mock_db):
+        with TestClient(app) as client:
+            resp = _post(client, b"not a zip file")
+        assert resp.status_code == 400 and resp.json()["detail"]["code"] == "IMP_INVALID_WORKBOOK"
+
+    def test_bad_cell(self, mock_db):
+        before = _codes(mock_db)
+        content = _workbook([("NEW-01", "New", False, 10), ("NEW-02", "New", False, "lots")])
+        with TestClient(app) as client:
+            resp = _post(client, content)
+        assert resp.status_code == 400 and "row 3" in resp.json()["detail"]["error"]
+        assert _codes(mock_db) == before  # nothing written
+
+    def test_duplicate_codes_import_nothing(self, mock_db):
+        before = _codes(mock_db)
+        with TestClient(app) as client:
+            existing = _post(client, _workbook([("NEW-01", "New"), ("CW-01", "Taken")]))
+            repeated = _post(client, _workbook([("NEW-01", "New"), ("NEW-01", "Again")]))
+        for resp in (existing, repeated):
+            assert resp.status_code == 422 and resp.json()["detail"]["code"] == "WBS_DUPLICATE_CODE"
+        assert "CW-01" in existing.json()["detail"]["error"]
+        assert _codes(mock_db) == before
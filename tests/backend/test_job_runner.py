@@ -0,0 +1,280 @@
+"""Tests for background jobs (runner, endpoints with Prefer: respond-async)."""
+
+import asyncio
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.config import settings
+from backend.main import app
+from backend.services.baseline_service import BaselineService, BaselineVersionConflict
+from backend.services.job_runner import JobFile, JobQueueFull, JobRunner
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+ASYNC = {"Prefer": "respond-async"}
+
+
+@pytest.fixture
+def runner(mock_db, monkeypatch):
+    monkeypatch.setattr(settings, "job_progress_interval_s", 0)
+    return JobRunner(workers={"baseline": 1, "pdf": 1, "forecast": 1, "import": 1})
+
+
+def _stored(db, job_id):
+    return db.table("jobs").select("*").eq("id", job_id).execute().data[0]
+
+
+async def _finished(runner, job_id):
+    for _ in range(200):
+        job = await runner.get(job_id)
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestJobRunner:
+    @pytest.mark.asyncio
+    async def test_result_and_progress_are_persisted(self, runner, mock_db):
+        seen = []
+
+        async def work(progress):
+            await progress(0.5, "halfway")
+            seen.append(_stored(mock_db, job["id"])["progress"])
+            return {"answer": 42}
+
+        job = await runner.submit("forecast", PROJECT_ID, work, params={"scope": "all"})
+        assert job["status"] == "queued" and job["params"] == {"scope": "all"}
+
+        done = await _finished(runner, job["id"])
+        assert seen == [0.5]
+        stored = _stored(mock_db, job["id"])
+        assert (stored["status"], stored["progress"], stored["result"]) == ("succeeded", 1, {"answer": 42})
+        assert done["finished_at"] and stored["worker"] == runner.worker_id
+
+    @pytest.mark.asyncio
+    async def test_pool_bounds_concurrency(self, runner):
+        release = asyncio.Event()
+        running = []
+
+        async def work(progress):
+            running.append(1)
+            await release.wait()
+            return None
+
+        first = await runner.submit("pdf", PROJECT_ID, work)
+        second = await runner.submit("pdf", PROJECT_ID, work)
+        await asyncio.sleep(0.02)
+        assert len(running) == 1
+        assert (await runner.get(second["id"]))["status"] == "queued"
+        assert runner.stats()["queued"] == 1 and runner.stats()["running"] == 1
+
+        release.set()
+        assert (await _finished(runner, first["id"]))["status"] == "succeeded"
+        assert (await _finished(runner, second["id"]))["status"] == "succeeded"
+        assert len(running) == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_limit(self, runner, monkeypatch):
+        monkeypatch.setattr(settings, "job_max_queued", 1)
+        release = asyncio.Event()
+
+        async def work(progress):
+            await release.wait()
+
+        await runner.submit("import", PROJECT_ID, work)  # running
+        await asyncio.sleep(0)
+        await runner.submit("import", PROJECT_ID, work)  # queued
+        with pytest.raises(JobQueueFull):
+            await runner.submit("import", PROJECT_ID, work)
+        await runner.submit("pdf", PROJECT_ID, work)  # other pools are unaffected
+        release.set()
+        await runner.drain()
+
+    @pytest.mark.asyncio
+    async def test_error_codes(self, runner):
+        async def missing(progress):
+            raise ValueError("Project not found")
+
+        async def broken(progress):
+            raise RuntimeError("API down")
+
+        codes = {ValueError: "PRJ_NOT_FOUND", Exception: "AI_UNAVAILABLE"}
+        a = await runner.submit("forecast", PROJECT_ID, missing, error_codes=codes)
+        b = await runner.submit("forecast", PROJECT_ID, broken, error_codes=codes)
+        c = await runner.submit("forecast", PROJECT_ID, broken)
+
+        assert (await _finished(runner, a["id"]))["error"] == {"error": "Project not found", "code": "PRJ_NOT_FOUND"}
+        assert (await _finished(runner, b["id"]))["error"]["code"] == "AI_UNAVAILABLE"
+        assert (await _finished(runner, c["id"]))["error"]["code"] == "JOB_FAILED"
+        assert runner.stats()["failed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_file_result(self, runner):
+        async def work(progress):
+            return JobFile(b"%PDF-1.4", "report.pdf", "application/pdf")
+
+        job = await _finished(runner, (await runner.submit("pdf", PROJECT_ID, work))["id"])
+        assert job["result"] == {"filename": "report.pdf", "media_type": "application/pdf", "size": 8}
+        # Stored in the DB, so a worker other than the one that ran the job serves it too
+        assert await JobRunner().artifact(job["id"]) == JobFile(b"%PDF-1.4", "report.pdf", "application/pdf")
+
+    @pytest.mark.asyncio
+    async def test_drain_fails_unfinished_jobs(self, runner, monkeypatch):
+        monkeypatch.setattr(settings, "job_shutdown_grace_s", 0.01)
+
+        async def forever(progress):
+            await asyncio.Event().wait()
+
+        job = await runner.submit("baseline", PROJECT_ID, forever)
+        await runner.drain()
+        assert (await runner.get(job["id"]))["error"]["code"] == "JOB_INTERRUPTED"
+
+    @pytest.mark.asyncio
+    async def test_recover_fails_jobs_of_dead_workers(self, runner, mock_db, monkeypatch):
+        host = socket.gethostname()
+        alive = {"pid": 4242}
+        monkeypatch.setattr("backend.services.job_runner.pid_alive", lambda pid: pid == alive["pid"])
+        rows = [
+            {"project_id": str(PROJECT_ID), "job_type": "pdf", "status": "running", "worker": f"{host}:999"},
+            {"project_id": str(PROJECT_ID), "job_type": "pdf", "status": "running", "worker": f"{host}:4242"},
+            {"project_id": str(PROJECT_ID), "job_type": "pdf", "status": "queued", "worker": "other-host:999"},
+            {"project_id": str(PROJECT_ID), "job_type": "pdf", "status": "succeeded", "worker": f"{host}:999"},
+        ]
+        mock_db.table("jobs").insert(rows).execute()
+
+        assert await runner.recover() == 1
+        assert [_stored(mock_db, r["id"])["status"] for r in rows] == ["failed", "running", "queued", "succeeded"]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_refreshes_unfinished_jobs(self, runner, mock_db, monkeypatch):
+        monkeypatch.setattr(settings, "job_heartbeat_s", 0.01)
+        release = asyncio.Event()
+
+        async def work(progress):
+            await release.wait()
+
+        running = await runner.submit("pdf", PROJECT_ID, work)
+        queued = await runner.submit("pdf", PROJECT_ID, work)
+        await asyncio.sleep(0)
+        beats = {j["id"]: _stored(mock_db, j["id"])["updated_at"] for j in (running, queued)}
+        await asyncio.sleep(0.05)
+        assert all(_stored(mock_db, job_id)["updated_at"] > beat for job_id, beat in beats.items())
+        release.set()
+        await runner.drain()
+
+    @pytest.mark.asyncio
+    async def test_job_without_heartbeat_fails_on_any_host(self, runner, mock_db):
+        old = datetime.now(timezone.utc) - timedelta(seconds=settings.job_stale_after_s + 1)
+        rows = [
+            {"project_id": str(PROJECT_ID), "job_type": "pdf", "status": "running", "worker": "old-pod:7"},
+            {"project_id": str(PROJECT_ID), "job_type": "pdf", "status": "queued", "worker": "old-pod:7"},
+            {"project_id": str(PROJECT_ID), "job_type": "pdf", "status": "running", "worker": "live-pod:7"},
+        ]
+        mock_db.table("jobs").insert(rows).execute()
+        for row in rows[:2]:
+            row["updated_at"] = old.isoformat()  # MockDB stores the inserted dicts; its update would stamp now
+
+        polled = await runner.get(rows[0]["id"])
+        assert (polled["status"], polled["error"]["code"]) == ("failed", "JOB_INTERRUPTED")
+        assert await runner.recover() == 1
+        assert [_stored(mock_db, r["id"])["status"] for r in rows] == ["failed", "failed", "running"]
+
+    @pytest.mark.asyncio
+    async def test_recover_deletes_expired_files(self, runner, mock_db):
+        async def work(progress):
+            return JobFile(b"%PDF-1.4", "report.pdf", "application/pdf")
+
+        old, new = [await runner.submit("pdf", PROJECT_ID, work) for _ in range(2)]
+        for job in (old, new):
+            await _finished(runner, job["id"])
+        mock_db.table("job_artifacts").update({"created_at": "2026-01-01T00:00:00+00:00"}).eq(
+            "job_id", old["id"]
+        ).execute()
+
+        await runner.recover()
+        assert await runner.artifact(old["id"]) is None
+        assert await runner.artifact(new["id"]) is not None
+
+
+class TestJobEndpoints:
+    @staticmethod
+    def _wait(client, location):
+        for _ in range(200):
+            job = client.get(location).json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.01)
+        raise AssertionError(f"{location} did not finish")
+
+    def test_baseline_as_job(self, mock_db, monkeypatch):
+        with TestClient(app) as client:
+            resp = client.post(f"/api/v1/baselines/{PROJECT_ID}/", json={"name": "v1"}, headers=ASYNC)
+            assert resp.status_code == 202
+            assert resp.headers["location"] == f"/api/v1/jobs/{resp.json()['id']}"
+            assert resp.json()["job_type"] == "baseline"
+
+            job = self._wait(client, resp.headers["location"])
+            assert job["status"] == "succeeded" and job["result"]["version"] == 1
+            assert client.get(f"/api/v1/baselines/{PROJECT_ID}/1").status_code == 200
+            listed = client.get("/api/v1/jobs/", params={"project_id": str(PROJECT_ID)}).json()
+            assert [j["id"] for j in listed] == [job["id"]]
+
+    def test_pdf_as_job(self, mock_db, monkeypatch):
+        with TestClient(app) as client:
+            resp = client.get(f"/api/v1/reports/{PROJECT_ID}/progress", headers=ASYNC)
+            assert resp.status_code == 202
+            job = self._wait(client, resp.headers["location"])
+            assert job["status"] == "succeeded"
+
+            download = client.get(f"/api/v1/jobs/{job['id']}/download")
+            assert download.status_code == 200
+            assert download.headers["content-type"].startswith(job["result"]["media_type"])
+            assert len(download.content) == job["result"]["size"]
+
+            mock_db.table("job_artifacts").delete().eq("job_id", job["id"]).execute()
+            expired = client.get(f"/api/v1/jobs/{job['id']}/download")
+            assert expired.status_code == 410 and expired.json()["detail"]["code"] == "JOB_RESULT_EXPIRED"
+
+            # Without the header the report is still streamed inline
+            assert client.get(f"/api/v1/reports/{PROJECT_ID}/progress").status_code == 200
+
+    def test_unknown_project_and_job(self, mock_db, monkeypatch):
+        missing = "00000000-0000-0000-0000-00000000dead"
+        with TestClient(app) as client:
+            resp = client.post(f"/api/v1/ai/{missing}/forecast", headers=ASYNC)
+            job = self._wait(client, resp.headers["location"])
+            assert job["error"]["code"] == "PRJ_NOT_FOUND"
+            assert client.get(f"/api/v1/jobs/{job['id']}/download").json()["detail"]["code"] == "JOB_NOT_READY"
+
+            unknown = client.get(f"/api/v1/jobs/{missing}")
+            assert unknown.status_code == 404 and unknown.json()["detail"]["code"] == "JOB_NOT_FOUND"
+
+    def test_only_known_failures_get_endpoint_codes(self, mock_db, monkeypatch):
+        missing = "00000000-0000-0000-0000-00000000dead"
+
+        def boom(*args, **kwargs):
+            raise RuntimeError("bug")
+
+        with TestClient(app) as client:
+            resp = client.post(f"/api/v1/baselines/{missing}/rebaseline", json={"name": "v1"}, headers=ASYNC)
+            assert self._wait(client, resp.headers["location"])["error"]["code"] == "PRJ_NOT_FOUND"
+            inline = client.post(f"/api/v1/baselines/{missing}/", json={"name": "v1"})
+            assert inline.status_code == 404 and inline.json()["detail"]["code"] == "PRJ_NOT_FOUND"
+
+            monkeypatch.setattr("backend.services.ai.forecast.forecast_items", boom)
+            resp = client.post(f"/api/v1/ai/{PROJECT_ID}/forecast", headers=ASYNC)
+            assert self._wait(client, resp.headers["location"])["error"]["code"] == "JOB_FAILED"
+
+            async def conflict(self, *args, **kwargs):
+                raise BaselineVersionConflict("taken")
+
+            monkeypatch.setattr(BaselineService, "create_baseline", conflict)
+            resp = client.post(f"/api/v1/baselines/{PROJECT_ID}/", json={"name": "v1"}, headers=ASYNC)
+            assert self._wait(client, resp.headers["location"])["error"]["code"] == "BSL_VERSION_CONFLICT"
+            inline = client.post(f"/api/v1/baselines/{PROJECT_ID}/", json={"name": "v1"})
+            assert inline.status_code == 422 and inline.json()["detail"]["code"] == "BSL_VERSION_CONFLICT"
@@ -0,0 +1,167 @@
+"""Tests for matrix_engine.py — columnar daily matrix builder, no DB needed."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from backend.services.matrix_engine import build_daily_matrix, iso_week_window, resample_weeks
+
+
+def _legacy_matrix(wbs_ids, from_date, to_date, allocations, baseline_plan, today):
+    """The original per-cell loop from ScheduleService.get_daily_matrix (reference)."""
+    date_range = [(from_date + timedelta(days=i)).isoformat() for i in range((to_date - from_date).days + 1)]
+    totals = {d: {"planned": 0.0, "actual": 0.0} for d in date_range}
+    alloc_index = {(str(a["wbs_item_id"]), str(a["date"])): a for a in allocations}
+    matrix = {}
+    for wbs_id in wbs_ids:
+        wbs_baseline = baseline_plan.get(wbs_id, {})
+        matrix[wbs_id] = {}
+        for d in date_range:
+            alloc = alloc_index.get((wbs_id, d))
+            planned = wbs_baseline.get(d, 0.0)
+            if planned == 0 and alloc:
+                planned = float(alloc.get("planned_manpower", 0))
+            cell = {
+                "planned": planned,
+                "actual": float(alloc.get("actual_manpower", 0)) if alloc else 0.0,
+                "qty_done": float(alloc.get("qty_done", 0)) if alloc else 0.0,
+                "is_future": date.fromisoformat(d) > today,
+            }
+            matrix[wbs_id][d] = cell
+            totals[d]["planned"] += cell["planned"]
+            totals[d]["actual"] += cell["actual"]
+    return date_range, matrix, totals
+
+
+
+class TestBuildDailyMatrix:
+    def test_parity_with_legacy_loop(self, random_project):
+        start, end, today = date(2026, 3, 2), date(2026, 4, 12), date(2026, 3, 20)
+        wbs_items, allocations, plan = random_project(25, 42, start)
+        wbs_ids = [w["id"] for w in wbs_items]
+
+        dates, matrix, totals = _legacy_matrix(wbs_ids, start, end, allocations, plan, today)
+        grid = build_daily_matrix(wbs_ids, start, end, allocations, plan, today=today)
+        new_matrix, new_totals = grid.to_ic002()
+
+        assert grid.dates == dates
+        assert new_matrix == matrix
+        for d in dates:
+            assert abs(new_totals[d]["planned"] - totals[d]["planned"]) < 1e-9
+            assert abs(new_totals[d]["actual"] - totals[d]["actual"]) < 1e-9
+
+    def test_baseline_overrides_allocation_planned(self):
+        d = date(2026, 2, 17)
+        allocations = [{"wbs_item_id": "a", "date": "2026-02-17", "planned_manpower": 4, "actual_manpower": 5}]
+        grid = build_daily_matrix(["a"], d, d, allocations, {"a": {"2026-02-17": 7.0}}, today=d)
+        matrix, totals = grid.to_ic002()
+        assert matrix["a"]["2026-02-17"]["planned"] == 7.0
+        assert totals["2026-02-17"] == {"planned": 7.0, "actual": 5.0}
+
+    def test_zero_baseline_falls_back_to_allocation(self):
+        d = date(2026, 2, 17)
+        allocations = [{"wbs_item_id": "a", "date": "2026-02-17", "planned_manpower": 4}]
+        grid = build_daily_matrix(["a"], d, d, allocations, {"a": {"2026-02-17": 0.0}}, today=d)
+        assert grid.to_ic002()[0]["a"]["2026-02-17"]["planned"] == 4.0
+
+    def test_is_future_cutoff(self):
+        grid = build_daily_matrix(["a"], date(2026, 2, 16), date(2026, 2, 20), [], {}, today=date(2026, 2, 18))
+        matrix, _ = grid.to_ic002()
+        assert [c["is_future"] for c in matrix["a"].values()] == [False, False, False, True, True]
+
+    def test_null_values_treated_as_zero(self):
+        d = date(2026, 2, 17)
+        allocations = [{"wbs_item_id": "a", "date": "2026-02-17", "actual_manpower": None, "qty_done": 2}]
+        matrix, _ = build_daily_matrix(["a"], d, d, allocations, {}, today=d).to_ic002()
+        assert matrix["a"]["2026-02-17"]["actual"] == 0.0
+        assert matrix["a"]["2026-02-17"]["qty_done"] == 2.0
+
+    def test_empty_window(self):
+        grid = build_daily_matrix(["a"], date(2026, 2, 18), date(2026, 2, 17), [], {})
+        assert grid.dates == []
+        assert grid.to_ic002() == ({"a": {}}, {})
+
+
+class TestSparse:
+    def test_only_nonempty_cells(self):
+        start, end = date(2026, 2, 16), date(2026, 2, 20)
+        allocations = [
+            {"wbs_item_id": "b", "date": "2026-02-18", "actual_manpower": 3, "qty_done": 1},
+            {"wbs_item_id": "a", "date": "2026-02-17", "planned_manpower": 2},
+        ]
+        sparse = build_daily_matrix(["a", "b"], start, end, allocations, {}, today=date(2026, 2, 18)).to_sparse()
+
+        assert sparse["cells"] == {
+            "row": [0, 1], "day": [1, 2], "planned": [2.0, 0.0], "actual": [0.0, 3.0], "qty_done": [0.0, 1.0],
+        }
+        assert sparse["future_from"] == "2026-02-19"
+        assert sparse["totals"]["actual"] == [0.0, 0.0, 3.0, 0.0, 0.0]
+
+    def test_roundtrip_matches_ic002(self, random_project):
+        wbs_items, allocations, plan = random_project(12, 30, date(2026, 2, 2))
+        wbs_ids = [w["id"] for w in wbs_items]
+        grid = build_daily_matrix(wbs_ids, date(2026, 2, 2), date(2026, 3, 3), allocations, plan, today=date(2026, 2, 20))
+        matrix, totals = grid.to_ic002()
+        sparse = grid.to_sparse()
+
+        expanded = {
+            w: {d: {"planned": 0.0, "actual": 0.0, "qty_done": 0.0,
+                    "is_future": sparse["future_from"] is not None and d >= sparse["future_from"]}
+                for d in sparse["date_range"]}
+            for w in wbs_ids
+        }
+        cells = sparse["cells"]
+        for k, (r, d) in enumerate(zip(cells["row"], cells["day"])):
+            expanded[wbs_ids[r]][sparse["date_range"][d]].update(
+                planned=cells["planned"][k], actual=cells["actual"][k], qty_done=cells["qty_done"][k]
+            )
+        assert expanded == matrix
+        assert sparse["totals"]["planned"] == [t["planned"] for t in totals.values()]
+
+    def test_no_future_dates(self):
+        grid = build_daily_matrix(["a"], date(2026, 2, 16), date(2026, 2, 17), [], {}, today=date(2026, 3, 1))
+        assert grid.to_sparse()["future_from"] is None
+
+
+class TestResampleWeeks:
+    def test_parity_with_per_row_grouping(self, random_project):
+        start, end = iso_week_window(date(2026, 3, 4), date(2026, 4, 20))
+        wbs_items, allocations, plan = random_project(15, (end - start).days + 1, start)
+        wbs_ids = [w["id"] for w in wbs_items]
+        grid = build_daily_matrix(wbs_ids, start, end, allocations, plan, today=start)
+        matrix, totals = resample_weeks(grid).to_nested()
+
+        daily, _ = grid.to_ic002()
+        expected: dict = {}
+        for wbs_id, cells in daily.items():
+            for d, cell in cells.items():
+                year, week, _ = date.fromisoformat(d).isocalendar()
+                bucket = expected.setdefault(wbs_id, {}).setdefault(
+                    f"{year}-KW{week:02d}", {"planned": 0.0, "actual": 0.0, "qty_done": 0.0}
+                )
+                for k in bucket:
+                    bucket[k] += cell[k]
+        for wbs_id, weeks in expected.items():
+            for key, bucket in weeks.items():
+                got = matrix[wbs_id].get(key, {"planned": 0.0, "actual": 0.0, "qty_done": 0.0})
+                assert got == pytest.approx(bucket)
+        assert sum(t["actual"] for t in totals.values()) == pytest.approx(grid.actual.sum())
+
+    def test_week_labels_and_partial_edges(self):
+        grid = build_daily_matrix(["a"], date(2026, 2, 18), date(2026, 3, 3), [], {})
+        weeks = resample_weeks(grid).weeks
+        assert [w["key"] for w in weeks] == ["2026-KW08", "2026-KW09", "2026-KW10"]
+        assert (weeks[0]["start"], weeks[0]["end"]) == ("2026-02-18", "2026-02-22")
+        assert (weeks[-1]["start"], weeks[-1]["end"]) == ("2026-03-02", "2026-03-03")
+
+    def test_iso_year_boundary(self):
+        grid = build_daily_matrix(["a"], *iso_week_window(date(2026, 12, 30), date(2027, 1, 5)), [], {})
+        assert [w["key"] for w in resample_weeks(grid).weeks] == ["2026-KW53", "2027-KW01"]
+
+    def test_empty_weeks_omitted(self):
+        d = date(2026, 2, 16)
+        allocations = [{"wbs_item_id": "a", "date": "2026-02-24", "actual_manpower": 3}]
+        grid = build_daily_matrix(["a", "b"], d, date(2026, 3, 1), allocations, {})
+        matrix, totals = resample_weeks(grid).to_nested()
+        assert matrix == {"a": {"2026-KW09": {"planned": 0.0, "actual": 3.0, "qty_done": 0.0}}, "b": {}}
+        assert set(totals) == {"2026-KW08", "2026-KW09"}
@@ -0,0 +1,141 @@
+"""Tests for the per-ISO-week matrix tile cache."""
+
+import random
+from datetime import date, timedelta
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from backend.models.schemas import AllocationBatchUpdate, AllocationCell, WBSItemUpdate
+from backend.services import schedule_service
+from backend.services.matrix_engine import build_daily_matrix
+from backend.services.matrix_tiles import MatrixTileCache, assemble, matrix_tiles, split_tiles, week_mondays
+from backend.services.schedule_service import ScheduleService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+KW08 = date(2026, 2, 16)
+KW09 = date(2026, 2, 23)
+
+
+def _grid(mondays=(KW08, KW09)):
+    rng = random.Random(5)
+    wbs_ids = ["a", "b"]
+    allocations = [
+        {"wbs_item_id": w, "date": (mondays[0] + timedelta(days=d)).isoformat(),
+         "planned_manpower": rng.randint(0, 4), "actual_manpower": rng.randint(0, 4), "qty_done": rng.random()}
+        for w in wbs_ids for d in range(7 * len(mondays))
+    ]
+    return build_daily_matrix(wbs_ids, mondays[0], mondays[-1] + timedelta(days=6), allocations, {})
+
+
+class TestTiles:
+    def test_week_mondays(self):
+        assert week_mondays(date(2026, 2, 18), date(2026, 2, 24)) == [KW08, KW09]
+        assert week_mondays(KW08, KW08) == [KW08]
+
+    def test_split_assemble_round_trip(self):
+        grid = _grid()
+        tiles = split_tiles(grid)
+        assert list(tiles) == [KW08, KW09]
+
+        window = assemble(list(tiles.values()), KW08, date(2026, 2, 18), date(2026, 2, 25), today=date(2026, 2, 20))
+        assert window.dates[0] == "2026-02-18" and window.dates[-1] == "2026-02-25"
+        np.testing.assert_array_equal(window.actual, grid.actual[:, 2:10])
+        assert window.future_from == 3
+
+
+class TestCache:
+    def test_advance_drops_only_touched_weeks(self):
+        cache = MatrixTileCache(max_tiles=10)
+        cache.store(PROJECT_ID, 4, split_tiles(_grid()))
+        cache.advance(PROJECT_ID, ["2026-02-25"], 5)
+
+        version, found = cache.lookup(PROJECT_ID, [KW08, KW09])
+        assert version == 5 and list(found) == [KW08]
+
+    def test_version_gap_drops_project(self):
+        cache = MatrixTileCache(max_tiles=10)
+        cache.store(PROJECT_ID, 4, split_tiles(_grid()))
+        cache.advance(PROJECT_ID, ["2026-02-25"], 6)  # another write happened in between
+        assert cache.lookup(PROJECT_ID, [KW08, KW09]) == (None, {})
+
+    def test_older_read_is_not_stored(self):
+        cache = MatrixTileCache(max_tiles=10)
+        cache.store(PROJECT_ID, 5, split_tiles(_grid((KW08,))))
+        cache.store(PROJECT_ID, 4, split_tiles(_grid((KW09,))))
+        assert list(cache.lookup(PROJECT_ID, [KW08, KW09])[1]) == [KW08]
+
+    def test_lru_eviction_and_counters(self):
+        cache = MatrixTileCache(max_tiles=1)
+        cache.store(PROJECT_ID, 1, split_tiles(_grid()))
+        _, found = cache.lookup(PROJECT_ID, [KW08, KW09])
+        assert list(found) == [KW09]
+        assert cache.stats() == {"tiles": 1, "max_tiles": 1, "hits": 1, "misses": 1}
+
+
+class TestScheduleServiceTiles:
+    @staticmethod
+    async def _uncached(monkeypatch, from_date, to_date):
+        """The same window built with an empty tile cache (read time dropped)."""
+        with monkeypatch.context() as m:
+            m.setattr(schedule_service, "matrix_tiles", MatrixTileCache())
+            result = await ScheduleService().get_daily_matrix(PROJECT_ID, from_date, to_date)
+        return {k: v for k, v in result.items() if k != "as_of"}
+
+    @pytest.mark.asyncio
+    async def test_overlapping_window_hits(self, mock_db, monkeypatch):
+        service = ScheduleService()
+        await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 3, 1))
+        hits = matrix_tiles.hits
+
+        result = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 19), date(2026, 3, 4))
+
+        assert matrix_tiles.hits == hits + 2  # KW08, KW09 cached; KW10 built
+        del result["as_of"]
+        assert result == await self._uncached(monkeypatch, date(2026, 2, 19), date(2026, 3, 4))
+
+    @pytest.mark.asyncio
+    async def test_grid_write_invalidates_its_week_only(self, mock_db, monkeypatch):
+        service = ScheduleService()
+        await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 3, 1))
+        await service.batch_update_allocations(PROJECT_ID, AllocationBatchUpdate(
+            updates=[AllocationCell(wbs_id=CW_01, date=date(2026, 2, 24), actual_manpower=9)]
+        ))
+        hits, misses = matrix_tiles.hits, matrix_tiles.misses
+
+        result = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 3, 1))
+
+        assert (matrix_tiles.hits - hits, matrix_tiles.misses - misses) == (1, 1)
+        assert result["matrix"][CW_01]["2026-02-24"]["actual"] == 9
+        del result["as_of"]
+        assert result == await self._uncached(monkeypatch, date(2026, 2, 16), date(2026, 3, 1))
+
+    @pytest.mark.asyncio
+    async def test_other_writes_rebuild(self, mock_db):
+        service = ScheduleService()
+        await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 22))
+        await service.update_wbs_item(PROJECT_ID, UUID(CW_01), WBSItemUpdate(wbs_name="Renamed"))
+        # A write from another worker: data and version change without advance()
+        mock_db.table("daily_allocations").update({"actual_manpower": 11}).eq("wbs_item_id", CW_01).eq(
+            "date", "2026-02-17"
+        ).execute()
+        mock_db.rpc("fn_bump_project_version", {"p_project_id": str(PROJECT_ID)}).execute()
+
+        result = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 22))
+        assert result["matrix"][CW_01]["2026-02-17"]["actual"] == 11
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("from_date, to_date", [
+        (date(2026, 3, 2), date(2026, 2, 20)),  # earlier week
+        (date(2026, 2, 19), date(2026, 2, 17)),  # same week
+    ])
+    async def test_reversed_window_is_empty(self, mock_db, from_date, to_date):
+        service = ScheduleService()
+        result = await service.get_daily_matrix(PROJECT_ID, from_date, to_date)
+        assert (result["date_range"], result["totals"]) == ([], {})
+        assert result["matrix"][CW_01] == {} and result["wbs_items"]
+
+        sparse = await service.get_daily_matrix_sparse(PROJECT_ID, from_date, to_date)
+        assert sparse["date_range"] == [] and sparse["cells"]["row"] == []
@@ -0,0 +1,185 @@
+"""Tests for MockDB — in-memory tables with hash indexes."""
+
+import asyncio
+
+import pytest
+
+from backend.config import settings
+from backend.models import db as db_module
+from backend.models.db import AsyncDB, AsyncQuery, MockDB, fetch_all_in, get_async_db
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000001"
+CW_01 = "10000000-0000-0000-0000-000000000001"
+
+
+class TestIndexedFilters:
+    def test_eq_on_indexed_column(self):
+        db = MockDB()
+        rows = db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data
+        assert len(rows) == 3
+        assert all(r["wbs_item_id"] == CW_01 for r in rows)
+
+    def test_in_preserves_insertion_order(self):
+        db = MockDB()
+        ids = ["10000000-0000-0000-0000-000000000006", CW_01]
+        rows = db.table("daily_allocations").select("*").in_("wbs_item_id", ids).execute().data
+        assert [r["wbs_item_id"] for r in rows] == [CW_01] * 3 + [ids[0]] * 2
+
+    def test_indexed_and_range_filters_combine(self):
+        db = MockDB()
+        rows = (
+            db.table("daily_allocations")
+            .select("*")
+            .eq("wbs_item_id", CW_01)
+            .gte("date", "2026-02-18")
+            .lte("date", "2026-02-18")
+            .execute()
+            .data
+        )
+        assert len(rows) == 1
+        assert rows[0]["date"] == "2026-02-18"
+
+    def test_unindexed_column_still_filters(self):
+        db = MockDB()
+        rows = db.table("wbs_items").select("*").eq("wbs_code", "DR-01").execute().data
+        assert len(rows) == 1
+
+    def test_empty_in_list(self):
+        db = MockDB()
+        assert db.table("daily_allocations").select("*").in_("wbs_item_id", []).execute().data == []
+
+    def test_range_pages_after_order(self):
+        db = MockDB()
+        everything = db.table("daily_allocations").select("*").order("id").execute().data
+        pages = [
+            db.table("daily_allocations").select("*").order("id").range(start, start + 2).execute().data
+            for start in range(0, len(everything), 3)
+        ]
+        assert [len(p) for p in pages] == [3, 3, 2]
+        assert [r for p in pages for r in p] == everything
+
+
+class TestUpsert:
+    def test_conflict_updates_existing_row(self):
+        db = MockDB()
+        before = len(db.table("daily_allocations").select("*").execute().data)
+        db.table("daily_allocations").upsert(
+            {"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 9},
+            on_conflict="wbs_item_id,date",
+        ).execute()
+        rows = db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data
+        assert len(db.table("daily_allocations").select("*").execute().data) == before
+        assert rows[0]["actual_manpower"] == 9
+        assert rows[0]["qty_done"] == 4
+
+    def test_conflict_keeps_original_id(self):
+        db = MockDB()
+        original = db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data[0]
+        original_id = original["id"]
+        resp = db.table("daily_allocations").upsert(
+            {"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 2},
+            on_conflict="wbs_item_id,date",
+        ).execute()
+        assert resp.data[0]["id"] == original_id
+
+    def test_new_key_inserts_and_is_indexed(self):
+        db = MockDB()
+        db.table("daily_allocations").upsert(
+            [{"wbs_item_id": CW_01, "date": "2026-03-02", "actual_manpower": 4}],
+            on_conflict="wbs_item_id,date",
+        ).execute()
+        rows = db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data
+        assert len(rows) == 4
+        # A second upsert on the same key must hit the freshly indexed row
+        db.table("daily_allocations").upsert(
+            {"wbs_item_id": CW_01, "date": "2026-03-02", "actual_manpower": 6},
+            on_conflict="wbs_item_id,date",
+        ).execute()
+        rows = db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data
+        assert len(rows) == 4
+        assert rows[-1]["actual_manpower"] == 6
+
+    def test_undeclared_conflict_keys_are_indexed_lazily(self):
+        db = MockDB()
+        db.table("chat_messages").insert({"project_id": PROJECT_ID, "message": "a"}).execute()
+        db.table("chat_messages").upsert(
+            {"project_id": PROJECT_ID, "message": "a", "applied": True},
+            on_conflict="project_id,message",
+        ).execute()
+        rows = db.table("chat_messages").select("*").execute().data
+        assert len(rows) == 1
+        assert rows[0]["applied"] is True
+
+
+class TestUpdate:
+    def test_update_reindexes_changed_column(self):
+        db = MockDB()
+        other = "10000000-0000-0000-0000-000000000005"
+        db.table("daily_allocations").update({"wbs_item_id": other}).eq("wbs_item_id", CW_01).execute()
+        assert db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data == []
+        moved = db.table("daily_allocations").select("*").eq("wbs_item_id", other).execute().data
+        assert len(moved) == 3
+
+    def test_update_and_upsert_bump_updated_at(self):
+        db = MockDB()
+        before = db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data[0]["updated_at"]
+        db.table("daily_allocations").update({"notes": "x"}).eq("wbs_item_id", CW_01).execute()
+        changed = db.table("daily_allocations").select("*").gt("updated_at", before).execute().data
+        assert len(changed) == 3
+
+        stamp = changed[0]["updated_at"]
+        db.table("daily_allocations").upsert(
+            {"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 1},
+            on_conflict="wbs_item_id,date",
+        ).execute()
+        assert len(db.table("daily_allocations").select("*").gt("updated_at", stamp).execute().data) == 1
+
+
+class TestAsyncFacade:
+    @pytest.mark.asyncio
+    async def test_async_query_matches_sync(self, mock_db):
+        adb = get_async_db()
+        resp = await adb.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute()
+        assert len(resp.data) == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_visible_to_sync_client(self, mock_db):
+        adb = get_async_db()
+        await adb.table("daily_allocations").upsert(
+            {"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 11},
+            on_conflict="wbs_item_id,date",
+        ).execute()
+        row = mock_db.table("daily_allocations").select("*").eq("wbs_item_id", CW_01).execute().data[0]
+        assert row["actual_manpower"] == 11
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_in_reads_every_page_of_every_chunk(self, mock_db, monkeypatch):
+        monkeypatch.setattr(settings, "db_page_size", 2)
+        monkeypatch.setattr(db_module, "ID_CHUNK_SIZE", 2)
+        adb = get_async_db()
+        wbs_ids = [w["id"] for w in mock_db.table("wbs_items").select("id").execute().data]
+
+        rows = await fetch_all_in(wbs_ids, lambda ids: (
+            adb.table("daily_allocations").select("*").in_("wbs_item_id", ids).order("id")
+        ))
+        expected = mock_db.table("daily_allocations").select("*").in_("wbs_item_id", wbs_ids).execute().data
+        assert len(rows) == len(expected) > 2  # CW-01 alone spans two pages
+        assert sorted(r["id"] for r in rows) == sorted(r["id"] for r in expected)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, mock_db, monkeypatch):
+        monkeypatch.setattr(settings, "db_max_concurrency", 2)
+        adb = AsyncDB(mock_db)
+        in_flight = 0
+        peak = 0
+
+        class SlowBuilder:
+            async def execute(self):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(AsyncQuery(SlowBuilder(), adb).execute() for _ in range(6)))
+        assert peak == 2
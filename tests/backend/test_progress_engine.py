@@ -0,0 +1,59 @@
+"""Parity tests: progress_engine.wbs_progress vs the vw_wbs_progress view (MockDB mirror)."""
+
+import random
+from datetime import date, timedelta
+
+from backend.models.db import MockDB, _mock_wbs_progress
+from backend.services.progress_engine import wbs_progress
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _project_rows(db):
+    items = db.table("wbs_items").select("*").eq("project_id", PROJECT_ID).execute().data
+    allocs = (
+        db.table("daily_allocations").select("*").in_("wbs_item_id", [w["id"] for w in items]).execute().data
+    )
+    return items, allocs
+
+
+def _assert_matches_view(db):
+    items, allocs = _project_rows(db)
+    view = {r["id"]: r for r in _mock_wbs_progress(db, PROJECT_ID)}
+    engine = {r["id"]: r for r in wbs_progress(items, allocs)}
+    assert engine == view
+
+
+class TestViewParity:
+    def test_seed_project(self):
+        _assert_matches_view(MockDB())
+
+    def test_random_allocations(self):
+        db = MockDB()
+        rng = random.Random(13)
+        items, _ = _project_rows(db)
+        rows = []
+        for w in items:
+            for day in rng.sample(range(120), 40):
+                rows.append({
+                    "wbs_item_id": w["id"],
+                    "date": (date(2026, 2, 17) + timedelta(days=day)).isoformat(),
+                    "planned_manpower": rng.randint(0, 6),
+                    "actual_manpower": rng.choice([0, 0, 1.5, 3, 4]),
+                    "qty_done": rng.choice([None, 0, 0.25, 1.1, 7]),
+                })
+        db.table("daily_allocations").upsert(rows, on_conflict="wbs_item_id,date").execute()
+        _assert_matches_view(db)
+
+    def test_no_allocations(self):
+        db = MockDB()
+        items, _ = _project_rows(db)
+        out = wbs_progress(items, [])
+        assert all(r["done"] == 0 and r["working_days"] == 0 and r["first_working_day"] is None for r in out)
+
+    def test_foreign_allocations_ignored(self):
+        db = MockDB()
+        items, allocs = _project_rows(db)
+        stray = {"wbs_item_id": "99999999-0000-0000-0000-000000000000", "date": "2026-02-17",
+                 "actual_manpower": 9, "qty_done": 9}
+        assert wbs_progress(items, [*allocs, stray]) == wbs_progress(items, allocs)
@@ -0,0 +1,96 @@
+"""Tests for the version-checked project snapshot cache."""
+
+import asyncio
+from datetime import date
+from uuid import UUID
+
+import pytest
+
+from backend.config import settings
+from backend.models import db as db_module
+from backend.models.schemas import ProjectCreate
+from backend.services.project_snapshot import ProjectSnapshotCache
+from backend.services.schedule_service import ScheduleService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+
+
+
+class TestProjectSnapshot:
+    @pytest.mark.asyncio
+    async def test_indexes(self, mock_db):
+        snapshot = await ProjectSnapshotCache().get(PROJECT_ID)
+        assert [a["date"] for a in snapshot.allocations_for(CW_01)] == ["2026-02-17", "2026-02-18", "2026-02-19"]
+        assert {a["wbs_item_id"] for a in snapshot.allocations_on("2026-02-19")} >= {CW_01}
+        assert snapshot.wbs_by_id[CW_01]["wbs_code"] == "CW-01"
+
+    @pytest.mark.asyncio
+    async def test_rows_are_paged_in_order(self, mock_db, monkeypatch):
+        expected = await ProjectSnapshotCache().get(PROJECT_ID)
+        monkeypatch.setattr(settings, "db_page_size", 2)
+        monkeypatch.setattr(db_module, "ID_CHUNK_SIZE", 2)
+
+        snapshot = await ProjectSnapshotCache().get(PROJECT_ID)
+        assert sorted(a["id"] for a in snapshot.allocations) == sorted(a["id"] for a in expected.allocations)
+        dates = [a["date"] for a in snapshot.allocations]
+        assert dates == sorted(dates)
+        assert len(snapshot.wbs_items) == len(expected.wbs_items) > 2
+        assert [w["id"] for w in snapshot.wbs_items] == [w["id"] for w in expected.wbs_items]
+        sort_orders = [w["sort_order"] for w in snapshot.wbs_items]
+        assert sort_orders == sorted(sort_orders)
+
+    @pytest.mark.asyncio
+    async def test_second_get_is_a_hit(self, mock_db, count_table_calls):
+        cache = ProjectSnapshotCache()
+        first = await cache.get(PROJECT_ID)
+        calls = count_table_calls()
+
+        assert await cache.get(PROJECT_ID) is first
+        assert calls == ["projects"]  # version lookup only
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates(self, mock_db):
+        cache = ProjectSnapshotCache()
+        await cache.get(PROJECT_ID)
+        await ScheduleService().upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-03-02", "actual_manpower": 4}]
+        )
+        snapshot = await cache.get(PROJECT_ID)
+        assert snapshot.allocations_for(CW_01)[-1]["date"] == "2026-03-02"
+        assert cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, mock_db, count_table_calls):
+        cache = ProjectSnapshotCache()
+        calls = count_table_calls()
+        snapshots = await asyncio.gather(*(cache.get(PROJECT_ID) for _ in range(4)))
+
+        assert all(s is snapshots[0] for s in snapshots)
+        assert calls.count("daily_allocations") == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, mock_db):
+        service = ScheduleService()
+        extra = [
+            (await service.create_project(
+                ProjectCreate(name=f"P{i}", code=f"P-{i}", start_date=date(2026, 3, 1))
+            ))["id"]
+            for i in range(2)
+        ]
+        cache = ProjectSnapshotCache(max_projects=2)
+        await cache.get(PROJECT_ID)
+        await cache.get(extra[0])
+        await cache.get(PROJECT_ID)  # refresh -> extra[0] is now least recent
+        await cache.get(extra[1])
+
+        await cache.get(PROJECT_ID)
+        assert cache.hits == 2
+        await cache.get(extra[0])
+        assert cache.misses == 4
+
+    @pytest.mark.asyncio
+    async def test_unknown_project(self, mock_db):
+        with pytest.raises(ValueError):
+            await ProjectSnapshotCache().get(UUID("00000000-0000-0000-0000-0000000000ff"))
@@ -0,0 +1,73 @@
+"""Tests for the per-project data_version and conditional GET handling."""
+
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import BaselineCreate, WBSItemUpdate
+from backend.services.baseline_service import BaselineService
+from backend.services.project_version import get_project_version
+from backend.services.schedule_service import ScheduleService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+DAILY_URL = f"/api/v1/allocations/{PROJECT_ID}/daily?from=2026-02-16&to=2026-02-20"
+
+
+class TestVersionBumps:
+    @pytest.mark.asyncio
+    async def test_allocation_upsert_bumps(self, mock_db):
+        before = await get_project_version(PROJECT_ID)
+        await ScheduleService().upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 1}]
+        )
+        assert await get_project_version(PROJECT_ID) == before + 1
+
+    @pytest.mark.asyncio
+    async def test_empty_upsert_does_not_bump(self, mock_db):
+        before = await get_project_version(PROJECT_ID)
+        await ScheduleService().upsert_allocations(PROJECT_ID, [])
+        assert await get_project_version(PROJECT_ID) == before
+
+    @pytest.mark.asyncio
+    async def test_wbs_edit_and_baseline_bump(self, mock_db):
+        before = await get_project_version(PROJECT_ID)
+        await ScheduleService().update_wbs_item(PROJECT_ID, UUID(CW_01), WBSItemUpdate(wbs_name="Renamed"))
+        await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        assert await get_project_version(PROJECT_ID) == before + 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_project_has_no_version(self, mock_db):
+        assert await get_project_version(UUID("00000000-0000-0000-0000-0000000000ff")) is None
+
+
+class TestConditionalGet:
+    def test_matching_etag_returns_304(self, mock_db):
+        client = TestClient(app)
+        first = client.get(DAILY_URL)
+        etag = first.headers["etag"]
+
+        second = client.get(DAILY_URL, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+
+    def test_write_invalidates_etag(self, mock_db):
+        client = TestClient(app)
+        etag = client.get(DAILY_URL).headers["etag"]
+        client.put(
+            f"/api/v1/allocations/{PROJECT_ID}/daily",
+            json={"updates": [{"wbs_id": CW_01, "date": "2026-02-17", "actual_manpower": 3}]},
+        )
+        resp = client.get(DAILY_URL, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+
+    def test_etag_varies_by_representation(self, mock_db):
+        client = TestClient(app)
+        v1 = client.get(DAILY_URL).headers["etag"]
+        v2 = client.get(DAILY_URL + "&format=v2").headers["etag"]
+        wbs = client.get(f"/api/v1/wbs/{PROJECT_ID}/items").headers["etag"]
+        assert len({v1, v2, wbs}) == 3
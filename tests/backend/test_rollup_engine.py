@@ -0,0 +1,81 @@
+"""Tests for the WBS hierarchy roll-up engine."""
+
+import numpy as np
+
+from backend.services.compute_engine import weighted_progress
+from backend.services.rollup_engine import rollup_progress, rollup_rows, tree_levels
+
+
+def _row(wbs_id, parent_id=None, is_summary=False, qty=0, done=0, manday=0, days=0, first=None, last=None):
+    return {
+        "id": wbs_id, "parent_id": parent_id, "is_summary": is_summary, "qty": qty,
+        "done": done, "remaining": qty - done, "progress_pct": round(done / qty * 100, 1) if qty else 0,
+        "total_actual_manday": manday, "working_days": days,
+        "productivity_rate": round(done / manday, 3) if manday else 0,
+        "first_working_day": first, "last_working_day": last,
+    }
+
+
+class TestTree:
+    def test_tree_levels_orphans_and_cycles(self):
+        items = [
+            {"id": "x", "parent_id": "y"},
+            {"id": "y", "parent_id": "x"},
+            {"id": "z", "parent_id": "missing"},
+            {"id": "w", "parent_id": "z"},
+        ]
+        parent, depth = tree_levels(items)
+        assert sorted(depth.tolist()) == [0, 0, 1, 1]
+        assert parent[3] == 2 and depth[2] == 0
+
+    def test_rollup_rows_reaches_every_ancestor(self):
+        items = [{"id": "a"}, {"id": "b", "parent_id": "a"}, {"id": "c", "parent_id": "b"}, {"id": "d", "parent_id": "a"}]
+        parent, depth = tree_levels(items)
+        out = rollup_rows(np.array([1.0, 2.0, 4.0, 8.0]), parent, depth, np.add)
+        assert out.tolist() == [15.0, 6.0, 4.0, 8.0]
+
+
+class TestRollupProgress:
+    ROWS = [
+        _row("cw", is_summary=True),
+        _row("cw1", "cw", qty=100, done=10.5, manday=15, days=3, first="2026-02-17", last="2026-02-19"),
+        _row("cw2", "cw", qty=150, done=200, manday=15, days=2, first="2026-02-16", last="2026-02-18"),
+        _row("cw3", "cw", qty=80),
+        _row("dr", is_summary=True),
+    ]
+
+    def test_summary_row_aggregates_children(self):
+        cw = rollup_progress(self.ROWS)[0]
+        assert cw["done"] == 210.5
+        assert cw["total_actual_manday"] == 30
+        assert cw["productivity_rate"] == round(210.5 / 30, 3)
+        assert (cw["first_working_day"], cw["last_working_day"]) == ("2026-02-16", "2026-02-19")
+        assert cw["working_days"] == 3
+        assert cw["progress_pct"] == weighted_progress(
+            [{"qty": r["qty"], "done": r["done"]} for r in self.ROWS[1:4]]
+        )
+
+    def test_leaves_and_childless_rows_unchanged(self):
+        rolled = rollup_progress(self.ROWS)
+        assert rolled[1:] == self.ROWS[1:]
+        assert rolled[0] is not self.ROWS[0] and self.ROWS[0]["done"] == 0
+
+    def test_nested_summaries(self):
+        rows = [
+            _row("root", is_summary=True),
+            _row("grp", "root", is_summary=True),
+            _row("leaf", "grp", qty=10, done=5, manday=2, days=1, first="2026-03-02", last="2026-03-02"),
+        ]
+        rolled = rollup_progress(rows)
+        assert [r["progress_pct"] for r in rolled] == [50.0, 50.0, 50.0]
+        assert rolled[0]["first_working_day"] == "2026-03-02"
+
+    def test_tree_from_wbs_items(self):
+        bare = [{k: v for k, v in r.items() if k not in ("parent_id", "is_summary")} for r in self.ROWS]
+        assert rollup_progress(bare, self.ROWS)[0]["done"] == 210.5
+
+    def test_empty_subtree(self):
+        rows = [_row("grp", is_summary=True), _row("child", "grp", is_summary=True)]
+        grp = rollup_progress(rows)[0]
+        assert grp["progress_pct"] == 0.0
+        assert grp["first_working_day"] is None and grp["last_working_day"] is None
@@ -0,0 +1,391 @@
+"""Tests for ScheduleService against the in-memory MockDB."""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+
+from backend.config import settings
+from backend.models import db as db_module
+from backend.models.db import MockTable
+from backend.models.schemas import (
+    AllocationBatchUpdate,
+    AllocationCell,
+    BaselineCreate,
+    DailyMatrixSparseResponse,
+)
+from backend.services import schedule_service
+from backend.services.baseline_service import BaselineService
+from backend.services.schedule_service import ScheduleService
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+CW_02 = "10000000-0000-0000-0000-000000000002"
+
+
+def _allocs(db, wbs_id):
+    return db.table("daily_allocations").select("*").eq("wbs_item_id", wbs_id).order("date").execute().data
+
+
+class TestBatchUpdateAllocations:
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_updates_and_inserts(self, mock_db):
+        payload = AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 17), actual_manpower=9),
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 20), actual_manpower=3, qty_done=2),
+            AllocationCell(wbs_id=CW_02, date=date(2026, 2, 20), qty_done=1),
+        ])
+        result = await ScheduleService().batch_update_allocations(PROJECT_ID, payload)
+
+        assert (result["updated_count"], result["errors"]) == (3, [])
+        assert {(a["wbs_id"], a["date"]) for a in result["applied"]} == {
+            (CW_01, "2026-02-17"), (CW_01, "2026-02-20"), (CW_02, "2026-02-20"),
+        }
+        rows = {r["date"]: r for r in _allocs(mock_db, CW_01)}
+        assert rows["2026-02-17"]["actual_manpower"] == 9
+        assert rows["2026-02-17"]["qty_done"] == 4  # untouched column kept
+        assert rows["2026-02-20"]["qty_done"] == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicate_cells_are_merged(self, mock_db):
+        payload = AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 20), actual_manpower=3),
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 20), qty_done=5),
+        ])
+        result = await ScheduleService().batch_update_allocations(PROJECT_ID, payload)
+
+        assert result["updated_count"] == 2
+        row = [r for r in _allocs(mock_db, CW_01) if r["date"] == "2026-02-20"][0]
+        assert row["actual_manpower"] == 3
+        assert row["qty_done"] == 5
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip_per_chunk(self, mock_db, monkeypatch):
+        calls = []
+        original = MockTable.upsert
+
+        def counting_upsert(self, data, on_conflict=""):
+            calls.append(data)
+            return original(self, data, on_conflict)
+
+        monkeypatch.setattr(MockTable, "upsert", counting_upsert)
+        payload = AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 3, d), actual_manpower=4) for d in range(1, 29)
+        ])
+        await ScheduleService().batch_update_allocations(PROJECT_ID, payload)
+
+        assert len(calls) == 1
+        assert len(calls[0]) == 28
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_falls_back_to_per_row_errors(self, mock_db, monkeypatch):
+        original = MockTable.upsert
+
+        def flaky_upsert(self, data, on_conflict=""):
+            rows = data if isinstance(data, list) else [data]
+            if any(r["wbs_item_id"] == "bad-id" for r in rows):
+                raise ValueError("violates foreign key constraint")
+            return original(self, data, on_conflict)
+
+        monkeypatch.setattr(MockTable, "upsert", flaky_upsert)
+        payload = AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 20), actual_manpower=3),
+            AllocationCell(wbs_id="bad-id", date=date(2026, 2, 20), actual_manpower=3),
+        ])
+        result = await ScheduleService().batch_update_allocations(PROJECT_ID, payload)
+
+        assert result["updated_count"] == 1
+        assert result["errors"] == [
+            {"wbs_id": "bad-id", "date": "2026-02-20", "error": "violates foreign key constraint"}
+        ]
+
+
+class TestOptimisticConcurrency:
+    @pytest.mark.asyncio
+    async def test_stale_cells_are_returned_not_written(self, mock_db, monkeypatch):
+        service = ScheduleService()
+        read = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 22))
+        # Another planner saves 02-17 after our read
+        await service.batch_update_allocations(PROJECT_ID, AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 17), actual_manpower=7),
+        ]))
+
+        calls = []
+        original = MockTable.upsert
+
+        def counting_upsert(self, data, on_conflict=""):
+            calls.append(data)
+            return original(self, data, on_conflict)
+
+        monkeypatch.setattr(MockTable, "upsert", counting_upsert)
+        result = await service.batch_update_allocations(PROJECT_ID, AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 17), actual_manpower=1, expected_updated_at=read["as_of"]),
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 18), actual_manpower=2, expected_updated_at=read["as_of"]),
+            AllocationCell(wbs_id=CW_01, date=date(2026, 2, 21), actual_manpower=3, expected_updated_at=read["as_of"]),
+        ]))
+
+        assert len(calls) == 1 and len(calls[0]) == 2  # non-conflicting cells in one write
+        assert result["updated_count"] == 2
+        assert [(c["wbs_id"], c["date"], c["current"]["actual_manpower"]) for c in result["conflicts"]] == [
+            (CW_01, "2026-02-17", 7)
+        ]
+        rows = {r["date"]: r for r in _allocs(mock_db, CW_01)}
+        assert rows["2026-02-17"]["actual_manpower"] == 7
+        assert rows["2026-02-18"]["actual_manpower"] == 2
+
+    @pytest.mark.asyncio
+    async def test_applied_stamps_chain_edits(self, mock_db):
+        service = ScheduleService()
+        first = await service.batch_update_allocations(PROJECT_ID, AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 3, 2), actual_manpower=1, expected_updated_at=None),
+        ]))
+        stamp = datetime.fromisoformat(first["applied"][0]["updated_at"])
+
+        second = await service.batch_update_allocations(PROJECT_ID, AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 3, 2), actual_manpower=2, expected_updated_at=stamp),
+        ]))
+        again_empty = await service.batch_update_allocations(PROJECT_ID, AllocationBatchUpdate(updates=[
+            AllocationCell(wbs_id=CW_01, date=date(2026, 3, 2), actual_manpower=3, expected_updated_at=None),
+        ]))
+
+        assert (first["conflicts"], second["conflicts"]) == ([], [])
+        assert again_empty["updated_count"] == 0 and len(again_empty["conflicts"]) == 1
+        assert {r["date"]: r for r in _allocs(mock_db, CW_01)}["2026-03-02"]["actual_manpower"] == 2
+
+
+class TestDailyMatrix:
+    @pytest.mark.asyncio
+    async def test_rpc_matches_multi_query_path(self, mock_db, monkeypatch):
+        service = ScheduleService()
+        via_rpc = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 20))
+        monkeypatch.setattr(schedule_service, "_matrix_rpc_available", False)
+        via_queries = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 20))
+
+        assert via_rpc["matrix"] == via_queries["matrix"]
+        assert via_rpc["totals"] == via_queries["totals"]
+        assert {w["id"]: w["done"] for w in via_rpc["wbs_items"]} == {
+            w["id"]: w["done"] for w in via_queries["wbs_items"]
+        }
+
+    @pytest.mark.asyncio
+    async def test_single_rpc_call(self, mock_db, monkeypatch):
+        bundle = db_module._mock_fn_daily_matrix(mock_db, {
+            "p_project_id": str(PROJECT_ID), "p_from": "2026-02-16", "p_to": "2026-02-20",
+        })
+        calls = []
+        monkeypatch.setattr(db_module, "_MOCK_RPCS", {"fn_daily_matrix": lambda db, p: calls.append(p) or bundle})
+        monkeypatch.setattr(db_module.MockDB, "table", lambda self, name: pytest.fail(f"unexpected query on {name}"))
+
+        result = await ScheduleService().get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 20))
+
+        assert len(calls) == 1
+        assert result["totals"]["2026-02-17"]["actual"] == 16.0
+
+    @pytest.mark.asyncio
+    async def test_summary_rows_rolled_up(self, mock_db, monkeypatch):
+        service = ScheduleService()
+        via_rpc = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 20))
+        monkeypatch.setattr(schedule_service, "_matrix_rpc_available", False)
+        via_fallback = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 20))
+
+        for result in (via_rpc, via_fallback):
+            cw = next(w for w in result["wbs_items"] if w["wbs_code"] == "CW")
+            assert cw["done"] == 21.5
+            assert cw["total_actual_manday"] == 30
+            assert cw["progress_pct"] == 6.5  # (10.5 + 11) / (100 + 150 + 80)
+
+    @pytest.mark.asyncio
+    async def test_progress_fallback_is_paged_not_per_item(self, mock_db, monkeypatch):
+        monkeypatch.setattr(settings, "db_page_size", 3)
+        queried = []
+        real_table = db_module.MockDB.table
+        monkeypatch.setattr(
+            db_module.MockDB, "table", lambda self, name: queried.append(name) or real_table(self, name)
+        )
+        service = ScheduleService()
+        wbs_items = await service.list_wbs_items(PROJECT_ID)
+        queried.clear()
+
+        progress = await service._compute_progress(PROJECT_ID, wbs_items)
+
+        assert queried == ["daily_allocations"] * 3  # 8 seed rows in pages of 3
+        view = {r["id"]: r for r in db_module._mock_wbs_progress(mock_db, str(PROJECT_ID))}
+        assert {r["id"]: r for r in progress} == view
+
+    @pytest.mark.asyncio
+    async def test_baseline_plan_feeds_planned(self, mock_db):
+        await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        result = await ScheduleService().get_daily_matrix(PROJECT_ID, date(2026, 2, 17), date(2026, 2, 17))
+
+        assert result["matrix"][CW_01]["2026-02-17"]["planned"] == 6.0
+
+    @pytest.mark.asyncio
+    async def test_unknown_project(self, mock_db):
+        with pytest.raises(ValueError):
+            await ScheduleService().get_daily_matrix(
+                UUID("00000000-0000-0000-0000-0000000000ff"), date(2026, 2, 16), date(2026, 2, 20)
+            )
+
+    @pytest.mark.asyncio
+    async def test_sparse_format_matches_v1(self, mock_db):
+        service = ScheduleService()
+        dense = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 20))
+        sparse = await service.get_daily_matrix_sparse(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 20))
+
+        assert sparse["format"] == "v2"
+        assert sparse["date_range"] == dense["date_range"]
+        cells = sparse["cells"]
+        assert len(cells["row"]) == sum(
+            1 for row in dense["matrix"].values() for c in row.values()
+            if c["planned"] or c["actual"] or c["qty_done"]
+        )
+        for k, (r, d) in enumerate(zip(cells["row"], cells["day"])):
+            cell = dense["matrix"][sparse["wbs_items"][r]["id"]][sparse["date_range"][d]]
+            assert cell["actual"] == cells["actual"][k]
+        DailyMatrixSparseResponse.model_validate(sparse)
+
+
+class TestAllocationChanges:
+    @pytest.mark.asyncio
+    async def test_returns_only_rows_after_watermark(self, mock_db, monkeypatch):
+        monkeypatch.setattr(settings, "delta_overlap_s", 0)
+        service = ScheduleService()
+        first = await service.get_allocation_changes(PROJECT_ID, datetime.now(timezone.utc))
+        assert first["allocations"] == [] and first["full_reload"] is False
+
+        await service.upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 9}]
+        )
+        second = await service.get_allocation_changes(PROJECT_ID, first["watermark"])
+
+        assert [(r["wbs_item_id"], r["date"]) for r in second["allocations"]] == [(CW_01, "2026-02-17")]
+        assert second["watermark"] > first["watermark"]
+        third = await service.get_allocation_changes(PROJECT_ID, second["watermark"])
+        assert third["allocations"] == []
+
+    @pytest.mark.asyncio
+    async def test_late_commit_is_read_by_next_poll(self, mock_db):
+        service = ScheduleService()
+        since = datetime.now(timezone.utc)
+        await asyncio.sleep(0.002)
+        await service.upsert_allocations(
+            PROJECT_ID, [{"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 9}]
+        )
+        first = await service.get_allocation_changes(PROJECT_ID, since)
+        assert [r["wbs_item_id"] for r in first["allocations"]] == [CW_01]
+
+        # A transaction that began before that write commits only now: stamped earlier than the row just read
+        began = since + timedelta(milliseconds=1)
+        mock_db.table("daily_allocations").insert({
+            "wbs_item_id": CW_02, "date": "2026-03-02", "actual_manpower": 4, "updated_at": began.isoformat(),
+        }).execute()
+        second = await service.get_allocation_changes(PROJECT_ID, first["watermark"])
+        assert {r["wbs_item_id"] for r in second["allocations"]} == {CW_01, CW_02}
+
+    @pytest.mark.asyncio
+    async def test_row_limit_reads_id_chunks(self, mock_db, monkeypatch):
+        monkeypatch.setattr(db_module, "ID_CHUNK_SIZE", 2)
+        queries = []
+        original = db_module.MockTable.in_
+
+        def recording(self, key, values):
+            queries.append(len(values))
+            return original(self, key, values)
+
+        monkeypatch.setattr(db_module.MockTable, "in_", recording)
+        service = ScheduleService()
+        since = datetime.now(timezone.utc)
+        wbs_items = mock_db.table("wbs_items").select("id").eq("project_id", str(PROJECT_ID)).execute().data
+        wbs_ids = [w["id"] for w in wbs_items]
+        await service.upsert_allocations(PROJECT_ID, [
+            {"wbs_item_id": wbs_id, "date": "2026-03-02", "actual_manpower": 1} for wbs_id in wbs_ids
+        ])
+        queries.clear()
+
+        monkeypatch.setattr(settings, "delta_max_rows", len(wbs_ids) - 1)
+        busy = await service.get_allocation_changes(PROJECT_ID, since)
+        assert busy["full_reload"] is True
+        monkeypatch.setattr(settings, "delta_max_rows", len(wbs_ids))
+        quiet = await service.get_allocation_changes(PROJECT_ID, since)
+        assert len(quiet["allocations"]) == len(wbs_ids)
+        assert queries and max(queries) <= 2
+
+    @pytest.mark.asyncio
+    async def test_date_window_filters_changes(self, mock_db):
+        service = ScheduleService()
+        since = datetime.now(timezone.utc)
+        await service.upsert_allocations(PROJECT_ID, [
+            {"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 9},
+            {"wbs_item_id": CW_01, "date": "2026-03-10", "actual_manpower": 2},
+        ])
+        changes = await service.get_allocation_changes(PROJECT_ID, since, date(2026, 3, 1), date(2026, 3, 31))
+        assert [r["date"] for r in changes["allocations"]] == ["2026-03-10"]
+
+    @pytest.mark.asyncio
+    async def test_large_gap_requests_full_reload(self, mock_db, monkeypatch):
+        service = ScheduleService()
+        stale = await service.get_allocation_changes(PROJECT_ID, datetime.now(timezone.utc) - timedelta(days=3))
+        assert stale["full_reload"] is True
+
+        monkeypatch.setattr(settings, "delta_max_rows", 1)
+        since = datetime.now(timezone.utc)
+        await service.upsert_allocations(PROJECT_ID, [
+            {"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 9},
+            {"wbs_item_id": CW_02, "date": "2026-02-17", "actual_manpower": 2},
+        ])
+        busy = await service.get_allocation_changes(PROJECT_ID, since)
+        assert busy["full_reload"] is True and busy["allocations"] == []
+
+    @pytest.mark.asyncio
+    async def test_baseline_change_requests_full_reload(self, mock_db):
+        since = datetime.now(timezone.utc)
+        await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        changes = await ScheduleService().get_allocation_changes(PROJECT_ID, since)
+        assert changes["full_reload"] is True
+        assert changes["baselines"]
+
+
+class TestWeeklyData:
+    @pytest.mark.asyncio
+    async def test_sums_match_daily_matrix(self, mock_db):
+        service = ScheduleService()
+        weekly = await service.get_weekly_data(PROJECT_ID, date(2026, 2, 17), date(2026, 2, 19))
+        daily = await service.get_daily_matrix(PROJECT_ID, date(2026, 2, 16), date(2026, 2, 22))
+
+        assert [w["key"] for w in weekly["weeks"]] == ["2026-KW08"]
+        assert weekly["matrix"][CW_01]["2026-KW08"]["actual"] == sum(
+            c["actual"] for c in daily["matrix"][CW_01].values()
+        )
+        assert weekly["totals"]["2026-KW08"]["actual"] == sum(t["actual"] for t in daily["totals"].values())
+
+    @pytest.mark.asyncio
+    async def test_defaults_to_project_window(self, mock_db):
+        weekly = await ScheduleService().get_weekly_data(PROJECT_ID)
+        project = await ScheduleService().get_project(PROJECT_ID)
+        assert weekly["weeks"][0]["start"] <= str(project["start_date"])
+
+    @pytest.mark.asyncio
+    async def test_unknown_project(self, mock_db):
+        with pytest.raises(ValueError):
+            await ScheduleService().get_weekly_data(UUID("00000000-0000-0000-0000-0000000000ff"))
+
+
+class TestSummaryData:
+    @pytest.mark.asyncio
+    async def test_bars_follow_wbs_and_daily_matrix(self, mock_db):
+        service = ScheduleService()
+        summary = await service.get_summary_data(PROJECT_ID, zoom="month")
+        wbs = await service.list_wbs_items(PROJECT_ID)
+
+        assert summary["zoom"] == "month"
+        assert [b["wbs_id"] for b in summary["gantt_bars"]] == [str(w["id"]) for w in wbs]
+        bar = next(b for b in summary["gantt_bars"] if b["wbs_id"] == CW_01)
+        first_bucket = date.fromisoformat(summary["buckets"][0])
+        daily = await service.get_daily_matrix(PROJECT_ID, first_bucket, date(2026, 12, 31))
+        assert bar["actual_manday"] == round(sum(c["actual"] for c in daily["matrix"][CW_01].values()), 2)
+
+    @pytest.mark.asyncio
+    async def test_unknown_project(self, mock_db):
+        with pytest.raises(ValueError):
+            await ScheduleService().get_summary_data(UUID("00000000-0000-0000-0000-0000000000ff"))
@@ -0,0 +1,104 @@
+"""Tests for baseline variance (engine, service and endpoint)."""
+
+from datetime import date
+from uuid import UUID
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.schemas import BaselineCreate
+from backend.services.baseline_service import BaselineService
+from backend.services.schedule_service import ScheduleService
+from backend.services.variance_engine import compare_grids
+
+PROJECT_ID = UUID("00000000-0000-0000-0000-000000000001")
+CW_01 = "10000000-0000-0000-0000-000000000001"
+
+ROOT = {"id": "r", "wbs_code": "R", "wbs_name": "Root", "parent_id": None, "is_summary": True}
+A = {"id": "a", "wbs_code": "R.1", "wbs_name": "A", "parent_id": "r"}
+B = {"id": "b", "wbs_code": "R.2", "wbs_name": "B", "parent_id": "r"}
+
+
+class TestCompareGrids:
+    def test_items_weeks_and_totals(self):
+        start = date(2026, 2, 13)  # Friday: the first week is partial
+        base = np.zeros((3, 10))
+        target = np.zeros((3, 10))
+        base[1, 0:4] = 2  # A: Fri..Mon
+        target[1, 2:7] = 2  # A: starts 2 days later, one day longer
+        base[2, 5] = 3  # B only in the base
+        result = compare_grids([ROOT, A, B], start, base, target)
+
+        root, a, b = result["items"]
+        assert (a["base_manday"], a["target_manday"], a["variance_manday"]) == (8.0, 10.0, 2.0)
+        assert (a["start_shift_days"], a["finish_shift_days"]) == (2, 3)
+        assert (b["target_start"], b["start_shift_days"]) == (None, None)
+        assert (root["base_manday"], root["target_manday"], root["level"]) == (11.0, 10.0, 0)
+        assert (root["base_start"], root["target_end"]) == ("2026-02-13", "2026-02-19")
+
+        assert [(w["key"], w["start"], w["end"]) for w in result["weeks"]] == [
+            ("2026-KW07", "2026-02-13", "2026-02-15"),
+            ("2026-KW08", "2026-02-16", "2026-02-22"),
+        ]
+        assert [w["variance_manday"] for w in result["weeks"]] == [-4.0, 3.0]
+        assert result["totals"] == {
+            "base_manday": 11.0, "target_manday": 10.0, "variance_manday": -1.0, "variance_pct": -9.1,
+        }
+
+    def test_empty_window(self):
+        result = compare_grids([A], date(2026, 2, 13), np.zeros((1, 0)), np.zeros((1, 0)))
+        assert result["weeks"] == []
+        assert result["items"][0]["base_start"] is None
+        assert result["totals"]["variance_pct"] is None
+
+
+class TestCompareBaselines:
+    @pytest.mark.asyncio
+    async def test_baseline_vs_baseline(self, mock_db):
+        service = BaselineService()
+        await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        await ScheduleService().upsert_allocations(PROJECT_ID, [
+            {"wbs_item_id": CW_01, "date": "2026-02-17", "actual_manpower": 0},
+            {"wbs_item_id": CW_01, "date": "2026-02-20", "actual_manpower": 5},
+        ])
+        await service.rebaseline(PROJECT_ID, BaselineCreate(name="v2"))
+
+        result = await service.compare_baselines(PROJECT_ID, 1, 2)
+        item = next(i for i in result["items"] if i["wbs_id"] == CW_01)
+        assert (result["base"]["name"], result["target"]["version"]) == ("v1", 2)
+        assert item["variance_manday"] == -1.0
+        assert (item["start_shift_days"], item["finish_shift_days"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_baseline_vs_actual(self, mock_db):
+        service = BaselineService()
+        await service.create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        result = await service.compare_baselines(PROJECT_ID, 1)
+
+        assert result["target"] == {"version": None, "name": "Actual"}
+        assert result["totals"]["variance_manday"] == 0.0  # baseline taken from the same allocations
+
+        clipped = await service.compare_baselines(PROJECT_ID, 1, until=date(2026, 2, 17))
+        assert clipped["to_date"] == "2026-02-17"
+        assert clipped["totals"]["base_manday"] < result["totals"]["base_manday"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_version(self, mock_db):
+        await BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="v1"))
+        assert await BaselineService().compare_baselines(PROJECT_ID, 1, 7) is None
+
+    def test_endpoint(self, mock_db):
+        client = TestClient(app)
+        assert client.post(f"/api/v1/baselines/{PROJECT_ID}/", json={"name": "v1"}).status_code == 201
+
+        resp = client.get(f"/api/v1/baselines/{PROJECT_ID}/compare", params={"base": 1})
+        assert resp.status_code == 200
+        assert resp.json()["base"]["version"] == 1
+        assert client.get(
+            f"/api/v1/baselines/{PROJECT_ID}/compare", headers={"If-None-Match": resp.headers["etag"]},
+            params={"base": 1},
+        ).status_code == 304
+        missing = client.get(f"/api/v1/baselines/{PROJECT_ID}/compare", params={"base": 1, "target": 9})
+        assert missing.status_code == 404 and missing.json()["detail"]["code"] == "BSL_NO_ACTIVE"
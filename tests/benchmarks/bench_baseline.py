@@ -0,0 +1,126 @@
+"""Benchmark: set-based baseline creation vs the original per-item loop.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_baseline [--items 1000] [--days 180] [--rtt-ms 2]
+
+Baselines a synthetic project in MockDB with every query delayed by
+``--rtt-ms`` to stand in for the PostgREST round trip: the legacy loop (one
+allocation read and one snapshot insert per WBS item) against
+BaselineService.create_baseline (paged read, baseline_engine, chunked
+inserts). Reports wall time and request count for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import date
+from uuid import UUID
+
+from backend.models import db as db_module
+from backend.models.db import AsyncQuery, get_async_db
+from backend.models.schemas import BaselineCreate
+from backend.services.baseline_service import BaselineService
+from tests.benchmarks.bench_daily_matrix import synthetic_window
+
+PROJECT_ID = UUID("20000000-0000-0000-0000-000000000001")
+
+
+async def legacy_create(project_id, baseline_id):
+    """The original snapshot loop of BaselineService.create_baseline."""
+    db = get_async_db()
+    wbs_items = await db.table("wbs_items").select("*").eq("project_id", str(project_id)).execute()
+    for item in wbs_items.data:
+        allocs = await (
+            db.table("daily_allocations")
+            .select("date, planned_manpower, actual_manpower, qty_done")
+            .eq("wbs_item_id", item["id"])
+            .order("date")
+            .execute()
+        )
+        daily_plan, total, start, end = {}, 0.0, None, None
+        for a in allocs.data:
+            mp = float(a.get("actual_manpower", 0))
+            if mp > 0:
+                daily_plan[a["date"]] = mp
+                total += mp
+                start = start or a["date"]
+                end = a["date"]
+        await db.table("baseline_snapshots").insert({
+            "baseline_id": baseline_id, "wbs_item_id": item["id"], "total_manday": total,
+            "start_date": start, "end_date": end, "daily_plan": daily_plan,
+            "manpower_per_day": round(total / len(daily_plan) if daily_plan else 0, 2),
+        }).execute()
+
+
+def seeded_db(n_items: int, n_days: int) -> db_module.MockDB:
+    wbs_ids, allocations, _ = synthetic_window(n_items, n_days, date(2026, 2, 2), density=0.4)
+    client = db_module.MockDB()
+    client.table("projects").insert({
+        "id": str(PROJECT_ID), "name": "Bench", "code": "BENCH-1", "start_date": "2026-02-02",
+    }).execute()
+    client.table("wbs_items").insert([
+        {"id": w, "project_id": str(PROJECT_ID), "wbs_code": f"B-{i:05d}", "wbs_name": f"Item {i}", "qty": 10}
+        for i, w in enumerate(wbs_ids)
+    ]).execute()
+    client.table("daily_allocations").insert(allocations).execute()
+    return client
+
+
+def install(client: db_module.MockDB) -> None:
+    db_module._client = client
+    db_module._mock_mode = True
+    db_module._async_client = None
+
+
+def with_latency(rtt_s: float, counter: list[int]):
+    original = AsyncQuery.execute
+
+    async def execute(self):
+        counter[0] += 1
+        await asyncio.sleep(rtt_s)
+        return await original(self)
+
+    return execute
+
+
+def timed(coro_fn, rtt_s: float) -> tuple[float, int]:
+    counter = [0]
+    original = AsyncQuery.execute
+    AsyncQuery.execute = with_latency(rtt_s, counter)
+    try:
+        start = time.perf_counter()
+        asyncio.run(coro_fn())
+        return time.perf_counter() - start, counter[0]
+    finally:
+        AsyncQuery.execute = original
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    rtt = args.rtt_ms / 1000
+
+    install(seeded_db(args.items, args.days))
+    legacy, legacy_requests = timed(lambda: legacy_create(PROJECT_ID, "bench-legacy"), rtt)
+
+    client = seeded_db(args.items, args.days)
+    install(client)
+    set_based, set_requests = timed(
+        lambda: BaselineService().create_baseline(PROJECT_ID, BaselineCreate(name="bench")), rtt
+    )
+
+    n_allocs = len(client.table("daily_allocations").select("id").execute().data)
+    print(f"{args.items} WBS items x {args.days} days, {n_allocs:,} allocations, {args.rtt_ms:g} ms per request")
+    print(f"  per-item loop        {legacy * 1000:9.1f} ms   {legacy_requests:6d} requests")
+    print(f"  set-based            {set_based * 1000:9.1f} ms   {set_requests:6d} requests   "
+          f"({legacy / set_based:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
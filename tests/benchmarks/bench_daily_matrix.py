@@ -0,0 +1,105 @@
+"""Benchmark: columnar daily matrix builder vs the original per-cell loop.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_daily_matrix [--rows 250] [--days 180]
+
+Times the matrix/totals assembly of ScheduleService.get_daily_matrix for a
+synthetic window (no DB): the legacy dict-per-cell loop against
+``build_daily_matrix(...).to_ic002()``, the sparse v2 emission
+(``to_sparse()``) and the dense build alone.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from backend.services.matrix_engine import build_daily_matrix
+
+
+def legacy_matrix(wbs_ids, from_date, to_date, allocations, baseline_plan, today):
+    """The original loop from ScheduleService.get_daily_matrix."""
+    date_range = [(from_date + timedelta(days=i)).isoformat() for i in range((to_date - from_date).days + 1)]
+    totals = {d: {"planned": 0.0, "actual": 0.0} for d in date_range}
+    alloc_index = {(str(a["wbs_item_id"]), str(a["date"])): a for a in allocations}
+    matrix = {}
+    for wbs_id in wbs_ids:
+        wbs_baseline = baseline_plan.get(wbs_id, {})
+        matrix[wbs_id] = {}
+        for d in date_range:
+            alloc = alloc_index.get((wbs_id, d))
+            planned = wbs_baseline.get(d, 0.0)
+            if planned == 0 and alloc:
+                planned = float(alloc.get("planned_manpower", 0))
+            cell = {
+                "planned": planned,
+                "actual": float(alloc.get("actual_manpower", 0)) if alloc else 0.0,
+                "qty_done": float(alloc.get("qty_done", 0)) if alloc else 0.0,
+                "is_future": date.fromisoformat(d) > today,
+            }
+            matrix[wbs_id][d] = cell
+            totals[d]["planned"] += cell["planned"]
+            totals[d]["actual"] += cell["actual"]
+    return matrix, totals
+
+
+def synthetic_window(n_rows: int, n_days: int, start: date, density: float = 0.5):
+    rng = random.Random(42)
+    wbs_ids = [f"10000000-0000-0000-0000-{i:012d}" for i in range(n_rows)]
+    allocations, plan = [], {}
+    for wbs_id in wbs_ids:
+        plan[wbs_id] = {}
+        for day in range(n_days):
+            d = (start + timedelta(days=day)).isoformat()
+            if rng.random() < density:
+                allocations.append({
+                    "wbs_item_id": wbs_id, "date": d, "planned_manpower": 4,
+                    "actual_manpower": rng.randint(0, 8), "qty_done": rng.randint(0, 12) / 2,
+                })
+                plan[wbs_id][d] = float(rng.randint(0, 6))
+    return wbs_ids, allocations, plan
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=250)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = date(2026, 2, 2)
+    end = start + timedelta(days=args.days - 1)
+    today = start + timedelta(days=args.days // 2)
+    wbs_ids, allocations, plan = synthetic_window(args.rows, args.days, start)
+
+    legacy = best_of(lambda: legacy_matrix(wbs_ids, start, end, allocations, plan, today), args.repeat)
+    columnar = best_of(
+        lambda: build_daily_matrix(wbs_ids, start, end, allocations, plan, today=today).to_ic002(), args.repeat
+    )
+    sparse = best_of(
+        lambda: build_daily_matrix(wbs_ids, start, end, allocations, plan, today=today).to_sparse(), args.repeat
+    )
+    dense_only = best_of(lambda: build_daily_matrix(wbs_ids, start, end, allocations, plan, today=today), args.repeat)
+
+    cells = args.rows * args.days
+    print(f"{args.rows} rows x {args.days} days = {cells:,} cells, {len(allocations):,} allocations")
+    print(f"  legacy per-cell loop        {legacy * 1000:8.1f} ms")
+    print(f"  columnar build + IC-002     {columnar * 1000:8.1f} ms   ({legacy / columnar:.1f}x)")
+    print(f"  columnar build + sparse v2  {sparse * 1000:8.1f} ms   ({legacy / sparse:.1f}x)")
+    print(f"  columnar build (arrays)     {dense_only * 1000:8.1f} ms   ({legacy / dense_only:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: run-length baseline plans vs the daily_plan JSON object.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_plan_encoding [--items 1000] [--days 180]
+
+Builds snapshots for a synthetic project where each WBS item works a
+multi-month stretch with a few crew-size changes, then compares the JSON
+payload size of ``daily_plan`` against ``plan_runs``/``plan_values`` and the
+time from fetched rows to the matrix's baseline array: the old per-entry
+``float()`` dict build plus the dict scatter against ``decode_plans``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from datetime import date, timedelta
+
+from backend.services.baseline_engine import daily_plan, decode_plans, snapshot_rows
+from backend.services.matrix_engine import build_daily_matrix
+from tests.benchmarks.bench_daily_matrix import best_of
+
+
+def synthetic_plans(n_items: int, n_days: int, start: date) -> tuple[list[str], list[dict]]:
+    rng = random.Random(42)
+    wbs_ids = [f"10000000-0000-0000-0000-{i:012d}" for i in range(n_items)]
+    allocations = []
+    for wbs_id in wbs_ids:
+        first = rng.randint(0, n_days // 4)
+        crew = rng.choice([2, 4, 6])
+        for day in range(first, first + rng.randint(n_days // 2, n_days - first)):
+            if rng.random() < 0.02:
+                crew = rng.choice([2, 4, 6, 8])
+            allocations.append({
+                "wbs_item_id": wbs_id, "date": (start + timedelta(days=day)).isoformat(), "actual_manpower": crew,
+            })
+    return wbs_ids, snapshot_rows("bench", [{"id": w} for w in wbs_ids], allocations)
+
+
+def legacy_plan(rows: list[dict]) -> dict[str, dict[str, float]]:
+    """The original get_active_baseline_plan conversion."""
+    return {r["wbs_item_id"]: {k: float(v) for k, v in r["daily_plan"].items()} for r in rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = date(2026, 2, 2)
+    end = start + timedelta(days=args.days - 1)
+    wbs_ids, snapshots = synthetic_plans(args.items, args.days, start)
+    legacy_rows = [{"wbs_item_id": s["wbs_item_id"], "daily_plan": daily_plan(s)} for s in snapshots]
+    run_rows = [{k: s[k] for k in ("wbs_item_id", "start_date", "plan_runs", "plan_values")} for s in snapshots]
+
+    # Decode from the wire format, as the API sees it
+    legacy_json, runs_json = json.dumps(legacy_rows), json.dumps(run_rows)
+    legacy_bytes = sum(len(json.dumps(r["daily_plan"])) for r in legacy_rows)
+    runs_bytes = sum(len(json.dumps([r["plan_runs"], r["plan_values"]])) for r in run_rows)
+
+    legacy = best_of(lambda: build_daily_matrix(wbs_ids, start, end, [], legacy_plan(json.loads(legacy_json))),
+                     args.repeat)
+    runs = best_of(lambda: build_daily_matrix(wbs_ids, start, end, [], decode_plans(json.loads(runs_json))),
+                   args.repeat)
+
+    n_days = sum(len(r["daily_plan"]) for r in legacy_rows)
+    n_runs = sum(len(r["plan_runs"]) for r in run_rows)
+    print(f"{args.items} WBS items, {n_days:,} planned days in {n_runs:,} runs")
+    print(f"  daily_plan JSON       {legacy_bytes / 1024:9.1f} KiB   {legacy * 1000:8.1f} ms to matrix")
+    print(f"  plan_runs/values      {runs_bytes / 1024:9.1f} KiB   {runs * 1000:8.1f} ms to matrix   "
+          f"({legacy_bytes / runs_bytes:.0f}x smaller, {legacy / runs:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
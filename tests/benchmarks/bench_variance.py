@@ -0,0 +1,50 @@
+"""Benchmark: baseline vs baseline variance for a large project.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_variance [--items 1000] [--days 365]
+
+Times the compute step of BaselineService.compare_baselines (no DB): both
+plans scattered onto one WBS x date grid with ``build_daily_matrix`` and
+compared with ``compare_grids``, starting from cached BaselinePlans.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, timedelta
+
+from backend.services.baseline_engine import decode_plans, snapshot_rows
+from backend.services.matrix_engine import build_daily_matrix
+from backend.services.variance_engine import compare_grids
+from tests.benchmarks.bench_daily_matrix import best_of, synthetic_window
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    start = date(2026, 1, 5)
+    end = start + timedelta(days=args.days - 1)
+    wbs_ids, allocations, _ = synthetic_window(args.items, args.days, start, density=0.6)
+    wbs_items = [{"id": w, "wbs_code": f"B-{i:05d}", "wbs_name": f"Item {i}"} for i, w in enumerate(wbs_ids)]
+    base = decode_plans(snapshot_rows("v3", wbs_items, allocations))
+    shifted = [{**a, "date": (date.fromisoformat(a["date"]) + timedelta(days=7)).isoformat()} for a in allocations]
+    target = decode_plans(snapshot_rows("v5", wbs_items, shifted))
+    window_end = end + timedelta(days=7)
+
+    def compare():
+        base_grid = build_daily_matrix(wbs_ids, start, window_end, [], base, today=start).planned
+        target_grid = build_daily_matrix(wbs_ids, start, window_end, [], target, today=start).planned
+        return compare_grids(wbs_items, start, base_grid, target_grid)
+
+    elapsed = best_of(compare, args.repeat)
+    print(f"{args.items} WBS items x {args.days} days, {len(base):,} + {len(target):,} planned cells")
+    print(f"  grid + compare_grids     {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
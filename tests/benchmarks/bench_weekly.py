@@ -0,0 +1,62 @@
+"""Benchmark: weekly KW view — vectorised resampling vs a per-row loop.
+
+Run from the repository root::
+
+    python -m tests.benchmarks.bench_weekly [--rows 1000] [--days 730]
+
+Times ScheduleService.get_weekly_data's compute step for a synthetic
+two-year window (no DB): grouping allocation rows by (WBS, ISO week) in
+Python against ``resample_weeks(build_daily_matrix(...)).to_nested()``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, timedelta
+
+from backend.services.matrix_engine import build_daily_matrix, iso_week_window, resample_weeks
+from tests.benchmarks.bench_daily_matrix import best_of, synthetic_window
+
+
+def legacy_weekly(wbs_ids, allocations, baseline_plan):
+    """Per-row grouping with the same planned rule as the daily matrix."""
+    matrix = {wbs_id: {} for wbs_id in wbs_ids}
+    totals = {}
+    for a in allocations:
+        wbs_id, d = a["wbs_item_id"], a["date"]
+        year, week, _ = date.fromisoformat(d).isocalendar()
+        key = f"{year}-KW{week:02d}"
+        planned = baseline_plan.get(wbs_id, {}).get(d, 0.0) or float(a.get("planned_manpower", 0))
+        for bucket in (
+            matrix[wbs_id].setdefault(key, {"planned": 0.0, "actual": 0.0, "qty_done": 0.0}),
+            totals.setdefault(key, {"planned": 0.0, "actual": 0.0, "qty_done": 0.0}),
+        ):
+            bucket["planned"] += planned
+            bucket["actual"] += float(a.get("actual_manpower", 0))
+            bucket["qty_done"] += float(a.get("qty_done", 0))
+    return matrix, totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    start, end = iso_week_window(date(2026, 2, 2), date(2026, 2, 2) + timedelta(days=args.days - 1))
+    wbs_ids, allocations, plan = synthetic_window(args.rows, (end - start).days + 1, start, density=0.3)
+
+    legacy = best_of(lambda: legacy_weekly(wbs_ids, allocations, plan), args.repeat)
+    vectorised = best_of(
+        lambda: resample_weeks(build_daily_matrix(wbs_ids, start, end, allocations, plan, today=start)).to_nested(),
+        args.repeat,
+    )
+
+    print(f"{args.rows} rows x {(end - start).days + 1} days, {len(allocations):,} allocations")
+    print(f"  per-row grouping            {legacy * 1000:8.1f} ms")
+    print(f"  build + resample_weeks      {vectorised * 1000:8.1f} ms   ({legacy / vectorised:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
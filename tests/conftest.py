@@ -38,3 +38,21 @@ def sample_allocations():
         {"wbs_item_id": "10000000-0000-0000-0000-000000000001", "date": "2026-02-18", "actual_manpower": 5, "qty_done": 3.5},
         {"wbs_item_id": "10000000-0000-0000-0000-000000000001", "date": "2026-02-19", "actual_manpower": 4, "qty_done": 3},
     ]
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    """Fresh seeded MockDB installed as the process-wide DB client."""
+    from backend.models import db as db_module
+    from backend.services.baseline_cache import baseline_cache
+    from backend.services.matrix_tiles import matrix_tiles
+    from backend.services.project_snapshot import snapshot_cache
+
+    client = db_module.MockDB()
+    snapshot_cache.invalidate()
+    matrix_tiles.invalidate()
+    baseline_cache.invalidate()
+    monkeypatch.setattr(db_module, "_client", client)
+    monkeypatch.setattr(db_module, "_mock_mode", True)
+    monkeypatch.setattr(db_module, "_async_client", None)
+    return client